@@ -0,0 +1,318 @@
+"""Serves a fake DSS for offline prober, interoperability and load test runs.
+
+The fake implements the remote ID API under /v1/dss and the strategic
+coordination Subscription API under /dss/v1 in memory, with the DSS's
+validations, error statuses, version and ownership checks, Subscription
+notification indices and per-area Subscription limits, so that tools can be
+developed and exercised without a CockroachDB cluster.  --instances serves
+several instances sharing one Store on consecutive ports, like a DSS pool
+sharing one database, and --latency-ms delays each instance's responses.
+Usage:
+
+  python -m fakedss.server --port 8082 \
+      --public-key-file ../build/test-certs/auth2.pem
+"""
+
+import argparse
+import base64
+import http.server
+import json
+import logging
+import random
+import signal
+import sys
+import threading
+import time
+import urllib.parse
+from typing import Any, Dict, List, Optional, Sequence
+
+from fakedss import spatial, store
+
+LOG = logging.getLogger('fakedss')
+
+RID_PREFIX = '/v1/dss'
+SCD_PREFIX = '/dss/v1'
+
+READ_SCOPE = 'dss.read.identification_service_areas'
+WRITE_SCOPE = 'dss.write.identification_service_areas'
+
+# Longest lifetime the DSS accepts for an access token.
+MAX_TOKEN_LIFETIME_SEC = 3600
+
+# gRPC codes of the http-gateway's error bodies, by HTTP status.
+_GRPC_CODES = {400: 3, 401: 16, 403: 7, 404: 5, 409: 6, 413: 18, 429: 8}
+
+
+def _b64decode(segment: str) -> bytes:
+  return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
+class Authorizer(object):
+  """Checks access tokens like the DSS's authorization interceptor.
+
+  Args:
+    public_key: PEM public key verifying token signatures; if None, tokens are
+      decoded without verifying their signatures.
+    accepted_audiences: Audiences a token must have one of, if any.
+  """
+
+  def __init__(self, public_key: Optional[str] = None,
+               accepted_audiences: Sequence[str] = ()):
+    self.public_key = public_key
+    self.accepted_audiences = list(accepted_audiences)
+    self._verifier = None
+    if public_key is not None:
+      from google.auth import crypt  # Only needed to verify signatures.
+      self._verifier = crypt.RSAVerifier.from_string(public_key)
+
+  def _decode(self, token: str) -> Dict[str, Any]:
+    header, payload, signature = token.split('.')
+    try:
+      if self._verifier is not None and not self._verifier.verify(
+          (header + '.' + payload).encode('ascii'), _b64decode(signature)):
+        raise store.DSSError(401, 'crypto/rsa: verification error')
+      return json.loads(_b64decode(payload))
+    except ValueError:
+      raise store.DSSError(401, 'token is malformed')
+
+  def authorize(self, header: Optional[str], scopes: List[str]) -> str:
+    """Returns the owner named by the token in header, or raises DSSError."""
+    token = (header or '')[len('Bearer '):] if (header or '').startswith(
+        'Bearer ') else ''
+    if not token:
+      raise store.DSSError(401, 'missing token')
+    if len(token.split('.')) != 3:
+      raise store.DSSError(401, 'token contains an invalid number of segments')
+    claims = self._decode(token)
+
+    if not claims.get('sub'):
+      raise store.DSSError(401, 'missing or empty subject')
+    if not claims.get('iss'):
+      raise store.DSSError(401, 'missing Issuer URI')
+    now = time.time()
+    exp = claims.get('exp', 0)
+    if exp < now:
+      raise store.DSSError(401, 'token is expired by {}s'.format(
+          int(now - exp)))
+    if exp > now + MAX_TOKEN_LIFETIME_SEC + 1:
+      raise store.DSSError(401, 'token expiration time is too far in the '
+                           'furture, Max token duration is 1 Hour')
+    if (self.accepted_audiences and
+        claims.get('aud') not in self.accepted_audiences):
+      raise store.DSSError(
+          401, 'invalid token audience: {}'.format(claims.get('aud')))
+
+    granted = set((claims.get('scope') or '').split())
+    missing = [s for s in scopes if s not in granted]
+    if missing:
+      raise store.DSSError(403, 'missing scopes: {}'.format(', '.join(missing)))
+    return claims['sub']
+
+
+class Latency(object):
+  """Delay added before each response of an instance."""
+
+  def __init__(self, mean_ms: float = 0, jitter_ms: float = 0):
+    self.mean_ms = mean_ms
+    self.jitter_ms = jitter_ms
+
+  def sleep(self) -> None:
+    delay = self.mean_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+    if delay > 0:
+      time.sleep(delay / 1000.0)
+
+
+def _route(method: str, path: str, query: Dict[str, str], body: Any,
+           dss: store.Store, authorizer: Authorizer,
+           authorization: Optional[str]) -> Dict[str, Any]:
+  """Handles one request and returns its response body."""
+  if path.startswith(SCD_PREFIX + '/'):
+    parts = path[len(SCD_PREFIX) + 1:].split('/')
+    if parts[0] != 'subscriptions' or len(parts) != 2:
+      raise store.DSSError(404, 'Not Found')
+    owner = authorizer.authorize(authorization, [])
+    if parts[1] == 'query' and method == 'POST':
+      return dss.query_scd_subscriptions(body, owner)
+    if method == 'GET':
+      return dss.get_scd_subscription(parts[1], owner)
+    if method == 'PUT':
+      return dss.put_scd_subscription(parts[1], body, owner)
+    if method == 'DELETE':
+      return dss.delete_scd_subscription(parts[1], owner)
+    raise store.DSSError(405, 'Method Not Allowed')
+
+  if not path.startswith(RID_PREFIX + '/'):
+    raise store.DSSError(404, 'Not Found')
+  parts = path[len(RID_PREFIX) + 1:].split('/')
+  kind, args = parts[0], parts[1:]
+
+  if kind == 'validate_oauth' and not args and method == 'GET':
+    owner = authorizer.authorize(authorization, [WRITE_SCOPE])
+    if query.get('owner') and query['owner'] != owner:
+      raise store.DSSError(403, 'owner mismatch, required: {}, but oauth '
+                           'token has {}'.format(query['owner'], owner))
+    return {}
+  if kind not in ('identification_service_areas', 'subscriptions') or len(
+      args) > 2:
+    raise store.DSSError(404, 'Not Found')
+
+  owner = authorizer.authorize(
+      authorization, [READ_SCOPE if method == 'GET' else WRITE_SCOPE])
+  isa = kind == 'identification_service_areas'
+  if method == 'GET' and not args:
+    if isa:
+      return dss.search_isas(query.get('area'), query.get('earliest_time'),
+                             query.get('latest_time'))
+    return dss.search_subscriptions(query.get('area'), owner)
+  if method == 'GET' and len(args) == 1:
+    return dss.get_isa(args[0]) if isa else dss.get_subscription(args[0])
+  if method == 'PUT' and args:
+    version = args[1] if len(args) == 2 else None
+    put = dss.put_isa if isa else dss.put_subscription
+    return put(args[0], version, body, owner)
+  if method == 'DELETE' and len(args) == 2:
+    delete = dss.delete_isa if isa else dss.delete_subscription
+    return delete(args[0], args[1], owner)
+  raise store.DSSError(405, 'Method Not Allowed')
+
+
+def _make_handler(dss: store.Store, authorizer: Authorizer, latency: Latency):
+
+  class DSSHandler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _handle(self, method: str):
+      url = urllib.parse.urlsplit(self.path)
+      query = dict(urllib.parse.parse_qsl(url.query))
+      length = int(self.headers.get('Content-Length') or 0)
+      raw = self.rfile.read(length) if length else b''
+      try:
+        try:
+          body = json.loads(raw) if raw else {}
+        except ValueError as e:
+          raise store.DSSError(400, 'invalid JSON body: {}'.format(e))
+        status = 200
+        result = _route(method, url.path, query, body, dss, authorizer,
+                        self.headers.get('Authorization'))
+      except store.DSSError as e:
+        status = e.status
+        result = {'error': e.message, 'message': e.message,
+                  'code': _GRPC_CODES.get(e.status, 2)}
+      except Exception as e:
+        LOG.exception('Error handling %s %s', method, self.path)
+        status = 500
+        result = {'error': str(e), 'message': str(e), 'code': 13}
+      latency.sleep()
+      payload = json.dumps(result).encode('utf-8')
+      self.send_response(status)
+      self.send_header('Content-Type', 'application/json')
+      self.send_header('Content-Length', str(len(payload)))
+      self.end_headers()
+      self.wfile.write(payload)
+
+    def do_GET(self):
+      self._handle('GET')
+
+    def do_PUT(self):
+      self._handle('PUT')
+
+    def do_POST(self):
+      self._handle('POST')
+
+    def do_DELETE(self):
+      self._handle('DELETE')
+
+    def log_message(self, format, *args):
+      LOG.debug(format, *args)
+
+  return DSSHandler
+
+
+def serve(dss: store.Store, authorizer: Authorizer, port: int,
+          latency: Optional[Latency] = None) -> http.server.HTTPServer:
+  """Serves one fake DSS instance from a background thread."""
+  server = http.server.ThreadingHTTPServer(
+      ('', port), _make_handler(dss, authorizer, latency or Latency()))
+  server.daemon_threads = True
+  threading.Thread(target=server.serve_forever, name='fakedss-{}'.format(port),
+                   daemon=True).start()
+  return server
+
+
+def _per_instance(value: str, instances: int) -> List[float]:
+  """Parses a comma-separated list of values, one per instance."""
+  values = [float(v) for v in value.split(',')] if value else [0.0]
+  if len(values) == 1:
+    values *= instances
+  if len(values) != instances:
+    raise ValueError('Expected 1 or {} values, got "{}"'.format(
+        instances, value))
+  return values
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  parser.add_argument('--port', type=int, default=8082,
+                      help='Port of the first instance')
+  parser.add_argument('--instances', type=int, default=1,
+                      help='Number of instances sharing one Store, served on '
+                      'consecutive ports')
+  parser.add_argument('--public-key-file',
+                      help='PEM public key verifying access token signatures, '
+                      'e.g. build/test-certs/auth2.pem; if omitted, signatures '
+                      'are not verified')
+  parser.add_argument('--accepted-audiences', default='',
+                      help='Comma-separated audiences that access tokens must '
+                      'have one of; if omitted, any audience is accepted')
+  parser.add_argument('--latency-ms', default='',
+                      help='Milliseconds to delay each response by, or a '
+                      'comma-separated value per instance')
+  parser.add_argument('--latency-jitter-ms', default='',
+                      help='Uniform jitter, in milliseconds, around '
+                      '--latency-ms, or a comma-separated value per instance')
+  parser.add_argument('--cell-size', type=float,
+                      default=spatial.DEFAULT_CELL_SIZE_DEG,
+                      help='Side, in degrees, of the cells of the spatial '
+                      'index')
+  parser.add_argument('--max-subscriptions-per-area', type=int,
+                      default=store.rid.MAX_SUB_PER_AREA,
+                      help='Subscriptions an owner may have in one cell')
+  return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  means = _per_instance(args.latency_ms, args.instances)
+  jitters = _per_instance(args.latency_jitter_ms, args.instances)
+
+  public_key = None
+  if args.public_key_file:
+    with open(args.public_key_file, 'r') as f:
+      public_key = f.read()
+  authorizer = Authorizer(
+      public_key, [a for a in args.accepted_audiences.split(',') if a])
+  dss = store.Store(args.cell_size, args.max_subscriptions_per_area)
+
+  servers = []
+  for i in range(args.instances):
+    servers.append(serve(dss, authorizer, args.port + i,
+                         Latency(means[i], jitters[i])))
+    LOG.info('Serving fake DSS instance %d on port %d', i,
+             servers[-1].server_address[1])
+
+  stop = threading.Event()
+  signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+  try:
+    stop.wait()
+  except KeyboardInterrupt:
+    pass
+  for server in servers:
+    server.shutdown()
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,205 @@
+"""Area validation and an in-memory spatial index for the fake DSS.
+
+Like the DSS, which indexes entities by the ~1km² (level 13) S2 cells covering
+their footprints, entities are indexed by the cells of a fixed latitude and
+longitude grid that their footprints touch, and a search returns every entity
+sharing a cell with the search area.  Results therefore have the same cell
+granularity as the DSS's, though not the same cells.
+"""
+
+import collections
+import math
+import threading
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Set, Tuple
+
+# Largest area, in km², of an entity's footprint or of a search.
+MAX_AREA_KM2 = 2500.0
+
+# Rough area of the earth, as used by the DSS.
+EARTH_AREA_KM2 = 510072000.0
+
+# Grid cells are squares this many degrees on a side (~1km).
+DEFAULT_CELL_SIZE_DEG = 0.01
+
+# Messages of the DSS's geometry errors.
+ODD_COORDINATES = 'odd number of coordinates in area string'
+NOT_ENOUGH_POINTS = 'not enough points in polygon'
+BAD_COORDINATES = 'coordinates did not create a well formed area'
+
+Cell = Tuple[int, int]
+Vertices = List[Dict[str, float]]
+
+
+class AreaTooLarge(ValueError):
+  """An area exceeds MAX_AREA_KM2."""
+
+
+def _point(vertex: Dict[str, float]) -> Tuple[float, float, float]:
+  lat = math.radians(vertex['lat'])
+  lng = math.radians(vertex['lng'])
+  return (math.cos(lat) * math.cos(lng), math.cos(lat) * math.sin(lng),
+          math.sin(lat))
+
+
+def _dot(a, b) -> float:
+  return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b) -> Tuple[float, float, float]:
+  return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2],
+          a[0] * b[1] - a[1] * b[0])
+
+
+def loop_area(vertices: Vertices) -> float:
+  """Returns the area, in steradians, of the loop through vertices.
+
+  As for an S2 loop, the loop's interior is to the left of its edges (which
+  are great circle arcs), so listing the vertices of a small polygon clockwise
+  describes everything else on the sphere.
+  """
+  points = [_point(v) for v in vertices]
+  signed = 0.0
+  a = points[0]
+  for b, c in zip(points[1:], points[2:]):
+    signed += 2 * math.atan2(_dot(a, _cross(b, c)),
+                             1 + _dot(a, b) + _dot(b, c) + _dot(c, a))
+  return signed if signed >= 0 else 4 * math.pi + signed
+
+
+def loop_area_km2(vertices: Vertices) -> float:
+  # This is the DSS's formula, which is larger than the true area by a factor
+  # of pi squared; it is kept so that the same areas are accepted.
+  return loop_area(vertices) * EARTH_AREA_KM2 / 4.0 * math.pi
+
+
+def check_polygon(vertices: Vertices) -> None:
+  """Raises ValueError if the DSS would not accept vertices as a footprint.
+
+  AreaTooLarge is raised if the polygon is larger than MAX_AREA_KM2 whichever
+  way round its vertices are listed.
+  """
+  for v in vertices:
+    if not (-90 <= v['lat'] <= 90 and -180 <= v['lng'] <= 180):
+      raise ValueError(BAD_COORDINATES)
+  if len(vertices) < 3:
+    raise ValueError(NOT_ENOUGH_POINTS)
+  if loop_area_km2(vertices) <= MAX_AREA_KM2:
+    return
+  area = loop_area_km2(list(reversed(vertices)))
+  if area > MAX_AREA_KM2:
+    raise AreaTooLarge('area is too large ({:f}km² > {:f}km²)'.format(
+        area, MAX_AREA_KM2))
+
+
+def parse_area(area: str) -> Vertices:
+  """Parses the `area` parameter of searches, lat0,lng0,lat1,lng1,..."""
+  coordinates = area.split(',')
+  if len(coordinates) % 2:
+    raise ValueError(ODD_COORDINATES)
+  if len(coordinates) < 6:
+    raise ValueError(NOT_ENOUGH_POINTS)
+  try:
+    values = [float(c.strip()) for c in coordinates]
+  except ValueError:
+    raise ValueError(BAD_COORDINATES)
+  return [{'lat': lat, 'lng': lng} for lat, lng in zip(values[::2], values[1::2])]
+
+
+def _point_in_polygon(lat: float, lng: float, vertices: Vertices) -> bool:
+  inside = False
+  j = len(vertices) - 1
+  for i in range(len(vertices)):
+    a, b = vertices[i], vertices[j]
+    if (a['lat'] > lat) != (b['lat'] > lat):
+      crossing = (b['lng'] - a['lng']) * (lat - a['lat']) / (
+          b['lat'] - a['lat']) + a['lng']
+      if lng < crossing:
+        inside = not inside
+    j = i
+  return inside
+
+
+def _segment_hits_box(a: Dict[str, float], b: Dict[str, float], lat0: float,
+                      lng0: float, lat1: float, lng1: float) -> bool:
+  """Whether segment ab intersects the box (Liang-Barsky clipping)."""
+  t0, t1 = 0.0, 1.0
+  d_lat = b['lat'] - a['lat']
+  d_lng = b['lng'] - a['lng']
+  for p, q in ((-d_lng, a['lng'] - lng0), (d_lng, lng1 - a['lng']),
+               (-d_lat, a['lat'] - lat0), (d_lat, lat1 - a['lat'])):
+    if p == 0:
+      if q < 0:
+        return False
+    else:
+      t = q / p
+      if p < 0:
+        t0 = max(t0, t)
+      else:
+        t1 = min(t1, t)
+      if t0 > t1:
+        return False
+  return True
+
+
+class CellIndex(object):
+  """Thread-safe index of keys by the grid cells their footprints touch."""
+
+  def __init__(self, cell_size_deg: float = DEFAULT_CELL_SIZE_DEG):
+    self.cell_size_deg = cell_size_deg
+    self._lock = threading.Lock()
+    self._keys_by_cell: Dict[Cell, Set[Hashable]] = collections.defaultdict(
+        set)
+    self._cells_by_key: Dict[Hashable, FrozenSet[Cell]] = {}
+
+  def covering(self, vertices: Vertices) -> FrozenSet[Cell]:
+    """Returns the cells that the polygon through vertices touches."""
+    size = self.cell_size_deg
+    row0 = int(math.floor(min(v['lat'] for v in vertices) / size))
+    row1 = int(math.floor(max(v['lat'] for v in vertices) / size))
+    col0 = int(math.floor(min(v['lng'] for v in vertices) / size))
+    col1 = int(math.floor(max(v['lng'] for v in vertices) / size))
+    edges = list(zip(vertices, vertices[1:] + vertices[:1]))
+    cells = set()
+    for row in range(row0, row1 + 1):
+      lat0, lat1 = row * size, (row + 1) * size
+      for col in range(col0, col1 + 1):
+        lng0, lng1 = col * size, (col + 1) * size
+        if (_point_in_polygon((lat0 + lat1) / 2, (lng0 + lng1) / 2, vertices)
+            or any(_segment_hits_box(a, b, lat0, lng0, lat1, lng1)
+                   for a, b in edges)):
+          cells.add((row, col))
+    return frozenset(cells)
+
+  def put(self, key: Hashable, cells: FrozenSet[Cell]) -> None:
+    """Indexes key by cells, replacing any cells it was indexed by."""
+    with self._lock:
+      self._remove(key)
+      self._cells_by_key[key] = cells
+      for cell in cells:
+        self._keys_by_cell[cell].add(key)
+
+  def remove(self, key: Hashable) -> None:
+    with self._lock:
+      self._remove(key)
+
+  def _remove(self, key: Hashable) -> None:
+    for cell in self._cells_by_key.pop(key, ()):
+      keys = self._keys_by_cell[cell]
+      keys.discard(key)
+      if not keys:
+        del self._keys_by_cell[cell]
+
+  def search(self, cells: Iterable[Cell]) -> Set[Hashable]:
+    """Returns every key indexed by at least one of cells."""
+    with self._lock:
+      result = set()
+      for cell in cells:
+        result.update(self._keys_by_cell.get(cell, ()))
+      return result
+
+  def count_by_cell(self, cells: Iterable[Cell],
+                    keys: Set[Hashable]) -> Dict[Cell, int]:
+    """Returns how many of keys are indexed by each of cells."""
+    with self._lock:
+      return {cell: len(self._keys_by_cell.get(cell, set()) & keys)
+              for cell in cells}
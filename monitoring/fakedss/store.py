@@ -0,0 +1,623 @@
+"""In-memory state of the fake DSS, with the DSS's validations.
+
+A Store holds the remote ID ISAs and Subscriptions and the strategic
+coordination Subscriptions of a DSS region.  Several fake DSS instances may
+share one Store, just as the instances of a DSS pool share one database.
+Request bodies and responses are the JSON of the DSS's HTTP API, and errors
+are raised as DSSError with the HTTP status and message the DSS's http-gateway
+would respond with.
+"""
+
+import datetime
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from fakedss import spatial
+from monitorlib import geo, rid
+
+# Largest interval by which a new entity's time_start may be in the past.
+MAX_CLOCK_SKEW = datetime.timedelta(minutes=5)
+
+MAX_SUBSCRIPTION_DURATION = datetime.timedelta(hours=rid.MAX_SUB_TIME_HRS)
+
+# Number of vertices of the polygons approximating circular SCD volumes.
+CIRCLE_VERTICES = 32
+
+_VERSION_DIGITS = '0123456789abcdefghijklmnopqrstuv'
+
+_VERSION_PATTERN = re.compile(r'^[0-9a-v]+$')
+
+_TIME_PATTERN = re.compile(
+    r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:\d{2})$')
+
+
+class DSSError(Exception):
+  """An error response of the DSS."""
+
+  def __init__(self, status: int, message: str):
+    super(DSSError, self).__init__(message)
+    self.status = status
+    self.message = message
+
+
+def bad_request(message: str) -> DSSError:
+  return DSSError(400, message)
+
+
+def not_found(entity_id: str) -> DSSError:
+  return DSSError(404, 'resource not found: {}'.format(entity_id))
+
+
+def parse_time(value: str) -> datetime.datetime:
+  """Parses an RFC 3339 timestamp into a naive UTC datetime."""
+  match = _TIME_PATTERN.match(value or '')
+  if not match:
+    raise bad_request('bad extents: invalid timestamp {}'.format(value))
+  seconds, fraction, zone = match.groups()
+  t = datetime.datetime.strptime(seconds, '%Y-%m-%dT%H:%M:%S')
+  if fraction:
+    t += datetime.timedelta(microseconds=int((fraction + '00000')[:6]))
+  if zone != 'Z':
+    offset = datetime.timedelta(hours=int(zone[1:3]), minutes=int(zone[4:6]))
+    t -= offset if zone[0] == '+' else -offset
+  return t
+
+
+def format_time(t: datetime.datetime) -> str:
+  """Formats t like the http-gateway does, with fractional seconds if any."""
+  result = t.strftime('%Y-%m-%dT%H:%M:%S')
+  if t.microsecond:
+    fraction = '{:06d}'.format(t.microsecond)
+    result += '.' + (fraction[:3] if fraction.endswith('000') else fraction)
+  return result + 'Z'
+
+
+def _check_uuid(entity_id: str) -> None:
+  try:
+    uuid.UUID(entity_id)
+  except ValueError:
+    raise bad_request('invalid uuid')
+
+
+def _parse_version(version: str) -> str:
+  if not version:
+    raise bad_request('bad version: requires version string')
+  if not _VERSION_PATTERN.match(version):
+    raise bad_request(
+        'bad version: strconv.ParseUint: parsing "{}": invalid syntax'.format(
+            version))
+  return version
+
+
+def _area_error(prefix: str, e: ValueError) -> DSSError:
+  message = '{}: {}'.format(prefix, e)
+  return DSSError(413 if isinstance(e, spatial.AreaTooLarge) else 400, message)
+
+
+class _Entity(object):
+  """Fields common to every kind of entity."""
+
+  def __init__(self, entity_id: str, owner: str):
+    self.id = entity_id
+    self.owner = owner
+    self.cells: FrozenSet[spatial.Cell] = frozenset()
+    self.time_start: Optional[datetime.datetime] = None
+    self.time_end: Optional[datetime.datetime] = None
+    self.altitude_lo: Optional[float] = None
+    self.altitude_hi: Optional[float] = None
+
+  def live(self, now: datetime.datetime) -> bool:
+    return self.time_end is None or self.time_end >= now
+
+
+class ISA(_Entity):
+
+  def __init__(self, entity_id: str, owner: str, flights_url: str):
+    super(ISA, self).__init__(entity_id, owner)
+    self.flights_url = flights_url
+    self.version = ''
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {
+        'id': self.id,
+        'owner': self.owner,
+        'flights_url': self.flights_url,
+        'time_start': format_time(self.time_start),
+        'time_end': format_time(self.time_end),
+        'version': self.version,
+    }
+
+
+class Subscription(_Entity):
+
+  def __init__(self, entity_id: str, owner: str, url: str):
+    super(Subscription, self).__init__(entity_id, owner)
+    self.url = url
+    self.notification_index = 0
+    self.version = ''
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {
+        'id': self.id,
+        'owner': self.owner,
+        'callbacks': {'identification_service_area_url': self.url},
+        'notification_index': self.notification_index,
+        'time_start': format_time(self.time_start),
+        'time_end': format_time(self.time_end),
+        'version': self.version,
+    }
+
+  def to_notify_dict(self) -> Dict[str, Any]:
+    return {
+        'url': self.url,
+        'subscriptions': [{
+            'notification_index': self.notification_index,
+            'subscription_id': self.id,
+        }],
+    }
+
+
+class SCDSubscription(_Entity):
+
+  def __init__(self, entity_id: str, owner: str):
+    super(SCDSubscription, self).__init__(entity_id, owner)
+    self.version = 0
+    self.notification_index = 0
+    self.uss_base_url = ''
+    self.notify_for_operations = False
+    self.notify_for_constraints = False
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {
+        'id': self.id,
+        'version': self.version,
+        'notification_index': self.notification_index,
+        'uss_base_url': self.uss_base_url,
+        'notify_for_operations': self.notify_for_operations,
+        'notify_for_constraints': self.notify_for_constraints,
+        'implicit_subscription': False,
+        'dependent_operations': [],
+        'time_start': {'value': format_time(self.time_start),
+                       'format': 'RFC3339'},
+        'time_end': {'value': format_time(self.time_end), 'format': 'RFC3339'},
+    }
+
+
+def _check_ownership(old: _Entity, owner: str) -> None:
+  if old.owner != owner:
+    # Sic: the DSS says ISA for Subscriptions too.
+    raise DSSError(403, 'ISA is owned by {}'.format(old.owner))
+
+
+def _set_rid_extents(entity: _Entity, extents: Dict[str, Any],
+                     index: spatial.CellIndex) -> None:
+  try:
+    if extents.get('time_start'):
+      entity.time_start = parse_time(extents['time_start'])
+    if extents.get('time_end'):
+      entity.time_end = parse_time(extents['time_end'])
+  except DSSError as e:
+    raise bad_request(e.message)
+  volume = extents.get('spatial_volume')
+  if volume is None:
+    raise bad_request('bad extents: missing required spatial_volume')
+  entity.altitude_lo = volume.get('altitude_lo', 0)
+  entity.altitude_hi = volume.get('altitude_hi', 0)
+  footprint = volume.get('footprint')
+  if footprint is None:
+    raise bad_request('bad extents: spatial_volume missing required footprint')
+  vertices = footprint.get('vertices') or []
+  try:
+    spatial.check_polygon(vertices)
+  except ValueError as e:
+    raise bad_request('bad extents: {}'.format(e))
+  entity.cells = index.covering(vertices)
+
+
+def _circle_center(outline: Dict[str, Any]) -> Tuple[float, float]:
+  coordinates = (outline.get('geometry') or {}).get('coordinates')
+  # Some clients nest a whole Point here rather than just its coordinates.
+  if isinstance(coordinates, dict):
+    coordinates = coordinates.get('coordinates')
+  if not coordinates or len(coordinates) != 2:
+    raise bad_request('bad area: outline_circle has no center')
+  lng, lat = coordinates
+  return lat, lng
+
+
+def volume_vertices(volume4d: Dict[str, Any]) -> spatial.Vertices:
+  """Returns the footprint of an SCD Volume4D as a polygon."""
+  volume = (volume4d or {}).get('volume') or {}
+  if volume.get('outline_polygon'):
+    outline = volume['outline_polygon']
+    if 'vertices' in outline:
+      return outline['vertices']
+    ring = (outline.get('coordinates') or [[]])[0]
+    if len(ring) > 1 and ring[0] == ring[-1]:
+      ring = ring[:-1]
+    return [{'lat': lat, 'lng': lng} for lng, lat in ring]
+  if volume.get('outline_circle'):
+    outline = volume['outline_circle']
+    lat, lng = _circle_center(outline)
+    radius = ((outline.get('properties') or {}).get('radius') or {})
+    radius_km = radius.get('value', 0) / 1000.0
+    if radius_km <= 0:
+      raise bad_request('bad area: outline_circle has no radius')
+    return geo.regular_polygon(lat, lng, 3.14159265 * radius_km ** 2,
+                               CIRCLE_VERTICES)
+  raise bad_request('bad area: missing outline_polygon or outline_circle')
+
+
+class Store(object):
+  """Thread-safe in-memory DSS state, shared by any number of instances."""
+
+  def __init__(self, cell_size_deg: float = spatial.DEFAULT_CELL_SIZE_DEG,
+               max_subscriptions_per_area: int = rid.MAX_SUB_PER_AREA):
+    self._lock = threading.RLock()
+    self.max_subscriptions_per_area = max_subscriptions_per_area
+    self.isas: Dict[str, ISA] = {}
+    self.subscriptions: Dict[str, Subscription] = {}
+    self.scd_subscriptions: Dict[str, SCDSubscription] = {}
+    self._isa_index = spatial.CellIndex(cell_size_deg)
+    self._subscription_index = spatial.CellIndex(cell_size_deg)
+    self._scd_subscription_index = spatial.CellIndex(cell_size_deg)
+    self._last_version = 0
+
+  @staticmethod
+  def now() -> datetime.datetime:
+    return datetime.datetime.utcnow()
+
+  def _next_version(self) -> str:
+    # Like the DSS, versions encode the time of the write in nanoseconds.
+    self._last_version = max(self._last_version + 1, time.time_ns())
+    digits = []
+    n = self._last_version
+    while n:
+      n, d = divmod(n, 32)
+      digits.append(_VERSION_DIGITS[d])
+    return ''.join(reversed(digits))
+
+  def _live(self, entities: Dict[str, _Entity],
+            entity_id: str) -> Optional[_Entity]:
+    entity = entities.get(entity_id)
+    return entity if entity is not None and entity.live(self.now()) else None
+
+  def _cells(self, area: str) -> FrozenSet[spatial.Cell]:
+    try:
+      vertices = spatial.parse_area(area or '')
+      spatial.check_polygon(vertices)
+    except ValueError as e:
+      raise _area_error('bad area', e)
+    return self._isa_index.covering(vertices)
+
+  def _check_put(self, entities: Dict[str, _Entity], entity_id: str,
+                 version: Optional[str], owner: str) -> Optional[_Entity]:
+    """Returns the entity being updated, if any, or raises."""
+    old = self._live(entities, entity_id)
+    if old is None and version is not None:
+      raise not_found(entity_id)
+    if old is not None and version is None:
+      raise DSSError(409, 'resource already exists: {}'.format(entity_id))
+    if old is not None and version != old.version:
+      raise DSSError(409, 'old version')
+    if old is not None:
+      _check_ownership(old, owner)
+    return old
+
+  def _check_delete(self, entities: Dict[str, _Entity], entity_id: str,
+                    version: str, owner: str) -> _Entity:
+    old = self._live(entities, entity_id)
+    if old is None:
+      raise not_found(entity_id)
+    if version != old.version:
+      raise DSSError(409, 'old version')
+    _check_ownership(old, owner)
+    return old
+
+  def _notify(self, cells: FrozenSet[spatial.Cell]) -> List[Dict[str, Any]]:
+    """Advances the notification index of the Subscriptions in cells."""
+    subscribers = []
+    now = self.now()
+    for subscription_id in sorted(self._subscription_index.search(cells)):
+      subscription = self.subscriptions[subscription_id]
+      if subscription.live(now):
+        subscription.notification_index += 1
+        subscribers.append(subscription.to_notify_dict())
+    return subscribers
+
+  # Remote ID Identification Service Areas.
+
+  def get_isa(self, entity_id: str) -> Dict[str, Any]:
+    _check_uuid(entity_id)
+    with self._lock:
+      isa = self._live(self.isas, entity_id)
+      if isa is None:
+        raise not_found(entity_id)
+      return {'service_area': isa.to_dict()}
+
+  def put_isa(self, entity_id: str, version: Optional[str],
+              body: Dict[str, Any], owner: str) -> Dict[str, Any]:
+    """Creates an ISA, or updates it if version is not None."""
+    _check_uuid(entity_id)
+    if version is not None:
+      version = _parse_version(version)
+    if not body.get('flights_url'):
+      raise bad_request('missing required flightsURL')
+    if body.get('extents') is None:
+      raise bad_request('missing required extents')
+    isa = ISA(entity_id, owner, body['flights_url'])
+    _set_rid_extents(isa, body['extents'], self._isa_index)
+
+    with self._lock:
+      now = self.now()
+      old = self._check_put(self.isas, entity_id, version, owner)
+      if isa.time_start is None:
+        isa.time_start = now if old is None else old.time_start
+      elif now - isa.time_start > MAX_CLOCK_SKEW:
+        raise bad_request(
+            'IdentificationServiceArea time_start must not be in the past')
+      if isa.time_end is None and old is not None:
+        isa.time_end = old.time_end
+      if isa.time_end is None:
+        raise bad_request('IdentificationServiceArea must have an time_end')
+      if isa.time_end < isa.time_start:
+        raise bad_request(
+            'IdentificationServiceArea time_end must be after time_start')
+
+      isa.version = self._next_version()
+      self.isas[entity_id] = isa
+      self._isa_index.put(entity_id, isa.cells)
+      return {
+          'service_area': isa.to_dict(),
+          'subscribers': self._notify(isa.cells),
+      }
+
+  def delete_isa(self, entity_id: str, version: str,
+                 owner: str) -> Dict[str, Any]:
+    _check_uuid(entity_id)
+    version = _parse_version(version)
+    with self._lock:
+      old = self._check_delete(self.isas, entity_id, version, owner)
+      subscribers = self._notify(old.cells)
+      del self.isas[entity_id]
+      self._isa_index.remove(entity_id)
+      return {'service_area': old.to_dict(), 'subscribers': subscribers}
+
+  def _search_isas(self, cells: FrozenSet[spatial.Cell],
+                   earliest: Optional[datetime.datetime] = None,
+                   latest: Optional[datetime.datetime] = None) -> List[ISA]:
+    now = self.now()
+    result = []
+    for isa_id in sorted(self._isa_index.search(cells)):
+      isa = self.isas[isa_id]
+      if (isa.live(now) and (earliest is None or isa.time_end >= earliest) and
+          (latest is None or isa.time_start <= latest)):
+        result.append(isa)
+    return result
+
+  def search_isas(self, area: Optional[str], earliest_time: Optional[str],
+                  latest_time: Optional[str]) -> Dict[str, Any]:
+    cells = self._cells(area)
+    try:
+      earliest = parse_time(earliest_time) if earliest_time else None
+      latest = parse_time(latest_time) if latest_time else None
+    except DSSError as e:
+      raise bad_request(e.message.replace('bad extents', 'bad time'))
+    with self._lock:
+      return {
+          'service_areas': [
+              isa.to_dict()
+              for isa in self._search_isas(cells, earliest, latest)
+          ]
+      }
+
+  # Remote ID Subscriptions.
+
+  def get_subscription(self, entity_id: str) -> Dict[str, Any]:
+    _check_uuid(entity_id)
+    with self._lock:
+      subscription = self._live(self.subscriptions, entity_id)
+      if subscription is None:
+        raise not_found(entity_id)
+      return {'subscription': subscription.to_dict()}
+
+  def put_subscription(self, entity_id: str, version: Optional[str],
+                       body: Dict[str, Any], owner: str) -> Dict[str, Any]:
+    """Creates a Subscription, or updates it if version is not None."""
+    _check_uuid(entity_id)
+    if version is not None:
+      version = _parse_version(version)
+    callbacks = body.get('callbacks')
+    if callbacks is None:
+      raise bad_request('missing required callbacks')
+    if body.get('extents') is None:
+      raise bad_request('missing required extents')
+    subscription = Subscription(
+        entity_id, owner, callbacks.get('identification_service_area_url', ''))
+    _set_rid_extents(subscription, body['extents'], self._subscription_index)
+
+    with self._lock:
+      now = self.now()
+      old = self._check_put(self.subscriptions, entity_id, version, owner)
+      self._adjust_subscription_times(subscription, old, now,
+                                      'subscription')
+
+      # Like the DSS, this counts the owner's Subscriptions in each cell,
+      # including the one being updated.
+      owned = {s.id for s in self.subscriptions.values()
+               if s.owner == owner and s.live(now)}
+      counts = self._subscription_index.count_by_cell(subscription.cells,
+                                                      owned)
+      if max(counts.values(), default=0) >= self.max_subscriptions_per_area:
+        message = 'too many existing subscriptions in this area already'
+        if old is not None:
+          message += ', rejecting update request'
+        raise DSSError(429, message)
+
+      if old is not None:
+        subscription.notification_index = old.notification_index
+      subscription.version = self._next_version()
+      self.subscriptions[entity_id] = subscription
+      self._subscription_index.put(entity_id, subscription.cells)
+      return {
+          'subscription': subscription.to_dict(),
+          'service_areas': [
+              isa.to_dict() for isa in self._search_isas(subscription.cells)
+          ],
+      }
+
+  @staticmethod
+  def _adjust_subscription_times(subscription: _Entity,
+                                 old: Optional[_Entity],
+                                 now: datetime.datetime, name: str) -> None:
+    if subscription.time_start is None:
+      subscription.time_start = now if old is None else old.time_start
+    elif now - subscription.time_start > MAX_CLOCK_SKEW:
+      raise bad_request('{} time_start must not be in the past'.format(name))
+    if subscription.time_end is None and old is not None:
+      subscription.time_end = old.time_end
+    if subscription.time_end is None:
+      subscription.time_end = (subscription.time_start +
+                               MAX_SUBSCRIPTION_DURATION)
+    if subscription.time_end < subscription.time_start:
+      raise bad_request('{} time_end must be after time_start'.format(name))
+    if subscription.time_end - subscription.time_start > \
+        MAX_SUBSCRIPTION_DURATION:
+      raise bad_request('{} window exceeds {} hours'.format(
+          name, rid.MAX_SUB_TIME_HRS))
+
+  def delete_subscription(self, entity_id: str, version: str,
+                          owner: str) -> Dict[str, Any]:
+    _check_uuid(entity_id)
+    version = _parse_version(version)
+    with self._lock:
+      old = self._check_delete(self.subscriptions, entity_id, version, owner)
+      del self.subscriptions[entity_id]
+      self._subscription_index.remove(entity_id)
+      return {'subscription': old.to_dict()}
+
+  def search_subscriptions(self, area: Optional[str],
+                           owner: str) -> Dict[str, Any]:
+    """Returns the owner's Subscriptions in area."""
+    cells = self._cells(area)
+    with self._lock:
+      now = self.now()
+      subscriptions = [
+          self.subscriptions[s]
+          for s in sorted(self._subscription_index.search(cells))
+      ]
+      return {
+          'subscriptions': [
+              s.to_dict()
+              for s in subscriptions
+              if s.owner == owner and s.live(now)
+          ]
+      }
+
+  # Strategic coordination Subscriptions.
+
+  def _scd_subscription(self, entity_id: str, owner: str) -> SCDSubscription:
+    subscription = self._live(self.scd_subscriptions, entity_id)
+    if subscription is None:
+      raise not_found(entity_id)
+    _check_ownership(subscription, owner)
+    return subscription
+
+  def get_scd_subscription(self, entity_id: str,
+                           owner: str) -> Dict[str, Any]:
+    _check_uuid(entity_id)
+    with self._lock:
+      return {
+          'subscription': self._scd_subscription(entity_id, owner).to_dict()
+      }
+
+  def put_scd_subscription(self, entity_id: str, body: Dict[str, Any],
+                           owner: str) -> Dict[str, Any]:
+    """Creates an SCD Subscription, or updates it if body has old_version."""
+    _check_uuid(entity_id)
+    subscription = SCDSubscription(entity_id, owner)
+    subscription.uss_base_url = body.get('uss_base_url', '')
+    subscription.notify_for_operations = bool(
+        body.get('notify_for_operations'))
+    subscription.notify_for_constraints = bool(
+        body.get('notify_for_constraints'))
+    extents = body.get('extents')
+    if extents:
+      vertices = volume_vertices(extents)
+      try:
+        spatial.check_polygon(vertices)
+      except ValueError as e:
+        raise bad_request('bad extents: {}'.format(e))
+      subscription.cells = self._scd_subscription_index.covering(vertices)
+      if extents.get('time_start'):
+        subscription.time_start = parse_time(extents['time_start']['value'])
+      if extents.get('time_end'):
+        subscription.time_end = parse_time(extents['time_end']['value'])
+      volume = extents.get('volume') or {}
+      subscription.altitude_lo = (volume.get('altitude_lower') or {}).get(
+          'value')
+      subscription.altitude_hi = (volume.get('altitude_upper') or {}).get(
+          'value')
+
+    old_version = int(body.get('old_version') or 0)
+    with self._lock:
+      now = self.now()
+      old = self._live(self.scd_subscriptions, entity_id)
+      if old is None and old_version:
+        raise not_found(entity_id)
+      if old is not None and not old_version:
+        raise DSSError(409, 'resource already exists: {}'.format(entity_id))
+      if old is not None and old_version != old.version:
+        raise DSSError(409, 'old version')
+      if old is not None:
+        _check_ownership(old, owner)
+        if not extents:
+          subscription.cells = old.cells
+      self._adjust_subscription_times(subscription, old, now, 'subscription')
+      subscription.version = old_version + 1
+      self.scd_subscriptions[entity_id] = subscription
+      self._scd_subscription_index.put(entity_id, subscription.cells)
+      return {
+          'subscription': subscription.to_dict(),
+          'operations': [],
+          'constraints': [],
+      }
+
+  def delete_scd_subscription(self, entity_id: str,
+                              owner: str) -> Dict[str, Any]:
+    _check_uuid(entity_id)
+    with self._lock:
+      old = self._scd_subscription(entity_id, owner)
+      del self.scd_subscriptions[entity_id]
+      self._scd_subscription_index.remove(entity_id)
+      return {'subscription': old.to_dict()}
+
+  def query_scd_subscriptions(self, body: Dict[str, Any],
+                              owner: str) -> Dict[str, Any]:
+    """Returns the owner's SCD Subscriptions intersecting area_of_interest."""
+    area_of_interest = body.get('area_of_interest')
+    if not area_of_interest:
+      raise bad_request('missing area_of_interest')
+    vertices = volume_vertices(area_of_interest)
+    try:
+      spatial.check_polygon(vertices)
+    except ValueError as e:
+      raise _area_error('bad area', e)
+    cells = self._scd_subscription_index.covering(vertices)
+    start = area_of_interest.get('time_start')
+    end = area_of_interest.get('time_end')
+    earliest = parse_time(start['value']) if start else None
+    latest = parse_time(end['value']) if end else None
+    with self._lock:
+      now = self.now()
+      result = []
+      for entity_id in sorted(self._scd_subscription_index.search(cells)):
+        s = self.scd_subscriptions[entity_id]
+        if (s.owner == owner and s.live(now) and
+            (earliest is None or s.time_end >= earliest) and
+            (latest is None or s.time_start <= latest)):
+          result.append(s.to_dict())
+      return {'subscriptions': result}
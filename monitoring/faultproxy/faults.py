@@ -0,0 +1,367 @@
+"""Fault profiles: which faults to inject into which requests, and when.
+
+A profile is a list of phases, each starting a number of seconds after the
+profile was applied and lasting until the next phase starts (the last phase
+lasts forever, unless the profile loops).  A phase is a list of rules; the
+first rule of the current phase matching a request decides what happens to it.
+A rule matches requests by method, path and upstream, and may:
+
+* delay the request by a fixed or randomly distributed latency;
+* limit the bandwidth of the response body;
+* answer with an error status instead of forwarding the request;
+* reset the connection, either before forwarding the request or after the
+  upstream has handled it (so that the client cannot tell whether it did);
+* stall, holding the connection open without answering for a while before
+  closing it.
+
+Profiles are JSON objects, e.g.:
+
+  {"name": "flaky-search", "loop": true, "phases": [
+    {"at": 0, "rules": []},
+    {"at": 30, "rules": [{"methods": ["GET"], "path": "/v1/dss/.*_areas$",
+                          "latency": {"distribution": "lognormal",
+                                      "median_ms": 200, "sigma": 1},
+                          "error_rate": 0.05, "error_status": 503}]},
+    {"at": 60}]}
+
+BUILTIN_PROFILES contains a set of common ones, which the benchmark runs by
+default.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+FIXED = 'fixed'
+UNIFORM = 'uniform'
+NORMAL = 'normal'
+EXPONENTIAL = 'exponential'
+LOGNORMAL = 'lognormal'
+PARETO = 'pareto'
+DISTRIBUTIONS = [FIXED, UNIFORM, NORMAL, EXPONENTIAL, LOGNORMAL, PARETO]
+
+# Faults, as counted by the proxy.
+LATENCY = 'latency'
+BANDWIDTH = 'bandwidth'
+ERROR = 'error'
+RESET = 'reset'
+RESET_AFTER_UPSTREAM = 'reset_after_upstream'
+STALL = 'stall'
+FAULTS = [LATENCY, BANDWIDTH, ERROR, RESET, RESET_AFTER_UPSTREAM, STALL]
+
+DEFAULT_STALL_SEC = 30
+
+
+class Latency(object):
+  """Distribution of the delay added to requests, in milliseconds.
+
+  Args:
+    distribution: One of DISTRIBUTIONS.
+    ms: Delay of the fixed distribution, and mean of the others (except
+      lognormal).
+    jitter_ms: Half-width of the uniform distribution, standard deviation of
+      the normal one.
+    median_ms: Median of the lognormal distribution; defaults to ms.
+    sigma: Shape of the lognormal distribution; larger values mean longer
+      tails.
+    alpha: Shape of the Pareto distribution, whose minimum is ms.
+    max_ms: Upper bound on any sampled delay.
+  """
+
+  def __init__(self, distribution: str = FIXED, ms: float = 0,
+               jitter_ms: float = 0, median_ms: Optional[float] = None,
+               sigma: float = 1, alpha: float = 2,
+               max_ms: Optional[float] = None):
+    if distribution not in DISTRIBUTIONS:
+      raise ValueError('Unknown latency distribution "{}"; expected one of '
+                       '{}'.format(distribution, ', '.join(DISTRIBUTIONS)))
+    self.distribution = distribution
+    self.ms = ms
+    self.jitter_ms = jitter_ms
+    self.median_ms = ms if median_ms is None else median_ms
+    self.sigma = sigma
+    self.alpha = alpha
+    self.max_ms = max_ms
+
+  def sample(self, rng: random.Random) -> float:
+    """Returns a delay in seconds."""
+    if self.distribution == FIXED:
+      ms = self.ms
+    elif self.distribution == UNIFORM:
+      ms = rng.uniform(self.ms - self.jitter_ms, self.ms + self.jitter_ms)
+    elif self.distribution == NORMAL:
+      ms = rng.gauss(self.ms, self.jitter_ms)
+    elif self.distribution == EXPONENTIAL:
+      ms = rng.expovariate(1.0 / self.ms) if self.ms > 0 else 0
+    elif self.distribution == LOGNORMAL:
+      ms = (rng.lognormvariate(math.log(self.median_ms), self.sigma)
+            if self.median_ms > 0 else 0)
+    else:
+      ms = self.ms * rng.paretovariate(self.alpha)
+    if self.max_ms is not None:
+      ms = min(ms, self.max_ms)
+    return max(ms, 0) / 1000.0
+
+  @classmethod
+  def from_dict(cls, d: Any) -> 'Latency':
+    # A bare number is a fixed latency.
+    if isinstance(d, (int, float)):
+      return cls(ms=d)
+    return cls(**d)
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {
+        'distribution': self.distribution,
+        'ms': self.ms,
+        'jitter_ms': self.jitter_ms,
+        'median_ms': self.median_ms,
+        'sigma': self.sigma,
+        'alpha': self.alpha,
+        'max_ms': self.max_ms,
+    }
+
+
+class Rule(object):
+  """Faults to inject into the requests matching a rule.
+
+  Args:
+    methods: HTTP methods the rule applies to; all if empty.
+    path: Regular expression searched for in the request path (without the
+      query); matches every path if None.
+    upstreams: Indices of the upstreams the rule applies to; all if empty.
+    latency: Delay added before forwarding the request.
+    bandwidth_kbps: Rate, in kilobits per second, at which the response body
+      is sent back.
+    error_rate: Probability of answering with error_status instead of
+      forwarding the request.
+    error_status: HTTP status of injected errors.
+    reset_rate: Probability of resetting the connection without forwarding
+      the request.
+    reset_after_upstream_rate: Probability of resetting the connection after
+      the upstream has answered the request, discarding its response.
+    stall_rate: Probability of holding the connection for stall_sec without
+      answering and then closing it.
+    stall_sec: Duration of stalls.
+  """
+
+  def __init__(self, methods: Sequence[str] = (), path: Optional[str] = None,
+               upstreams: Sequence[int] = (),
+               latency: Optional[Latency] = None,
+               bandwidth_kbps: Optional[float] = None,
+               error_rate: float = 0, error_status: int = 503,
+               reset_rate: float = 0, reset_after_upstream_rate: float = 0,
+               stall_rate: float = 0, stall_sec: float = DEFAULT_STALL_SEC):
+    self.methods = [m.upper() for m in methods]
+    self.path = path
+    self._path_pattern = re.compile(path) if path is not None else None
+    self.upstreams = list(upstreams)
+    self.latency = latency
+    self.bandwidth_kbps = bandwidth_kbps
+    self.error_rate = error_rate
+    self.error_status = error_status
+    self.reset_rate = reset_rate
+    self.reset_after_upstream_rate = reset_after_upstream_rate
+    self.stall_rate = stall_rate
+    self.stall_sec = stall_sec
+
+  def matches(self, method: str, path: str, upstream: int) -> bool:
+    return ((not self.methods or method in self.methods) and
+            (self._path_pattern is None or
+             self._path_pattern.search(path) is not None) and
+            (not self.upstreams or upstream in self.upstreams))
+
+  def decide(self, rng: random.Random) -> 'Decision':
+    """Draws the faults to inject into one request."""
+    decision = Decision()
+    # At most one of the faults which end the request is drawn.
+    draw = rng.random()
+    for fault, rate in ((STALL, self.stall_rate), (RESET, self.reset_rate),
+                        (ERROR, self.error_rate),
+                        (RESET_AFTER_UPSTREAM,
+                         self.reset_after_upstream_rate)):
+      if draw < rate:
+        decision.fault = fault
+        break
+      draw -= rate
+    if self.latency is not None:
+      decision.delay = self.latency.sample(rng)
+    decision.bandwidth_kbps = self.bandwidth_kbps
+    decision.error_status = self.error_status
+    decision.stall_sec = self.stall_sec
+    return decision
+
+  @classmethod
+  def from_dict(cls, d: Dict[str, Any]) -> 'Rule':
+    d = dict(d)
+    if d.get('latency') is not None:
+      d['latency'] = Latency.from_dict(d['latency'])
+    return cls(**d)
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {
+        'methods': self.methods,
+        'path': self.path,
+        'upstreams': self.upstreams,
+        'latency': self.latency.to_dict() if self.latency else None,
+        'bandwidth_kbps': self.bandwidth_kbps,
+        'error_rate': self.error_rate,
+        'error_status': self.error_status,
+        'reset_rate': self.reset_rate,
+        'reset_after_upstream_rate': self.reset_after_upstream_rate,
+        'stall_rate': self.stall_rate,
+        'stall_sec': self.stall_sec,
+    }
+
+
+class Decision(object):
+  """What the proxy is to do with one request."""
+
+  def __init__(self):
+    # One of STALL, RESET, ERROR, RESET_AFTER_UPSTREAM or None to forward the
+    # request normally.
+    self.fault: Optional[str] = None
+    self.delay = 0.0
+    self.bandwidth_kbps: Optional[float] = None
+    self.error_status = 503
+    self.stall_sec = DEFAULT_STALL_SEC
+
+
+class Phase(object):
+
+  def __init__(self, at: float = 0, rules: Sequence[Rule] = ()):
+    self.at = at
+    self.rules = list(rules)
+
+  @classmethod
+  def from_dict(cls, d: Dict[str, Any]) -> 'Phase':
+    return cls(d.get('at', 0),
+               [Rule.from_dict(r) for r in d.get('rules') or []])
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {'at': self.at, 'rules': [r.to_dict() for r in self.rules]}
+
+
+class Profile(object):
+  """Phases of rules applied over time.
+
+  Args:
+    name: Name of the profile in reports.
+    phases: Phases, in order of their start times.
+    loop: Whether to start over with the first phase once the last phase has
+      started; the last phase then ends (and the first one starts again) at
+      its own `at`, which should mark the end of the cycle.
+  """
+
+  def __init__(self, name: str, phases: Sequence[Phase] = (),
+               loop: bool = False):
+    self.name = name
+    self.phases = sorted(phases, key=lambda p: p.at) or [Phase()]
+    self.loop = loop
+
+  @classmethod
+  def of_rules(cls, name: str, rules: Sequence[Rule]) -> 'Profile':
+    """Returns a profile applying rules from the start, forever."""
+    return cls(name, [Phase(0, rules)])
+
+  def phase_at(self, elapsed: float) -> int:
+    """Returns the index of the phase in effect elapsed seconds in."""
+    if self.loop and len(self.phases) > 1 and self.phases[-1].at > 0:
+      elapsed %= self.phases[-1].at
+    index = 0
+    for i, phase in enumerate(self.phases):
+      if phase.at <= elapsed:
+        index = i
+    return index
+
+  @classmethod
+  def from_dict(cls, d: Dict[str, Any]) -> 'Profile':
+    if 'phases' in d:
+      phases = [Phase.from_dict(p) for p in d['phases']]
+    else:
+      phases = [Phase.from_dict({'rules': d.get('rules')})]
+    return cls(d.get('name', 'custom'), phases, d.get('loop', False))
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {
+        'name': self.name,
+        'loop': self.loop,
+        'phases': [p.to_dict() for p in self.phases],
+    }
+
+
+class ActiveProfile(object):
+  """Thread-safe profile in effect, with the time it was applied."""
+
+  def __init__(self, profile: Optional[Profile] = None,
+               seed: Optional[int] = None):
+    self._lock = threading.Lock()
+    self._rng = random.Random(seed)
+    self.set(profile or Profile('none'))
+
+  def set(self, profile: Profile) -> None:
+    with self._lock:
+      self.profile = profile
+      self.start = time.monotonic()
+
+  def decide(self, method: str, path: str, upstream: int) -> Decision:
+    with self._lock:
+      phase = self.profile.phases[self.profile.phase_at(
+          time.monotonic() - self.start)]
+      for rule in phase.rules:
+        if rule.matches(method, path, upstream):
+          return rule.decide(self._rng)
+      return Decision()
+
+  def phase(self) -> int:
+    with self._lock:
+      return self.profile.phase_at(time.monotonic() - self.start)
+
+
+def _rules(**kwargs) -> List[Rule]:
+  if 'latency' in kwargs:
+    kwargs['latency'] = Latency.from_dict(kwargs['latency'])
+  return [Rule(**kwargs)]
+
+
+# Upstream 0 is the primary DSS of interoperability rounds run with
+# --coverage primaries, so several profiles degrade only that one.
+BUILTIN_PROFILES: Dict[str, Profile] = {
+    p.name: p for p in [
+        Profile.of_rules('baseline', []),
+        Profile.of_rules('latency-50ms', _rules(latency=50)),
+        Profile.of_rules('slow-region', _rules(
+            upstreams=[0],
+            latency={'distribution': NORMAL, 'ms': 300, 'jitter_ms': 50})),
+        Profile.of_rules('long-tail', _rules(
+            latency={'distribution': LOGNORMAL, 'median_ms': 20, 'sigma': 1.5,
+                     'max_ms': 5000})),
+        Profile.of_rules('narrow-link', _rules(bandwidth_kbps=64)),
+        Profile.of_rules('errors-5pct', _rules(error_rate=0.05)),
+        Profile.of_rules('resets-2pct', _rules(
+            reset_rate=0.01, reset_after_upstream_rate=0.01)),
+        Profile.of_rules('stalls-1pct', _rules(stall_rate=0.01, stall_sec=10)),
+        Profile('region-outage', [
+            Phase(0),
+            Phase(10, _rules(upstreams=[0], reset_rate=1)),
+            Phase(40),
+        ]),
+    ]
+}
+
+
+def load_profile(spec: str) -> Profile:
+  """Returns the built-in profile named spec, or the one in file spec."""
+  if spec in BUILTIN_PROFILES:
+    return BUILTIN_PROFILES[spec]
+  if not os.path.exists(spec):
+    raise ValueError('"{}" is neither a built-in profile ({}) nor a '
+                     'file'.format(spec, ', '.join(BUILTIN_PROFILES)))
+  with open(spec, 'r') as f:
+    d = json.load(f)
+  d.setdefault('name', os.path.splitext(os.path.basename(spec))[0])
+  return Profile.from_dict(d)
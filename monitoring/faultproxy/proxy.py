@@ -0,0 +1,372 @@
+"""Reverse proxy injecting latency and faults between DSS clients and DSSs.
+
+Each upstream DSS gets a port of its own (consecutive from --port); requests
+received on it are forwarded to that upstream, with the faults of the current
+phase of the fault profile (see faults.py) injected along the way, so that
+clients such as the prober, the interoperability test suite and the load
+testing tools can be run against a slow, failing or unreachable DSS without
+breaking a real one.  Run from the monitoring folder:
+
+  python -m faultproxy.proxy --port 9082 \\
+      --upstream http://localhost:8082 --upstream http://localhost:8083 \\
+      --profile slow-region
+
+and point the clients at http://localhost:9082/v1/dss etc.  Paths are
+forwarded unchanged.  On every port, GET /_faultproxy/stats returns the
+number of requests and injected faults per upstream and PUT
+/_faultproxy/profile (with a profile as the JSON body) replaces the profile,
+restarting its phases.
+"""
+
+import argparse
+import collections
+import http.client
+import http.server
+import io
+import json
+import logging
+import socket
+import struct
+import sys
+import threading
+import time
+import urllib.parse
+from typing import Any, Dict, List, Optional, Tuple
+
+from faultproxy import faults
+
+LOG = logging.getLogger('faultproxy')
+
+CONTROL_PREFIX = '/_faultproxy'
+
+DEFAULT_UPSTREAM_TIMEOUT_SEC = 60
+
+# Response bodies are sent in chunks of this many bytes when bandwidth is
+# limited.
+BANDWIDTH_CHUNK_BYTES = 512
+
+# Methods which may be resent on a new connection when a reused one fails,
+# since sending them twice has the same effect as sending them once.
+_IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'DELETE'))
+
+# gRPC codes of injected error bodies, like the http-gateway's, by status.
+_GRPC_CODES = {429: 8, 500: 13, 502: 14, 503: 14, 504: 4}
+
+_HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailers', 'transfer-encoding', 'upgrade', 'host',
+    'content-length'
+}
+
+
+def proxied_url(url: str, address: Tuple[str, int]) -> str:
+  """Returns url with its host and port replaced by the proxy's address."""
+  parsed = urllib.parse.urlsplit(url)
+  return urllib.parse.urlunsplit(
+      ('http', '{}:{}'.format(*address)) + tuple(parsed[2:]))
+
+
+class FaultStats(object):
+  """Thread-safe counts of requests and injected faults per upstream."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self.requests: Dict[int, int] = collections.Counter()
+    self.faults: Dict[int, Dict[str, int]] = collections.defaultdict(
+        collections.Counter)
+
+  def record(self, upstream: int, decision: faults.Decision) -> None:
+    with self._lock:
+      self.requests[upstream] += 1
+      counts = self.faults[upstream]
+      if decision.fault is not None:
+        counts[decision.fault] += 1
+      if decision.delay > 0:
+        counts[faults.LATENCY] += 1
+      if decision.bandwidth_kbps and decision.fault is None:
+        counts[faults.BANDWIDTH] += 1
+
+  def to_dict(self, upstreams: List[str]) -> Dict[str, Any]:
+    with self._lock:
+      return {
+          url: {
+              'requests': self.requests[i],
+              'faults': dict(self.faults[i]),
+          } for i, url in enumerate(upstreams)
+      }
+
+
+class _Upstream(object):
+  """Keep-alive connections to one upstream, one per proxy thread."""
+
+  def __init__(self, url: str, timeout: float):
+    parsed = urllib.parse.urlsplit(url)
+    self.url = url
+    self.netloc = parsed.netloc
+    self._connection_class = (http.client.HTTPSConnection
+                              if parsed.scheme == 'https' else
+                              http.client.HTTPConnection)
+    self._timeout = timeout
+    self._local = threading.local()
+
+  def request(self, method: str, path: str, body: bytes,
+              headers: Dict[str, str]) -> http.client.HTTPResponse:
+    connection = getattr(self._local, 'connection', None)
+    reused = connection is not None
+    if connection is None:
+      connection = self._connection_class(self.netloc, timeout=self._timeout)
+    try:
+      connection.request(method, path, body=body, headers=headers)
+      response = connection.getresponse()
+    except (ConnectionError, http.client.HTTPException):
+      connection.close()
+      self._local.connection = None
+      if not reused or method not in _IDEMPOTENT_METHODS:
+        # The upstream may have received the request, so resending it could
+        # apply it twice; the client gets a 502 and decides for itself.
+        raise
+      # The upstream closed an idle connection; try once on a new one.
+      return self.request(method, path, body, headers)
+    self._local.connection = connection
+    return response
+
+
+def _error_body(status: int, message: str) -> bytes:
+  return json.dumps({
+      'error': message,
+      'message': message,
+      'code': _GRPC_CODES.get(status, 2),
+  }).encode('utf-8')
+
+
+class FaultProxy(object):
+  """Proxies for a set of upstreams, sharing one active fault profile.
+
+  Args:
+    upstreams: Base URLs (scheme://host:port) of the upstream DSSs.
+    profile: Initial fault profile.
+    seed: Seed of the random draws of faults, for reproducible runs.
+    upstream_timeout: Seconds to wait for an upstream to respond.
+  """
+
+  def __init__(self, upstreams: List[str],
+               profile: Optional[faults.Profile] = None,
+               seed: Optional[int] = None,
+               upstream_timeout: float = DEFAULT_UPSTREAM_TIMEOUT_SEC):
+    self.upstreams = list(upstreams)
+    self.active = faults.ActiveProfile(profile, seed)
+    self.stats = FaultStats()
+    self._upstreams = [_Upstream(u, upstream_timeout) for u in upstreams]
+    self._servers: List[http.server.HTTPServer] = []
+    self._stopping = threading.Event()
+
+  @property
+  def addresses(self) -> List[Tuple[str, int]]:
+    """(host, port) the proxy of each upstream listens on."""
+    return [('localhost', s.server_address[1]) for s in self._servers]
+
+  def set_profile(self, profile: faults.Profile) -> None:
+    """Applies profile from now on, resetting the stats."""
+    self.active.set(profile)
+    self.stats = FaultStats()
+    LOG.info('Applied fault profile %s', profile.name)
+
+  def start(self, port: int = 0, host: str = '') -> None:
+    """Serves the proxies on consecutive ports from port (any if 0)."""
+    for i in range(len(self._upstreams)):
+      server = http.server.ThreadingHTTPServer(
+          (host, port + i if port else 0), self._make_handler(i))
+      server.daemon_threads = True
+      threading.Thread(target=server.serve_forever,
+                       name='faultproxy-{}'.format(i), daemon=True).start()
+      self._servers.append(server)
+      LOG.info('Proxying port %d to %s', server.server_address[1],
+               self.upstreams[i])
+
+  def stop(self) -> None:
+    # Wakes up any requests waiting out a latency or a stall.
+    self._stopping.set()
+    for server in self._servers:
+      server.shutdown()
+      server.server_close()
+    self._servers = []
+
+  def _make_handler(self, upstream_index: int):
+    proxy = self
+    upstream = self._upstreams[upstream_index]
+
+    class FaultHandler(http.server.BaseHTTPRequestHandler):
+
+      protocol_version = 'HTTP/1.1'
+      disable_nagle_algorithm = True
+
+      def _send(self, status: int, headers: List[Tuple[str, str]],
+                body: bytes, bandwidth_kbps: Optional[float] = None) -> None:
+        self.send_response(status)
+        for name, value in headers:
+          self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not bandwidth_kbps:
+          self.wfile.write(body)
+          return
+        seconds_per_chunk = BANDWIDTH_CHUNK_BYTES * 8 / (bandwidth_kbps * 1000)
+        for i in range(0, len(body), BANDWIDTH_CHUNK_BYTES):
+          self.wfile.write(body[i:i + BANDWIDTH_CHUNK_BYTES])
+          self.wfile.flush()
+          if proxy._stopping.wait(seconds_per_chunk):
+            return
+
+      def _reset(self) -> None:
+        # With a zero linger time, closing the socket sends a RST.  The
+        # socket's file objects are closed first so that close() releases it
+        # at once.
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER,
+                                   struct.pack('ii', 1, 0))
+        self.close_connection = True
+        self.rfile.close()
+        self.wfile.close()
+        self.connection.close()
+        self.wfile = io.BytesIO()
+
+      def _control(self, method: str, path: str, body: bytes) -> None:
+        if path == CONTROL_PREFIX + '/stats' and method == 'GET':
+          result = {
+              'profile': proxy.active.profile.name,
+              'phase': proxy.active.phase(),
+              'upstreams': proxy.stats.to_dict(proxy.upstreams),
+          }
+        elif path == CONTROL_PREFIX + '/profile' and method == 'GET':
+          result = proxy.active.profile.to_dict()
+        elif path == CONTROL_PREFIX + '/profile' and method == 'PUT':
+          try:
+            profile = faults.Profile.from_dict(json.loads(body))
+          except (ValueError, TypeError) as e:
+            self._send(400, [('Content-Type', 'application/json')],
+                       _error_body(400, 'bad profile: {}'.format(e)))
+            return
+          proxy.set_profile(profile)
+          result = profile.to_dict()
+        else:
+          self._send(404, [('Content-Type', 'application/json')],
+                     _error_body(404, 'Not Found'))
+          return
+        self._send(200, [('Content-Type', 'application/json')],
+                   json.dumps(result).encode('utf-8'))
+
+      def _handle(self, method: str) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        path = urllib.parse.urlsplit(self.path).path
+        if path.startswith(CONTROL_PREFIX + '/'):
+          self._control(method, path, body)
+          return
+
+        decision = proxy.active.decide(method, path, upstream_index)
+        proxy.stats.record(upstream_index, decision)
+        if decision.fault == faults.STALL:
+          proxy._stopping.wait(decision.stall_sec)
+          self.close_connection = True
+          return
+        if decision.fault == faults.RESET:
+          self._reset()
+          return
+        if decision.delay > 0 and proxy._stopping.wait(decision.delay):
+          return
+        if decision.fault == faults.ERROR:
+          self._send(decision.error_status,
+                     [('Content-Type', 'application/json')],
+                     _error_body(decision.error_status,
+                                 'injected fault'), decision.bandwidth_kbps)
+          return
+
+        headers = {
+            name: value
+            for name, value in self.headers.items()
+            if name.lower() not in _HOP_BY_HOP_HEADERS
+        }
+        headers['Host'] = upstream.netloc
+        try:
+          response = upstream.request(method, self.path, body, headers)
+          response_body = response.read()
+        except (OSError, http.client.HTTPException) as e:
+          LOG.warning('Error forwarding %s %s to %s: %s', method, self.path,
+                      upstream.url, e)
+          self._send(502, [('Content-Type', 'application/json')],
+                     _error_body(502, 'upstream unavailable: {}'.format(e)))
+          return
+        if decision.fault == faults.RESET_AFTER_UPSTREAM:
+          self._reset()
+          return
+        self._send(response.status, [
+            (name, value)
+            for name, value in response.getheaders()
+            if name.lower() not in _HOP_BY_HOP_HEADERS
+        ], response_body, decision.bandwidth_kbps)
+
+      def do_GET(self):
+        self._handle('GET')
+
+      def do_PUT(self):
+        self._handle('PUT')
+
+      def do_POST(self):
+        self._handle('POST')
+
+      def do_DELETE(self):
+        self._handle('DELETE')
+
+      def do_PATCH(self):
+        self._handle('PATCH')
+
+      def log_message(self, format, *args):
+        LOG.debug(format, *args)
+
+    return FaultHandler
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  parser.add_argument('--upstream', action='append', required=True,
+                      dest='upstreams',
+                      help='Base URL (scheme://host:port) of an upstream DSS; '
+                      'may be repeated, in which case upstream i is proxied '
+                      'on --port + i')
+  parser.add_argument('--port', type=int, default=9082,
+                      help='Port of the proxy of the first upstream')
+  parser.add_argument('--profile', default='baseline',
+                      help='Name of a built-in fault profile ({}) or JSON '
+                      'file describing one'.format(', '.join(
+                          faults.BUILTIN_PROFILES)))
+  parser.add_argument('--seed', type=int,
+                      help='Seed of the random draws of faults')
+  parser.add_argument('--upstream-timeout', type=float,
+                      default=DEFAULT_UPSTREAM_TIMEOUT_SEC,
+                      help='Seconds to wait for an upstream to respond')
+  return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  proxy = FaultProxy(args.upstreams, faults.load_profile(args.profile),
+                     seed=args.seed, upstream_timeout=args.upstream_timeout)
+  proxy.start(args.port)
+
+  phase = None
+  try:
+    while True:
+      current = proxy.active.phase()
+      if current != phase:
+        LOG.info('Profile %s entered phase %d', proxy.active.profile.name,
+                 current)
+        phase = current
+      time.sleep(0.5)
+  except KeyboardInterrupt:
+    pass
+  proxy.stop()
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
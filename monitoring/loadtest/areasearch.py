@@ -0,0 +1,330 @@
+"""Benchmark of DSS area search latency versus search area and entity density.
+
+Seeds a region with ISAs and Subscriptions, then searches for each kind of
+entity with polygons of every combination of --areas, --vertex-counts and
+--time-windows, centered on the seeded region.  Each combination (a "point")
+is searched --repeats times in sequence, and its latency percentiles, response
+sizes and result counts are written to --csv and/or --json.  Pass a previous
+JSON result as --baseline to compare against it.  Run from the monitoring
+folder:
+
+  python -m loadtest.areasearch \\
+      --dss-endpoint http://localhost:8082 --api-version-role /v1/dss \\
+      --oauth-token-endpoint http://localhost:8085/token --use-dummy-oauth \\
+      --isas 1000 --json v0.2.json [--baseline v0.1.json]
+
+Note that the DSS computes polygon areas generously, so searches of more than
+roughly 250 km² are rejected as too large; such points are still measured and
+reported with their error status.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import csv
+import datetime
+import json
+import logging
+import math
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from loadtest import cli, workload
+from monitorlib import geo, histogram, rid
+
+LOG = logging.getLogger(__name__)
+
+ISA = 'isa'
+SUBSCRIPTION = 'subscription'
+KINDS = [ISA, SUBSCRIPTION]
+
+DEFAULT_REGION = '-26.0,130.6,-25.7,130.9'
+
+# Footprint size of seeded entities (~500m).
+SEED_CELL_SIZE_DEG = 0.005
+
+CSV_COLUMNS = [
+    'kind', 'area_km2', 'vertex_count', 'time_window_min', 'requests',
+    'errors', 'statuses', 'mean_s', 'p50_s', 'p90_s', 'p99_s', 'max_s',
+    'mean_response_bytes', 'mean_results'
+]
+
+# (kind, area_km2, vertex_count, time_window_min)
+PointKey = Tuple[str, float, int, Optional[float]]
+
+
+def _float_list(value: str) -> List[float]:
+  return [float(x) for x in value.split(',')]
+
+
+def _int_list(value: str) -> List[int]:
+  return [int(x) for x in value.split(',')]
+
+
+def _time_windows(value: str) -> List[Optional[float]]:
+  return [None if x == 'none' else float(x) for x in value.split(',')]
+
+
+def seed(load: workload.RIDWorkload, isas: int, subscriptions: int,
+         concurrency: int) -> Dict[str, int]:
+  """Creates entities in random cells of the workload's grid.
+
+  Returns the number of each kind of entity actually created.  Subscription
+  creation may be refused where the DSS's limit of Subscriptions per area is
+  reached.
+  """
+  operations = [workload.ISA_PUT] * isas + [workload.SUB_PUT] * subscriptions
+  with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+    for resp in executor.map(load.run, operations):
+      if resp.status_code != 200:
+        LOG.debug('Seeding failed with %d: %s', resp.status_code, resp.text)
+  return {ISA: len(load.isas), SUBSCRIPTION: len(load.subscriptions)}
+
+
+def measure_point(session, kind: str, area: str,
+                  time_window_min: Optional[float], repeats: int,
+                  warmup: int) -> Dict[str, Any]:
+  """Searches area repeats times and summarizes the results."""
+  path = rid.ISA_PATH if kind == ISA else rid.SUBSCRIPTION_PATH
+  result_key = 'service_areas' if kind == ISA else 'subscriptions'
+  params = {'area': area}
+  if time_window_min is not None and kind == ISA:
+    earliest = datetime.datetime.utcnow()
+    latest = earliest + datetime.timedelta(minutes=time_window_min)
+    params['earliest_time'] = earliest.strftime(rid.DATE_FORMAT)
+    params['latest_time'] = latest.strftime(rid.DATE_FORMAT)
+
+  latency = histogram.Histogram()
+  statuses = collections.Counter()
+  response_bytes = 0
+  results = 0
+  for i in range(warmup + repeats):
+    t0 = time.perf_counter()
+    resp = session.get(path, params=params)
+    elapsed = time.perf_counter() - t0
+    if i < warmup:
+      continue
+    latency.record(elapsed)
+    statuses[str(resp.status_code)] += 1
+    response_bytes += len(resp.content)
+    if resp.status_code == 200:
+      results += len(resp.json().get(result_key, []))
+
+  summary = latency.summary()
+  ok = statuses.get('200', 0)
+  return {
+      'requests': repeats,
+      'errors': repeats - ok,
+      'statuses': dict(statuses),
+      'mean_s': summary['mean'],
+      'p50_s': summary['p50'],
+      'p90_s': summary['p90'],
+      'p99_s': summary['p99'],
+      'max_s': summary['max'],
+      'mean_response_bytes': response_bytes / repeats,
+      'mean_results': results / ok if ok else None,
+      'latency': latency.to_dict(),
+  }
+
+
+def sweep(session, kinds: List[str], center: Tuple[float, float],
+          areas: List[float], vertex_counts: List[int],
+          time_windows: List[Optional[float]], repeats: int,
+          warmup: int) -> List[Dict[str, Any]]:
+  points = []
+  for kind in kinds:
+    for area_km2 in areas:
+      for vertex_count in vertex_counts:
+        polygon = geo.polygon_string(
+            geo.regular_polygon(center[0], center[1], area_km2, vertex_count))
+        for time_window_min in time_windows:
+          if time_window_min is not None and kind != ISA:
+            # Subscription searches don't take a time window.
+            continue
+          point = {
+              'kind': kind,
+              'area_km2': area_km2,
+              'vertex_count': vertex_count,
+              'time_window_min': time_window_min,
+          }
+          point.update(measure_point(session, kind, polygon, time_window_min,
+                                     repeats, warmup))
+          LOG.info('%s %g km² %d vertices window %s: p50 %.1f ms, %s results',
+                   kind, area_km2, vertex_count, time_window_min,
+                   (point['p50_s'] or 0) * 1000, point['mean_results'])
+          points.append(point)
+  return points
+
+
+def point_key(point: Dict[str, Any]) -> PointKey:
+  return (point['kind'], point['area_km2'], point['vertex_count'],
+          point['time_window_min'])
+
+
+def compare(points: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+            threshold: float) -> Tuple[str, int]:
+  """Compares points against baseline points with the same parameters.
+
+  Returns a report and the number of points whose p50 or p99 latency grew by
+  more than a factor of threshold.
+  """
+  baseline_by_key = {point_key(p): p for p in baseline}
+  rows = [['point', 'p50 ms', 'base', 'ratio', 'p99 ms', 'base', 'ratio', '']]
+  regressions = 0
+  for point in points:
+    base = baseline_by_key.get(point_key(point))
+    if base is None:
+      continue
+    row = ['{} {:g}km² {}v {}'.format(
+        point['kind'], point['area_km2'], point['vertex_count'],
+        '-' if point['time_window_min'] is None else
+        '{:g}min'.format(point['time_window_min']))]
+    regressed = False
+    for p in ('p50_s', 'p99_s'):
+      current, previous = point[p], base[p]
+      ratio = current / previous if current and previous else None
+      row.extend([
+          '-' if current is None else '{:.1f}'.format(current * 1000),
+          '-' if previous is None else '{:.1f}'.format(previous * 1000),
+          '-' if ratio is None else '{:.2f}'.format(ratio),
+      ])
+      if ratio is not None and ratio > threshold:
+        regressed = True
+    if point['errors'] > base['errors']:
+      regressed = True
+    row.append('REGRESSION' if regressed else '')
+    regressions += regressed
+    rows.append(row)
+  widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+  report = '\n'.join(
+      '  '.join(cell.rjust(width) if i else cell.ljust(width)
+                for i, (cell, width) in enumerate(zip(row, widths)))
+      for row in rows)
+  return report, regressions
+
+
+def write_csv(path: str, points: List[Dict[str, Any]]) -> None:
+  with open(path, 'w', newline='') as f:
+    writer = csv.DictWriter(f, CSV_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    for point in points:
+      row = dict(point)
+      row['statuses'] = ' '.join(
+          '{}:{}'.format(k, v) for k, v in sorted(point['statuses'].items()))
+      writer.writerow(row)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  cli.add_dss_arguments(parser)
+  parser.add_argument('--isas', type=int, default=500,
+                      help='Number of ISAs to seed the region with')
+  parser.add_argument('--subscriptions', type=int, default=100,
+                      help='Number of Subscriptions to seed the region with')
+  parser.add_argument('--region', type=cli.parse_region, default=DEFAULT_REGION,
+                      help='lat_min,lng_min,lat_max,lng_max of the region to '
+                      'seed; searches are centered on it')
+  parser.add_argument('--kinds', default=','.join(KINDS),
+                      help='Comma-separated kinds of entities to search for')
+  parser.add_argument('--areas', type=_float_list, default='1,5,25,100,250',
+                      help='Comma-separated search polygon areas, in km²')
+  parser.add_argument('--vertex-counts', type=_int_list, default='4,16,64',
+                      help='Comma-separated search polygon vertex counts')
+  parser.add_argument('--time-windows', type=_time_windows, default='none',
+                      help='Comma-separated ISA search time windows in minutes '
+                      'from now, or "none" to search without one')
+  parser.add_argument('--repeats', type=int, default=20,
+                      help='Number of measured searches per point')
+  parser.add_argument('--warmup', type=int, default=2,
+                      help='Number of unmeasured searches per point')
+  parser.add_argument('--concurrency', type=int, default=16,
+                      help='Number of concurrent requests while seeding')
+  parser.add_argument('--ttl', type=float, default=3600,
+                      help='Lifetime in seconds of seeded entities')
+  parser.add_argument('--seed', type=int, help='Random seed')
+  parser.add_argument('--label', help='Label for this run, e.g. the DSS version')
+  parser.add_argument('--csv', help='Write results to this CSV file')
+  parser.add_argument('--json', help='Write results to this JSON file')
+  parser.add_argument('--baseline', help='JSON results to compare against')
+  parser.add_argument('--regression-threshold', type=float, default=1.2,
+                      help='Flag points whose p50 or p99 latency is this many '
+                      'times the baseline')
+  parser.add_argument('--fail-on-regression', action='store_true',
+                      help='Exit with status 1 if any point regressed')
+  parser.add_argument('--no-cleanup', action='store_true',
+                      help='Leave seeded entities in the DSS')
+  args = parser.parse_args(argv)
+  args.kinds = args.kinds.split(',')
+  for kind in args.kinds:
+    if kind not in KINDS:
+      parser.error('Unknown kind {}; expected one of {}'.format(
+          kind, ', '.join(KINDS)))
+  return args
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  lat_min, lng_min, lat_max, lng_max = args.region
+  grid = geo.Grid.over_region(lat_min, lng_min, lat_max, lng_max,
+                              cell_size_deg=SEED_CELL_SIZE_DEG,
+                              cell_pitch_deg=SEED_CELL_SIZE_DEG * 2)
+  session = cli.make_session(args, pool_maxsize=args.concurrency)
+  load = workload.RIDWorkload(session, grid, ttl=args.ttl,
+                              rng=random.Random(args.seed))
+
+  region_km2 = ((lat_max - lat_min) * geo.KM_PER_DEGREE *
+                (lng_max - lng_min) * geo.KM_PER_DEGREE *
+                math.cos(math.radians((lat_min + lat_max) / 2)))
+  LOG.info('Seeding %d ISAs and %d Subscriptions over %.0f km²', args.isas,
+           args.subscriptions, region_km2)
+  seeded = seed(load, args.isas, args.subscriptions, args.concurrency)
+  LOG.info('Seeded %d ISAs and %d Subscriptions', seeded[ISA],
+           seeded[SUBSCRIPTION])
+
+  try:
+    center = ((lat_min + lat_max) / 2, (lng_min + lng_max) / 2)
+    points = sweep(session, args.kinds, center, args.areas, args.vertex_counts,
+                   args.time_windows, args.repeats, args.warmup)
+  finally:
+    if not args.no_cleanup:
+      failures = load.cleanup()
+      if failures:
+        LOG.warning('Failed to delete %d seeded entities', failures)
+
+  result = {
+      'label': args.label,
+      'dss_endpoint': args.dss_endpoint,
+      'time': datetime.datetime.utcnow().strftime(rid.DATE_FORMAT),
+      'region': args.region,
+      'region_km2': region_km2,
+      'seeded': seeded,
+      'density_per_km2': {k: v / region_km2 for k, v in seeded.items()},
+      'points': points,
+  }
+  if args.json:
+    with open(args.json, 'w') as f:
+      json.dump(result, f, indent=2)
+  if args.csv:
+    write_csv(args.csv, points)
+
+  if args.baseline:
+    with open(args.baseline, 'r') as f:
+      baseline = json.load(f)
+    report, regressions = compare(points, baseline['points'],
+                                  args.regression_threshold)
+    print('Compared with {} ({}):'.format(
+        args.baseline, baseline.get('label') or baseline.get('time')))
+    print(report)
+    if regressions:
+      print('{} point(s) regressed by more than {:g}x'.format(
+          regressions, args.regression_threshold))
+      if args.fail_on_regression:
+        return 1
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,123 @@
+"""Command line options shared by the load testing tools.
+
+The DSS and OAuth options have the same names as the prober's.
+"""
+
+import argparse
+import atexit
+from typing import Dict, Optional
+
+from monitorlib import auth, infrastructure, recording, tokens
+
+# Recorders of --record-requests, by path, shared by all sessions.
+_recorders: Dict[str, recording.Recorder] = {}
+
+
+def add_dss_arguments(parser: argparse.ArgumentParser) -> None:
+  parser.add_argument('--dss-endpoint', required=True,
+                      help='Base URL of the DSS, e.g. http://localhost:8082')
+  parser.add_argument('--api-version-role', default='',
+                      help='Path prefix of the API, e.g. /v1/dss')
+  parser.add_argument('--dss-grpc-endpoint',
+                      help='host:port of a grpc-backend to send requests to as '
+                      'gRPC calls, bypassing the http-gateway at '
+                      '--dss-endpoint, e.g. localhost:8081')
+  parser.add_argument('--grpc-channels', type=int,
+                      help='Number of gRPC channels to spread calls over')
+  parser.add_argument('--oauth-token-endpoint')
+  parser.add_argument('--oauth-service-account-json')
+  parser.add_argument('--oauth-username')
+  parser.add_argument('--oauth-password')
+  parser.add_argument('--oauth-client-id')
+  parser.add_argument('--use-dummy-oauth', action='store_true')
+  parser.add_argument('--jwt-private-key-file',
+                      help='Sign access tokens locally with this RSA private '
+                      'key instead of requesting them from an OAuth server')
+  parser.add_argument('--jwt-issuer', default=auth.DEFAULT_ISSUER,
+                      help='Issuer of locally-signed access tokens')
+  parser.add_argument('--jwt-subject', default=auth.DEFAULT_SUBJECT,
+                      help='Subject of locally-signed access tokens')
+  parser.add_argument('--jwt-lifetime', type=float,
+                      default=auth.DEFAULT_TOKEN_LIFETIME_SEC,
+                      help='Seconds until locally-signed access tokens expire')
+  parser.add_argument('--jwt-claims', type=auth.parse_claims,
+                      help='Additional claims of locally-signed access tokens, '
+                      'as a JSON object')
+  parser.add_argument('--token-refresh-skew', type=float,
+                      default=tokens.DEFAULT_REFRESH_SKEW_SEC,
+                      help='Refresh access tokens this many seconds before '
+                      'they expire')
+  parser.add_argument('--token-cache-file',
+                      help='File to persist access tokens in between runs')
+  parser.add_argument('--record-requests',
+                      help='Record every request sent to the DSS in this file '
+                      '(gzipped if it ends in .gz), for loadtest.replay')
+
+
+def make_auth_adapter(args: argparse.Namespace, pool_maxsize: int = 10,
+                      subject: Optional[str] = None):
+  """Creates an auth adapter for the credentials specified on the command line.
+
+  subject overrides --jwt-subject, to act as another owner of entities; this
+  requires --jwt-private-key-file.
+  """
+  if subject is not None and not args.jwt_private_key_file:
+    raise ValueError('Acting as another owner requires --jwt-private-key-file')
+  return auth.make_auth_adapter(
+      args.oauth_token_endpoint,
+      service_account_json=args.oauth_service_account_json,
+      username=args.oauth_username,
+      password=args.oauth_password,
+      client_id=args.oauth_client_id,
+      use_dummy_oauth=args.use_dummy_oauth,
+      private_key_file=args.jwt_private_key_file,
+      signer_options={
+          'issuer': args.jwt_issuer,
+          'subject': subject or args.jwt_subject,
+          'lifetime': args.jwt_lifetime,
+          'extra_claims': args.jwt_claims,
+      },
+      token_cache_options={
+          'refresh_skew': args.token_refresh_skew,
+          'persist_path': args.token_cache_file,
+      },
+      pool_maxsize=pool_maxsize)
+
+
+def make_session(args: argparse.Namespace, pool_maxsize: int = 10,
+                 subject: Optional[str] = None,
+                 api_role: Optional[str] = None):
+  """Creates a session for the DSS specified on the command line.
+
+  pool_maxsize should be at least the number of threads sharing the session.
+  subject is as for make_auth_adapter.  api_role overrides --api-version-role,
+  for tools which use more than one of the DSS's APIs.
+  """
+  session = infrastructure.make_session(
+      args.dss_endpoint + (args.api_version_role if api_role is None
+                           else api_role),
+      make_auth_adapter(args, pool_maxsize, subject),
+      grpc_target=args.dss_grpc_endpoint, grpc_channels=args.grpc_channels)
+  attach_recorder(args, session)
+  return session
+
+
+def attach_recorder(args: argparse.Namespace, session) -> None:
+  """Records the requests of session if --record-requests was specified."""
+  path = args.record_requests
+  if not path:
+    return
+  if path not in _recorders:
+    _recorders[path] = recording.Recorder(path)
+    atexit.register(_recorders[path].close)
+  _recorders[path].attach(session)
+
+
+def parse_region(value: str):
+  """Parses a lat_min,lng_min,lat_max,lng_max region."""
+  try:
+    lat_min, lng_min, lat_max, lng_max = (float(x) for x in value.split(','))
+  except ValueError:
+    raise argparse.ArgumentTypeError(
+        'Region must be specified as lat_min,lng_min,lat_max,lng_max')
+  return lat_min, lng_min, lat_max, lng_max
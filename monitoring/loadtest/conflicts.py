@@ -0,0 +1,476 @@
+"""Benchmark of strategic deconfliction as Operations and Constraints pile up.
+
+Creating or updating an Operation reference requires a key listing the OVNs
+of every Operation (and, if the Operation's Subscription is notified of
+Constraints, every Constraint) it intersects in space and time; otherwise the
+DSS rejects it with 409 and lists the entities the key is missing.  This tool
+seeds increasing numbers of mutually-intersecting Operations and Constraints
+(--levels, with --constraint-ratio Constraints per Operation) around one point
+(--center), plus --disjoint entities per intersecting one that share their
+area but not their time window, so the DSS has to tell them apart.  At each
+level it times --repetitions cycles of putting a new Operation there without a
+key, putting it again with the key built from the tracked OVNs, updating it
+and deleting it.  Run from the monitoring folder:
+
+  python -m loadtest.conflicts --levels 0,5,10,20,40 \\
+      --dss-endpoint http://localhost:8082 --api-version-role /dss/v1 \\
+      --jwt-private-key-file ../build/test-certs/auth2.key
+
+Volumes alternate between polygons and circles (see --shapes), each placed and
+sized at random but so that every intersecting volume covers --center.  The
+OVN of each entity is tracked from the responses to its puts, and refreshed
+from the entities a 409 lists; the report shows how often the tracked key was
+stale, along with the latency and response size of each operation and the
+number of entities listed by each conflict response.
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import logging
+import math
+import random
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from loadtest import cli, stats
+from monitorlib import geo, histogram, scd
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_CENTER = '-24.2,129.1'
+DEFAULT_LEVELS = '0,5,10,20,40'
+
+OPERATION = 'operation'
+CONSTRAINT = 'constraint'
+
+POLYGON = 'polygon'
+CIRCLE = 'circle'
+SHAPES = [POLYGON, CIRCLE]
+
+PUT_UNKEYED = 'put_unkeyed'
+PUT_KEYED = 'put_keyed'
+UPDATE = 'update'
+DELETE = 'delete'
+OPERATIONS = [PUT_UNKEYED, PUT_KEYED, UPDATE, DELETE]
+
+_PATHS = {
+    OPERATION: scd.OPERATION_REFERENCE_PATH,
+    CONSTRAINT: scd.CONSTRAINT_REFERENCE_PATH
+}
+_ENTITY_KEYS = {
+    OPERATION: 'operation_reference',
+    CONSTRAINT: 'constraint_reference'
+}
+
+# Vertices of polygon outlines.
+POLYGON_VERTICES = 8
+
+# Entities are seeded in time windows starting this long after the run starts,
+# so that none of them starts in the past while it is being written.
+LEAD_TIME = datetime.timedelta(minutes=10)
+
+# Gap between the time windows of disjoint entities.
+WINDOW_GAP = datetime.timedelta(minutes=5)
+
+
+class Entity(object):
+  """An Operation or Constraint reference and its last known OVN."""
+
+  def __init__(self, kind: str, extents: List[Dict[str, Any]],
+               intersecting: bool):
+    self.kind = kind
+    self.id = str(uuid.uuid4())
+    self.path = '{}/{}'.format(_PATHS[kind], self.id)
+    self.extents = extents
+    # Whether the entity intersects the measured Operations.
+    self.intersecting = intersecting
+    self.ovn: Optional[str] = None
+    self.version = 0
+
+  def update_from(self, resp: requests.Response) -> None:
+    reference = resp.json()[_ENTITY_KEYS[self.kind]]
+    self.ovn = reference.get('ovn')
+    self.version = reference.get('version', 0)
+
+
+class Level(object):
+  """Measurements with one number of intersecting entities."""
+
+  def __init__(self, operations: int, constraints: int):
+    self.operations = operations
+    self.constraints = constraints
+    # Entities seeded outside the intersecting entities' time window.
+    self.disjoint = 0
+    self.stats = stats.LoadStats()
+    self.response_bytes = {op: histogram.Histogram(lowest_value=1)
+                           for op in OPERATIONS}
+    # Entities listed by each 409 response, and OVNs in each key sent.
+    self.conflicts = histogram.Histogram(lowest_value=1)
+    self.key_size = histogram.Histogram(lowest_value=1)
+    # Conflict responses listing OVNs other than the tracked ones.
+    self.stale_keys = 0
+    # Updates of the measured Operations the DSS rejected.
+    self.failed_updates = 0
+
+  def record(self, operation: str, latency: float,
+             resp: requests.Response) -> None:
+    self.stats.record(operation, latency, resp.status_code)
+    self.response_bytes[operation].record(len(resp.content))
+    if resp.status_code == 409:
+      self.conflicts.record(len(scd.conflicts(resp.json())))
+
+  def summary(self) -> Dict[str, Any]:
+    report = self.stats.report(1)
+    return {
+        'operations': self.operations,
+        'constraints': self.constraints,
+        'disjoint': self.disjoint,
+        'stale_keys': self.stale_keys,
+        'failed_updates': self.failed_updates,
+        'conflicts': self.conflicts.summary(),
+        'key_size': self.key_size.summary(),
+        'latency': {
+            op: {
+                'latency': report.get(op),
+                'response_bytes': self.response_bytes[op].summary(),
+            } for op in OPERATIONS
+        },
+    }
+
+
+class ConflictWorkload(object):
+  """Seeds intersecting entities and measures Operation writes among them.
+
+  Args:
+    session: Session for the DSS, with URLs relative to the SCD API root.
+    center: (lat, lng) every intersecting volume covers.
+    radius_m: Largest radius of the volumes' outlines.
+    shapes: Shapes of outlines, assigned in turn.
+    window: Duration of the intersecting entities' time window.
+    notify_for_constraints: Whether the measured Operations' Subscriptions are
+      notified of Constraints, which makes Constraints part of their keys.
+    rng: Source of the volumes' placement.
+  """
+
+  def __init__(self,
+               session: requests.Session,
+               center: Tuple[float, float],
+               radius_m: float = 2000,
+               shapes: List[str] = SHAPES,
+               window: datetime.timedelta = datetime.timedelta(minutes=30),
+               notify_for_constraints: bool = True,
+               rng: Optional[random.Random] = None):
+    self.session = session
+    self.center = center
+    self.radius_m = radius_m
+    self.shapes = shapes
+    self.window = window
+    self.notify_for_constraints = notify_for_constraints
+    self.rng = rng or random.Random()
+    self.window_start = datetime.datetime.utcnow() + LEAD_TIME
+    self.entities: List[Entity] = []
+    self._by_id: Dict[str, Entity] = {}
+    self._volumes = 0
+    self._disjoint_windows = 0
+
+  def _outline(self) -> Dict[str, Any]:
+    """Returns the outline of a volume covering the center."""
+    shape = self.shapes[self._volumes % len(self.shapes)]
+    self._volumes += 1
+    radius_m = self.radius_m * self.rng.uniform(0.6, 1)
+    # Offsetting the outline by less than half of the smallest radius keeps
+    # the center within it, even within the inscribed circle of a polygon.
+    offset_km = self.rng.uniform(0, 0.5 * 0.6 * self.radius_m) / 1000
+    bearing = self.rng.uniform(0, 2 * math.pi)
+    lat = self.center[0] + offset_km * math.sin(bearing) / geo.KM_PER_DEGREE
+    lng = self.center[1] + offset_km * math.cos(bearing) / (
+        geo.KM_PER_DEGREE * math.cos(math.radians(self.center[0])))
+    if shape == CIRCLE:
+      return {'outline_circle': scd.circle(lat, lng, radius_m)}
+    # Area of a regular polygon with circumradius r is n/2 r^2 sin(2 pi / n).
+    area_km2 = (POLYGON_VERTICES / 2 * (radius_m / 1000)**2 *
+                math.sin(2 * math.pi / POLYGON_VERTICES))
+    return {
+        'outline_polygon': scd.polygon(
+            geo.regular_polygon(lat, lng, area_km2, POLYGON_VERTICES))
+    }
+
+  def _extents(self, intersecting: bool) -> List[Dict[str, Any]]:
+    start = self.window_start
+    if not intersecting:
+      # Each disjoint entity gets a window of its own after the others.
+      self._disjoint_windows += 1
+      start += (self.window + WINDOW_GAP) * self._disjoint_windows
+    # Every intersecting volume spans 50-100m.
+    return [scd.volume4d(start, start + self.window,
+                         self.rng.uniform(0, 50), self.rng.uniform(100, 150),
+                         **self._outline())]
+
+  def key(self) -> List[str]:
+    """Returns the OVNs a new intersecting Operation has to provide."""
+    kinds = ({OPERATION, CONSTRAINT} if self.notify_for_constraints
+             else {OPERATION})
+    return [e.ovn for e in self.entities
+            if e.intersecting and e.kind in kinds and e.ovn]
+
+  def _learn(self, resp: requests.Response) -> int:
+    """Updates OVNs from a 409 response; returns the number that changed."""
+    changed = 0
+    for reference in scd.conflicts(resp.json()):
+      entity = self._by_id.get(reference.get('id'))
+      if entity is not None and reference.get('ovn') and (
+          entity.ovn != reference['ovn']):
+        entity.ovn = reference['ovn']
+        changed += 1
+    return changed
+
+  def _body(self, kind: str, extents: List[Dict[str, Any]], key: List[str],
+            old_version: int = 0) -> Dict[str, Any]:
+    if kind == CONSTRAINT:
+      return scd.constraint_body(extents, old_version=old_version)
+    return scd.operation_body(
+        extents, key, old_version=old_version,
+        notify_for_constraints=self.notify_for_constraints)
+
+  def _add(self, kind: str, intersecting: bool) -> None:
+    entity = Entity(kind, self._extents(intersecting), intersecting)
+    key = self.key() if intersecting else []
+    resp = self.session.put(entity.path,
+                            json=self._body(kind, entity.extents, key))
+    if resp.status_code == 409 and self._learn(resp):
+      # Another writer changed the area since; retry with the fresh OVNs.
+      resp = self.session.put(
+          entity.path, json=self._body(kind, entity.extents, self.key()))
+    if resp.status_code != 200:
+      raise RuntimeError('Failed to create {} {}: {} {}'.format(
+          kind, entity.id, resp.status_code, resp.text))
+    entity.update_from(resp)
+    self.entities.append(entity)
+    self._by_id[entity.id] = entity
+
+  def seed(self, level: Level, disjoint: int) -> None:
+    """Adds entities until the level's numbers of them intersect.
+
+    Raises:
+      RuntimeError: An entity could not be created.
+    """
+    def count(kind, intersecting):
+      return sum(1 for e in self.entities
+                 if e.kind == kind and e.intersecting == intersecting)
+
+    for kind, target in ((OPERATION, level.operations),
+                         (CONSTRAINT, level.constraints)):
+      while count(kind, True) < target:
+        self._add(kind, True)
+        for _ in range(disjoint):
+          self._add(kind, False)
+    level.disjoint = sum(1 for e in self.entities if not e.intersecting)
+
+  def measure(self, level: Level, repetitions: int) -> None:
+    """Puts, updates and deletes a new intersecting Operation repetitions
+    times."""
+    for _ in range(repetitions):
+      path = '{}/{}'.format(scd.OPERATION_REFERENCE_PATH, uuid.uuid4())
+      extents = self._extents(True)
+
+      resp = self._timed(level, PUT_UNKEYED, 'PUT', path,
+                         self._body(OPERATION, extents, []))
+      if resp.status_code == 409:
+        if self._learn(resp):
+          level.stale_keys += 1
+        key = self.key()
+        level.key_size.record(len(key))
+        resp = self._timed(level, PUT_KEYED, 'PUT', path,
+                           self._body(OPERATION, extents, key))
+        if resp.status_code == 409 and self._learn(resp):
+          level.stale_keys += 1
+      if resp.status_code != 200:
+        LOG.warning('Failed to create Operation: %d %s', resp.status_code,
+                    resp.text)
+        continue
+
+      version = resp.json()['operation_reference'].get('version', 0)
+      resp = self._timed(level, UPDATE, 'PUT', path,
+                         self._body(OPERATION, extents, self.key(), version))
+      if resp.status_code == 409 and self._learn(resp):
+        level.stale_keys += 1
+      if resp.status_code != 200:
+        level.failed_updates += 1
+        LOG.warning('Failed to update Operation %s: %d %s', path,
+                    resp.status_code, resp.text)
+      # Deleting an Operation takes no version, so it is deleted whether or
+      # not the update went through.
+      resp = self._timed(level, DELETE, 'DELETE', path)
+      if resp.status_code != 200:
+        LOG.warning('Failed to delete Operation %s: %d', path,
+                    resp.status_code)
+
+  def _timed(self, level: Level, operation: str, method: str, path: str,
+             body: Optional[Dict[str, Any]] = None) -> requests.Response:
+    t0 = time.monotonic()
+    resp = self.session.request(method, path, json=body)
+    level.record(operation, time.monotonic() - t0, resp)
+    return resp
+
+  def cleanup(self) -> int:
+    """Deletes the seeded entities; returns the number of failures."""
+    failures = 0
+    for entity in self.entities:
+      resp = self.session.delete(entity.path)
+      if resp.status_code != 200:
+        LOG.warning('Failed to delete %s %s: %d', entity.kind, entity.id,
+                    resp.status_code)
+        failures += 1
+    self.entities = []
+    self._by_id = {}
+    return failures
+
+
+def _ms(value: Optional[float]) -> str:
+  return '-' if value is None else '{:.1f}'.format(value * 1000)
+
+
+def _number(value: Optional[float]) -> str:
+  return '-' if value is None else '{:.0f}'.format(value)
+
+
+def points(summaries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+  """Flattens level summaries into one row per level and operation."""
+  rows = []
+  for s in summaries:
+    for op, o in s['latency'].items():
+      latency = o['latency'] or {}
+      rows.append({
+          'operations': s['operations'],
+          'constraints': s['constraints'],
+          'disjoint': s['disjoint'],
+          'operation': op,
+          'count': latency.get('count', 0),
+          'errors': latency.get('errors', 0),
+          'p50': latency.get('p50'),
+          'p99': latency.get('p99'),
+          'mean_response_bytes': o['response_bytes']['mean'],
+          'mean_conflicts': (s['conflicts']['mean']
+                             if op == PUT_UNKEYED else None),
+          'stale_keys': s['stale_keys'],
+          'failed_updates': s['failed_updates'],
+      })
+  return rows
+
+
+def format_points(rows: List[Dict[str, Any]]) -> str:
+  table = [['operations', 'constraints', 'disjoint', 'operation', 'count',
+            'errors', 'p50 ms', 'p99 ms', 'response bytes', 'conflicts']]
+  for r in rows:
+    table.append([
+        str(r['operations']), str(r['constraints']), str(r['disjoint']),
+        r['operation'], str(r['count']), str(r['errors']), _ms(r['p50']),
+        _ms(r['p99']), _number(r['mean_response_bytes']),
+        _number(r['mean_conflicts']),
+    ])
+  widths = [max(len(row[i]) for row in table) for i in range(len(table[0]))]
+  return '\n'.join(
+      '  '.join(cell.rjust(width) if i else cell.ljust(width)
+                for i, (cell, width) in enumerate(zip(row, widths)))
+      for row in table)
+
+
+def _parse_point(value: str) -> Tuple[float, float]:
+  try:
+    lat, lng = (float(x) for x in value.split(','))
+  except ValueError:
+    raise argparse.ArgumentTypeError('Point must be specified as lat,lng')
+  return lat, lng
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  cli.add_dss_arguments(parser)
+  parser.add_argument('--levels', default=DEFAULT_LEVELS,
+                      help='Comma-separated, increasing numbers of '
+                      'intersecting Operations to measure with')
+  parser.add_argument('--constraint-ratio', type=float, default=0.25,
+                      help='Intersecting Constraints seeded per intersecting '
+                      'Operation')
+  parser.add_argument('--disjoint', type=int, default=1,
+                      help='Entities seeded in the same area but another time '
+                      'window per intersecting entity')
+  parser.add_argument('--repetitions', type=int, default=20,
+                      help='Operation put/update/delete cycles at each level')
+  parser.add_argument('--center', type=_parse_point, default=DEFAULT_CENTER,
+                      help='lat,lng every intersecting volume covers')
+  parser.add_argument('--radius', type=float, default=2000,
+                      help='Largest radius of the volumes, in meters')
+  parser.add_argument('--shapes', default=','.join(SHAPES),
+                      help='Comma-separated shapes of the volumes: ' +
+                      ', '.join(SHAPES))
+  parser.add_argument('--ignore-constraints', action='store_true',
+                      help='Measure Operations whose Subscriptions are not '
+                      'notified of Constraints, so their keys omit them')
+  parser.add_argument('--seed', type=int, help='Random seed')
+  parser.add_argument('--csv', help='Write the results to this CSV file')
+  parser.add_argument('--json', help='Write the results to this JSON file')
+  args = parser.parse_args(argv)
+  try:
+    args.levels = [int(n) for n in args.levels.split(',')]
+  except ValueError:
+    parser.error('--levels must be comma-separated integers')
+  if args.levels != sorted(args.levels):
+    parser.error('--levels must be increasing')
+  args.shapes = args.shapes.split(',')
+  for shape in args.shapes:
+    if shape not in SHAPES:
+      parser.error('Unknown shape {}'.format(shape))
+  return args
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  session = cli.make_session(args)
+  workload = ConflictWorkload(
+      session, args.center, radius_m=args.radius, shapes=args.shapes,
+      notify_for_constraints=not args.ignore_constraints,
+      rng=random.Random(args.seed))
+  summaries = []
+  exit_code = 0
+  try:
+    for operations in args.levels:
+      level = Level(operations, int(round(operations * args.constraint_ratio)))
+      try:
+        workload.seed(level, args.disjoint)
+      except RuntimeError as e:
+        LOG.error('Stopping before the level of %d Operations: %s', operations,
+                  e)
+        exit_code = 1
+        break
+      LOG.info('%d Operations, %d Constraints, %d disjoint: measuring',
+               level.operations, level.constraints, level.disjoint)
+      workload.measure(level, args.repetitions)
+      summaries.append(level.summary())
+  finally:
+    failures = workload.cleanup()
+    if failures:
+      LOG.warning('Failed to delete %d entities', failures)
+
+  rows = points(summaries)
+  print(format_points(rows))
+  if args.csv:
+    with open(args.csv, 'w', newline='') as f:
+      writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+      writer.writeheader()
+      writer.writerows(rows)
+  if args.json:
+    with open(args.json, 'w') as f:
+      json.dump(summaries, f, indent=2)
+  return exit_code
+
+
+if __name__ == '__main__':
+  sys.exit(main())
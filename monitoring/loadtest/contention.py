@@ -0,0 +1,337 @@
+"""Benchmark of concurrent updates racing on the same ISAs and Subscriptions.
+
+Updates of ISAs and Subscriptions name the version being replaced
+(PUT /{id}/{version}), and the DSS rejects an update with 409 if the entity has
+changed since, so concurrent writers of the same entity have to retry.  This
+tool creates --entities entities (alternately ISAs and Subscriptions, unless
+--kinds says otherwise) and has K writers update randomly chosen ones for
+--duration seconds.  Each writer remembers the last version it saw of each
+entity; when an update is rejected it reads the current version and tries
+again, up to --max-retries times before giving up.  Run from the monitoring
+folder:
+
+  python -m loadtest.contention --writers 1,2,4,8,16,32 --entities 4 \\
+      --dss-endpoint http://localhost:8082 --api-version-role /v1/dss \\
+      --oauth-token-endpoint http://localhost:8085/token --use-dummy-oauth
+
+Each comma-separated number of writers is one step.  The report shows, for
+each, the goodput (successful updates per second), the fraction of attempts
+rejected with a version conflict, the fraction that failed with a server error
+(which is how transactions aborted by CockroachDB surface), the fraction of
+updates abandoned after too many retries, and the latency of updates including
+their retries.
+"""
+
+import argparse
+import collections
+import datetime
+import json
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from loadtest import cli, stats
+from monitorlib import geo, histogram, rid
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_REGION = '-25.6,130.6,-25.4,131.0'
+
+ISA = 'isa'
+SUBSCRIPTION = 'subscription'
+KINDS = [ISA, SUBSCRIPTION]
+
+_PATHS = {ISA: rid.ISA_PATH, SUBSCRIPTION: rid.SUBSCRIPTION_PATH}
+_BODIES = {ISA: rid.isa_body, SUBSCRIPTION: rid.subscription_body}
+_ENTITY_KEYS = {ISA: 'service_area', SUBSCRIPTION: 'subscription'}
+
+# Outcomes of one attempt.
+SUCCESS = 'success'
+CONFLICT = 'conflict'
+SERVER_ERROR = 'server_error'
+FAILURE = 'failure'
+
+
+class Entity(object):
+  """An ISA or Subscription the writers contend for."""
+
+  def __init__(self, kind: str, vertices: List[Dict[str, float]]):
+    self.kind = kind
+    self.id = str(uuid.uuid4())
+    self.vertices = vertices
+    self.path = '{}/{}'.format(_PATHS[kind], self.id)
+    self.version: Optional[str] = None
+
+
+class StepResult(object):
+  """Results of one number of writers."""
+
+  def __init__(self, writers: int):
+    self.writers = writers
+    # Latency of each update, including its retries, by kind.
+    self.stats = stats.LoadStats()
+    # Number of attempts each update took.
+    self.attempts = histogram.Histogram(lowest_value=1)
+    self.outcomes: Dict[str, int] = collections.Counter()
+    self.aborted = 0
+    self.elapsed = 0.0
+    self._lock = threading.Lock()
+
+  def record(self, outcomes: List[str], aborted: bool) -> None:
+    with self._lock:
+      self.attempts.record(len(outcomes))
+      self.outcomes.update(outcomes)
+      if aborted:
+        self.aborted += 1
+
+  def summary(self) -> Dict[str, Any]:
+    report = self.stats.report(self.elapsed)
+    attempts = sum(self.outcomes.values())
+    updates = self.attempts.count
+    succeeded = self.outcomes[SUCCESS]
+
+    def ratio(n, d):
+      return n / d if d else None
+
+    latency = histogram.Histogram()
+    for operation in self.stats.operations.values():
+      latency.merge(operation.latency)
+
+    return {
+        'writers': self.writers,
+        'elapsed': self.elapsed,
+        'updates': report,
+        'latency': latency.summary(),
+        'goodput': ratio(succeeded, self.elapsed),
+        'attempts': attempts,
+        'outcomes': dict(self.outcomes),
+        'conflict_ratio': ratio(self.outcomes[CONFLICT], attempts),
+        'server_error_ratio': ratio(self.outcomes[SERVER_ERROR], attempts),
+        'abort_ratio': ratio(self.aborted, updates),
+        'attempts_per_update': self.attempts.summary(),
+    }
+
+
+class ContentionBenchmark(object):
+  """Writers racing to update the same few entities.
+
+  Args:
+    session: Session for the DSS, with URLs relative to the RID API root.
+    grid: Each entity gets its own cell of this grid.
+    entities: Number of entities to contend for.
+    kinds: Kinds of entities, assigned in turn.
+    max_retries: Number of times an update is retried before it is abandoned.
+    ttl: Seconds each update extends the entity's time window by.
+  """
+
+  def __init__(self,
+               session: requests.Session,
+               grid: geo.Grid,
+               entities: int = 4,
+               kinds: List[str] = KINDS,
+               max_retries: int = 10,
+               ttl: float = 300):
+    if grid.cell_count is not None and entities > grid.cell_count:
+      raise ValueError('The grid only has room for {} entities'.format(
+          grid.cell_count))
+    self.session = session
+    self.grid = grid
+    self.entity_count = entities
+    self.kinds = kinds
+    self.max_retries = max_retries
+    self.ttl = ttl
+
+  def _body(self, entity: Entity) -> Dict[str, Any]:
+    now = datetime.datetime.utcnow()
+    return _BODIES[entity.kind](entity.vertices, now,
+                                now + datetime.timedelta(seconds=self.ttl))
+
+  def _create(self) -> List[Entity]:
+    entities = []
+    for i in range(self.entity_count):
+      entity = Entity(self.kinds[i % len(self.kinds)], self.grid.vertices(i))
+      resp = self.session.put(entity.path, json=self._body(entity))
+      if resp.status_code != 200:
+        raise RuntimeError('Failed to create {} {}: {} {}'.format(
+            entity.kind, entity.id, resp.status_code, resp.text))
+      entity.version = resp.json()[_ENTITY_KEYS[entity.kind]]['version']
+      entities.append(entity)
+    return entities
+
+  def _current_version(self, entity: Entity) -> Optional[str]:
+    try:
+      resp = self.session.get(entity.path)
+    except requests.RequestException:
+      return None
+    if resp.status_code != 200:
+      return None
+    return resp.json()[_ENTITY_KEYS[entity.kind]]['version']
+
+  def update(self, entity: Entity, known_version: str,
+             result: StepResult) -> Optional[str]:
+    """Updates entity, retrying on conflicts; returns the new version."""
+    outcomes = []
+    version = known_version
+    t0 = time.monotonic()
+    status = None
+    error = None
+    while len(outcomes) <= self.max_retries:
+      error = None
+      try:
+        resp = self.session.put('{}/{}'.format(entity.path, version),
+                                json=self._body(entity))
+        status = resp.status_code
+      except requests.RequestException as e:
+        error = e
+        status = None
+      if status == 200:
+        outcomes.append(SUCCESS)
+        version = resp.json()[_ENTITY_KEYS[entity.kind]]['version']
+        break
+      if status == 409:
+        outcomes.append(CONFLICT)
+      elif status is not None and status >= 500:
+        outcomes.append(SERVER_ERROR)
+      else:
+        outcomes.append(FAILURE)
+        if status is not None:
+          # Not worth retrying, e.g. 400.
+          break
+      version = self._current_version(entity) or version
+    result.stats.record(entity.kind, time.monotonic() - t0, status, error)
+    succeeded = outcomes[-1] == SUCCESS
+    result.record(outcomes, aborted=not succeeded)
+    return version if succeeded else None
+
+  def run(self, writers: int, duration: float,
+          rng: Optional[random.Random] = None) -> StepResult:
+    """Has writers concurrent writers update the entities for duration."""
+    rng = rng or random.Random()
+    result = StepResult(writers)
+    entities = self._create()
+    stop_at = time.monotonic() + duration
+
+    def writer(seed: float):
+      writer_rng = random.Random(seed)
+      # This writer's view of the entities' versions.
+      known = {entity.id: entity.version for entity in entities}
+      while time.monotonic() < stop_at:
+        entity = writer_rng.choice(entities)
+        version = self.update(entity, known[entity.id], result)
+        if version is not None:
+          known[entity.id] = version
+          entity.version = version
+
+    threads = [
+        threading.Thread(target=writer, args=(rng.random(),), daemon=True)
+        for _ in range(writers)
+    ]
+    start = time.monotonic()
+    try:
+      for t in threads:
+        t.start()
+      for t in threads:
+        t.join()
+      result.elapsed = time.monotonic() - start
+    finally:
+      self._delete(entities)
+    return result
+
+  def _delete(self, entities: List[Entity]) -> None:
+    for entity in entities:
+      version = self._current_version(entity) or entity.version
+      resp = self.session.delete('{}/{}'.format(entity.path, version))
+      if resp.status_code != 200:
+        LOG.warning('Failed to delete %s %s: %d', entity.kind, entity.id,
+                    resp.status_code)
+
+
+def _ms(value: Optional[float]) -> str:
+  return '-' if value is None else '{:.1f}'.format(value * 1000)
+
+
+def _pct(value: Optional[float]) -> str:
+  return '-' if value is None else '{:.1%}'.format(value)
+
+
+def format_steps(summaries: List[Dict[str, Any]]) -> str:
+  rows = [['writers', 'goodput/s', 'attempts', 'conflicts', 'server errors',
+           'aborted', 'p50 ms', 'p99 ms', 'p99.9 ms', 'max attempts']]
+  for s in summaries:
+    latency = s['latency']
+    rows.append([
+        str(s['writers']),
+        '-' if s['goodput'] is None else '{:.1f}'.format(s['goodput']),
+        str(s['attempts']),
+        _pct(s['conflict_ratio']), _pct(s['server_error_ratio']),
+        _pct(s['abort_ratio']),
+        _ms(latency['p50']), _ms(latency['p99']), _ms(latency['p99.9']),
+        '-' if s['attempts_per_update']['max'] is None else '{:.0f}'.format(
+            s['attempts_per_update']['max']),
+    ])
+  widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+  return '\n'.join(
+      '  '.join(cell.rjust(width) if i else cell.ljust(width)
+                for i, (cell, width) in enumerate(zip(row, widths)))
+      for row in rows)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  cli.add_dss_arguments(parser)
+  parser.add_argument('--writers', default='1,2,4,8,16',
+                      help='Comma-separated numbers of concurrent writers, '
+                      'one step each')
+  parser.add_argument('--entities', type=int, default=4,
+                      help='Number of entities the writers contend for')
+  parser.add_argument('--kinds', default=','.join(KINDS),
+                      help='Comma-separated kinds of entities: ' +
+                      ', '.join(KINDS))
+  parser.add_argument('--duration', type=float, default=20,
+                      help='Seconds each step lasts')
+  parser.add_argument('--max-retries', type=int, default=10,
+                      help='Retries of an update before it is abandoned')
+  parser.add_argument('--region', type=cli.parse_region, default=DEFAULT_REGION,
+                      help='lat_min,lng_min,lat_max,lng_max of the region to '
+                      'put entities in')
+  parser.add_argument('--seed', type=int, help='Random seed')
+  parser.add_argument('--json', help='Also write the results to this file')
+  args = parser.parse_args(argv)
+  try:
+    args.writers = [int(n) for n in args.writers.split(',')]
+  except ValueError:
+    parser.error('--writers must be comma-separated integers')
+  args.kinds = args.kinds.split(',')
+  for kind in args.kinds:
+    if kind not in KINDS:
+      parser.error('Unknown kind {}'.format(kind))
+  return args
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  session = cli.make_session(args, max(args.writers))
+  benchmark = ContentionBenchmark(
+      session, geo.Grid.over_region(*args.region), entities=args.entities,
+      kinds=args.kinds, max_retries=args.max_retries)
+  rng = random.Random(args.seed)
+  summaries = []
+  for writers in args.writers:
+    LOG.info('%d writers for %gs', writers, args.duration)
+    summaries.append(benchmark.run(writers, args.duration, rng).summary())
+  print(format_steps(summaries))
+  if args.json:
+    with open(args.json, 'w') as f:
+      json.dump(summaries, f, indent=2)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
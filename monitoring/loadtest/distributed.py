@@ -0,0 +1,515 @@
+"""Remote ID load from several worker processes and hosts, reported as one.
+
+One Python process is limited by the GIL to roughly one core's worth of
+requests, which isn't enough to saturate a multi-node DSS.  The coordinator
+splits loadgen's workload across worker processes on this host (--workers)
+and worker hosts (--remote): each worker gets its own block of the --region
+grid, an equal share of --rate and its own random seed.  Workers send back,
+every --report-interval seconds, the counters and latency histograms of the
+requests they completed since their last report rather than individual
+samples, and the coordinator merges them into one report.  Run from the
+monitoring folder:
+
+  python -m loadtest.distributed coordinator --workers 8 --rate 2000 \\
+      --dss-endpoint http://localhost:8082 --api-version-role /v1/dss \\
+      --jwt-private-key-file ../build/test-certs/auth2.key
+
+To drive the DSS from other hosts too, start a worker on each of them with
+the DSS and authentication options it should use:
+
+  python -m loadtest.distributed worker --listen 0.0.0.0:7878 \\
+      --dss-endpoint http://dss.example.com --api-version-role /v1/dss ...
+
+and pass --remote host1:7878,host2:7878 to the coordinator.  Workers on this
+host use the coordinator's own DSS and authentication options.
+
+Workers do not authenticate coordinators: anyone who can connect to a worker
+can make it send requests to its DSS with its credentials.  Workers therefore
+listen on localhost unless --listen says otherwise, and should only listen on
+other interfaces within a trusted network.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import queue
+import random
+import socket
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from loadtest import cli, loadgen, stats, workload
+from monitorlib import geo
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PORT = 7878
+DEFAULT_REPORT_INTERVAL_SEC = 5
+
+# Seconds to wait for every worker to be ready to start.
+READY_TIMEOUT_SEC = 60
+
+# Messages between the coordinator and its workers.
+ASSIGNMENT = 'assignment'
+READY = 'ready'
+START = 'start'
+STATS = 'stats'
+DONE = 'done'
+ERROR = 'error'
+
+
+class _PipeChannel(object):
+  """Messages to or from a worker process on this host."""
+
+  def __init__(self, connection):
+    self._connection = connection
+
+  def send(self, message: Dict[str, Any]) -> None:
+    self._connection.send(message)
+
+  def recv(self) -> Optional[Dict[str, Any]]:
+    """Returns the next message, or None once the other end has closed."""
+    try:
+      return self._connection.recv()
+    except EOFError:
+      return None
+
+  def close(self) -> None:
+    self._connection.close()
+
+
+class _SocketChannel(object):
+  """Messages to or from a worker host, as lines of JSON."""
+
+  def __init__(self, sock: socket.socket):
+    self._socket = sock
+    self._reader = sock.makefile('r', encoding='utf-8')
+    self._lock = threading.Lock()
+
+  def send(self, message: Dict[str, Any]) -> None:
+    data = (json.dumps(message) + '\n').encode('utf-8')
+    with self._lock:
+      self._socket.sendall(data)
+
+  def recv(self) -> Optional[Dict[str, Any]]:
+    """Returns the next message, or None once the other end has closed."""
+    line = self._reader.readline()
+    return json.loads(line) if line else None
+
+  def close(self) -> None:
+    self._reader.close()
+    self._socket.close()
+
+
+def parse_address(value: str, default_host: str = '') -> Tuple[str, int]:
+  """Parses host:port, either of which may be omitted."""
+  host, separator, port = value.rpartition(':')
+  if not separator:
+    host, port = value, ''
+  return host or default_host, int(port) if port else DEFAULT_PORT
+
+
+def _shares(total: int, parts: int) -> List[int]:
+  """Splits total into parts integers differing by at most one."""
+  return [total // parts + (1 if i < total % parts else 0)
+          for i in range(parts)]
+
+
+def split_grid(grid: geo.Grid, parts: int) -> List[Dict[str, Any]]:
+  """Splits grid as evenly as possible into parts rectangular grids.
+
+  The columns are split into min(parts, grid.columns) groups, and the rows of
+  each group into as many bands as it has parts.  Returns the keyword
+  arguments of geo.Grid for each part.  The parts' footprints together are
+  exactly those of grid.
+  """
+  if grid.cell_count is None:
+    raise ValueError('Only a bounded grid can be split')
+  if parts > grid.cell_count:
+    raise ValueError('Cannot split {} grid cells between {} workers; use a '
+                     'larger --region or a smaller --cell-size'.format(
+                         grid.cell_count, parts))
+  groups = min(parts, grid.columns)
+  result = []
+  first_column = 0
+  for columns, bands in zip(_shares(grid.columns, groups),
+                            _shares(parts, groups)):
+    first_row = 0
+    for rows in _shares(grid.rows, bands):
+      result.append({
+          'origin_lat': grid.origin_lat + first_row * grid.cell_pitch_deg,
+          'origin_lng': grid.origin_lng + first_column * grid.cell_pitch_deg,
+          'cell_size_deg': grid.cell_size_deg,
+          'cell_pitch_deg': grid.cell_pitch_deg,
+          'columns': columns,
+          'rows': rows,
+      })
+      first_row += rows
+    first_column += columns
+  return result
+
+
+def make_assignments(grid: geo.Grid, workers: int, args: argparse.Namespace,
+                     rng: random.Random) -> List[Dict[str, Any]]:
+  """Divides the load specified by args between workers."""
+  return [{
+      'type': ASSIGNMENT,
+      'worker': i,
+      'grid': part,
+      'mix': args.mix,
+      'rate': args.rate / workers if args.rate else None,
+      'concurrency': args.concurrency,
+      'duration': args.duration,
+      'ttl': args.ttl,
+      'seed': rng.random(),
+      'cleanup': not args.no_cleanup,
+      'report_interval': args.report_interval,
+  } for i, part in enumerate(split_grid(grid, workers))]
+
+
+def run_worker(args: argparse.Namespace, channel) -> None:
+  """Performs one assignment received over channel, reporting back over it.
+
+  args are the DSS and authentication options to use.
+  """
+  assignment = channel.recv()
+  if assignment is None or assignment.get('type') != ASSIGNMENT:
+    return
+  try:
+    session = cli.make_session(args, pool_maxsize=assignment['concurrency'])
+    load = workload.RIDWorkload(session, geo.Grid(**assignment['grid']),
+                                ttl=assignment['ttl'],
+                                rng=random.Random(assignment['seed']))
+  except Exception as e:  # Reported to the coordinator rather than lost.
+    LOG.exception('Worker %d could not start', assignment['worker'])
+    channel.send({'type': ERROR, 'message': str(e)})
+    return
+  channel.send({'type': READY})
+  message = channel.recv()
+  if message is None or message.get('type') != START:
+    return
+
+  results = stats.LoadStats()
+  outcome = {}
+
+  def generate():
+    _, outcome['elapsed'] = loadgen.run(
+        load, assignment['mix'], assignment['duration'],
+        assignment['concurrency'], rate=assignment['rate'],
+        seed=assignment['seed'], results=results)
+
+  generator = threading.Thread(target=generate, daemon=True)
+  generator.start()
+  while True:
+    generator.join(assignment['report_interval'])
+    if not generator.is_alive():
+      break
+    channel.send({'type': STATS, 'stats': results.take().to_dict()})
+
+  failures = load.cleanup() if assignment['cleanup'] else 0
+  channel.send({
+      'type': DONE,
+      'stats': results.take().to_dict(),
+      'elapsed': outcome.get('elapsed'),
+      'cleanup_failures': failures,
+  })
+
+
+def _run_local_worker(args: argparse.Namespace, connection) -> None:
+  logging.basicConfig(level=logging.INFO)
+  channel = _PipeChannel(connection)
+  try:
+    run_worker(args, channel)
+  finally:
+    channel.close()
+
+
+def serve(args: argparse.Namespace, host: str, port: int,
+          once: bool = False) -> None:
+  """Performs assignments from coordinators connecting to host:port in turn."""
+  server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+  server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+  server.bind((host, port))
+  server.listen(1)
+  LOG.info('Waiting for a coordinator on %s:%d', host or '*', port)
+  try:
+    while True:
+      sock, address = server.accept()
+      LOG.info('Accepted assignment connection from %s:%d', *address[:2])
+      channel = _SocketChannel(sock)
+      try:
+        run_worker(args, channel)
+      except (OSError, ValueError) as e:
+        LOG.warning('Lost coordinator %s:%d: %s', address[0], address[1], e)
+      finally:
+        channel.close()
+      if once:
+        return
+  finally:
+    server.close()
+
+
+class WorkerResult(object):
+  """What one worker has reported so far."""
+
+  def __init__(self, name: str):
+    self.name = name
+    self.stats = stats.LoadStats()
+    self.elapsed: Optional[float] = None
+    self.cleanup_failures = 0
+    self.error: Optional[str] = None
+    self.done = False
+
+  def summary(self) -> Dict[str, Any]:
+    operations = self.stats.operations.values()
+    count = sum(s.count for s in operations)
+    return {
+        'worker': self.name,
+        'requests': count,
+        'errors': sum(s.errors for s in operations),
+        'throughput': count / self.elapsed if self.elapsed else None,
+        'elapsed': self.elapsed,
+        'cleanup_failures': self.cleanup_failures,
+        'error': self.error,
+    }
+
+
+class Coordinator(object):
+  """Drives a set of workers as one load source and merges their results."""
+
+  def __init__(self, channels: Dict[str, Any]):
+    self._channels = channels
+    self._messages: queue.Queue = queue.Queue()
+    self.workers = {name: WorkerResult(name) for name in channels}
+    self.total = stats.LoadStats()
+    for name, channel in channels.items():
+      threading.Thread(target=self._receive, args=(name, channel),
+                       daemon=True).start()
+
+  def _receive(self, name: str, channel) -> None:
+    while True:
+      try:
+        message = channel.recv()
+      except (OSError, ValueError) as e:
+        message = {'type': ERROR, 'message': str(e)}
+      if message is None:
+        message = {'type': ERROR, 'message': 'Worker disconnected'}
+      self._messages.put((name, message))
+      if message['type'] in (DONE, ERROR):
+        return
+
+  def _handle(self, name: str, message: Dict[str, Any]) -> None:
+    worker = self.workers[name]
+    if message['type'] in (STATS, DONE):
+      delta = stats.LoadStats.from_dict(message['stats'])
+      worker.stats.merge(delta)
+      self.total.merge(delta)
+    if message['type'] == DONE:
+      worker.elapsed = message['elapsed']
+      worker.cleanup_failures = message['cleanup_failures']
+      worker.done = True
+    elif message['type'] == ERROR and not worker.done:
+      worker.error = message['message']
+      worker.done = True
+      LOG.error('Worker %s failed: %s', name, worker.error)
+
+  def run(self, assignments: List[Dict[str, Any]],
+          report_interval: float) -> float:
+    """Performs assignments, one per worker; returns the longest run time."""
+    for channel, assignment in zip(self._channels.values(), assignments):
+      channel.send(assignment)
+
+    ready = set()
+    deadline = time.monotonic() + READY_TIMEOUT_SEC
+    while len(ready) < len(self.workers):
+      try:
+        name, message = self._messages.get(
+            timeout=max(0, deadline - time.monotonic()))
+      except queue.Empty:
+        raise RuntimeError('Workers {} did not get ready in time'.format(
+            ', '.join(sorted(set(self.workers) - ready))))
+      if message['type'] != READY:
+        self._handle(name, message)
+        raise RuntimeError('Worker {} could not start: {}'.format(
+            name, self.workers[name].error))
+      ready.add(name)
+
+    LOG.info('Starting %d workers', len(self.workers))
+    for channel in self._channels.values():
+      channel.send({'type': START})
+    last_report = time.monotonic()
+    last_count = 0
+    while not all(w.done for w in self.workers.values()):
+      try:
+        name, message = self._messages.get(timeout=report_interval)
+        self._handle(name, message)
+      except queue.Empty:
+        pass
+      now = time.monotonic()
+      if now - last_report >= report_interval:
+        count = sum(s.count for s in self.total.operations.values())
+        LOG.info('%.1f requests/s across %d workers',
+                 (count - last_count) / (now - last_report),
+                 sum(1 for w in self.workers.values() if not w.done))
+        last_report, last_count = now, count
+    return max((w.elapsed or 0 for w in self.workers.values()), default=0)
+
+
+def format_workers(summaries: List[Dict[str, Any]]) -> str:
+  """Formats WorkerResult summaries as a table."""
+  rows = [['worker', 'requests', 'ops/s', 'errors', 'status']]
+  for s in summaries:
+    rows.append([
+        s['worker'],
+        str(s['requests']),
+        '-' if s['throughput'] is None else '{:.1f}'.format(s['throughput']),
+        str(s['errors']),
+        'failed: ' + s['error'] if s['error'] else 'ok',
+    ])
+  widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+  return '\n'.join(
+      '  '.join(cell.rjust(width) if 0 < i < 4 else cell.ljust(width)
+                for i, (cell, width) in enumerate(zip(row, widths)))
+      for row in rows)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  commands = parser.add_subparsers(dest='command')
+  commands.required = True
+
+  coordinator = commands.add_parser(
+      'coordinator', help='Split load between workers and merge their results')
+  cli.add_dss_arguments(coordinator)
+  coordinator.add_argument('--workers', type=int,
+                           help='Number of worker processes to start on this '
+                           'host; by default, one per core (at most one per '
+                           'cell of the --region grid)')
+  coordinator.add_argument('--remote', default='',
+                           help='Comma-separated host:port of worker hosts')
+  coordinator.add_argument('--mix', default=workload.DEFAULT_MIX,
+                           help='Comma-separated operation=weight pairs; '
+                           'operations are ' + ', '.join(workload.OPERATIONS))
+  coordinator.add_argument('--rate', type=float,
+                           help='Target requests per second across all '
+                           'workers; if omitted, clients send requests back '
+                           'to back')
+  coordinator.add_argument('--concurrency', type=int, default=16,
+                           help='Number of concurrent clients of each worker')
+  coordinator.add_argument('--duration', type=float, default=60,
+                           help='Seconds to generate load for')
+  coordinator.add_argument('--region', type=cli.parse_region,
+                           default=loadgen.DEFAULT_REGION,
+                           help='lat_min,lng_min,lat_max,lng_max of the region '
+                           'to spread footprints across')
+  coordinator.add_argument('--cell-size', type=float,
+                           default=geo.DEFAULT_CELL_SIZE_DEG,
+                           help='Size in degrees of each footprint')
+  coordinator.add_argument('--ttl', type=float,
+                           default=workload.DEFAULT_TTL_SEC,
+                           help='Lifetime in seconds of created entities')
+  coordinator.add_argument('--seed', type=int, help='Random seed')
+  coordinator.add_argument('--report-interval', type=float,
+                           default=DEFAULT_REPORT_INTERVAL_SEC,
+                           help='Seconds between reports from workers')
+  coordinator.add_argument('--no-cleanup', action='store_true',
+                           help='Leave created entities in the DSS')
+  coordinator.add_argument('--json', help='Also write the report to this file')
+
+  worker = commands.add_parser(
+      'worker', help='Perform assignments from coordinators on other hosts')
+  cli.add_dss_arguments(worker)
+  worker.add_argument('--listen', default='127.0.0.1:{}'.format(DEFAULT_PORT),
+                      help='host:port to accept coordinator connections on '
+                      '(host defaults to 127.0.0.1); coordinators are not '
+                      'authenticated, so only listen on a trusted network')
+  worker.add_argument('--once', action='store_true',
+                      help='Exit after performing one assignment')
+
+  args = parser.parse_args(argv)
+  if args.command == 'coordinator':
+    try:
+      args.mix = workload.parse_mix(args.mix)
+      args.remote = [parse_address(a) for a in args.remote.split(',') if a]
+    except ValueError as e:
+      parser.error(str(e))
+    try:
+      cells = geo.Grid.over_region(
+          *args.region, cell_size_deg=args.cell_size,
+          cell_pitch_deg=args.cell_size * 2).cell_count
+    except ValueError as e:
+      parser.error(str(e))
+    if args.workers is None:
+      args.workers = max(0, min(multiprocessing.cpu_count(),
+                                cells - len(args.remote)))
+    if args.workers < 0 or not args.workers + len(args.remote):
+      parser.error('At least one local or remote worker is required')
+    if args.workers + len(args.remote) > cells:
+      parser.error('The --region grid only has {} cells, too few for {} '
+                   'workers'.format(cells, args.workers + len(args.remote)))
+  return args
+
+
+def _coordinate(args: argparse.Namespace) -> int:
+  rng = random.Random(args.seed)
+  grid = geo.Grid.over_region(*args.region, cell_size_deg=args.cell_size,
+                              cell_pitch_deg=args.cell_size * 2)
+  assignments = make_assignments(grid, args.workers + len(args.remote), args,
+                                 rng)
+
+  channels = {}
+  processes = []
+  for i in range(args.workers):
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_run_local_worker,
+                                      args=(args, child), daemon=True)
+    process.start()
+    child.close()
+    processes.append(process)
+    channels['local-{}'.format(i)] = _PipeChannel(parent)
+  for host, port in args.remote:
+    channels['{}:{}'.format(host, port)] = _SocketChannel(
+        socket.create_connection((host, port)))
+
+  LOG.info('Generating load for %gs across %d cells with %d workers',
+           args.duration, grid.cell_count, len(channels))
+  coordinator = Coordinator(channels)
+  try:
+    elapsed = coordinator.run(assignments, args.report_interval)
+  finally:
+    for channel in channels.values():
+      channel.close()
+    for process in processes:
+      process.join(timeout=10)
+
+  report = coordinator.total.report(elapsed)
+  workers = [w.summary() for w in coordinator.workers.values()]
+  print(stats.format_report(report))
+  print()
+  print(format_workers(workers))
+  if args.json:
+    with open(args.json, 'w') as f:
+      json.dump({'elapsed': elapsed, 'operations': report, 'workers': workers},
+                f, indent=2)
+
+  failures = sum(w['cleanup_failures'] for w in workers)
+  if failures:
+    LOG.warning('Failed to delete %d entities', failures)
+  return 1 if any(w['error'] for w in workers) else 0
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  if args.command == 'worker':
+    host, port = parse_address(args.listen, default_host='127.0.0.1')
+    serve(args, host, port, once=args.once)
+    return 0
+  return _coordinate(args)
+
+
+if __name__ == '__main__':
+  sys.exit(main())
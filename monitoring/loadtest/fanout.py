@@ -0,0 +1,369 @@
+"""Benchmark of ISA writes as the Subscriptions they notify grow in number.
+
+The response to every ISA create, update and delete lists each Subscription
+overlapping the ISA (grouped by the callback URL of its owner), so the cost of
+ISA writes grows with the density of Subscriptions.  This tool seeds
+increasing numbers of Subscriptions overlapping one ISA footprint (--area),
+and at each level (--levels) times --repetitions cycles of creating, updating
+and deleting an ISA there, recording the latency and size of each response.
+Run from the monitoring folder:
+
+  python -m loadtest.fanout --levels 0,10,20,40,80,160 --plot fanout.png \\
+      --dss-endpoint http://localhost:8082 --api-version-role /v1/dss \\
+      --jwt-private-key-file ../build/test-certs/auth2.key
+
+The DSS allows each owner at most rid.MAX_SUB_PER_AREA Subscriptions in any
+S2 cell, so every rid.MAX_SUB_PER_AREA Subscriptions get a new owner.  The
+footprint is split into --tiles x --tiles adjacent tiles which Subscriptions
+are spread across, but since adjacent tiles share the cells along their edges,
+tiles do not raise the limit.  Owners other than the tool's own require tokens
+signed locally with --jwt-private-key-file (their subjects are
+fanout-owner-<n>); if a level's Subscriptions cannot all be created, e.g.
+because there is no such key, the run stops and reports the levels measured
+so far.
+
+--plot draws latency percentiles and response sizes against the number of
+Subscriptions (this requires matplotlib); --csv writes the same points.
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import logging
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from loadtest import cli, stats
+from monitorlib import geo, histogram, rid
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_AREA = '-25.3,130.7,-25.26,130.74'
+DEFAULT_LEVELS = '0,5,10,20,40,80'
+
+ISA_CREATE = 'isa_create'
+ISA_UPDATE = 'isa_update'
+ISA_DELETE = 'isa_delete'
+OPERATIONS = [ISA_CREATE, ISA_UPDATE, ISA_DELETE]
+
+# Lifetime of the seeded Subscriptions and the ISAs written.
+TTL = datetime.timedelta(minutes=30)
+
+
+def subscription_count(body: Dict[str, Any]) -> int:
+  """Returns the number of Subscriptions in an ISA write's response."""
+  return sum(
+      len(s.get('subscriptions', [])) for s in body.get('subscribers', []))
+
+
+class Level(object):
+  """Measurements with one number of overlapping Subscriptions."""
+
+  def __init__(self, subscriptions: int):
+    self.subscriptions = subscriptions
+    # Subscriptions the DSS (or the lack of owners) rejected so far.
+    self.rejected = 0
+    self.stats = stats.LoadStats()
+    # Response bytes and Subscriptions listed per response, by operation.
+    self.response_bytes = {op: histogram.Histogram(lowest_value=1)
+                           for op in OPERATIONS}
+    self.notified = {op: histogram.Histogram(lowest_value=1)
+                     for op in OPERATIONS}
+
+  def record(self, operation: str, latency: float,
+             resp: requests.Response) -> None:
+    self.stats.record(operation, latency, resp.status_code)
+    self.response_bytes[operation].record(len(resp.content))
+    if resp.status_code == 200:
+      self.notified[operation].record(subscription_count(resp.json()))
+
+  def summary(self) -> Dict[str, Any]:
+    report = self.stats.report(1)
+    return {
+        'subscriptions': self.subscriptions,
+        'rejected': self.rejected,
+        'operations': {
+            op: {
+                'latency': report.get(op),
+                'response_bytes': self.response_bytes[op].summary(),
+                'notified': self.notified[op].summary(),
+            } for op in OPERATIONS
+        },
+    }
+
+
+class FanoutBenchmark(object):
+  """Seeds Subscriptions and measures ISA writes in the same area.
+
+  Args:
+    session: Session for the DSS, with URLs relative to the RID API root,
+      which writes the ISAs.
+    owner_session: Returns the session of the n-th owner of Subscriptions, or
+      None if there can be no such owner.
+    area: (lat_min, lng_min, lat_max, lng_max) of the ISAs' footprint.
+    tiles: Number of tiles per side the Subscriptions are spread across.
+  """
+
+  def __init__(self, session: requests.Session, owner_session,
+               area: Tuple[float, float, float, float], tiles: int = 2):
+    self.session = session
+    self._owner_session = owner_session
+    self._owner_sessions: Dict[int, Optional[requests.Session]] = {}
+    lat_min, lng_min, lat_max, lng_max = area
+    self.footprint = geo.tile_region(
+        lat_min, lng_min, lat_max, lng_max,
+        max(lat_max - lat_min, lng_max - lng_min))[0]
+    self.tiles = geo.tile_region(
+        lat_min, lng_min, lat_max, lng_max,
+        max(lat_max - lat_min, lng_max - lng_min) / tiles)
+    # (owner, Subscription ID, version) of every seeded Subscription.
+    self.subscriptions: List[Tuple[int, str, str]] = []
+    self._seeded = 0
+    self._rejected = 0
+
+  def _owner(self, n: int) -> Optional[requests.Session]:
+    if n not in self._owner_sessions:
+      self._owner_sessions[n] = self._owner_session(n)
+    return self._owner_sessions[n]
+
+  def seed(self, level: Level) -> None:
+    """Adds Subscriptions until level.subscriptions have been attempted.
+
+    Raises:
+      RuntimeError: Fewer than level.subscriptions Subscriptions exist, so
+        the level would be measured with less fan-out than it claims.
+    """
+    # Tiles share S2 cells along their edges, and the DSS counts an owner's
+    # Subscriptions in the busiest cell of a new Subscription, so each owner
+    # only gets one quota however the Subscriptions are spread.
+    per_owner = rid.MAX_SUB_PER_AREA
+    now = datetime.datetime.utcnow()
+    while self._seeded < level.subscriptions:
+      i = self._seeded
+      self._seeded += 1
+      n = i // per_owner
+      session = self._owner(n)
+      if session is None:
+        self._rejected += 1
+        continue
+      tile = self.tiles[i % len(self.tiles)]
+      sub_id = str(uuid.uuid4())
+      resp = session.put(
+          '{}/{}'.format(rid.SUBSCRIPTION_PATH, sub_id),
+          json=rid.subscription_body(
+              tile, now, now + TTL,
+              callback_url='https://example.com/uss{}'.format(n)))
+      if resp.status_code == 200:
+        self.subscriptions.append(
+            (n, sub_id, resp.json()['subscription']['version']))
+      else:
+        LOG.warning('Subscription %d rejected: %d %s', i, resp.status_code,
+                    resp.text)
+        self._rejected += 1
+    level.rejected = self._rejected
+    if len(self.subscriptions) < level.subscriptions:
+      raise RuntimeError(
+          'Only {} of {} Subscriptions could be created ({} rejected)'.format(
+              len(self.subscriptions), level.subscriptions, self._rejected))
+
+  def measure(self, level: Level, repetitions: int) -> None:
+    """Creates, updates and deletes an ISA repetitions times."""
+    for _ in range(repetitions):
+      isa_id = str(uuid.uuid4())
+      path = '{}/{}'.format(rid.ISA_PATH, isa_id)
+      now = datetime.datetime.utcnow()
+      body = rid.isa_body(self.footprint, now, now + TTL)
+
+      resp = self._timed(level, ISA_CREATE, 'PUT', path, body)
+      if resp.status_code != 200:
+        continue
+      version = resp.json()['service_area']['version']
+      body = rid.isa_body(self.footprint, now,
+                          now + TTL + datetime.timedelta(minutes=1))
+      resp = self._timed(level, ISA_UPDATE, 'PUT',
+                         '{}/{}'.format(path, version), body)
+      if resp.status_code == 200:
+        version = resp.json()['service_area']['version']
+      resp = self._timed(level, ISA_DELETE, 'DELETE',
+                         '{}/{}'.format(path, version))
+      if resp.status_code != 200:
+        LOG.warning('Failed to delete ISA %s: %d', isa_id, resp.status_code)
+
+  def _timed(self, level: Level, operation: str, method: str, path: str,
+             body: Optional[Dict[str, Any]] = None) -> requests.Response:
+    t0 = time.monotonic()
+    resp = self.session.request(method, path, json=body)
+    level.record(operation, time.monotonic() - t0, resp)
+    return resp
+
+  def cleanup(self) -> int:
+    """Deletes the seeded Subscriptions; returns the number of failures."""
+    failures = 0
+    for n, sub_id, version in self.subscriptions:
+      resp = self._owner(n).delete('{}/{}/{}'.format(rid.SUBSCRIPTION_PATH,
+                                                     sub_id, version))
+      if resp.status_code != 200:
+        failures += 1
+    self.subscriptions = []
+    return failures
+
+
+def _ms(value: Optional[float]) -> str:
+  return '-' if value is None else '{:.1f}'.format(value * 1000)
+
+
+def points(summaries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+  """Flattens level summaries into one row per level and operation."""
+  rows = []
+  for s in summaries:
+    for op, o in s['operations'].items():
+      latency = o['latency'] or {}
+      rows.append({
+          'subscriptions': s['subscriptions'],
+          'rejected': s['rejected'],
+          'operation': op,
+          'count': latency.get('count', 0),
+          'errors': latency.get('errors', 0),
+          'p50': latency.get('p50'),
+          'p99': latency.get('p99'),
+          'mean_response_bytes': o['response_bytes']['mean'],
+          'mean_notified': o['notified']['mean'],
+      })
+  return rows
+
+
+def format_points(rows: List[Dict[str, Any]]) -> str:
+  table = [['subscriptions', 'rejected', 'operation', 'count', 'errors',
+            'p50 ms', 'p99 ms', 'response bytes', 'notified']]
+  for r in rows:
+    table.append([
+        str(r['subscriptions']), str(r['rejected']), r['operation'],
+        str(r['count']), str(r['errors']), _ms(r['p50']), _ms(r['p99']),
+        '-' if r['mean_response_bytes'] is None else '{:.0f}'.format(
+            r['mean_response_bytes']),
+        '-' if r['mean_notified'] is None else '{:.0f}'.format(
+            r['mean_notified']),
+    ])
+  widths = [max(len(row[i]) for row in table) for i in range(len(table[0]))]
+  return '\n'.join(
+      '  '.join(cell.rjust(width) if i else cell.ljust(width)
+                for i, (cell, width) in enumerate(zip(row, widths)))
+      for row in table)
+
+
+def plot(rows: List[Dict[str, Any]], path: str) -> None:
+  """Plots latency and response size against the number of Subscriptions."""
+  # Imported here so that matplotlib is only needed when plotting.
+  import matplotlib
+  matplotlib.use('Agg')
+  from matplotlib import pyplot
+
+  figure, (latency_axes, size_axes) = pyplot.subplots(
+      2, 1, sharex=True, figsize=(8, 8))
+  for op in OPERATIONS:
+    series = [r for r in rows if r['operation'] == op and r['p50'] is not None]
+    x = [r['subscriptions'] for r in series]
+    line, = latency_axes.plot(x, [r['p50'] * 1000 for r in series],
+                              marker='o', label='{} p50'.format(op))
+    latency_axes.plot(x, [r['p99'] * 1000 for r in series], marker='x',
+                      linestyle='--', color=line.get_color(),
+                      label='{} p99'.format(op))
+    size_axes.plot(x, [r['mean_response_bytes'] / 1024 for r in series],
+                   marker='o', color=line.get_color(), label=op)
+  limit = rid.MAX_SUB_PER_AREA
+  for axes in (latency_axes, size_axes):
+    axes.axvline(limit, color='grey', linestyle=':',
+                 label='MAX_SUB_PER_AREA ({})'.format(limit))
+    axes.grid(True)
+    axes.legend()
+  latency_axes.set_ylabel('latency (ms)')
+  size_axes.set_ylabel('response size (KiB)')
+  size_axes.set_xlabel('overlapping Subscriptions')
+  latency_axes.set_title('ISA writes vs. Subscription density')
+  figure.tight_layout()
+  figure.savefig(path)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  cli.add_dss_arguments(parser)
+  parser.add_argument('--levels', default=DEFAULT_LEVELS,
+                      help='Comma-separated, increasing numbers of overlapping '
+                      'Subscriptions to measure with')
+  parser.add_argument('--repetitions', type=int, default=20,
+                      help='ISA create/update/delete cycles at each level')
+  parser.add_argument('--area', type=cli.parse_region, default=DEFAULT_AREA,
+                      help='lat_min,lng_min,lat_max,lng_max of the ISA '
+                      'footprint')
+  parser.add_argument('--tiles', type=int, default=2,
+                      help='Number of tiles per side of the footprint that '
+                      'Subscriptions are spread across')
+  parser.add_argument('--plot', help='Plot the results to this image file')
+  parser.add_argument('--csv', help='Write the results to this CSV file')
+  parser.add_argument('--json', help='Write the results to this JSON file')
+  args = parser.parse_args(argv)
+  try:
+    args.levels = [int(n) for n in args.levels.split(',')]
+  except ValueError:
+    parser.error('--levels must be comma-separated integers')
+  if args.levels != sorted(args.levels):
+    parser.error('--levels must be increasing')
+  return args
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  session = cli.make_session(args)
+
+  def owner_session(n: int) -> Optional[requests.Session]:
+    if n == 0:
+      return session
+    if not args.jwt_private_key_file:
+      return None
+    return cli.make_session(args, subject='fanout-owner-{}'.format(n))
+
+  benchmark = FanoutBenchmark(session, owner_session, args.area, args.tiles)
+  summaries = []
+  exit_code = 0
+  try:
+    for subscriptions in args.levels:
+      level = Level(subscriptions)
+      try:
+        benchmark.seed(level)
+      except RuntimeError as e:
+        LOG.error('Stopping before the level of %d Subscriptions: %s',
+                  subscriptions, e)
+        exit_code = 1
+        break
+      LOG.info('%d Subscriptions (%d rejected): measuring', subscriptions,
+               level.rejected)
+      benchmark.measure(level, args.repetitions)
+      summaries.append(level.summary())
+  finally:
+    failures = benchmark.cleanup()
+    if failures:
+      LOG.warning('Failed to delete %d Subscriptions', failures)
+
+  rows = points(summaries)
+  print(format_points(rows))
+  if args.csv:
+    with open(args.csv, 'w', newline='') as f:
+      writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+      writer.writeheader()
+      writer.writerows(rows)
+  if args.json:
+    with open(args.json, 'w') as f:
+      json.dump(summaries, f, indent=2)
+  if args.plot:
+    plot(rows, args.plot)
+  return exit_code
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,453 @@
+"""Simulation of flights moving through a region and the ISAs tracking them.
+
+Remote ID service providers keep the ISA of each of their flights up to date
+as the aircraft moves, by updating it with
+PUT /identification_service_areas/{id}/{version} every few seconds, while
+display providers with Subscriptions over the area search it for ISAs.  This
+tool simulates both: each of --flights flights flies in a straight line at a
+random speed and heading, bouncing off the edges of --region, and its ISA is
+moved to its current position (and its time window extended) every
+--update-interval seconds, using the version returned by the previous update.
+--display-providers display providers each subscribe to every view of the
+region and, every --poll-interval seconds, all search all views at the same
+time.  Run from the monitoring folder:
+
+  python -m loadtest.flights --flights 100,500,1000 --duration 30 \\
+      --dss-endpoint http://localhost:8082 --api-version-role /v1/dss \\
+      --oauth-token-endpoint http://localhost:8085/token --use-dummy-oauth
+
+Each comma-separated number of flights is one step of --duration seconds, so
+one run shows how the DSS copes as the number of flights grows.  For each step
+the report shows the update throughput and latency, the fraction of updates
+rejected because of a version conflict, and the visibility latency: the time
+from the acknowledgement of an update until a display provider's search
+returned the ISA at its new version, accurate to within one poll interval.
+"""
+
+import argparse
+import datetime
+import heapq
+import json
+import logging
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from loadtest import cli, stats
+from monitorlib import geo, histogram, rid
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_REGION = '-25.0,130.8,-24.86,130.96'
+
+# Views must stay well within the DSS's limit on the area of searches.
+DEFAULT_VIEW_SIZE_DEG = 0.07
+
+DEFAULT_FOOTPRINT_KM2 = 1
+
+# Range of ground speeds of flights, in m/s.
+MIN_SPEED = 10
+MAX_SPEED = 40
+
+ISA_CREATE = 'isa_create'
+ISA_UPDATE = 'isa_update'
+ISA_SEARCH = 'isa_search'
+ISA_DELETE = 'isa_delete'
+
+# Versions of each flight's ISA remembered for measuring visibility latency.
+MAX_TRACKED_VERSIONS = 8
+
+
+def _fold(value: float, low: float, high: float) -> float:
+  """Reflects value off low and high, like a ball bouncing between them."""
+  span = high - low
+  if span <= 0:
+    return low
+  offset = (value - low) % (2 * span)
+  return low + (offset if offset <= span else 2 * span - offset)
+
+
+class Flight(object):
+  """A flight moving in a straight line within a region, and its ISA."""
+
+  def __init__(self, region: Tuple[float, float, float, float],
+               rng: random.Random):
+    self.region = region
+    lat_min, lng_min, lat_max, lng_max = region
+    self.id = str(uuid.uuid4())
+    self.lat0 = rng.uniform(lat_min, lat_max)
+    self.lng0 = rng.uniform(lng_min, lng_max)
+    speed_deg = rng.uniform(MIN_SPEED, MAX_SPEED) / 1000 / geo.KM_PER_DEGREE
+    heading = rng.uniform(0, 2 * math.pi)
+    self.lat_rate = speed_deg * math.cos(heading)
+    self.lng_rate = speed_deg * math.sin(heading) / math.cos(
+        math.radians(self.lat0))
+    self.version: Optional[str] = None
+    # Version -> time.monotonic() at which the DSS acknowledged it.
+    self.acknowledged: Dict[str, float] = {}
+    self.busy = False
+
+  def position(self, t: float) -> Tuple[float, float]:
+    """Returns the (lat, lng) of the flight t seconds after it started."""
+    lat_min, lng_min, lat_max, lng_max = self.region
+    return (_fold(self.lat0 + self.lat_rate * t, lat_min, lat_max),
+            _fold(self.lng0 + self.lng_rate * t, lng_min, lng_max))
+
+  def acknowledge(self, version: str, at: float) -> None:
+    self.version = version
+    self.acknowledged[version] = at
+    if len(self.acknowledged) > MAX_TRACKED_VERSIONS:
+      del self.acknowledged[next(iter(self.acknowledged))]
+
+
+class StepResult(object):
+  """Results of simulating a number of flights for a while."""
+
+  def __init__(self, flights: int):
+    self.flights = flights
+    self.stats = stats.LoadStats()
+    self.conflicts = 0
+    self.visibility = histogram.Histogram()
+    # Seconds updates were sent after they were due.
+    self.lateness = histogram.Histogram()
+    self.elapsed = 0.0
+    self._lock = threading.Lock()
+
+  def record_visibility(self, latency: float) -> None:
+    with self._lock:
+      self.visibility.record(latency)
+
+  def record_lateness(self, lateness: float) -> None:
+    with self._lock:
+      self.lateness.record(lateness)
+
+  def record_conflict(self) -> None:
+    with self._lock:
+      self.conflicts += 1
+
+  def summary(self) -> Dict[str, Any]:
+    report = self.stats.report(self.elapsed)
+    updates = report.get(ISA_UPDATE, {})
+    count = updates.get('count', 0)
+    return {
+        'flights': self.flights,
+        'elapsed': self.elapsed,
+        'operations': report,
+        'update_throughput': updates.get('throughput'),
+        'conflicts': self.conflicts,
+        'conflict_rate': self.conflicts / count if count else None,
+        'visibility': self.visibility.summary(),
+        'lateness': self.lateness.summary(),
+    }
+
+
+class Simulation(object):
+  """Flights updating their ISAs and display providers searching for them.
+
+  Args:
+    session: Session for the DSS, with URLs relative to the RID API root.
+    region: (lat_min, lng_min, lat_max, lng_max) flights fly within.
+    display_providers: Number of display providers polling every view.
+    view_size: Size in degrees of the views display providers search.
+    update_interval: Seconds between updates of each flight's ISA.
+    poll_interval: Seconds between searches of each display provider.
+    footprint_km2: Area of each flight's ISA.
+    ttl: Seconds each ISA extends past its latest update.
+    concurrency: Number of updates in flight at once.
+    rng: Source of flights' starting positions and velocities.
+  """
+
+  def __init__(self,
+               session: requests.Session,
+               region: Tuple[float, float, float, float],
+               display_providers: int = 2,
+               view_size: float = DEFAULT_VIEW_SIZE_DEG,
+               update_interval: float = 1,
+               poll_interval: float = 1,
+               footprint_km2: float = DEFAULT_FOOTPRINT_KM2,
+               ttl: float = 300,
+               concurrency: int = 16,
+               rng: Optional[random.Random] = None):
+    if display_providers > rid.MAX_SUB_PER_AREA:
+      raise ValueError('At most {} display providers can subscribe to the '
+                       'same area'.format(rid.MAX_SUB_PER_AREA))
+    self.session = session
+    self.region = region
+    self.display_providers = display_providers
+    self.views = geo.tile_region(*region, tile_size_deg=view_size)
+    self.update_interval = update_interval
+    self.poll_interval = poll_interval
+    self.footprint_km2 = footprint_km2
+    self.ttl = ttl
+    self.concurrency = concurrency
+    self.rng = rng or random.Random()
+    # (display provider, view) -> Subscription (id, version).
+    self._subscriptions: Dict[Tuple[int, int], Tuple[str, str]] = {}
+
+  def _body(self, flight: Flight, t: float) -> Dict[str, Any]:
+    lat, lng = flight.position(t)
+    now = datetime.datetime.utcnow()
+    return rid.isa_body(geo.regular_polygon(lat, lng, self.footprint_km2, 4),
+                        now, now + datetime.timedelta(seconds=self.ttl))
+
+  def _timed(self, result: StepResult, operation: str, method: str, url: str,
+             **kwargs) -> Optional[requests.Response]:
+    t0 = time.monotonic()
+    try:
+      resp = self.session.request(method, url, **kwargs)
+    except requests.RequestException as e:
+      result.stats.record(operation, time.monotonic() - t0, error=e)
+      return None
+    result.stats.record(operation, time.monotonic() - t0, resp.status_code)
+    return resp
+
+  def subscribe(self) -> None:
+    """Creates every display provider's Subscription to every view."""
+    now = datetime.datetime.utcnow()
+    for dp in range(self.display_providers):
+      for v, view in enumerate(self.views):
+        sub_id = str(uuid.uuid4())
+        resp = self.session.put(
+            '{}/{}'.format(rid.SUBSCRIPTION_PATH, sub_id),
+            json=rid.subscription_body(
+                view, now, now + datetime.timedelta(hours=1),
+                callback_url='https://example.com/dp{}'.format(dp)))
+        if resp.status_code == 200:
+          self._subscriptions[(dp, v)] = (
+              sub_id, resp.json()['subscription']['version'])
+        else:
+          LOG.warning('Failed to create Subscription of display provider %d: '
+                      '%d %s', dp, resp.status_code, resp.text)
+
+  def unsubscribe(self) -> None:
+    for sub_id, version in self._subscriptions.values():
+      resp = self.session.delete('{}/{}/{}'.format(rid.SUBSCRIPTION_PATH,
+                                                   sub_id, version))
+      if resp.status_code != 200:
+        LOG.warning('Failed to delete Subscription %s: %d', sub_id,
+                    resp.status_code)
+    self._subscriptions.clear()
+
+  def run(self, flights: int, duration: float) -> StepResult:
+    """Simulates flights for duration seconds."""
+    result = StepResult(flights)
+    fleet = [Flight(self.region, self.rng) for _ in range(flights)]
+    by_id = {flight.id: flight for flight in fleet}
+    self.subscribe()
+    stop = threading.Event()
+    try:
+      # Positions are computed from the time since origin.
+      origin = time.monotonic()
+      with ThreadPoolExecutor(self.concurrency) as executor:
+        for flight in fleet:
+          executor.submit(self._create, flight, origin, result)
+      LOG.info('Created %d ISAs in %.1fs', flights, time.monotonic() - origin)
+
+      pollers = threading.Thread(target=self._poll_loop,
+                                 args=(by_id, stop, result), daemon=True)
+      start = time.monotonic()
+      pollers.start()
+      self._update_loop(fleet, origin, start, start + duration, result)
+      result.elapsed = time.monotonic() - start
+    finally:
+      stop.set()
+      self._delete(fleet, result)
+      self.unsubscribe()
+    return result
+
+  def _create(self, flight: Flight, origin: float,
+              result: StepResult) -> None:
+    resp = self._timed(result, ISA_CREATE, 'PUT',
+                       '{}/{}'.format(rid.ISA_PATH, flight.id),
+                       json=self._body(flight, time.monotonic() - origin))
+    if resp is not None and resp.status_code == 200:
+      flight.acknowledge(resp.json()['service_area']['version'],
+                         time.monotonic())
+
+  def _update_loop(self, fleet: List[Flight], origin: float, start: float,
+                   stop_at: float, result: StepResult) -> None:
+    """Sends the update of every flight when it is due until stop_at."""
+    # (due time, flight index); flights' updates are spread over an interval.
+    due = [(start + self.update_interval * i / len(fleet), i)
+           for i in range(len(fleet))]
+    heapq.heapify(due)
+    lock = threading.Lock()
+    with ThreadPoolExecutor(self.concurrency) as executor:
+      while due:
+        at, i = heapq.heappop(due)
+        if at >= stop_at:
+          break
+        delay = at - time.monotonic()
+        if delay > 0:
+          time.sleep(delay)
+        heapq.heappush(due, (at + self.update_interval, i))
+        flight = fleet[i]
+        with lock:
+          if flight.busy or flight.version is None:
+            # The previous update has not completed yet (or the ISA was never
+            # created), as happens when the DSS cannot keep up.
+            result.stats.record_skipped(ISA_UPDATE)
+            continue
+          flight.busy = True
+        result.record_lateness(max(time.monotonic() - at, 0))
+        executor.submit(self._update, flight, origin, result, lock)
+
+  def _update(self, flight: Flight, origin: float, result: StepResult,
+              lock: threading.Lock) -> None:
+    try:
+      url = '{}/{}/{}'.format(rid.ISA_PATH, flight.id, flight.version)
+      resp = self._timed(result, ISA_UPDATE, 'PUT', url,
+                         json=self._body(flight, time.monotonic() - origin))
+      if resp is None:
+        return
+      if resp.status_code == 200:
+        flight.acknowledge(resp.json()['service_area']['version'],
+                           time.monotonic())
+      elif resp.status_code == 409:
+        result.record_conflict()
+        # Catch up with the version the DSS has.
+        current = self.session.get('{}/{}'.format(rid.ISA_PATH, flight.id))
+        if current.status_code == 200:
+          flight.version = current.json()['service_area']['version']
+    except requests.RequestException as e:
+      LOG.warning('Failed to refresh the version of %s: %s', flight.id, e)
+    finally:
+      with lock:
+        flight.busy = False
+
+  def _poll_loop(self, flights: Dict[str, Flight], stop: threading.Event,
+                 result: StepResult) -> None:
+    """Has every display provider search every view every poll interval."""
+    # (display provider, flight ID) -> latest version seen.
+    seen: Dict[Tuple[int, str], str] = {}
+    searches = [(dp, geo.polygon_string(view))
+                for dp in range(self.display_providers) for view in self.views]
+    with ThreadPoolExecutor(len(searches)) as executor:
+      next_poll = time.monotonic()
+      while not stop.is_set():
+        polled_at = time.monotonic()
+        futures = [
+            executor.submit(self._timed, result, ISA_SEARCH, 'GET',
+                            '{}?area={}'.format(rid.ISA_PATH, area))
+            for _, area in searches
+        ]
+        for (dp, _), future in zip(searches, futures):
+          resp = future.result()
+          if resp is None or resp.status_code != 200:
+            continue
+          for isa in resp.json().get('service_areas', []):
+            flight = flights.get(isa['id'])
+            if flight is None or seen.get((dp, flight.id)) == isa['version']:
+              continue
+            seen[(dp, flight.id)] = isa['version']
+            acknowledged_at = flight.acknowledged.get(isa['version'])
+            if acknowledged_at is not None:
+              result.record_visibility(max(polled_at - acknowledged_at, 0))
+        next_poll += self.poll_interval
+        stop.wait(max(next_poll - time.monotonic(), 0))
+
+  def _delete(self, fleet: List[Flight], result: StepResult) -> None:
+
+    def delete(flight: Flight):
+      if flight.version is not None:
+        self._timed(result, ISA_DELETE, 'DELETE', '{}/{}/{}'.format(
+            rid.ISA_PATH, flight.id, flight.version))
+
+    with ThreadPoolExecutor(self.concurrency) as executor:
+      list(executor.map(delete, fleet))
+
+
+def _ms(value: Optional[float]) -> str:
+  return '-' if value is None else '{:.1f}'.format(value * 1000)
+
+
+def format_steps(summaries: List[Dict[str, Any]]) -> str:
+  rows = [['flights', 'updates/s', 'update p50 ms', 'update p99 ms',
+           'skipped', 'conflicts', 'visible p50 ms', 'visible p99 ms',
+           'search p50 ms', 'search p99 ms']]
+  for s in summaries:
+    update = s['operations'].get(ISA_UPDATE, {})
+    search = s['operations'].get(ISA_SEARCH, {})
+    rows.append([
+        str(s['flights']),
+        '-' if s['update_throughput'] is None else '{:.1f}'.format(
+            s['update_throughput']),
+        _ms(update.get('p50')), _ms(update.get('p99')),
+        str(update.get('skipped', 0)),
+        '{} ({:.2%})'.format(s['conflicts'], s['conflict_rate'] or 0),
+        _ms(s['visibility']['p50']), _ms(s['visibility']['p99']),
+        _ms(search.get('p50')), _ms(search.get('p99')),
+    ])
+  widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+  return '\n'.join(
+      '  '.join(cell.rjust(width) if i else cell.ljust(width)
+                for i, (cell, width) in enumerate(zip(row, widths)))
+      for row in rows)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  cli.add_dss_arguments(parser)
+  parser.add_argument('--flights', default='100',
+                      help='Comma-separated numbers of flights to simulate, '
+                      'one step each')
+  parser.add_argument('--duration', type=float, default=30,
+                      help='Seconds each step lasts')
+  parser.add_argument('--update-interval', type=float, default=1,
+                      help='Seconds between updates of each flight\'s ISA')
+  parser.add_argument('--display-providers', type=int, default=2,
+                      help='Number of display providers subscribing to and '
+                      'searching the region')
+  parser.add_argument('--poll-interval', type=float, default=1,
+                      help='Seconds between searches of display providers')
+  parser.add_argument('--region', type=cli.parse_region, default=DEFAULT_REGION,
+                      help='lat_min,lng_min,lat_max,lng_max of the region '
+                      'flights fly within')
+  parser.add_argument('--view-size', type=float, default=DEFAULT_VIEW_SIZE_DEG,
+                      help='Size in degrees of the areas display providers '
+                      'subscribe to and search')
+  parser.add_argument('--footprint', type=float, default=DEFAULT_FOOTPRINT_KM2,
+                      help='Area in km^2 of each flight\'s ISA')
+  parser.add_argument('--concurrency', type=int, default=16,
+                      help='Maximum number of ISA updates in flight')
+  parser.add_argument('--seed', type=int, help='Random seed')
+  parser.add_argument('--json', help='Also write the results to this file')
+  args = parser.parse_args(argv)
+  try:
+    args.flights = [int(n) for n in args.flights.split(',')]
+  except ValueError:
+    parser.error('--flights must be comma-separated integers')
+  return args
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  views = geo.tile_region(*args.region, tile_size_deg=args.view_size)
+  session = cli.make_session(
+      args, args.concurrency + args.display_providers * len(views))
+  simulation = Simulation(
+      session, args.region, display_providers=args.display_providers,
+      view_size=args.view_size, update_interval=args.update_interval,
+      poll_interval=args.poll_interval, footprint_km2=args.footprint,
+      concurrency=args.concurrency, rng=random.Random(args.seed))
+  summaries = []
+  for flights in args.flights:
+    LOG.info('Simulating %d flights for %gs', flights, args.duration)
+    summaries.append(simulation.run(flights, args.duration).summary())
+  print(format_steps(summaries))
+  if args.json:
+    with open(args.json, 'w') as f:
+      json.dump(summaries, f, indent=2)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
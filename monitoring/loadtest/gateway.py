@@ -0,0 +1,247 @@
+"""Benchmark of the latency and CPU the http-gateway adds to DSS requests.
+
+Runs the same remote ID workload as loadgen twice per round: once through the
+http-gateway at --dss-endpoint, and once as gRPC calls sent directly to the
+grpc-backend at --dss-grpc-endpoint.  The two phases alternate order from
+round to round so that drift in the DSS's state affects both equally.  The
+report compares latency percentiles per operation and the CPU time spent per
+request by this client and, when their process IDs are given, by the gateway
+and backend processes (which must then run on this host).  Run from the
+monitoring folder:
+
+  python -m loadtest.gateway \\
+      --dss-endpoint http://localhost:8082 --api-version-role /v1/dss \\
+      --dss-grpc-endpoint localhost:8081 \\
+      --oauth-token-endpoint http://localhost:8085/token --use-dummy-oauth \\
+      --gateway-pid $(pgrep http-gateway) --backend-pid $(pgrep grpc-backend)
+
+Both phases authenticate with the same access tokens, and the gRPC phase
+uses the same URLs (transcoded to gRPC calls in this process, see
+monitorlib.grpc_client), so everything but the gateway hop is the same.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from loadtest import cli, loadgen, stats, workload
+from monitorlib import geo, infrastructure
+
+LOG = logging.getLogger(__name__)
+
+GATEWAY = 'gateway'
+BACKEND = 'backend'
+
+DEFAULT_REGION = '-23.7,128.6,-22.7,129.6'
+DEFAULT_MIX = 'isa_put=1,isa_search=4,isa_delete=1,sub_search=2'
+
+
+def process_cpu_seconds(pid: int) -> float:
+  """Returns the user plus system CPU time a local process has used so far."""
+  with open('/proc/{}/stat'.format(pid), 'r') as f:
+    # The command name may contain spaces; fields after it are space-separated.
+    fields = f.read().rsplit(')', 1)[1].split()
+  # utime and stime are fields 14 and 15 of /proc/<pid>/stat.
+  return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+class CPUMeter(object):
+  """Measures CPU time used by this process and optional other processes."""
+
+  def __init__(self, pids: Dict[str, Optional[int]]):
+    self._pids = {name: pid for name, pid in pids.items() if pid is not None}
+
+  def read(self) -> Dict[str, float]:
+    result = {'client': time.process_time()}
+    for name, pid in self._pids.items():
+      result[name] = process_cpu_seconds(pid)
+    return result
+
+
+class Phase(object):
+  """Accumulated results of one transport across rounds."""
+
+  def __init__(self):
+    self.stats = stats.LoadStats()
+    self.elapsed = 0.0
+    self.cpu_seconds: Dict[str, float] = {}
+
+  @property
+  def requests(self) -> int:
+    return sum(s.count for s in self.stats.operations.values())
+
+  def add(self, results: stats.LoadStats, elapsed: float,
+          cpu_before: Dict[str, float], cpu_after: Dict[str, float]) -> None:
+    self.stats.merge(results)
+    self.elapsed += elapsed
+    for name, value in cpu_after.items():
+      self.cpu_seconds[name] = (self.cpu_seconds.get(name, 0) + value -
+                                cpu_before[name])
+
+  def cpu_ms_per_request(self) -> Dict[str, Optional[float]]:
+    requests = self.requests
+    return {
+        name: seconds * 1000 / requests if requests else None
+        for name, seconds in self.cpu_seconds.items()
+    }
+
+
+def run_phase(load: workload.RIDWorkload, args: argparse.Namespace,
+              mix: Dict[str, float], cpu: CPUMeter, phase: Phase) -> None:
+  before = cpu.read()
+  results, elapsed = loadgen.run(load, mix, args.duration, args.concurrency,
+                                 rate=args.rate, seed=args.seed)
+  after = cpu.read()
+  phase.add(results, elapsed, before, after)
+
+
+def compare(gateway: Phase, backend: Phase) -> Dict[str, Any]:
+  """Returns per-operation latencies of both phases and their differences."""
+  operations = {}
+  gateway_report = gateway.stats.report(gateway.elapsed)
+  backend_report = backend.stats.report(backend.elapsed)
+  for operation in sorted(set(gateway_report) & set(backend_report)):
+    g = gateway_report[operation]
+    b = backend_report[operation]
+    result = {GATEWAY: g, BACKEND: b}
+    for p in ('p50', 'p90', 'p99'):
+      if g[p] is not None and b[p] is not None:
+        result['added_' + p] = g[p] - b[p]
+    operations[operation] = result
+  gateway_cpu = gateway.cpu_ms_per_request()
+  backend_cpu = backend.cpu_ms_per_request()
+  return {
+      'operations': operations,
+      'cpu_ms_per_request': {GATEWAY: gateway_cpu, BACKEND: backend_cpu},
+  }
+
+
+def _ms(value: Optional[float]) -> str:
+  return '-' if value is None else '{:.2f}'.format(value * 1000)
+
+
+def _cpu(value: Optional[float]) -> str:
+  return '-' if value is None else '{:.3f}'.format(value)
+
+
+def format_comparison(comparison: Dict[str, Any]) -> str:
+  rows = [['operation', 'count', 'gateway p50 ms', 'gRPC p50 ms', 'added',
+           'gateway p99 ms', 'gRPC p99 ms', 'added']]
+  for operation, c in comparison['operations'].items():
+    rows.append([
+        operation,
+        '{}/{}'.format(c[GATEWAY]['count'], c[BACKEND]['count']),
+        _ms(c[GATEWAY]['p50']), _ms(c[BACKEND]['p50']),
+        _ms(c.get('added_p50')),
+        _ms(c[GATEWAY]['p99']), _ms(c[BACKEND]['p99']),
+        _ms(c.get('added_p99')),
+    ])
+  lines = _table(rows)
+
+  cpu = comparison['cpu_ms_per_request']
+  rows = [['cpu ms/request', 'via gateway', 'direct gRPC', 'added']]
+  for name in sorted(cpu[GATEWAY]):
+    g = cpu[GATEWAY].get(name)
+    b = cpu[BACKEND].get(name)
+    added = g - b if g is not None and b is not None else None
+    rows.append([name, _cpu(g), _cpu(b), _cpu(added)])
+  return lines + '\n\n' + _table(rows)
+
+
+def _table(rows: List[List[str]]) -> str:
+  widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+  return '\n'.join(
+      '  '.join(cell.rjust(width) if i else cell.ljust(width)
+                for i, (cell, width) in enumerate(zip(row, widths)))
+      for row in rows)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  cli.add_dss_arguments(parser)
+  parser.add_argument('--mix', default=DEFAULT_MIX,
+                      help='Comma-separated operation=weight pairs; '
+                      'operations are ' + ', '.join(workload.OPERATIONS))
+  parser.add_argument('--rate', type=float,
+                      help='Target requests per second in each phase; if '
+                      'omitted, clients send requests back to back')
+  parser.add_argument('--concurrency', type=int, default=4,
+                      help='Number of concurrent clients')
+  parser.add_argument('--duration', type=float, default=20,
+                      help='Seconds each phase of each round lasts')
+  parser.add_argument('--rounds', type=int, default=3,
+                      help='Number of rounds of both phases')
+  parser.add_argument('--region', type=cli.parse_region, default=DEFAULT_REGION,
+                      help='lat_min,lng_min,lat_max,lng_max of the region to '
+                      'spread footprints across')
+  parser.add_argument('--cell-size', type=float,
+                      default=geo.DEFAULT_CELL_SIZE_DEG,
+                      help='Size in degrees of each footprint')
+  parser.add_argument('--ttl', type=float, default=workload.DEFAULT_TTL_SEC,
+                      help='Lifetime in seconds of created entities')
+  parser.add_argument('--gateway-pid', type=int,
+                      help='Process ID of a local http-gateway, to measure '
+                      'its CPU time')
+  parser.add_argument('--backend-pid', type=int,
+                      help='Process ID of a local grpc-backend, to measure '
+                      'its CPU time')
+  parser.add_argument('--seed', type=int, help='Random seed')
+  parser.add_argument('--json', help='Also write the comparison to this file')
+  args = parser.parse_args(argv)
+  if not args.dss_grpc_endpoint:
+    parser.error('--dss-grpc-endpoint is required')
+  return args
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  mix = workload.parse_mix(args.mix)
+  grid = geo.Grid.over_region(*args.region, cell_size_deg=args.cell_size,
+                              cell_pitch_deg=args.cell_size * 2)
+
+  prefix_url = args.dss_endpoint + args.api_version_role
+  auth_adapter = cli.make_auth_adapter(args, args.concurrency)
+  sessions = {
+      GATEWAY: infrastructure.make_session(prefix_url, auth_adapter),
+      BACKEND: infrastructure.make_session(
+          prefix_url, auth_adapter, grpc_target=args.dss_grpc_endpoint,
+          grpc_channels=args.grpc_channels),
+  }
+  loads = {
+      name: workload.RIDWorkload(session, grid, ttl=args.ttl,
+                                 rng=random.Random(args.seed))
+      for name, session in sessions.items()
+  }
+  phases = {GATEWAY: Phase(), BACKEND: Phase()}
+  cpu = CPUMeter({GATEWAY: args.gateway_pid, BACKEND: args.backend_pid})
+
+  try:
+    for i in range(args.rounds):
+      order = [GATEWAY, BACKEND] if i % 2 == 0 else [BACKEND, GATEWAY]
+      for name in order:
+        LOG.info('Round %d/%d: %s for %gs', i + 1, args.rounds, name,
+                 args.duration)
+        run_phase(loads[name], args, mix, cpu, phases[name])
+  finally:
+    for name, load in loads.items():
+      failures = load.cleanup()
+      if failures:
+        LOG.warning('Failed to delete %d entities created via %s', failures,
+                    name)
+
+  comparison = compare(phases[GATEWAY], phases[BACKEND])
+  print(format_comparison(comparison))
+  if args.json:
+    with open(args.json, 'w') as f:
+      json.dump(comparison, f, indent=2)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,336 @@
+"""Finds the highest load a DSS sustains within a latency and error SLO.
+
+Sends an open-loop mix of requests (see loadtest.openloop) at increasing
+rates: --start-rate, then --growth times the previous rate, up to --max-rate.
+At each rate, load is sent continuously for --max-warmup windows of --window
+seconds and then for --measure seconds more, which are measured.  The warm-up
+windows show whether the DSS reached a steady state first: the median latency
+of two consecutive windows must agree within --steady-tolerance.  Since it is
+one run, any queue that built up during the warm-up is still there when the
+measurement starts.  The search stops at the first rate whose p99 latency or
+error rate breaches the SLO, and --refine bisection steps then narrow down the
+knee between the last rate within the SLO and that one.  Since every rate
+writes to the same region, the mix should delete about as much as it creates.
+Run from the monitoring folder:
+
+  python -m loadtest.knee --mix isa_put=1,isa_delete=1,isa_search=4 \\
+      --slo-p99-ms 300 --slo-error-rate 0.001 --label v0.2.0 \\
+      --dss-endpoint http://localhost:8082 --api-version-role /v1/dss \\
+      --jwt-private-key-file ../build/test-certs/auth2.key --json knee.json
+
+Latencies are response times from each request's scheduled send time, across
+all operations of the mix, so they are corrected for coordinated omission.
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import logging
+import random
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+from loadtest import cli, loadgen, openloop, stats, workload
+from monitorlib import geo, histogram, rid
+
+LOG = logging.getLogger(__name__)
+
+CSV_COLUMNS = ['rate', 'throughput', 'count', 'errors', 'error_rate', 'p50',
+               'p90', 'p99', 'service_p99', 'queueing_p99', 'warmup_windows',
+               'steady', 'within_slo']
+
+
+class SLO(object):
+  """Latency and error rate objectives for the whole mix."""
+
+  def __init__(self, p99: float, error_rate: float):
+    self.p99 = p99
+    self.error_rate = error_rate
+
+  def breaches(self, point: Dict[str, Any]) -> List[str]:
+    """Returns a description of each objective point does not meet."""
+    result = []
+    if point['p99'] is None or point['p99'] >= self.p99:
+      result.append('p99 {} >= {:.0f}ms'.format(_ms(point['p99']),
+                                                self.p99 * 1000))
+    # Inclusive, unlike the latency objective, so that an objective of 0
+    # means no errors at all.
+    if point['error_rate'] is None or point['error_rate'] > self.error_rate:
+      result.append('error rate {:.3%} > {:.3%}'.format(
+          point['error_rate'] or 0, self.error_rate))
+    return result
+
+  def to_dict(self) -> Dict[str, float]:
+    return {'p99': self.p99, 'error_rate': self.error_rate}
+
+
+def combine(results: stats.LoadStats) -> stats.OperationStats:
+  """Merges the stats of every operation into one."""
+  combined = stats.OperationStats()
+  for operation in results.operations.values():
+    combined.merge(operation)
+  return combined
+
+
+def _median(results: openloop.OpenLoopStats) -> Optional[float]:
+  return combine(results.response).latency.percentile(50)
+
+
+def measure_rate(operations: Dict[str, Callable], mix: Dict[str, float],
+                 rate: float, args: argparse.Namespace,
+                 rng: random.Random) -> Dict[str, Any]:
+  """Brings the load to rate, checks for steady state and measures it.
+
+  The warm-up and the measurement are one schedule sent in a single run, and
+  are told apart by when each request was scheduled.
+  """
+  warmup = args.max_warmup * args.window
+  schedule = openloop.arrival_times([(rate, warmup + args.measure)],
+                                    args.arrivals, rng=rng)
+  boundaries = [args.window * (i + 1) for i in range(args.max_warmup)]
+  run, elapsed = openloop.run(operations, mix, schedule, args.concurrency, rng,
+                              boundaries=boundaries)
+  results = run.slices[-1]
+  # The measurement lasts from its first scheduled request until the end of
+  # the run, including the time taken to drain any queue.
+  elapsed -= warmup
+
+  previous = None
+  windows = 0
+  steady = False
+  for window in run.slices[:-1]:
+    median = _median(window)
+    windows += 1
+    if previous and median and (abs(median - previous) <=
+                                args.steady_tolerance * previous):
+      steady = True
+      break
+    previous = median
+  if not steady:
+    LOG.warning('Latency at %g requests/s did not settle within %d windows',
+                rate, windows)
+
+  response = combine(results.response)
+  queueing = histogram.Histogram()
+  for h in results.queueing.values():
+    queueing.merge(h)
+  return {
+      'rate': rate,
+      'throughput': response.count / elapsed if elapsed else None,
+      'count': response.count,
+      'errors': response.errors,
+      'error_rate': response.errors / response.count if response.count
+                    else None,
+      'p50': response.latency.percentile(50),
+      'p90': response.latency.percentile(90),
+      'p99': response.latency.percentile(99),
+      'service_p99': combine(results.service).latency.percentile(99),
+      'queueing_p99': queueing.percentile(99),
+      'warmup_windows': windows,
+      'steady': steady,
+      'operations': results.report(elapsed)['response'],
+  }
+
+
+def find_knee(measure: Callable[[float], Dict[str, Any]], slo: SLO,
+              start_rate: float, growth: float, max_rate: float,
+              refine: int) -> Dict[str, Any]:
+  """Steps the rate up until the SLO is breached, then bisects.
+
+  measure returns the point measured at a rate.  Returns every point measured,
+  in increasing order of rate, and the knee: the highest rate measured within
+  the SLO, or None if even start_rate breached it.
+  """
+  points = []
+  passed = None
+  failed = None
+
+  def evaluate(rate: float) -> bool:
+    LOG.info('Measuring %g requests/s', rate)
+    point = measure(rate)
+    breaches = slo.breaches(point)
+    point['within_slo'] = not breaches
+    points.append(point)
+    LOG.info('%g requests/s: p50 %sms, p99 %sms, error rate %.3f%% (%s)', rate,
+             _ms(point['p50']), _ms(point['p99']),
+             (point['error_rate'] or 0) * 100,
+             '; '.join(breaches) if breaches else 'within SLO')
+    return not breaches
+
+  rate = start_rate
+  while rate <= max_rate:
+    if not evaluate(rate):
+      failed = rate
+      break
+    passed = rate
+    rate *= growth
+
+  if failed is not None and passed is not None:
+    for _ in range(refine):
+      rate = (passed + failed) / 2
+      if evaluate(rate):
+        passed = rate
+      else:
+        failed = rate
+
+  points.sort(key=lambda p: p['rate'])
+  return {
+      'knee': passed,
+      'first_breach': failed,
+      # Without a breach, the DSS sustained every rate tried.
+      'saturated': failed is not None,
+      'points': points,
+  }
+
+
+def _ms(value: Optional[float]) -> str:
+  return '-' if value is None else '{:.1f}'.format(value * 1000)
+
+
+def format_points(points: List[Dict[str, Any]]) -> str:
+  rows = [['rate', 'ops/s', 'errors', 'p50 ms', 'p90 ms', 'p99 ms',
+           'service p99', 'queue p99', 'steady', 'SLO']]
+  for p in points:
+    rows.append([
+        '{:g}'.format(p['rate']),
+        '-' if p['throughput'] is None else '{:.1f}'.format(p['throughput']),
+        '{} ({:.2%})'.format(p['errors'], p['error_rate'] or 0),
+        _ms(p['p50']), _ms(p['p90']), _ms(p['p99']),
+        _ms(p['service_p99']), _ms(p['queueing_p99']),
+        'yes' if p['steady'] else 'no',
+        'ok' if p['within_slo'] else 'breached',
+    ])
+  widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+  return '\n'.join(
+      '  '.join(cell.rjust(width) if i else cell.ljust(width)
+                for i, (cell, width) in enumerate(zip(row, widths)))
+      for row in rows)
+
+
+def write_csv(path: str, points: List[Dict[str, Any]]) -> None:
+  with open(path, 'w', newline='') as f:
+    writer = csv.DictWriter(f, CSV_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    for point in points:
+      writer.writerow(point)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  cli.add_dss_arguments(parser)
+  parser.add_argument('--scd-api-role', default=openloop.DEFAULT_SCD_API_ROLE,
+                      help='Path prefix of the strategic coordination API')
+  parser.add_argument('--mix', default=openloop.DEFAULT_MIX,
+                      help='Comma-separated operation=weight pairs; '
+                      'operations are ' + ', '.join(
+                          workload.OPERATIONS + workload.SCD_OPERATIONS))
+  parser.add_argument('--slo-p99-ms', type=float, default=300,
+                      help='Highest acceptable p99 latency, in ms')
+  parser.add_argument('--slo-error-rate', type=float, default=0.001,
+                      help='Highest acceptable fraction of failed requests '
+                      '(0 for none)')
+  parser.add_argument('--start-rate', type=float, default=10,
+                      help='First rate to measure, in requests per second')
+  parser.add_argument('--growth', type=float, default=1.5,
+                      help='Factor by which the rate grows between steps')
+  parser.add_argument('--max-rate', type=float, default=10000,
+                      help='Highest rate to try')
+  parser.add_argument('--refine', type=int, default=3,
+                      help='Number of bisection steps between the last rate '
+                      'within the SLO and the first beyond it')
+  parser.add_argument('--window', type=float, default=10,
+                      help='Seconds of each warm-up window')
+  parser.add_argument('--max-warmup', type=int, default=6,
+                      help='Number of warm-up windows per rate, within which '
+                      'latency must settle')
+  parser.add_argument('--steady-tolerance', type=float, default=0.2,
+                      help='Largest relative change in median latency between '
+                      'warm-up windows considered steady')
+  parser.add_argument('--measure', type=float, default=30,
+                      help='Seconds to measure each rate for')
+  parser.add_argument('--arrivals', choices=openloop.ARRIVALS,
+                      default=openloop.POISSON,
+                      help='Spacing of requests at a given rate')
+  parser.add_argument('--concurrency', type=int, default=256,
+                      help='Maximum number of requests in flight')
+  parser.add_argument('--region', type=cli.parse_region,
+                      default=loadgen.DEFAULT_REGION,
+                      help='lat_min,lng_min,lat_max,lng_max of the region to '
+                      'spread footprints across')
+  parser.add_argument('--cell-size', type=float,
+                      default=geo.DEFAULT_CELL_SIZE_DEG,
+                      help='Size in degrees of each footprint')
+  parser.add_argument('--ttl', type=float, default=workload.DEFAULT_TTL_SEC,
+                      help='Lifetime in seconds of created entities')
+  parser.add_argument('--seed', type=int, help='Random seed')
+  parser.add_argument('--label',
+                      help='Label for this run, e.g. the DSS version')
+  parser.add_argument('--csv', help='Write the curve to this CSV file')
+  parser.add_argument('--json', help='Write the results to this JSON file')
+  parser.add_argument('--no-cleanup', action='store_true',
+                      help='Leave created entities in the DSS')
+  args = parser.parse_args(argv)
+  if args.start_rate <= 0 or args.growth <= 1:
+    parser.error('--start-rate must be positive and --growth greater than 1')
+  if args.max_warmup < 1:
+    parser.error('--max-warmup must be at least 1')
+  try:
+    args.mix = workload.parse_mix(
+        args.mix, workload.OPERATIONS + workload.SCD_OPERATIONS)
+  except ValueError as e:
+    parser.error(str(e))
+  return args
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  rng = random.Random(args.seed)
+  grid = geo.Grid.over_region(*args.region, cell_size_deg=args.cell_size,
+                              cell_pitch_deg=args.cell_size * 2)
+  operations, loads = openloop.make_operations(args, grid, rng)
+  slo = SLO(args.slo_p99_ms / 1000, args.slo_error_rate)
+
+  try:
+    result = find_knee(
+        lambda rate: measure_rate(operations, args.mix, rate, args, rng), slo,
+        args.start_rate, args.growth, args.max_rate, args.refine)
+  finally:
+    if not args.no_cleanup:
+      failures = sum(load.cleanup() for load in loads)
+      if failures:
+        LOG.warning('Failed to delete %d entities', failures)
+
+  print(format_points(result['points']))
+  if result['knee'] is None:
+    print('Even {:g} requests/s breached the SLO'.format(args.start_rate))
+  elif not result['saturated']:
+    print('Every rate up to {:g} requests/s was within the SLO; raise '
+          '--max-rate to find the knee'.format(result['knee']))
+  else:
+    print('Knee: {:g} requests/s (SLO breached at {:g} requests/s)'.format(
+        result['knee'], result['first_breach']))
+  if any(p['queueing_p99'] and
+         p['queueing_p99'] > openloop.QUEUEING_WARNING_SEC
+         for p in result['points']):
+    LOG.warning('Queueing delays show that the harness limited the load at '
+                'some rates; consider a larger --concurrency')
+
+  if args.json:
+    result.update({
+        'label': args.label,
+        'dss_endpoint': args.dss_endpoint,
+        'time': datetime.datetime.utcnow().strftime(rid.DATE_FORMAT),
+        'mix': args.mix,
+        'slo': slo.to_dict(),
+    })
+    with open(args.json, 'w') as f:
+      json.dump(result, f, indent=2)
+  if args.csv:
+    write_csv(args.csv, result['points'])
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
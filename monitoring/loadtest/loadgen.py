@@ -0,0 +1,172 @@
+"""Sustained remote ID load against a DSS.
+
+Drives a weighted mix of ISA and Subscription requests at a target rate or
+with a fixed number of concurrent clients, then reports throughput, error
+rate and latency percentiles per operation.  Run from the monitoring folder:
+
+  python -m loadtest.loadgen \
+      --dss-endpoint http://localhost:8082 --api-version-role /v1/dss \
+      --oauth-token-endpoint http://localhost:8085/token --use-dummy-oauth \
+      --rate 50 --duration 60
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from loadtest import cli, stats, workload
+from monitorlib import geo
+
+LOG = logging.getLogger(__name__)
+
+# Default region of the load generators (loadgen, openloop, knee and
+# distributed).  It lies west of the footprints of the prober and the
+# interoperability test suite, and apart from the other load tools' regions,
+# so that load runs don't fill the tests' areas with entities and push them
+# into the DSS's area limits.
+DEFAULT_REGION = '-24.6,129.7,-22.7,130.5'
+
+
+class Pacer(object):
+  """Hands out evenly-spaced send times to achieve a target request rate."""
+
+  # Don't try to catch up on more than this many seconds of missed sends.
+  MAX_BACKLOG_SEC = 1
+
+  def __init__(self, rate: float):
+    self._interval = 1.0 / rate
+    self._lock = threading.Lock()
+    self._next = time.monotonic()
+
+  def wait(self, stop_at: float) -> bool:
+    """Waits for the next send time; returns False if it is after stop_at."""
+    with self._lock:
+      self._next = max(self._next, time.monotonic() - self.MAX_BACKLOG_SEC)
+      send_at = self._next
+      self._next += self._interval
+    if send_at >= stop_at:
+      return False
+    delay = send_at - time.monotonic()
+    if delay > 0:
+      time.sleep(delay)
+    return True
+
+
+def run(load: workload.RIDWorkload,
+        mix: Dict[str, float],
+        duration: float,
+        concurrency: int,
+        rate: Optional[float] = None,
+        seed: Optional[int] = None,
+        results: Optional[stats.LoadStats] = None
+        ) -> Tuple[stats.LoadStats, float]:
+  """Runs load for duration seconds; returns the stats and actual duration.
+
+  Requests are recorded in results if specified, so that they can be read
+  while the run is in progress.
+  """
+  results = stats.LoadStats() if results is None else results
+  operations = list(mix)
+  weights = [mix[op] for op in operations]
+  pacer = Pacer(rate) if rate else None
+  start = time.monotonic()
+  stop_at = start + duration
+
+  def worker(worker_seed):
+    rng = random.Random(worker_seed)
+    while True:
+      if pacer is not None:
+        if not pacer.wait(stop_at):
+          return
+      elif time.monotonic() >= stop_at:
+        return
+      operation = rng.choices(operations, weights)[0]
+      t0 = time.perf_counter()
+      try:
+        resp = load.run(operation)
+      except requests.RequestException as e:
+        results.record(operation, time.perf_counter() - t0, error=e)
+        continue
+      if resp is None:
+        results.record_skipped(operation)
+      else:
+        results.record(operation, time.perf_counter() - t0, resp.status_code)
+
+  seeds = random.Random(seed)
+  threads = [
+      threading.Thread(target=worker, args=(seeds.random(),), daemon=True)
+      for _ in range(concurrency)
+  ]
+  for t in threads:
+    t.start()
+  for t in threads:
+    t.join()
+  return results, time.monotonic() - start
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  cli.add_dss_arguments(parser)
+  parser.add_argument('--mix', default=workload.DEFAULT_MIX,
+                      help='Comma-separated operation=weight pairs; '
+                      'operations are ' + ', '.join(workload.OPERATIONS))
+  parser.add_argument('--rate', type=float,
+                      help='Target requests per second across all clients; '
+                      'if omitted, clients send requests back to back')
+  parser.add_argument('--concurrency', type=int, default=16,
+                      help='Number of concurrent clients')
+  parser.add_argument('--duration', type=float, default=60,
+                      help='Seconds to generate load for')
+  parser.add_argument('--region', type=cli.parse_region, default=DEFAULT_REGION,
+                      help='lat_min,lng_min,lat_max,lng_max of the region to '
+                      'spread footprints across')
+  parser.add_argument('--cell-size', type=float,
+                      default=geo.DEFAULT_CELL_SIZE_DEG,
+                      help='Size in degrees of each footprint')
+  parser.add_argument('--ttl', type=float, default=workload.DEFAULT_TTL_SEC,
+                      help='Lifetime in seconds of created entities')
+  parser.add_argument('--seed', type=int, help='Random seed')
+  parser.add_argument('--no-cleanup', action='store_true',
+                      help='Leave created entities in the DSS')
+  parser.add_argument('--json', help='Also write the report to this file')
+  return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  mix = workload.parse_mix(args.mix)
+  grid = geo.Grid.over_region(*args.region, cell_size_deg=args.cell_size,
+                              cell_pitch_deg=args.cell_size * 2)
+  session = cli.make_session(args, pool_maxsize=args.concurrency)
+  load = workload.RIDWorkload(session, grid, ttl=args.ttl,
+                              rng=random.Random(args.seed))
+
+  LOG.info('Generating load for %gs across %d cells', args.duration,
+           grid.cell_count)
+  results, elapsed = run(load, mix, args.duration, args.concurrency,
+                         rate=args.rate, seed=args.seed)
+  report = results.report(elapsed)
+  print(stats.format_report(report))
+  if args.json:
+    with open(args.json, 'w') as f:
+      json.dump({'elapsed': elapsed, 'operations': report}, f, indent=2)
+
+  if not args.no_cleanup:
+    LOG.info('Deleting %d ISAs and %d Subscriptions', len(load.isas),
+             len(load.subscriptions))
+    failures = load.cleanup()
+    if failures:
+      LOG.warning('Failed to delete %d entities', failures)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,402 @@
+"""Open-loop remote ID and strategic coordination load against a DSS.
+
+loadgen's clients each wait for a response before sending their next request,
+so when the DSS slows down they send fewer requests, and the requests that
+would have been sent during the slowdown are never measured (coordinated
+omission).  This tool instead computes every request's send time up front,
+from an arrival process (--arrivals constant or poisson) and a rate profile
+(--rate), and sends each request at its time whether or not earlier ones have
+completed.  Run from the monitoring folder:
+
+  python -m loadtest.openloop --rate 20@30,50@30,100@30 --arrivals poisson \\
+      --dss-endpoint http://localhost:8082 --api-version-role /v1/dss \\
+      --jwt-private-key-file ../build/test-certs/auth2.key
+
+--rate is either one rate for --duration seconds or comma-separated
+rate@seconds steps; with --ramp the rate changes linearly from each step to
+the next rather than all at once.  Operations are drawn from --mix, which may
+include the strategic coordination operations (sent under --scd-api-role).
+
+Each request is timed three ways:
+
+  service:  from when it was actually sent until its response, i.e. what the
+            DSS (and the network) took.
+  queueing: from its scheduled time until it was actually sent, i.e. delay
+            caused by this harness, when all --concurrency senders were busy.
+  response: from its scheduled time until its response, the latency a client
+            sending at that time would have seen, corrected for coordinated
+            omission.
+
+If queueing delays are significant, the harness (or --concurrency) rather than
+the DSS limited the load, and the report says so.
+"""
+
+import argparse
+import bisect
+import json
+import logging
+import math
+import random
+import sys
+import threading
+import time
+from concurrent import futures
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from loadtest import cli, loadgen, stats, workload
+from monitorlib import geo, histogram
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MIX = 'isa_put=2,isa_search=4,isa_delete=1,sub_search=2'
+DEFAULT_SCD_API_ROLE = '/dss/v1'
+
+CONSTANT = 'constant'
+POISSON = 'poisson'
+ARRIVALS = [CONSTANT, POISSON]
+
+# Queueing delays above this are reported as the harness limiting the load.
+QUEUEING_WARNING_SEC = 0.01
+
+# (requests per second, seconds) of each step of a rate profile.
+Profile = List[Tuple[float, float]]
+
+
+def parse_profile(value: str, duration: Optional[float] = None) -> Profile:
+  """Parses a rate, or comma-separated rate@seconds steps."""
+  steps = []
+  for item in value.split(','):
+    rate, at, seconds = item.partition('@')
+    if at:
+      steps.append((float(rate), float(seconds)))
+    elif duration is not None:
+      steps.append((float(rate), duration))
+    else:
+      raise ValueError('Step {} has no duration'.format(item))
+  if any(rate < 0 or seconds <= 0 for rate, seconds in steps):
+    raise ValueError('Rates must not be negative and durations positive')
+  return steps
+
+
+def rate_at(profile: Profile, t: float, ramp: bool = False) -> float:
+  """Returns the rate t seconds into the profile (0 past its end)."""
+  start = 0.0
+  for i, (rate, seconds) in enumerate(profile):
+    if t < start + seconds:
+      if ramp and i + 1 < len(profile):
+        next_rate = profile[i + 1][0]
+        return rate + (next_rate - rate) * (t - start) / seconds
+      return rate
+    start += seconds
+  return 0.0
+
+
+def _segments(profile: Profile, ramp: bool) -> List[Tuple[float, float, float]]:
+  """Returns the (start rate, end rate, seconds) of each step of profile."""
+  segments = []
+  for i, (rate, seconds) in enumerate(profile):
+    end_rate = profile[i + 1][0] if ramp and i + 1 < len(profile) else rate
+    segments.append((rate, end_rate, seconds))
+  return segments
+
+
+def _time_to_count(start_rate: float, end_rate: float, seconds: float,
+                   count: float) -> float:
+  """Returns when count requests are due into a linearly changing rate.
+
+  Solves start_rate * u + slope * u^2 / 2 = count for u, in a form which also
+  holds when the rate is constant or starts at 0.
+  """
+  slope = (end_rate - start_rate) / seconds
+  root = math.sqrt(max(0.0, start_rate ** 2 + 2 * slope * count))
+  return min(seconds, 2 * count / (start_rate + root))
+
+
+def arrival_times(profile: Profile,
+                  arrivals: str = CONSTANT,
+                  ramp: bool = False,
+                  rng: Optional[random.Random] = None) -> List[float]:
+  """Returns the send times, in seconds from the start, of a whole run.
+
+  With constant arrivals, the n-th request is sent when n requests are due
+  according to the rate so far (its integral over time), so that they are
+  evenly spaced at a constant rate.  With poisson arrivals, requests form a
+  Poisson process whose rate follows the profile, drawn by thinning: candidate
+  times are drawn at the highest rate of each step, and each is kept with
+  probability the rate at that time over that highest rate.  Steps whose rate
+  is 0 throughout have no requests; a ramp from 0 does.
+  """
+  if arrivals not in ARRIVALS:
+    raise ValueError('Unknown arrival process {}'.format(arrivals))
+  rng = rng or random.Random()
+  total = sum(seconds for _, seconds in profile)
+  times = []
+  start = 0.0
+  # Requests due before the current step, and the next request's number.
+  due = 0.0
+  n = 1
+  for start_rate, end_rate, seconds in _segments(profile, ramp):
+    step_due = (start_rate + end_rate) / 2 * seconds
+    if arrivals == CONSTANT:
+      while n <= due + step_due:
+        t = start + _time_to_count(start_rate, end_rate, seconds, n - due)
+        if t >= total:
+          return times
+        times.append(t)
+        n += 1
+    else:
+      highest = max(start_rate, end_rate)
+      t = start
+      while highest > 0:
+        t += rng.expovariate(highest)
+        if t >= start + seconds:
+          break
+        rate = start_rate + (end_rate - start_rate) * (t - start) / seconds
+        if rng.random() * highest < rate:
+          times.append(t)
+    due += step_due
+    start += seconds
+  return times
+
+
+class OpenLoopStats(object):
+  """Service, queueing and response times of each operation."""
+
+  def __init__(self):
+    self.service = stats.LoadStats()
+    self.response = stats.LoadStats()
+    self._lock = threading.Lock()
+    self.queueing: Dict[str, histogram.Histogram] = {}
+    # Requests still unsent when the schedule ended.
+    self.backlog = 0
+    # Stats of the requests scheduled in each slice of the run, if run was
+    # given boundaries.
+    self.slices: List[OpenLoopStats] = []
+
+  def record(self, operation: str, scheduled: float, sent: float,
+             completed: float, status_code: Optional[int] = None,
+             error: Optional[Exception] = None) -> None:
+    self.service.record(operation, completed - sent, status_code, error)
+    self.response.record(operation, completed - scheduled, status_code, error)
+    with self._lock:
+      if operation not in self.queueing:
+        self.queueing[operation] = histogram.Histogram()
+      self.queueing[operation].record(sent - scheduled)
+
+  def report(self, elapsed: float) -> Dict[str, Any]:
+    with self._lock:
+      queueing = {op: h.summary() for op, h in self.queueing.items()}
+    return {
+        'service': self.service.report(elapsed),
+        'queueing': queueing,
+        'response': self.response.report(elapsed),
+        'backlog': self.backlog,
+    }
+
+
+def run(operations: Dict[str, Callable[[], Optional[requests.Response]]],
+        mix: Dict[str, float],
+        schedule: List[float],
+        concurrency: int,
+        rng: Optional[random.Random] = None,
+        boundaries: Optional[List[float]] = None
+       ) -> Tuple[OpenLoopStats, float]:
+  """Sends one request per scheduled time; returns stats and actual duration.
+
+  Args:
+    operations: Performs each operation of mix, returning its response or None
+      if it was skipped.
+    mix: Relative weights of the operations.
+    schedule: Increasing send times, in seconds from the start of the run.
+    concurrency: Number of threads sending requests; a request whose time has
+      come while they are all busy waits for one, which counts as queueing.
+    boundaries: Increasing offsets, in seconds from the start of the run,
+      which split it into len(boundaries) + 1 slices.  The requests scheduled
+      in each slice are also recorded in the stats' slices, so that parts of
+      one continuous run can be told apart.
+  """
+  rng = rng or random.Random()
+  names = list(mix)
+  weights = [mix[op] for op in names]
+  boundaries = boundaries or []
+  # Drawn up front too, so that the draws don't delay the schedule.
+  chosen = rng.choices(names, weights, k=len(schedule))
+  results = OpenLoopStats()
+  results.slices = [OpenLoopStats() for _ in range(len(boundaries) + 1)]
+
+  def send(operation: str, offset: float, scheduled: float):
+    sent = time.monotonic()
+    targets = (results, results.slices[bisect.bisect_right(boundaries, offset)])
+    try:
+      resp = operations[operation]()
+    except requests.RequestException as e:
+      completed = time.monotonic()
+      for target in targets:
+        target.record(operation, scheduled, sent, completed, error=e)
+      return
+    completed = time.monotonic()
+    for target in targets:
+      if resp is None:
+        target.service.record_skipped(operation)
+        target.response.record_skipped(operation)
+      else:
+        target.record(operation, scheduled, sent, completed, resp.status_code)
+
+  executor = futures.ThreadPoolExecutor(max_workers=concurrency)
+  pending = []
+  start = time.monotonic()
+  for offset, operation in zip(schedule, chosen):
+    scheduled = start + offset
+    delay = scheduled - time.monotonic()
+    if delay > 0:
+      time.sleep(delay)
+    pending.append(executor.submit(send, operation, offset, scheduled))
+  results.backlog = sum(1 for f in pending if not f.running() and not f.done())
+  executor.shutdown(wait=True)
+  return results, time.monotonic() - start
+
+
+def _ms(value: Optional[float]) -> str:
+  return '-' if value is None else '{:.1f}'.format(value * 1000)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+  """Formats the result of OpenLoopStats.report as a table."""
+  rows = [['operation', 'count', 'ops/s', 'errors', 'service p50',
+           'service p99', 'queue p50', 'queue p99', 'response p50',
+           'response p99', 'response p99.9']]
+  for operation, response in report['response'].items():
+    service = report['service'][operation]
+    queueing = report['queueing'].get(operation, {})
+    rows.append([
+        operation,
+        str(response['count']),
+        '-' if response['throughput'] is None else '{:.1f}'.format(
+            response['throughput']),
+        '{} ({:.2%})'.format(response['errors'], response['error_rate'] or 0),
+        _ms(service['p50']), _ms(service['p99']),
+        _ms(queueing.get('p50')), _ms(queueing.get('p99')),
+        _ms(response['p50']), _ms(response['p99']),
+        _ms(response['p99.9']),
+    ])
+  widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+  return '\n'.join(
+      '  '.join(cell.rjust(width) if i else cell.ljust(width)
+                for i, (cell, width) in enumerate(zip(row, widths)))
+      for row in rows) + '\n(times in ms)'
+
+
+def make_operations(args: argparse.Namespace, grid: geo.Grid,
+                    rng: random.Random) -> Tuple[Dict[str, Callable], List]:
+  """Creates the workloads performing the operations of args.mix.
+
+  Returns the operations to pass to run and the workloads, to clean up.
+  """
+  operations = {}
+  loads = []
+  if any(op in workload.OPERATIONS for op in args.mix):
+    rid_load = workload.RIDWorkload(
+        cli.make_session(args, pool_maxsize=args.concurrency), grid,
+        ttl=args.ttl, rng=random.Random(rng.random()))
+    loads.append(rid_load)
+    for op in workload.OPERATIONS:
+      operations[op] = lambda op=op: rid_load.run(op)
+  if any(op in workload.SCD_OPERATIONS for op in args.mix):
+    scd_load = workload.SCDWorkload(
+        cli.make_session(args, pool_maxsize=args.concurrency,
+                         api_role=args.scd_api_role), grid,
+        ttl=args.ttl, rng=random.Random(rng.random()))
+    loads.append(scd_load)
+    for op in workload.SCD_OPERATIONS:
+      operations[op] = lambda op=op: scd_load.run(op)
+  return operations, loads
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  cli.add_dss_arguments(parser)
+  parser.add_argument('--scd-api-role', default=DEFAULT_SCD_API_ROLE,
+                      help='Path prefix of the strategic coordination API')
+  parser.add_argument('--mix', default=DEFAULT_MIX,
+                      help='Comma-separated operation=weight pairs; '
+                      'operations are ' + ', '.join(
+                          workload.OPERATIONS + workload.SCD_OPERATIONS))
+  parser.add_argument('--rate', required=True,
+                      help='Requests per second, or comma-separated '
+                      'rate@seconds steps, e.g. 10@30,20@30')
+  parser.add_argument('--ramp', action='store_true',
+                      help='Change the rate linearly between steps')
+  parser.add_argument('--arrivals', choices=ARRIVALS, default=CONSTANT,
+                      help='Spacing of requests at a given rate')
+  parser.add_argument('--duration', type=float, default=60,
+                      help='Seconds to generate load for, if --rate is a '
+                      'single rate')
+  parser.add_argument('--concurrency', type=int, default=64,
+                      help='Maximum number of requests in flight')
+  parser.add_argument('--region', type=cli.parse_region,
+                      default=loadgen.DEFAULT_REGION,
+                      help='lat_min,lng_min,lat_max,lng_max of the region to '
+                      'spread footprints across')
+  parser.add_argument('--cell-size', type=float,
+                      default=geo.DEFAULT_CELL_SIZE_DEG,
+                      help='Size in degrees of each footprint')
+  parser.add_argument('--ttl', type=float, default=workload.DEFAULT_TTL_SEC,
+                      help='Lifetime in seconds of created entities')
+  parser.add_argument('--seed', type=int, help='Random seed')
+  parser.add_argument('--no-cleanup', action='store_true',
+                      help='Leave created entities in the DSS')
+  parser.add_argument('--json', help='Also write the report to this file')
+  args = parser.parse_args(argv)
+  try:
+    args.rate = parse_profile(args.rate, args.duration)
+    args.mix = workload.parse_mix(
+        args.mix, workload.OPERATIONS + workload.SCD_OPERATIONS)
+  except ValueError as e:
+    parser.error(str(e))
+  return args
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  rng = random.Random(args.seed)
+  grid = geo.Grid.over_region(*args.region, cell_size_deg=args.cell_size,
+                              cell_pitch_deg=args.cell_size * 2)
+
+  operations, loads = make_operations(args, grid, rng)
+  schedule = arrival_times(args.rate, args.arrivals, args.ramp, rng)
+  LOG.info('Sending %d requests over %gs', len(schedule),
+           sum(seconds for _, seconds in args.rate))
+  results, elapsed = run(operations, args.mix, schedule, args.concurrency, rng)
+  report = results.report(elapsed)
+  print(format_report(report))
+  if results.backlog:
+    LOG.warning('%d requests were still waiting to be sent when the schedule '
+                'ended', results.backlog)
+  worst = max((q['p99'] or 0 for q in report['queueing'].values()), default=0)
+  if worst > QUEUEING_WARNING_SEC:
+    LOG.warning('p99 queueing delay of %.1fms: the harness, not the DSS, '
+                'limited the load; consider a larger --concurrency',
+                worst * 1000)
+  if args.json:
+    with open(args.json, 'w') as f:
+      json.dump({
+          'elapsed': elapsed,
+          'profile': args.rate,
+          'arrivals': args.arrivals,
+          'ramp': args.ramp,
+          'scheduled': len(schedule),
+          'report': report,
+      }, f, indent=2)
+
+  if not args.no_cleanup:
+    failures = sum(load.cleanup() for load in loads)
+    if failures:
+      LOG.warning('Failed to delete %d entities', failures)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,399 @@
+"""Replays recorded DSS traffic against a DSS, optionally sped up.
+
+The input is either a recording written with --record-requests by the load
+testing tools or the interoperability test (see monitorlib.recording), or,
+with --gateway-trace, the log of an http-gateway started with -trace-requests.
+Requests are sent at the times they were recorded divided by --speed (or as
+fast as possible with --speed max) by up to --concurrency threads.  Run from
+the monitoring folder:
+
+  python -m loadtest.replay recording.jsonl.gz --speed 10 \\
+      --dss-endpoint http://localhost:8082 \\
+      --oauth-token-endpoint http://localhost:8085/token --use-dummy-oauth
+
+Paths are replayed as recorded, so --dss-endpoint must not include the API
+prefix.  So that the replay is accepted by a DSS that has never seen the
+recorded entities, every entity ID is replaced by a new one, versions and OVNs
+are replaced by the ones the replayed requests received, and the time windows
+of bodies and searches are shifted by how long ago they were recorded.
+Requests concerning the same entity are sent in the order they were recorded,
+even when earlier ones are slow.
+
+Gateway traces contain neither bodies nor query strings: RID ISAs and
+Subscriptions are created with generated bodies, each entity in a footprint of
+its own within --region, and RID searches search one of these footprints.  SCD
+writes without bodies cannot be replayed and are counted as skipped.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import copy
+import datetime
+import json
+import logging
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from loadtest import cli, stats, workload
+from monitorlib import geo, histogram, infrastructure, instrumentation
+from monitorlib import recording, rid
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_REGION = '-25.7,128.6,-24.7,130.6'
+
+RID_PREFIX = '/v1/dss'
+
+# Fields of request bodies and query parameters holding times to shift.
+TIME_FIELDS = {'time_start', 'time_end', 'earliest_time', 'latest_time'}
+
+_BODY_FACTORIES = {
+    rid.ISA_PATH: rid.isa_body,
+    rid.SUBSCRIPTION_PATH: rid.subscription_body,
+}
+
+
+class Rewriter(object):
+  """Rewrites recorded requests so that they are valid when replayed.
+
+  Args:
+    grid: Footprints to use for generated bodies and searches.
+    ttl: Lifetime in seconds of entities created with generated bodies.
+  """
+
+  def __init__(self, grid: geo.Grid, ttl: float = workload.DEFAULT_TTL_SEC):
+    self.grid = grid
+    self.ttl = ttl
+    self._lock = threading.Lock()
+    # Recorded ID -> replayed ID.
+    self._ids: Dict[str, str] = {}
+    # Recorded version or OVN -> replayed one.
+    self._versions: Dict[str, str] = {}
+    # Replayed ID -> latest version it received.
+    self._latest: Dict[str, str] = {}
+    # Replayed ID -> footprint index, for generated bodies.
+    self._footprints: Dict[str, int] = {}
+    self._searches = 0
+
+  def entity_id(self, recorded_id: str) -> str:
+    with self._lock:
+      if recorded_id not in self._ids:
+        self._ids[recorded_id] = str(uuid.uuid4())
+        self._footprints[self._ids[recorded_id]] = len(self._footprints)
+      return self._ids[recorded_id]
+
+  def _version(self, recorded_version: str, entity_id: Optional[str]) -> str:
+    with self._lock:
+      if recorded_version in self._versions:
+        return self._versions[recorded_version]
+      # Versions are unknown if their response was not recorded, as in gateway
+      # traces; the latest version of the entity is the best guess.
+      return self._latest.get(entity_id, recorded_version)
+
+  def path(self, record: recording.Record) -> Tuple[str, Optional[str]]:
+    """Returns the replayed path of record and the replayed entity ID in it."""
+    segments = record['path'].split('/')
+    template = record['endpoint'].split('/')
+    entity_id = None
+    for i, (segment, kind) in enumerate(zip(segments, template)):
+      if kind == '{id}':
+        entity_id = segments[i] = self.entity_id(segment)
+      elif kind == '{version}':
+        segments[i] = self._version(segment, entity_id)
+    return '/'.join(segments), entity_id
+
+  def query(self, record: recording.Record, shift: float) -> str:
+    if record['query'] is None:
+      collection = self._rid_collection(record)
+      if (record['method'] == 'GET' and collection and
+          record['endpoint'].endswith(collection)):
+        # A search from a gateway trace; search one of our footprints.
+        with self._lock:
+          index = self._searches % max(len(self._footprints), 1)
+          self._searches += 1
+        return 'area=' + geo.polygon_string(self.grid.vertices(index))
+      return ''
+    params = urllib.parse.parse_qsl(record['query'], keep_blank_values=True)
+    return urllib.parse.urlencode([
+        (k, _shift_time(v, shift) if k in TIME_FIELDS else v)
+        for k, v in params
+    ], safe=',:')
+
+  def body(self, record: recording.Record, entity_id: Optional[str],
+           shift: float) -> Tuple[bool, Any]:
+    """Returns whether record can be replayed and the body to send."""
+    if record['body'] is not None:
+      return True, self._rewrite(copy.deepcopy(record['body']), shift)
+    if record['method'] not in ('PUT', 'POST'):
+      return True, None
+    collection = self._rid_collection(record)
+    if collection is None or entity_id is None:
+      return False, None
+    now = datetime.datetime.utcnow()
+    with self._lock:
+      index = self._footprints[entity_id]
+    return True, _BODY_FACTORIES[collection](
+        self.grid.vertices(index), now,
+        now + datetime.timedelta(seconds=self.ttl))
+
+  def _rid_collection(self, record: recording.Record) -> Optional[str]:
+    for collection in _BODY_FACTORIES:
+      if record['endpoint'].startswith(RID_PREFIX + collection):
+        return collection
+    return None
+
+  def _rewrite(self, value: Any, shift: float, key: str = '') -> Any:
+    if isinstance(value, dict):
+      if key in TIME_FIELDS and isinstance(value.get('value'), str):
+        # SCD times, e.g. {"value": "...", "format": "RFC3339"}.
+        value['value'] = _shift_time(value['value'], shift)
+        return value
+      return {k: self._rewrite(v, shift, k) for k, v in value.items()}
+    if isinstance(value, list):
+      return [self._rewrite(v, shift, key) for v in value]
+    if isinstance(value, str):
+      if key in TIME_FIELDS:
+        return _shift_time(value, shift)
+      with self._lock:
+        if value in self._ids:
+          return self._ids[value]
+        if value in self._versions:
+          return self._versions[value]
+      if instrumentation.is_uuid(value):
+        return self.entity_id(value)
+    return value
+
+  def learn(self, record: recording.Record, entity_id: Optional[str],
+            resp: requests.Response) -> None:
+    """Remembers the versions a replayed request received."""
+    if entity_id is None or resp.status_code != 200:
+      return
+    if record['method'] == 'DELETE':
+      with self._lock:
+        self._latest.pop(entity_id, None)
+      return
+    try:
+      versions = recording.entity_versions(resp.json())
+    except ValueError:
+      return
+    if not versions:
+      return
+    with self._lock:
+      self._latest[entity_id] = versions[0]
+      for recorded, replayed in zip(record.get('versions') or [], versions):
+        self._versions[recorded] = replayed
+
+  def leftovers(self) -> List[Tuple[str, str]]:
+    """Returns the (ID, version) of entities the replay created and kept."""
+    with self._lock:
+      return list(self._latest.items())
+
+
+def _shift_time(value: str, shift: float) -> str:
+  try:
+    return recording.format_timestamp(recording.parse_timestamp(value) + shift)
+  except ValueError:
+    return value
+
+
+class Replayer(object):
+  """Sends the requests of a recording to a DSS.
+
+  Args:
+    session: Session for the DSS, with URLs relative to its root.
+    rewriter: Rewriter of the recorded requests.
+    speed: Factor to compress the recording's timeline by, or None to send
+      requests as fast as possible.
+    concurrency: Maximum number of requests in flight.
+  """
+
+  def __init__(self, session: requests.Session, rewriter: Rewriter,
+               speed: Optional[float] = 1, concurrency: int = 8):
+    self.session = session
+    self.rewriter = rewriter
+    self.speed = speed
+    self.concurrency = concurrency
+    self.stats = stats.LoadStats()
+    # Seconds requests were sent later than scheduled.
+    self.lateness = histogram.Histogram()
+    # Operation -> number of responses whose status differed from the
+    # recorded one.
+    self.mismatches: Dict[str, int] = collections.Counter()
+    self._lock = threading.Lock()
+    # Replayed entity -> (path, version) of the last write, for cleanup.
+    self._paths: Dict[str, str] = {}
+
+  def run(self, rec: recording.Recording) -> float:
+    """Replays rec and returns the number of seconds it took."""
+    slots = threading.Semaphore(self.concurrency * 2)
+    # Recorded entity ID -> future of the latest request concerning it.
+    previous: Dict[str, concurrent.futures.Future] = {}
+    with concurrent.futures.ThreadPoolExecutor(self.concurrency) as executor:
+      t0 = time.monotonic()
+      for record in rec.records:
+        if self.speed is not None:
+          delay = t0 + record['t'] / self.speed - time.monotonic()
+          if delay > 0:
+            time.sleep(delay)
+        slots.acquire()
+        scheduled = t0 + record['t'] / self.speed if self.speed else None
+        key = _recorded_entity(record)
+        future = executor.submit(self._send, record, rec.started, scheduled,
+                                 previous.get(key))
+        future.add_done_callback(lambda _: slots.release())
+        if key is not None:
+          previous[key] = future
+    return time.monotonic() - t0
+
+  def _send(self, record: recording.Record, started: Optional[float],
+            scheduled: Optional[float],
+            after: Optional[concurrent.futures.Future]) -> None:
+    if after is not None:
+      # Executor tasks run in the order they were submitted, so the task we
+      # wait for has already started and this cannot deadlock.
+      after.result()
+    operation = '{} {}'.format(record['method'], record['endpoint'])
+    if scheduled is not None:
+      self.lateness.record(max(time.monotonic() - scheduled, 0))
+    shift = 0 if started is None else time.time() - (started + record['t'])
+    path, entity_id = self.rewriter.path(record)
+    ok, body = self.rewriter.body(record, entity_id, shift)
+    if not ok:
+      self.stats.record_skipped(operation)
+      return
+    query = self.rewriter.query(record, shift)
+    url = path + ('?' + query if query else '')
+    t0 = time.monotonic()
+    try:
+      resp = self.session.request(record['method'], url, json=body)
+    except requests.RequestException as e:
+      self.stats.record(operation, time.monotonic() - t0, error=e)
+      return
+    self.stats.record(operation, time.monotonic() - t0, resp.status_code)
+    if resp.status_code != record['status']:
+      with self._lock:
+        self.mismatches[operation] += 1
+    self.rewriter.learn(record, entity_id, resp)
+    if entity_id is not None and record['method'] == 'PUT':
+      with self._lock:
+        self._paths[entity_id] = path.rsplit('/' + entity_id, 1)[0]
+
+  def cleanup(self) -> int:
+    """Deletes entities the replay left behind; returns the failures."""
+    failures = 0
+    for entity_id, version in self.rewriter.leftovers():
+      collection = self._paths.get(entity_id)
+      if collection is None:
+        continue
+      path = '{}/{}'.format(collection, entity_id)
+      if collection.startswith(RID_PREFIX):
+        path += '/' + version
+      try:
+        resp = self.session.delete(path)
+        if resp.status_code not in (200, 404):
+          failures += 1
+      except requests.RequestException:
+        failures += 1
+    return failures
+
+
+def _recorded_entity(record: recording.Record) -> Optional[str]:
+  for segment, kind in zip(record['path'].split('/'),
+                           record['endpoint'].split('/')):
+    if kind == '{id}':
+      return segment
+  return None
+
+
+def parse_speed(value: str) -> Optional[float]:
+  if value == 'max':
+    return None
+  speed = float(value)
+  if speed <= 0:
+    raise argparse.ArgumentTypeError('Speed must be positive or "max"')
+  return speed
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  cli.add_dss_arguments(parser)
+  parser.add_argument('input', help='Recording or, with --gateway-trace, '
+                      'http-gateway log to replay')
+  parser.add_argument('--gateway-trace', action='store_true',
+                      help='input is the log of an http-gateway started with '
+                      '-trace-requests')
+  parser.add_argument('--convert',
+                      help='Instead of replaying input, write it to this file '
+                      'as a recording')
+  parser.add_argument('--speed', type=parse_speed, default=1,
+                      help='How many times faster than recorded to replay, or '
+                      '"max" to send requests as fast as possible')
+  parser.add_argument('--concurrency', type=int, default=8,
+                      help='Maximum number of requests in flight')
+  parser.add_argument('--region', type=cli.parse_region, default=DEFAULT_REGION,
+                      help='lat_min,lng_min,lat_max,lng_max of the region '
+                      'for footprints of generated bodies')
+  parser.add_argument('--ttl', type=float, default=workload.DEFAULT_TTL_SEC,
+                      help='Lifetime in seconds of entities created with '
+                      'generated bodies')
+  parser.add_argument('--json', help='Also write the report to this file')
+  return parser.parse_args(argv)
+
+
+def load(args: argparse.Namespace) -> recording.Recording:
+  if args.gateway_trace:
+    with open(args.input, 'r', encoding='utf-8') as f:
+      return recording.read_gateway_trace(f)
+  return recording.Recording.load(args.input)
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  rec = load(args)
+  if args.convert:
+    rec.save(args.convert)
+    return 0
+
+  grid = geo.Grid.over_region(*args.region)
+  session = infrastructure.make_session(
+      args.dss_endpoint, cli.make_auth_adapter(args, args.concurrency),
+      grpc_target=args.dss_grpc_endpoint, grpc_channels=args.grpc_channels)
+  cli.attach_recorder(args, session)
+  replayer = Replayer(session, Rewriter(grid, args.ttl), speed=args.speed,
+                      concurrency=args.concurrency)
+  try:
+    elapsed = replayer.run(rec)
+  finally:
+    failures = replayer.cleanup()
+    if failures:
+      LOG.warning('Failed to delete %d entities', failures)
+
+  report = replayer.stats.report(elapsed)
+  print(stats.format_report(report))
+  print('Status differed from the recording for {} requests'.format(
+      sum(replayer.mismatches.values())))
+  if replayer.lateness.count:
+    print('Sent behind schedule by p50 {:.1f} ms, p99 {:.1f} ms'.format(
+        replayer.lateness.percentile(50) * 1000,
+        replayer.lateness.percentile(99) * 1000))
+  if args.json:
+    with open(args.json, 'w') as f:
+      json.dump({
+          'elapsed': elapsed,
+          'operations': report,
+          'mismatches': dict(replayer.mismatches),
+          'lateness': replayer.lateness.to_dict(),
+      }, f, indent=2)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,145 @@
+"""Per-operation throughput, error and latency statistics of a load run."""
+
+import collections
+import threading
+from typing import Any, Dict, Optional
+
+from monitorlib.histogram import Histogram
+
+
+class OperationStats(object):
+  """Counters and latency histogram for one kind of operation."""
+
+  def __init__(self):
+    self.latency = Histogram()
+    self.errors = 0
+    self.skipped = 0
+    self.statuses: Dict[str, int] = collections.Counter()
+
+  @property
+  def count(self) -> int:
+    return self.latency.count
+
+  def merge(self, other: 'OperationStats') -> None:
+    self.latency.merge(other.latency)
+    self.errors += other.errors
+    self.skipped += other.skipped
+    self.statuses.update(other.statuses)
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {
+        'latency': self.latency.to_dict(),
+        'errors': self.errors,
+        'skipped': self.skipped,
+        'statuses': dict(self.statuses),
+    }
+
+  @classmethod
+  def from_dict(cls, d: Dict[str, Any]) -> 'OperationStats':
+    stats = cls()
+    stats.latency = Histogram.from_dict(d['latency'])
+    stats.errors = d['errors']
+    stats.skipped = d['skipped']
+    stats.statuses.update(d['statuses'])
+    return stats
+
+
+class LoadStats(object):
+  """Thread-safe collection of OperationStats keyed by operation name."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self.operations: Dict[str, OperationStats] = {}
+
+  def _get(self, operation: str) -> OperationStats:
+    if operation not in self.operations:
+      self.operations[operation] = OperationStats()
+    return self.operations[operation]
+
+  def record(self, operation: str, latency: float,
+             status_code: Optional[int] = None,
+             error: Optional[Exception] = None) -> None:
+    """Records one completed request.
+
+    A request is an error if it raised or its status code was not 2xx.
+    """
+    with self._lock:
+      stats = self._get(operation)
+      stats.latency.record(latency)
+      if error is not None:
+        stats.statuses[type(error).__name__] += 1
+        stats.errors += 1
+      else:
+        stats.statuses[str(status_code)] += 1
+        if not 200 <= status_code < 300:
+          stats.errors += 1
+
+  def record_skipped(self, operation: str) -> None:
+    with self._lock:
+      self._get(operation).skipped += 1
+
+  def take(self) -> 'LoadStats':
+    """Returns what has been recorded so far and starts over empty."""
+    taken = LoadStats()
+    with self._lock:
+      taken.operations, self.operations = self.operations, {}
+    return taken
+
+  def merge(self, other: 'LoadStats') -> None:
+    with self._lock:
+      for operation, stats in other.operations.items():
+        self._get(operation).merge(stats)
+
+  def to_dict(self) -> Dict[str, Any]:
+    with self._lock:
+      return {op: stats.to_dict() for op, stats in self.operations.items()}
+
+  @classmethod
+  def from_dict(cls, d: Dict[str, Any]) -> 'LoadStats':
+    stats = cls()
+    stats.operations = {
+        op: OperationStats.from_dict(v) for op, v in d.items()
+    }
+    return stats
+
+  def report(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+    """Summarizes each operation over a run lasting elapsed seconds."""
+    result = {}
+    with self._lock:
+      for operation in sorted(self.operations):
+        stats = self.operations[operation]
+        summary = stats.latency.summary()
+        summary.update({
+            'throughput': stats.count / elapsed if elapsed else None,
+            'errors': stats.errors,
+            'error_rate': stats.errors / stats.count if stats.count else None,
+            'skipped': stats.skipped,
+            'statuses': dict(stats.statuses),
+        })
+        result[operation] = summary
+    return result
+
+
+def _ms(value: Optional[float]) -> str:
+  return '-' if value is None else '{:.1f}'.format(value * 1000)
+
+
+def format_report(report: Dict[str, Dict[str, Any]]) -> str:
+  """Formats the result of LoadStats.report as a table."""
+  columns = ['operation', 'count', 'ops/s', 'errors', 'p50 ms', 'p90 ms',
+             'p99 ms', 'p99.9 ms', 'max ms']
+  rows = [columns]
+  for operation, s in report.items():
+    rows.append([
+        operation,
+        str(s['count']),
+        '-' if s['throughput'] is None else '{:.1f}'.format(s['throughput']),
+        '{} ({:.2%})'.format(s['errors'], s['error_rate'] or 0),
+        _ms(s['p50']), _ms(s['p90']), _ms(s['p99']), _ms(s['p99.9']),
+        _ms(s['max']),
+    ])
+  widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+  return '\n'.join(
+      '  '.join(cell.rjust(width) if i else cell.ljust(width)
+                for i, (cell, width) in enumerate(zip(row, widths)))
+      for row in rows)
@@ -0,0 +1,74 @@
+"""Deletes ISAs and Subscriptions left behind in a region of a DSS.
+
+Load tests, the prober and the interoperability test all delete what they
+create, but a run that is interrupted can leave entities behind until they
+expire.  This tool searches every tile of a region in parallel and deletes
+every ISA and Subscription found there whose owner is the subject of this
+tool's access token (or --owner).  Run from the monitoring folder:
+
+  python -m loadtest.sweep \\
+      --dss-endpoint http://localhost:8082 --api-version-role /v1/dss \\
+      --oauth-token-endpoint http://localhost:8085/token --use-dummy-oauth \\
+      --region=-24.6,129.7,-22.7,130.5
+
+The default region covers the footprints of the load testing tools.  Tiles are
+small enough that every search stays well within the DSS's area limit.
+"""
+
+import argparse
+import logging
+import sys
+
+from loadtest import cli
+from monitorlib import geo, sweeper
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_REGION = '-26.0,128.6,-22.7,131.6'
+DEFAULT_TILE_SIZE_DEG = 0.1
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  cli.add_dss_arguments(parser)
+  parser.add_argument('--region', type=cli.parse_region, default=DEFAULT_REGION,
+                      help='lat_min,lng_min,lat_max,lng_max of the region to '
+                      'sweep')
+  parser.add_argument('--tile-size', type=float, default=DEFAULT_TILE_SIZE_DEG,
+                      help='Size in degrees of the area of each search')
+  parser.add_argument('--owner',
+                      help='Owner of the entities to delete; defaults to the '
+                      'subject of the access token')
+  parser.add_argument('--kinds', default=','.join(sweeper.KINDS),
+                      help='Comma-separated kinds of entities to delete: ' +
+                      ', '.join(sweeper.KINDS))
+  parser.add_argument('--concurrency', type=int,
+                      default=sweeper.DEFAULT_CONCURRENCY,
+                      help='Number of concurrent requests')
+  parser.add_argument('--rate', type=float,
+                      help='Maximum deletes per second; unlimited if omitted')
+  parser.add_argument('--dry-run', action='store_true',
+                      help='Only count the entities that would be deleted')
+  args = parser.parse_args(argv)
+  args.kinds = [kind for kind in args.kinds.split(',') if kind]
+  for kind in args.kinds:
+    if kind not in sweeper.KINDS:
+      parser.error('Unknown kind {}'.format(kind))
+  return args
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args = parse_args(argv)
+  tiles = geo.tile_region(*args.region, tile_size_deg=args.tile_size)
+  session = cli.make_session(args, args.concurrency)
+  sweep = sweeper.Sweeper(session, owner=args.owner, kinds=args.kinds,
+                          concurrency=args.concurrency, rate=args.rate)
+  LOG.info('Searching %d tiles', len(tiles))
+  result = sweep.sweep(tiles, dry_run=args.dry_run)
+  print(result.summary())
+  return 1 if result.failures else 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
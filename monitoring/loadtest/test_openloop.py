@@ -0,0 +1,50 @@
+"""Tests of the open-loop arrival schedules.
+
+Run from the monitoring folder with `python -m pytest loadtest`.
+"""
+
+import random
+
+import pytest
+
+from loadtest import openloop
+
+
+def test_constant_rate_is_evenly_spaced():
+  times = openloop.arrival_times([(5, 2)])
+  assert times == pytest.approx([0.2, 0.4, 0.6, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8])
+
+
+def test_ramp_from_zero_has_arrivals():
+  profile = openloop.parse_profile('0@10,100@10')
+  times = openloop.arrival_times(profile, ramp=True)
+
+  ramp = [t for t in times if t <= 10]
+  # The rate rises linearly from 0 to 100 over 10s, so 500 requests are due,
+  # the n-th at sqrt(n / 5) seconds.
+  assert len(ramp) == 500
+  assert ramp[0] == pytest.approx(0.2 ** 0.5)
+  assert ramp[99] == pytest.approx(20 ** 0.5)
+  # Then 100/s for 10s, the last of which would be sent at the very end.
+  assert len(times) - len(ramp) == pytest.approx(1000, abs=1)
+  assert times == sorted(times)
+
+
+def test_ramp_from_zero_poisson_has_arrivals():
+  profile = openloop.parse_profile('0@10,100@10')
+  times = openloop.arrival_times(profile, openloop.POISSON, ramp=True,
+                                 rng=random.Random(1))
+
+  ramp = [t for t in times if t < 10]
+  assert 400 < len(ramp) < 600
+  # Fewer requests in the first half of the ramp than in the second.
+  assert sum(1 for t in ramp if t < 5) < sum(1 for t in ramp if t >= 5) / 2
+
+
+@pytest.mark.parametrize('arrivals', openloop.ARRIVALS)
+def test_no_arrivals_in_zero_rate_step(arrivals):
+  profile = openloop.parse_profile('10@2,0@3,10@1')
+  times = openloop.arrival_times(profile, arrivals, rng=random.Random(1))
+
+  assert times
+  assert not [t for t in times if 2 < t < 5]
@@ -0,0 +1,324 @@
+"""Configurable mixes of remote ID and strategic coordination requests.
+
+Each operation is one request.  Entities created by the workload are tracked
+(with their current versions) so that deletes can target them and so that
+whatever is left can be cleaned up at the end of a run.
+"""
+
+import datetime
+import random
+import threading
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from monitorlib import geo, rid, scd
+
+ISA_PUT = 'isa_put'
+ISA_SEARCH = 'isa_search'
+ISA_DELETE = 'isa_delete'
+SUB_PUT = 'sub_put'
+SUB_SEARCH = 'sub_search'
+SUB_DELETE = 'sub_delete'
+OPERATIONS = [ISA_PUT, ISA_SEARCH, ISA_DELETE, SUB_PUT, SUB_SEARCH, SUB_DELETE]
+
+OP_PUT = 'op_put'
+OP_SEARCH = 'op_search'
+OP_DELETE = 'op_delete'
+SCD_OPERATIONS = [OP_PUT, OP_SEARCH, OP_DELETE]
+
+DEFAULT_MIX = 'isa_put=2,isa_search=4,isa_delete=1,sub_put=1,sub_search=2,sub_delete=1'
+
+# Lifetime of the entities created by the workload.
+DEFAULT_TTL_SEC = 600
+
+
+def parse_mix(value: str,
+              operations: List[str] = OPERATIONS) -> Dict[str, float]:
+  """Parses a comma-separated list of operation=weight pairs."""
+  mix = {}
+  for item in value.split(','):
+    name, _, weight = item.partition('=')
+    name = name.strip()
+    if name not in operations:
+      raise ValueError('Unknown operation {}; expected one of {}'.format(
+          name, ', '.join(operations)))
+    mix[name] = float(weight) if weight else 1.0
+  if not any(w > 0 for w in mix.values()):
+    raise ValueError('At least one operation must have a positive weight')
+  return mix
+
+
+class _EntityPool(object):
+  """Thread-safe set of (id, version) pairs of entities we created."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._entities: Dict[str, str] = {}
+
+  def add(self, entity_id: str, version: str) -> None:
+    with self._lock:
+      self._entities[entity_id] = version
+
+  def pop_random(self, rng: random.Random) -> Optional[Tuple[str, str]]:
+    with self._lock:
+      if not self._entities:
+        return None
+      entity_id = rng.choice(list(self._entities))
+      return entity_id, self._entities.pop(entity_id)
+
+  def pop_all(self) -> List[Tuple[str, str]]:
+    with self._lock:
+      entities = list(self._entities.items())
+      self._entities.clear()
+      return entities
+
+  def __len__(self):
+    return len(self._entities)
+
+
+class RIDWorkload(object):
+  """Issues remote ID requests with footprints spread across a grid.
+
+  Args:
+    session: Session for the DSS, with URLs relative to the RID API root.
+    grid: Footprints of created entities and search areas are cells of this
+      grid, chosen uniformly at random.
+    ttl: Lifetime, in seconds, of created entities.
+  """
+
+  def __init__(self,
+               session: requests.Session,
+               grid: geo.Grid,
+               ttl: float = DEFAULT_TTL_SEC,
+               rng: Optional[random.Random] = None):
+    if grid.cell_count is None:
+      raise ValueError('The workload grid must be bounded')
+    self.session = session
+    self.grid = grid
+    self.ttl = ttl
+    self._rng = rng or random.Random()
+    self._rng_lock = threading.Lock()
+    self.isas = _EntityPool()
+    self.subscriptions = _EntityPool()
+
+  def _random_cell(self) -> List[Dict[str, float]]:
+    with self._rng_lock:
+      index = self._rng.randrange(self.grid.cell_count)
+    return self.grid.vertices(index)
+
+  def _time_range(self) -> Tuple[datetime.datetime, datetime.datetime]:
+    time_start = datetime.datetime.utcnow()
+    return time_start, time_start + datetime.timedelta(seconds=self.ttl)
+
+  def run(self, operation: str) -> Optional[requests.Response]:
+    """Performs one operation.
+
+    Returns the DSS's response, or None if the operation could not be
+    performed (a delete when no entities of that type exist).
+    """
+    if operation == ISA_PUT:
+      return self.put_isa()
+    elif operation == ISA_SEARCH:
+      return self.search_isas()
+    elif operation == ISA_DELETE:
+      return self.delete_isa()
+    elif operation == SUB_PUT:
+      return self.put_subscription()
+    elif operation == SUB_SEARCH:
+      return self.search_subscriptions()
+    elif operation == SUB_DELETE:
+      return self.delete_subscription()
+    raise ValueError('Unknown operation {}'.format(operation))
+
+  def put_isa(self) -> requests.Response:
+    isa_id = str(uuid.uuid4())
+    time_start, time_end = self._time_range()
+    resp = self.session.put(
+        '{}/{}'.format(rid.ISA_PATH, isa_id),
+        json=rid.isa_body(self._random_cell(), time_start, time_end))
+    if resp.status_code == 200:
+      self.isas.add(isa_id, resp.json()['service_area']['version'])
+    return resp
+
+  def search_isas(self) -> requests.Response:
+    return self.session.get('{}?area={}'.format(
+        rid.ISA_PATH, geo.polygon_string(self._random_cell())))
+
+  def _delete(self, pool: _EntityPool,
+              path: str) -> Optional[requests.Response]:
+    """Deletes a random entity of pool, or returns None if there is none.
+
+    The entity stays in the pool if the DSS may not have deleted it, so that
+    cleanup still tries to.
+    """
+    with self._rng_lock:
+      entity = pool.pop_random(self._rng)
+    if entity is None:
+      return None
+    try:
+      resp = self.session.delete('{}/{}/{}'.format(path, *entity))
+    except requests.RequestException:
+      pool.add(*entity)
+      raise
+    # A 404 means the entity is already gone, e.g. because it expired.
+    if resp.status_code not in (200, 404):
+      pool.add(*entity)
+    return resp
+
+  def delete_isa(self) -> Optional[requests.Response]:
+    return self._delete(self.isas, rid.ISA_PATH)
+
+  def put_subscription(self) -> requests.Response:
+    sub_id = str(uuid.uuid4())
+    time_start, time_end = self._time_range()
+    resp = self.session.put(
+        '{}/{}'.format(rid.SUBSCRIPTION_PATH, sub_id),
+        json=rid.subscription_body(self._random_cell(), time_start, time_end))
+    if resp.status_code == 200:
+      self.subscriptions.add(sub_id, resp.json()['subscription']['version'])
+    return resp
+
+  def search_subscriptions(self) -> requests.Response:
+    return self.session.get('{}?area={}'.format(
+        rid.SUBSCRIPTION_PATH, geo.polygon_string(self._random_cell())))
+
+  def delete_subscription(self) -> Optional[requests.Response]:
+    return self._delete(self.subscriptions, rid.SUBSCRIPTION_PATH)
+
+  def cleanup(self) -> int:
+    """Deletes every entity the workload created and has not yet deleted.
+
+    Returns the number of entities that could not be deleted.
+    """
+    failures = 0
+    for path, pool in ((rid.ISA_PATH, self.isas),
+                       (rid.SUBSCRIPTION_PATH, self.subscriptions)):
+      for entity_id, version in pool.pop_all():
+        resp = self.session.delete('{}/{}/{}'.format(path, entity_id, version))
+        if resp.status_code != 200:
+          failures += 1
+    return failures
+
+
+class SCDWorkload(object):
+  """Issues strategic coordination requests with volumes across a grid.
+
+  Operations are created in cells of the grid chosen uniformly at random, with
+  a key listing the OVNs of the Operations this workload already has in the
+  same cell, so that puts only conflict when they race with each other.
+
+  Args:
+    session: Session for the DSS, with URLs relative to the SCD API root.
+    grid: Outlines of created Operations and search areas are cells of this
+      grid.
+    ttl: Lifetime, in seconds, of created Operations.
+  """
+
+  def __init__(self,
+               session: requests.Session,
+               grid: geo.Grid,
+               ttl: float = DEFAULT_TTL_SEC,
+               rng: Optional[random.Random] = None):
+    if grid.cell_count is None:
+      raise ValueError('The workload grid must be bounded')
+    self.session = session
+    self.grid = grid
+    self.ttl = ttl
+    self._rng = rng or random.Random()
+    self._lock = threading.Lock()
+    # OVNs of the Operations we created, by cell and then ID.
+    self._cells: Dict[int, Dict[str, str]] = {}
+    self._operation_cells: Dict[str, int] = {}
+
+  def _random_cell(self) -> int:
+    with self._lock:
+      return self._rng.randrange(self.grid.cell_count)
+
+  def _extents(self, cell: int) -> List[Dict]:
+    time_start = datetime.datetime.utcnow()
+    return [scd.volume4d(
+        time_start, time_start + datetime.timedelta(seconds=self.ttl), 20, 400,
+        outline_polygon=scd.polygon(self.grid.vertices(cell)))]
+
+  def run(self, operation: str) -> Optional[requests.Response]:
+    """Performs one operation, as RIDWorkload.run."""
+    if operation == OP_PUT:
+      return self.put_operation()
+    elif operation == OP_SEARCH:
+      return self.search_operations()
+    elif operation == OP_DELETE:
+      return self.delete_operation()
+    raise ValueError('Unknown operation {}'.format(operation))
+
+  def put_operation(self) -> requests.Response:
+    op_id = str(uuid.uuid4())
+    cell = self._random_cell()
+    with self._lock:
+      key = list(self._cells.get(cell, {}).values())
+    resp = self.session.put(
+        '{}/{}'.format(scd.OPERATION_REFERENCE_PATH, op_id),
+        json=scd.operation_body(self._extents(cell), key))
+    if resp.status_code == 200:
+      with self._lock:
+        self._cells.setdefault(cell, {})[op_id] = (
+            resp.json()['operation_reference']['ovn'])
+        self._operation_cells[op_id] = cell
+    return resp
+
+  def search_operations(self) -> requests.Response:
+    return self.session.post(
+        scd.OPERATION_QUERY_PATH,
+        json={'area_of_interest': self._extents(self._random_cell())[0]})
+
+  def _pop(self, op_id: Optional[str] = None
+          ) -> Optional[Tuple[str, int, str]]:
+    """Stops tracking an Operation; returns its ID, cell and OVN."""
+    with self._lock:
+      if op_id is None:
+        if not self._operation_cells:
+          return None
+        op_id = self._rng.choice(list(self._operation_cells))
+      cell = self._operation_cells.pop(op_id)
+      return op_id, cell, self._cells[cell].pop(op_id)
+
+  def _restore(self, op_id: str, cell: int, ovn: str) -> None:
+    with self._lock:
+      self._cells.setdefault(cell, {})[op_id] = ovn
+      self._operation_cells[op_id] = cell
+
+  def delete_operation(self) -> Optional[requests.Response]:
+    operation = self._pop()
+    if operation is None:
+      return None
+    try:
+      resp = self.session.delete('{}/{}'.format(
+          scd.OPERATION_REFERENCE_PATH, operation[0]))
+    except requests.RequestException:
+      self._restore(*operation)
+      raise
+    # Keep tracking an Operation the DSS may not have deleted, as
+    # RIDWorkload._delete does.
+    if resp.status_code not in (200, 404):
+      self._restore(*operation)
+    return resp
+
+  def __len__(self):
+    return len(self._operation_cells)
+
+  def cleanup(self) -> int:
+    """Deletes every Operation the workload created and has not yet deleted.
+
+    Returns the number of Operations that could not be deleted.
+    """
+    failures = 0
+    with self._lock:
+      op_ids = list(self._operation_cells)
+    for op_id in op_ids:
+      self._pop(op_id)
+      resp = self.session.delete('{}/{}'.format(scd.OPERATION_REFERENCE_PATH,
+                                                op_id))
+      if resp.status_code != 200:
+        failures += 1
+    return failures
@@ -0,0 +1,253 @@
+"""asyncio client for the remote ID and strategic coordination DSS APIs.
+
+Unlike the requests-based sessions, which need a thread per in-flight request,
+one AsyncDSSClient can keep thousands of requests in flight from a single
+thread.  Connections to the DSS are pooled (and bounded), HTTP/2 can be used
+to multiplex requests over fewer connections, and access tokens are obtained
+without blocking the event loop.  For example:
+
+  adapter = auth.make_auth_adapter(...)
+  async with AsyncDSSClient('https://dss.example.com',
+                            adapter.get_token_async) as client:
+    responses = await asyncio.gather(
+        *[client.search_isas(area) for area in areas])
+
+Requires httpx (and h2 for HTTP/2).
+"""
+
+import time
+import urllib.parse
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from monitorlib import auth, instrumentation
+
+# Called with (intended audience, scopes); returns an access token.
+TokenProvider = Callable[[str, List[str]], Awaitable[str]]
+
+DEFAULT_RID_PREFIX = '/v1/dss'
+DEFAULT_SCD_PREFIX = '/dss/v1'
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_TIMEOUT_SEC = 30
+
+
+class AsyncDSSClient(object):
+  """Sends requests to one DSS instance from an asyncio event loop.
+
+  Args:
+    base_url: Scheme, host and port of the DSS, e.g. https://dss.example.com.
+    token_provider: Coroutine function returning an access token for an
+      audience and scopes, e.g. the get_token_async method of an
+      auth.AuthAdapter.
+    rid_prefix: Path prefix of the remote ID API.
+    scd_prefix: Path prefix of the strategic coordination API.
+    scopes: Scopes requested for access tokens.
+    http2: Whether to negotiate HTTP/2 with the DSS.
+    max_connections: Maximum number of connections to the DSS; further
+      requests wait for a connection to become available.
+    max_keepalive_connections: Maximum number of idle connections kept open.
+    timeout: Seconds to wait for connecting, sending and receiving.
+  """
+
+  def __init__(self,
+               base_url: str,
+               token_provider: TokenProvider,
+               rid_prefix: str = DEFAULT_RID_PREFIX,
+               scd_prefix: str = DEFAULT_SCD_PREFIX,
+               scopes: Optional[List[str]] = None,
+               http2: bool = False,
+               max_connections: int = DEFAULT_MAX_CONNECTIONS,
+               max_keepalive_connections: Optional[int] = None,
+               timeout: float = DEFAULT_TIMEOUT_SEC):
+    self._base_url = base_url.rstrip('/')
+    self._token_provider = token_provider
+    self._rid_prefix = rid_prefix
+    self._scd_prefix = scd_prefix
+    self._scopes = list(scopes or auth.SCOPES)
+    self._audience = urllib.parse.urlparse(base_url).hostname
+    self.instrumentation_hooks: List[instrumentation.InstrumentationHook] = []
+    self._client = httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=(max_keepalive_connections if
+                                       max_keepalive_connections is not None
+                                       else max_connections)),
+        # Requests waiting for a connection from the pool don't time out; the
+        # pool size bounds concurrency rather than failing requests.
+        timeout=httpx.Timeout(timeout, pool=None))
+
+  def add_instrumentation_hook(
+      self, hook: instrumentation.InstrumentationHook) -> None:
+    self.instrumentation_hooks.append(hook)
+
+  async def __aenter__(self) -> 'AsyncDSSClient':
+    return self
+
+  async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+    await self.aclose()
+
+  async def aclose(self) -> None:
+    await self._client.aclose()
+
+  async def request(self, method: str, path: str,
+                    **kwargs) -> httpx.Response:
+    """Sends an authenticated request to path on the DSS.
+
+    Keyword arguments (json, params, ...) are passed to httpx.
+    """
+    token = await self._token_provider(self._audience, self._scopes)
+    headers = dict(kwargs.pop('headers', None) or {})
+    headers['Authorization'] = 'Bearer ' + token
+    request = self._client.build_request(
+        method, self._base_url + path, headers=headers, **kwargs)
+    if not self.instrumentation_hooks:
+      return await self._client.send(request)
+
+    fields = {
+        'host': urllib.parse.urlparse(str(request.url)).netloc,
+        'method': method,
+        'endpoint': instrumentation.url_template(str(request.url)),
+        'request_bytes': len(request.content),
+    }
+    t0 = time.perf_counter()
+    try:
+      response = await self._client.send(request, stream=True)
+      ttfb = time.perf_counter() - t0
+      try:
+        await response.aread()
+      finally:
+        await response.aclose()
+    except Exception as e:
+      self._report(instrumentation.RequestRecord(
+          status=None, elapsed=time.perf_counter() - t0, ttfb=None,
+          response_bytes=None, error=type(e).__name__, **fields))
+      raise
+    self._report(instrumentation.RequestRecord(
+        status=response.status_code, elapsed=time.perf_counter() - t0,
+        ttfb=ttfb, response_bytes=len(response.content), error=None,
+        **fields))
+    return response
+
+  def _report(self, record: instrumentation.RequestRecord) -> None:
+    for hook in self.instrumentation_hooks:
+      hook(record)
+
+  # Remote ID
+
+  def _rid(self, path: str) -> str:
+    return self._rid_prefix + path
+
+  async def get_isa(self, isa_id: str) -> httpx.Response:
+    return await self.request(
+        'GET', self._rid('/identification_service_areas/{}'.format(isa_id)))
+
+  async def search_isas(self, area: str,
+                        earliest_time: Optional[str] = None,
+                        latest_time: Optional[str] = None) -> httpx.Response:
+    """Searches for ISAs in area, a comma-separated list of lat,lng points."""
+    params = {'area': area}
+    if earliest_time is not None:
+      params['earliest_time'] = earliest_time
+    if latest_time is not None:
+      params['latest_time'] = latest_time
+    return await self.request(
+        'GET', self._rid('/identification_service_areas'), params=params)
+
+  async def put_isa(self, isa_id: str, body: Dict[str, Any],
+                    version: Optional[str] = None) -> httpx.Response:
+    """Creates an ISA or, if version is specified, updates it."""
+    path = '/identification_service_areas/{}'.format(isa_id)
+    if version is not None:
+      path += '/' + version
+    return await self.request('PUT', self._rid(path), json=body)
+
+  async def delete_isa(self, isa_id: str, version: str) -> httpx.Response:
+    return await self.request('DELETE', self._rid(
+        '/identification_service_areas/{}/{}'.format(isa_id, version)))
+
+  async def get_subscription(self, sub_id: str) -> httpx.Response:
+    return await self.request(
+        'GET', self._rid('/subscriptions/{}'.format(sub_id)))
+
+  async def search_subscriptions(self, area: str) -> httpx.Response:
+    return await self.request(
+        'GET', self._rid('/subscriptions'), params={'area': area})
+
+  async def put_subscription(self, sub_id: str, body: Dict[str, Any],
+                             version: Optional[str] = None) -> httpx.Response:
+    """Creates a Subscription or, if version is specified, updates it."""
+    path = '/subscriptions/{}'.format(sub_id)
+    if version is not None:
+      path += '/' + version
+    return await self.request('PUT', self._rid(path), json=body)
+
+  async def delete_subscription(self, sub_id: str,
+                                version: str) -> httpx.Response:
+    return await self.request('DELETE', self._rid(
+        '/subscriptions/{}/{}'.format(sub_id, version)))
+
+  # Strategic coordination
+
+  def _scd(self, path: str) -> str:
+    return self._scd_prefix + path
+
+  async def get_operation_reference(self, entity_id: str) -> httpx.Response:
+    return await self.request(
+        'GET', self._scd('/operation_references/{}'.format(entity_id)))
+
+  async def put_operation_reference(self, entity_id: str,
+                                    body: Dict[str, Any]) -> httpx.Response:
+    return await self.request(
+        'PUT', self._scd('/operation_references/{}'.format(entity_id)),
+        json=body)
+
+  async def delete_operation_reference(self,
+                                       entity_id: str) -> httpx.Response:
+    return await self.request(
+        'DELETE', self._scd('/operation_references/{}'.format(entity_id)))
+
+  async def search_operation_references(
+      self, body: Dict[str, Any]) -> httpx.Response:
+    return await self.request(
+        'POST', self._scd('/operation_references/query'), json=body)
+
+  async def get_constraint_reference(self, entity_id: str) -> httpx.Response:
+    return await self.request(
+        'GET', self._scd('/constraint_references/{}'.format(entity_id)))
+
+  async def put_constraint_reference(self, entity_id: str,
+                                     body: Dict[str, Any]) -> httpx.Response:
+    return await self.request(
+        'PUT', self._scd('/constraint_references/{}'.format(entity_id)),
+        json=body)
+
+  async def delete_constraint_reference(self,
+                                        entity_id: str) -> httpx.Response:
+    return await self.request(
+        'DELETE', self._scd('/constraint_references/{}'.format(entity_id)))
+
+  async def query_constraint_references(
+      self, body: Dict[str, Any]) -> httpx.Response:
+    return await self.request(
+        'POST', self._scd('/constraints/query'), json=body)
+
+  async def get_scd_subscription(self, sub_id: str) -> httpx.Response:
+    return await self.request(
+        'GET', self._scd('/subscriptions/{}'.format(sub_id)))
+
+  async def put_scd_subscription(self, sub_id: str,
+                                 body: Dict[str, Any]) -> httpx.Response:
+    return await self.request(
+        'PUT', self._scd('/subscriptions/{}'.format(sub_id)), json=body)
+
+  async def delete_scd_subscription(self, sub_id: str) -> httpx.Response:
+    return await self.request(
+        'DELETE', self._scd('/subscriptions/{}'.format(sub_id)))
+
+  async def query_scd_subscriptions(
+      self, body: Dict[str, Any]) -> httpx.Response:
+    return await self.request(
+        'POST', self._scd('/subscriptions/query'), json=body)
@@ -0,0 +1,225 @@
+"""Requests adapters that add access tokens to DSS requests."""
+
+import json
+import time
+import urllib.parse
+
+from google.auth import crypt, jwt
+from google.auth.transport import requests as google_requests
+from google.oauth2 import service_account
+import requests
+
+from monitorlib import tokens
+
+SCOPES = [
+    'dss.write.identification_service_areas',
+    'dss.read.identification_service_areas',
+]
+
+# Defaults for the claims of locally-signed tokens, matching what the Dummy
+# OAuth Server issues.
+DEFAULT_ISSUER = 'dummy'
+DEFAULT_SUBJECT = 'fake-user'
+DEFAULT_TOKEN_LIFETIME_SEC = 3600
+
+
+class TokenSigner(object):
+  """Signs RS256 access tokens locally, like the Dummy OAuth Server does.
+
+  Args:
+    private_key_file: PEM file of the RSA private key whose public key the DSS
+      accepts, e.g. build/test-certs/auth2.key.
+    issuer: `iss` claim.
+    subject: `sub` claim.
+    lifetime: Seconds from signing until the `exp` claim.
+    extra_claims: Additional claims, which override the ones above as well as
+      `aud` and `scope`.
+  """
+
+  def __init__(self, private_key_file, issuer=DEFAULT_ISSUER,
+               subject=DEFAULT_SUBJECT, lifetime=DEFAULT_TOKEN_LIFETIME_SEC,
+               extra_claims=None):
+    with open(private_key_file, 'r') as f:
+      self._signer = crypt.RSASigner.from_string(f.read())
+    self.private_key_file = private_key_file
+    self.issuer = issuer
+    self.subject = subject
+    self.lifetime = lifetime
+    self.extra_claims = dict(extra_claims or {})
+
+  def sign(self, intended_audience, scopes):
+    claims = {
+        'aud': intended_audience,
+        'scope': ' '.join(scopes),
+        'iss': self.issuer,
+        'sub': self.subject,
+        'exp': int(time.time() + self.lifetime),
+    }
+    claims.update(self.extra_claims)
+    return jwt.encode(self._signer, claims).decode('ascii')
+
+
+def parse_claims(value):
+  """Parses extra token claims specified on the command line as JSON."""
+  claims = json.loads(value) if value else {}
+  if not isinstance(claims, dict):
+    raise ValueError('Claims must be a JSON object')
+  return claims
+
+
+class AuthAdapter(requests.adapters.HTTPAdapter):
+  """Base class for requests adapters that add JWTs to requests.
+
+  token_cache_options are passed to the monitorlib.tokens.TokenCache holding
+  the tokens issued by this adapter; other keyword arguments are passed to
+  HTTPAdapter (e.g., pool_maxsize).
+  """
+
+  def __init__(self, token_cache_options=None, **kwargs):
+    super().__init__(**kwargs)
+    self._token_cache_options = token_cache_options or {}
+
+  def _init_token_cache(self, namespace):
+    """Subclasses must call this once they are ready to issue tokens."""
+    self._tokens = tokens.TokenCache(
+        lambda scopes, audience: self.issue_token(audience, scopes),
+        namespace=namespace, **self._token_cache_options)
+
+  def issue_token(self, intended_audience, scopes):
+    """Subclasses must return a bearer token for the given audience."""
+
+    raise NotImplementedError()
+
+  def get_token(self, intended_audience, scopes=SCOPES):
+    """Returns a cached (or newly issued) bearer token."""
+    return self._tokens.get(scopes, intended_audience)
+
+  async def get_token_async(self, intended_audience, scopes=SCOPES):
+    """Like get_token, but doesn't block the event loop while issuing."""
+    return await self._tokens.get_async(scopes, intended_audience)
+
+  def prefetch_token(self, intended_audience, scopes=SCOPES):
+    """Starts obtaining a token in the background, before it is needed."""
+    self._tokens.prefetch(scopes, intended_audience)
+
+  def add_headers(self, request, **kwargs):
+    intended_audience = urllib.parse.urlparse(request.url).hostname
+    token = self.get_token(intended_audience)
+    request.headers['Authorization'] = 'Bearer ' + token
+
+
+class DummyOAuthServerAdapter(AuthAdapter):
+  """Requests adapter that gets JWTs that uses the Dummy OAuth Server"""
+
+  def __init__(self, token_endpoint, token_cache_options=None, **kwargs):
+    super().__init__(token_cache_options, **kwargs)
+
+    oauth_session = requests.Session()
+
+    self._oauth_token_endpoint = token_endpoint
+    self._oauth_session = oauth_session
+    self._init_token_cache('dummy:' + token_endpoint)
+
+  def issue_token(self, intended_audience, scopes):
+    url = '{}?grant_type=client_credentials&scope={}&intended_audience={}&issuer=dummy'.format(
+        self._oauth_token_endpoint, urllib.parse.quote(' '.join(scopes)),
+        urllib.parse.quote(intended_audience))
+    response = self._oauth_session.post(url).json()
+    return response['access_token']
+
+
+class ServiceAccountAuthAdapter(AuthAdapter):
+  """Requests adapter that gets JWTs using a service account."""
+
+  def __init__(self, token_endpoint, service_account_json,
+               token_cache_options=None, **kwargs):
+    super().__init__(token_cache_options, **kwargs)
+
+    credentials = service_account.Credentials.from_service_account_file(
+        service_account_json).with_scopes(['email'])
+    oauth_session = google_requests.AuthorizedSession(credentials)
+
+    self._oauth_token_endpoint = token_endpoint
+    self._oauth_session = oauth_session
+    self._init_token_cache('service_account:{}:{}'.format(
+        token_endpoint, credentials.service_account_email))
+
+  def issue_token(self, intended_audience, scopes):
+    url = '{}?grant_type=client_credentials&scope={}&intended_audience={}'.format(
+        self._oauth_token_endpoint, urllib.parse.quote(' '.join(scopes)),
+        urllib.parse.quote(intended_audience))
+    response = self._oauth_session.post(url).json()
+    return response['access_token']
+
+
+class UsernamePasswordAuthAdapter(AuthAdapter):
+  """Requests adapter that gets JWTs using a username and password."""
+
+  def __init__(self, token_endpoint, username, password, client_id,
+               token_cache_options=None, **kwargs):
+    super().__init__(token_cache_options, **kwargs)
+
+    self._oauth_token_endpoint = token_endpoint
+    self._username = username
+    self._password = password
+    self._client_id = client_id
+    self._init_token_cache('password:{}:{}:{}'.format(
+        token_endpoint, username, client_id))
+
+  def issue_token(self, intended_audience, scopes):
+    scopes.append('aud:{}'.format(intended_audience))
+    response = requests.post(self._oauth_token_endpoint, data={
+      'grant_type': "password",
+      'username': self._username,
+      'password': self._password,
+      'client_id': self._client_id,
+      'scope': ' '.join(scopes),
+    }).json()
+    return response['access_token']
+
+
+class PrivateKeyAuthAdapter(AuthAdapter):
+  """Requests adapter that signs its own JWTs instead of requesting them.
+
+  No OAuth server is involved, so this only works against a DSS configured to
+  accept tokens signed with the given key, such as a local or test instance.
+  """
+
+  def __init__(self, signer, token_cache_options=None, **kwargs):
+    super().__init__(token_cache_options, **kwargs)
+
+    self._signer = signer
+    self._init_token_cache('private_key:{}:{}:{}'.format(
+        signer.private_key_file, signer.issuer, signer.subject))
+
+  def issue_token(self, intended_audience, scopes):
+    return self._signer.sign(intended_audience, scopes)
+
+
+def make_auth_adapter(token_endpoint, service_account_json=None, username=None,
+                      password=None, client_id=None, use_dummy_oauth=False,
+                      private_key_file=None, signer_options=None,
+                      token_cache_options=None, **kwargs):
+  """Creates an auth adapter to get JWTs using the given credentials.
+
+  We can use either a service account, a username/password/client_id, a dummy
+  oauth server or a private key to sign tokens with (in which case
+  signer_options, if specified, are keyword arguments of TokenSigner).  Other
+  keyword arguments are passed to the adapter.
+  """
+  if private_key_file is not None:
+    return PrivateKeyAuthAdapter(
+        TokenSigner(private_key_file, **(signer_options or {})),
+        token_cache_options, **kwargs)
+  elif service_account_json is not None:
+    return ServiceAccountAuthAdapter(token_endpoint, service_account_json,
+                                     token_cache_options, **kwargs)
+  elif username is not None:
+    return UsernamePasswordAuthAdapter(token_endpoint, username, password,
+                                       client_id, token_cache_options, **kwargs)
+  elif use_dummy_oauth:
+    return DummyOAuthServerAdapter(token_endpoint, token_cache_options, **kwargs)
+  else:
+    raise ValueError(
+        'You must provide either an OAuth service account, a username, '
+        'password and client ID, or a private key to sign tokens with')
@@ -0,0 +1,111 @@
+"""Waiting for DSS entities to expire without sleeping for a fixed time.
+
+An entity cannot expire before its time_end, so we sleep until then and poll
+the DSS with exponential backoff until the entity has disappeared or the
+deadline (time_end plus the maximum propagation delay we tolerate) passes.
+"""
+
+import calendar
+import collections
+import datetime
+import time
+from typing import Callable, Iterable, Optional
+
+import requests
+
+# Longest we will wait after time_end for an entity to disappear.
+DEFAULT_MAX_PROPAGATION_SEC = 10
+
+DEFAULT_INITIAL_INTERVAL_SEC = 0.1
+DEFAULT_MAX_INTERVAL_SEC = 1
+
+# "expired" is whether the entity was observed to have expired before the
+# deadline.  "propagation_delay" is the number of seconds between time_end and
+# the start of the first poll that observed the expiry (or the deadline, if it
+# never did).
+# "polls" is the number of times the condition was checked.
+ExpiryResult = collections.namedtuple(
+    'ExpiryResult', ['expired', 'propagation_delay', 'polls'])
+
+
+def _timestamp(t: datetime.datetime) -> float:
+  if t.tzinfo is None:
+    # Naive datetimes are UTC, as produced by datetime.utcnow().
+    return calendar.timegm(t.utctimetuple()) + t.microsecond / 1e6
+  return t.timestamp()
+
+
+def wait_for_expiry(
+    is_expired: Callable[[], bool],
+    time_end: datetime.datetime,
+    max_propagation: float = DEFAULT_MAX_PROPAGATION_SEC,
+    initial_interval: float = DEFAULT_INITIAL_INTERVAL_SEC,
+    max_interval: float = DEFAULT_MAX_INTERVAL_SEC,
+    clock: Callable[[], float] = time.time,
+    sleep: Callable[[float], None] = time.sleep) -> ExpiryResult:
+  """Polls is_expired, starting at time_end, until it returns True.
+
+  Args:
+    is_expired: Returns True once the entity is no longer visible.
+    time_end: The time_end of the entity; naive datetimes are treated as UTC.
+    max_propagation: Seconds after time_end to keep polling for.
+    initial_interval: Seconds between the first two polls.
+    max_interval: Upper bound on the seconds between polls; the interval
+      doubles after every unsuccessful poll until it reaches this value.
+  """
+  end = _timestamp(time_end)
+  deadline = end + max_propagation
+
+  now = clock()
+  if now < end:
+    sleep(end - now)
+
+  interval = initial_interval
+  polls = 0
+  while True:
+    polls += 1
+    # Measure from when the poll was sent so our own request latency does not
+    # count towards the propagation delay.
+    poll_time = clock()
+    if is_expired():
+      return ExpiryResult(True, poll_time - end, polls)
+    now = clock()
+    if now >= deadline:
+      return ExpiryResult(False, now - end, polls)
+    sleep(min(interval, deadline - now))
+    interval = min(interval * 2, max_interval)
+
+
+def _absent(session: requests.Session, kind: str, result_key: str,
+            ids: Iterable[str], area: Optional[str]) -> Callable[[], bool]:
+  ids = set(ids)
+
+  def is_expired() -> bool:
+    for entity_id in ids:
+      resp = session.get('/{}/{}'.format(kind, entity_id))
+      if resp.status_code != 404:
+        return False
+    if area is not None:
+      resp = session.get('/{}?area={}'.format(kind, area))
+      if resp.status_code != 200:
+        return False
+      if ids & set(x['id'] for x in resp.json()[result_key]):
+        return False
+    return True
+
+  return is_expired
+
+
+def isas_expired(session: requests.Session, isa_ids: Iterable[str],
+                 area: Optional[str] = None) -> Callable[[], bool]:
+  """Returns a condition that is True once none of the ISAs can be retrieved by
+  ID nor, if area is specified, found by searching area."""
+  return _absent(session, 'identification_service_areas', 'service_areas',
+                 isa_ids, area)
+
+
+def subscriptions_expired(session: requests.Session, sub_ids: Iterable[str],
+                          area: Optional[str] = None) -> Callable[[], bool]:
+  """Returns a condition that is True once none of the Subscriptions can be
+  retrieved by ID nor, if area is specified, found by searching area."""
+  return _absent(session, 'subscriptions', 'subscriptions', sub_ids, area)
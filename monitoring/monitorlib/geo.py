@@ -0,0 +1,149 @@
+"""Geographic helpers shared by the monitoring and test tools."""
+
+import math
+from typing import Dict, List, Optional
+
+# South-west corner of the default grid, in the same sparsely-populated area
+# the prober and interoperability tests have always used.
+DEFAULT_ORIGIN_LAT = -23.7
+DEFAULT_ORIGIN_LNG = 130.6
+
+# Footprints are squares this many degrees on a side (~5km).
+DEFAULT_CELL_SIZE_DEG = 0.05
+
+# Distance between the south-west corners of adjacent footprints.  The gap
+# between footprints is several times the size of the ~1km (level 13) S2 cells
+# the DSS indexes entities with, so entities in different footprints never
+# share an S2 cell and are never returned by each other's searches.
+DEFAULT_CELL_PITCH_DEG = 0.1
+
+DEFAULT_COLUMNS = 40
+
+# Length of one degree of latitude (and of longitude at the equator).
+KM_PER_DEGREE = 111.32
+
+
+class Grid(object):
+  """Deterministic grid of non-overlapping square footprints.
+
+  Cells are numbered row by row starting from the south-west corner, so the
+  same index always produces the same footprint.  If rows is not specified, the
+  grid extends northwards indefinitely.
+  """
+
+  def __init__(self,
+               origin_lat: float = DEFAULT_ORIGIN_LAT,
+               origin_lng: float = DEFAULT_ORIGIN_LNG,
+               cell_size_deg: float = DEFAULT_CELL_SIZE_DEG,
+               cell_pitch_deg: float = DEFAULT_CELL_PITCH_DEG,
+               columns: int = DEFAULT_COLUMNS,
+               rows: Optional[int] = None):
+    if cell_size_deg >= cell_pitch_deg:
+      raise ValueError('cell_size_deg must be smaller than cell_pitch_deg')
+    self.origin_lat = origin_lat
+    self.origin_lng = origin_lng
+    self.cell_size_deg = cell_size_deg
+    self.cell_pitch_deg = cell_pitch_deg
+    self.columns = columns
+    self.rows = rows
+
+  @classmethod
+  def over_region(cls,
+                  lat_min: float,
+                  lng_min: float,
+                  lat_max: float,
+                  lng_max: float,
+                  cell_size_deg: float = DEFAULT_CELL_SIZE_DEG,
+                  cell_pitch_deg: float = DEFAULT_CELL_PITCH_DEG) -> 'Grid':
+    """Creates the largest grid that fits within the specified region."""
+    columns = int(math.floor(
+        (lng_max - lng_min - cell_size_deg) / cell_pitch_deg)) + 1
+    rows = int(math.floor(
+        (lat_max - lat_min - cell_size_deg) / cell_pitch_deg)) + 1
+    if columns < 1 or rows < 1:
+      raise ValueError('Region is too small to contain a single grid cell')
+    return cls(lat_min, lng_min, cell_size_deg, cell_pitch_deg, columns, rows)
+
+  @property
+  def cell_count(self) -> Optional[int]:
+    """Number of cells in the grid, or None if it is unbounded."""
+    return None if self.rows is None else self.rows * self.columns
+
+  def vertices(self, index: int) -> List[Dict[str, float]]:
+    """Returns the vertices of the footprint of cell `index`."""
+    if index < 0:
+      raise ValueError('Grid cell index must not be negative')
+    if self.cell_count is not None and index >= self.cell_count:
+      raise ValueError('Grid only has {} cells'.format(self.cell_count))
+    row, column = divmod(index, self.columns)
+    lat0 = self.origin_lat + row * self.cell_pitch_deg
+    lng0 = self.origin_lng + column * self.cell_pitch_deg
+    lat1 = lat0 + self.cell_size_deg
+    lng1 = lng0 + self.cell_size_deg
+    return [
+        {'lat': round(lat0, 6), 'lng': round(lng0, 6)},
+        {'lat': round(lat0, 6), 'lng': round(lng1, 6)},
+        {'lat': round(lat1, 6), 'lng': round(lng1, 6)},
+        {'lat': round(lat1, 6), 'lng': round(lng0, 6)},
+    ]
+
+
+def tile_region(lat_min: float, lng_min: float, lat_max: float,
+                lng_max: float,
+                tile_size_deg: float) -> List[List[Dict[str, float]]]:
+  """Returns square tiles covering the whole region, row by row.
+
+  Unlike the cells of a Grid, adjacent tiles share their edges, so searching
+  every tile searches the entire region.  Tiles on the northern and eastern
+  edges are clipped to the region.
+  """
+  if tile_size_deg <= 0:
+    raise ValueError('tile_size_deg must be positive')
+  rows = max(1, int(math.ceil((lat_max - lat_min) / tile_size_deg)))
+  columns = max(1, int(math.ceil((lng_max - lng_min) / tile_size_deg)))
+  tiles = []
+  for row in range(rows):
+    lat0 = lat_min + row * tile_size_deg
+    lat1 = min(lat0 + tile_size_deg, lat_max)
+    for column in range(columns):
+      lng0 = lng_min + column * tile_size_deg
+      lng1 = min(lng0 + tile_size_deg, lng_max)
+      tiles.append([
+          {'lat': round(lat0, 6), 'lng': round(lng0, 6)},
+          {'lat': round(lat0, 6), 'lng': round(lng1, 6)},
+          {'lat': round(lat1, 6), 'lng': round(lng1, 6)},
+          {'lat': round(lat1, 6), 'lng': round(lng0, 6)},
+      ])
+  return tiles
+
+
+def polygon_string(vertices: List[Dict[str, float]]) -> str:
+  """Formats vertices as the `area` query parameter of DSS searches."""
+  return ','.join('{},{}'.format(v['lat'], v['lng']) for v in vertices)
+
+
+def regular_polygon(center_lat: float, center_lng: float, area_km2: float,
+                    vertex_count: int) -> List[Dict[str, float]]:
+  """Returns the vertices of a regular polygon with approximately area_km2.
+
+  Vertices are listed counter-clockwise.  The polygon is computed on a local
+  flat approximation of the earth, which is accurate for polygons a few tens of
+  kilometers across.
+  """
+  if vertex_count < 3:
+    raise ValueError('A polygon needs at least 3 vertices')
+  # Area of a regular polygon with circumradius r is n/2 r^2 sin(2 pi / n).
+  radius_km = math.sqrt(
+      2 * area_km2 / (vertex_count * math.sin(2 * math.pi / vertex_count)))
+  km_per_degree_lng = KM_PER_DEGREE * math.cos(math.radians(center_lat))
+  vertices = []
+  for i in range(vertex_count):
+    # Start at the south-west so squares are aligned with the axes.
+    angle = 2 * math.pi * i / vertex_count - 3 * math.pi / 4
+    vertices.append({
+        'lat': round(center_lat + radius_km * math.sin(angle) / KM_PER_DEGREE,
+                     6),
+        'lng': round(center_lng + radius_km * math.cos(angle) /
+                     km_per_degree_lng, 6),
+    })
+  return vertices
@@ -0,0 +1,509 @@
+"""gRPC client for the DSS's grpc-backend, bypassing the http-gateway.
+
+Every request the other tools send goes through cmds/http-gateway, which
+transcodes JSON to protobuf and back before grpc-backend sees it.  The
+clients here talk to grpc-backend (":8081" by default) directly so that the
+cost of that transcoding can be told apart from the cost of the backend and
+its database:
+
+  * GRPCDSSClient has the same methods as async_client.AsyncDSSClient, but
+    takes and returns protobuf messages.
+  * GRPCAdapter is a requests transport adapter which transcodes HTTP requests
+    to gRPC calls the way the http-gateway does, using the google.api.http
+    annotations of the DSS's protos.  A session with it mounted (see
+    infrastructure.make_session) behaves like a session for the http-gateway,
+    so the prober and the load tools run unchanged against grpc-backend.
+
+Both spread calls over a pool of channels, each with its own connection, and
+pass access tokens as "authorization" metadata like the http-gateway does.
+
+The stubs in monitorlib/pb are generated from pkg/api/v1 with `make
+python-protos`.  Requires grpcio and googleapis-common-protos.
+"""
+
+import datetime
+import itertools
+import json
+import re
+import time
+import urllib.parse
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from google.api import annotations_pb2
+from google.protobuf import json_format, message
+import grpc
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from monitorlib import auth
+from monitorlib.pb.auxpb import aux_service_pb2, aux_service_pb2_grpc
+from monitorlib.pb.ridpb import rid_pb2, rid_pb2_grpc
+from monitorlib.pb.scdpb import scd_pb2, scd_pb2_grpc
+
+DEFAULT_GRPC_PORT = 8081
+DEFAULT_CHANNELS = 4
+DEFAULT_TIMEOUT_SEC = 30
+
+# Called with (intended audience, scopes); returns an access token.
+TokenProvider = Callable[[str, List[str]], str]
+
+# gRPC status code the DSS uses for areas that are too large (see
+# pkg/errors/errors.go).  grpcio doesn't know it, so it surfaces as UNKNOWN.
+AREA_TOO_LARGE_CODE = 18
+
+# HTTP status the http-gateway responds with for each gRPC status code (see
+# myCodeToHTTPStatus in cmds/http-gateway/main.go).
+_HTTP_STATUS = {
+    grpc.StatusCode.OK.value[0]: 200,
+    grpc.StatusCode.CANCELLED.value[0]: 408,
+    grpc.StatusCode.UNKNOWN.value[0]: 500,
+    grpc.StatusCode.INVALID_ARGUMENT.value[0]: 400,
+    grpc.StatusCode.DEADLINE_EXCEEDED.value[0]: 504,
+    grpc.StatusCode.NOT_FOUND.value[0]: 404,
+    grpc.StatusCode.ALREADY_EXISTS.value[0]: 409,
+    grpc.StatusCode.PERMISSION_DENIED.value[0]: 403,
+    grpc.StatusCode.UNAUTHENTICATED.value[0]: 401,
+    grpc.StatusCode.RESOURCE_EXHAUSTED.value[0]: 429,
+    grpc.StatusCode.FAILED_PRECONDITION.value[0]: 400,
+    grpc.StatusCode.ABORTED.value[0]: 409,
+    grpc.StatusCode.OUT_OF_RANGE.value[0]: 400,
+    grpc.StatusCode.UNIMPLEMENTED.value[0]: 501,
+    grpc.StatusCode.INTERNAL.value[0]: 500,
+    grpc.StatusCode.UNAVAILABLE.value[0]: 503,
+    grpc.StatusCode.DATA_LOSS.value[0]: 500,
+    AREA_TOO_LARGE_CODE: 413,
+}
+
+_UNKNOWN_CODE = re.compile(
+    r'^Server sent unknown code (\d+) and details "(.*)"$', re.DOTALL)
+
+# (generated module, stub class) of each service grpc-backend serves.
+_SERVICES = [
+    (rid_pb2, rid_pb2_grpc.DiscoveryAndSynchronizationServiceStub),
+    (scd_pb2, scd_pb2_grpc.UTMAPIUSSDSSAndUSSUSSServiceStub),
+    (aux_service_pb2, aux_service_pb2_grpc.DSSAuxServiceStub),
+]
+
+
+def status_of(error: grpc.RpcError) -> Tuple[int, str]:
+  """Returns the numeric gRPC status code and message of a failed call."""
+  code = error.code()
+  details = error.details() or ''
+  match = _UNKNOWN_CODE.match(details)
+  if code == grpc.StatusCode.UNKNOWN and match:
+    return int(match.group(1)), match.group(2)
+  return code.value[0], details
+
+
+def http_status(code: int) -> int:
+  """Returns the HTTP status the http-gateway uses for a gRPC status code."""
+  return _HTTP_STATUS.get(code, 500)
+
+
+def message_to_dict(msg: message.Message) -> Dict[str, Any]:
+  """Converts msg to the JSON the http-gateway would respond with.
+
+  Like the http-gateway, fields keep their proto names and fields with default
+  values are included.
+  """
+  try:
+    return json_format.MessageToDict(msg, preserving_proto_field_name=True,
+                                     including_default_value_fields=True)
+  except TypeError:
+    # protobuf>=5 renamed including_default_value_fields.
+    return json_format.MessageToDict(msg, preserving_proto_field_name=True,
+                                     always_print_fields_with_no_presence=True)
+
+
+class _Method(NamedTuple):
+  name: str
+  stub_class: type
+  request_class: type
+  http_rule: Any
+
+
+def _methods() -> Dict[Tuple[str, str], _Method]:
+  """Returns every RPC, keyed by (proto package, method name)."""
+  result = {}
+  for module, stub_class in _SERVICES:
+    for service in module.DESCRIPTOR.services_by_name.values():
+      for method in service.methods:
+        result[(module.DESCRIPTOR.package, method.name)] = _Method(
+            method.name, stub_class, getattr(module, method.input_type.name),
+            method.GetOptions().Extensions[annotations_pb2.http])
+  return result
+
+
+class ChannelPool(object):
+  """Round-robins calls over several channels to one grpc-backend.
+
+  gRPC multiplexes concurrent calls over a channel's single HTTP/2
+  connection; several channels spread them over several connections (and
+  therefore several backend instances behind a TCP load balancer).
+
+  Args:
+    target: host:port of grpc-backend.
+    size: Number of channels.
+    credentials: Channel credentials for TLS; insecure channels are used if
+      not specified.
+  """
+
+  def __init__(self, target: str, size: int = DEFAULT_CHANNELS,
+               credentials: Optional[grpc.ChannelCredentials] = None):
+    if size < 1:
+      raise ValueError('A channel pool needs at least one channel')
+    # Without a local subchannel pool, channels to the same target would share
+    # one connection.
+    options = [('grpc.use_local_subchannel_pool', 1)]
+    if credentials is None:
+      self._channels = [grpc.insecure_channel(target, options=options)
+                        for _ in range(size)]
+    else:
+      self._channels = [
+          grpc.secure_channel(target, credentials, options=options)
+          for _ in range(size)
+      ]
+    self._stubs: List[Dict[type, Any]] = [{} for _ in self._channels]
+    self._next = itertools.count()
+
+  def stub(self, stub_class: type):
+    """Returns a stub of stub_class on the next channel."""
+    i = next(self._next) % len(self._channels)
+    stubs = self._stubs[i]
+    if stub_class not in stubs:
+      stubs[stub_class] = stub_class(self._channels[i])
+    return stubs[stub_class]
+
+  def close(self) -> None:
+    for channel in self._channels:
+      channel.close()
+
+
+class GRPCDSSClient(object):
+  """Sends requests to one grpc-backend instance.
+
+  Methods raise grpc.RpcError for calls that fail.
+
+  Args:
+    target: host:port of grpc-backend.
+    token_provider: Function returning an access token for an audience and
+      scopes, e.g. the get_token method of an auth.AuthAdapter.
+    audience: Intended audience of access tokens; the host name of the
+      http-gateway the DSS is normally accessed through.
+    scopes: Scopes requested for access tokens.
+    channels: Number of channels to spread calls over.
+    credentials: Channel credentials for TLS.
+    timeout: Seconds to wait for each call.
+  """
+
+  def __init__(self,
+               target: str,
+               token_provider: TokenProvider,
+               audience: str,
+               scopes: Optional[List[str]] = None,
+               channels: int = DEFAULT_CHANNELS,
+               credentials: Optional[grpc.ChannelCredentials] = None,
+               timeout: float = DEFAULT_TIMEOUT_SEC):
+    self._pool = ChannelPool(target, channels, credentials)
+    self._token_provider = token_provider
+    self._audience = audience
+    self._scopes = list(scopes or auth.SCOPES)
+    self._timeout = timeout
+    self._methods = _methods()
+
+  def __enter__(self) -> 'GRPCDSSClient':
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback) -> None:
+    self.close()
+
+  def close(self) -> None:
+    self._pool.close()
+
+  def call(self, method: str, request: message.Message) -> message.Message:
+    """Calls the named RPC, e.g. 'GetIdentificationServiceArea'.
+
+    The service is the one whose proto package request belongs to.
+    """
+    token = self._token_provider(self._audience, self._scopes)
+    key = (request.DESCRIPTOR.file.package, method)
+    stub = self._pool.stub(self._methods[key].stub_class)
+    return getattr(stub, method)(
+        request, timeout=self._timeout,
+        metadata=[('authorization', 'Bearer ' + token)])
+
+  # Remote ID
+
+  def get_isa(self, isa_id: str) -> rid_pb2.GetIdentificationServiceAreaResponse:
+    return self.call('GetIdentificationServiceArea',
+                     rid_pb2.GetIdentificationServiceAreaRequest(id=isa_id))
+
+  def search_isas(
+      self, area: str, earliest_time: Optional[str] = None,
+      latest_time: Optional[str] = None
+  ) -> rid_pb2.SearchIdentificationServiceAreasResponse:
+    """Searches for ISAs in area, a comma-separated list of lat,lng points."""
+    request = rid_pb2.SearchIdentificationServiceAreasRequest(area=area)
+    if earliest_time is not None:
+      request.earliest_time.FromJsonString(earliest_time)
+    if latest_time is not None:
+      request.latest_time.FromJsonString(latest_time)
+    return self.call('SearchIdentificationServiceAreas', request)
+
+  def put_isa(
+      self, isa_id: str, body: Dict[str, Any], version: Optional[str] = None
+  ) -> rid_pb2.PutIdentificationServiceAreaResponse:
+    """Creates an ISA or, if version is specified, updates it."""
+    if version is None:
+      request = rid_pb2.CreateIdentificationServiceAreaRequest(id=isa_id)
+      method = 'CreateIdentificationServiceArea'
+    else:
+      request = rid_pb2.UpdateIdentificationServiceAreaRequest(
+          id=isa_id, version=version)
+      method = 'UpdateIdentificationServiceArea'
+    json_format.ParseDict(body, request.params, ignore_unknown_fields=True)
+    return self.call(method, request)
+
+  def delete_isa(
+      self, isa_id: str,
+      version: str) -> rid_pb2.DeleteIdentificationServiceAreaResponse:
+    return self.call('DeleteIdentificationServiceArea',
+                     rid_pb2.DeleteIdentificationServiceAreaRequest(
+                         id=isa_id, version=version))
+
+  def get_subscription(self, sub_id: str) -> rid_pb2.GetSubscriptionResponse:
+    return self.call('GetSubscription',
+                     rid_pb2.GetSubscriptionRequest(id=sub_id))
+
+  def search_subscriptions(self,
+                           area: str) -> rid_pb2.SearchSubscriptionsResponse:
+    return self.call('SearchSubscriptions',
+                     rid_pb2.SearchSubscriptionsRequest(area=area))
+
+  def put_subscription(
+      self, sub_id: str, body: Dict[str, Any],
+      version: Optional[str] = None) -> rid_pb2.PutSubscriptionResponse:
+    """Creates a Subscription or, if version is specified, updates it."""
+    if version is None:
+      request = rid_pb2.CreateSubscriptionRequest(id=sub_id)
+      method = 'CreateSubscription'
+    else:
+      request = rid_pb2.UpdateSubscriptionRequest(id=sub_id, version=version)
+      method = 'UpdateSubscription'
+    json_format.ParseDict(body, request.params, ignore_unknown_fields=True)
+    return self.call(method, request)
+
+  def delete_subscription(self, sub_id: str,
+                          version: str) -> rid_pb2.DeleteSubscriptionResponse:
+    return self.call('DeleteSubscription', rid_pb2.DeleteSubscriptionRequest(
+        id=sub_id, version=version))
+
+  # Strategic coordination
+
+  def _scd_call(self, method: str, body: Optional[Dict[str, Any]] = None,
+                **fields) -> message.Message:
+    request = self._methods[('scdpb', method)].request_class(**fields)
+    if body is not None:
+      json_format.ParseDict(body, request.params, ignore_unknown_fields=True)
+    return self.call(method, request)
+
+  def get_operation_reference(
+      self, entity_id: str) -> scd_pb2.GetOperationReferenceResponse:
+    return self._scd_call('GetOperationReference', entityuuid=entity_id)
+
+  def put_operation_reference(
+      self, entity_id: str,
+      body: Dict[str, Any]) -> scd_pb2.ChangeOperationReferenceResponse:
+    return self._scd_call('PutOperationReference', body, entityuuid=entity_id)
+
+  def delete_operation_reference(
+      self, entity_id: str) -> scd_pb2.ChangeOperationReferenceResponse:
+    return self._scd_call('DeleteOperationReference', entityuuid=entity_id)
+
+  def search_operation_references(
+      self, body: Dict[str, Any]) -> scd_pb2.SearchOperationReferenceResponse:
+    return self._scd_call('SearchOperationReferences', body)
+
+  def get_constraint_reference(
+      self, entity_id: str) -> scd_pb2.GetConstraintReferenceResponse:
+    return self._scd_call('GetConstraintReference', entityuuid=entity_id)
+
+  def put_constraint_reference(
+      self, entity_id: str,
+      body: Dict[str, Any]) -> scd_pb2.ChangeConstraintReferenceResponse:
+    return self._scd_call('PutConstraintReference', body,
+                          entityuuid=entity_id)
+
+  def delete_constraint_reference(
+      self, entity_id: str) -> scd_pb2.ChangeConstraintReferenceResponse:
+    return self._scd_call('DeleteConstraintReference', entityuuid=entity_id)
+
+  def query_constraint_references(
+      self, body: Dict[str, Any]) -> scd_pb2.SearchConstraintReferencesResponse:
+    return self._scd_call('QueryConstraintReferences', body)
+
+  def get_scd_subscription(self,
+                           sub_id: str) -> scd_pb2.GetSubscriptionResponse:
+    return self._scd_call('GetSubscription', subscriptionid=sub_id)
+
+  def put_scd_subscription(
+      self, sub_id: str,
+      body: Dict[str, Any]) -> scd_pb2.PutSubscriptionResponse:
+    return self._scd_call('PutSubscription', body, subscriptionid=sub_id)
+
+  def delete_scd_subscription(
+      self, sub_id: str) -> scd_pb2.DeleteSubscriptionResponse:
+    return self._scd_call('DeleteSubscription', subscriptionid=sub_id)
+
+  def query_scd_subscriptions(
+      self, body: Dict[str, Any]) -> scd_pb2.SearchSubscriptionsResponse:
+    return self._scd_call('QuerySubscriptions', body)
+
+
+class _Route(NamedTuple):
+  http_method: str
+  pattern: Any
+  body: str
+  method: _Method
+
+
+def _routes() -> List[_Route]:
+  """Returns the HTTP route of every RPC, per its google.api.http option."""
+  routes = []
+  for method in _methods().values():
+    kind = method.http_rule.WhichOneof('pattern')
+    if kind is None or kind == 'custom':
+      continue
+    template = getattr(method.http_rule, kind)
+    pattern = re.compile('^' + re.sub(
+        r'\\\{(\w+)\\\}', r'(?P<\1>[^/]*)', re.escape(template)) + '$')
+    routes.append(_Route(kind.upper(), pattern, method.http_rule.body, method))
+  return routes
+
+
+def _json_body(content: Dict[str, Any]) -> bytes:
+  return json.dumps(content, indent=2).encode('utf-8')
+
+
+def _error_body(code: int, details: str) -> bytes:
+  """Returns the body the http-gateway responds with for a failed call."""
+  return _json_body({'error': details, 'code': code, 'message': details})
+
+
+class GRPCAdapter(BaseAdapter):
+  """Requests adapter that sends HTTP requests to grpc-backend as gRPC calls.
+
+  Requests are transcoded like the http-gateway does: path parameters and
+  query parameters populate fields of the RPC's request message and the JSON
+  body populates its body field.  Responses are converted back to JSON, and
+  failed calls to the HTTP status and error body the http-gateway would
+  respond with.  Calls which cannot reach grpc-backend raise
+  requests.ConnectionError, and calls which time out raise requests.Timeout.
+
+  Args:
+    target: host:port of grpc-backend.
+    auth_adapter: Adds the Authorization header to each request before it is
+      sent, e.g. an auth.AuthAdapter.
+    channels: Number of channels to spread calls over.
+    credentials: Channel credentials for TLS.
+  """
+
+  def __init__(self,
+               target: str,
+               auth_adapter: Optional[auth.AuthAdapter] = None,
+               channels: int = DEFAULT_CHANNELS,
+               credentials: Optional[grpc.ChannelCredentials] = None):
+    super().__init__()
+    self.target = target
+    self._auth_adapter = auth_adapter
+    self._pool = ChannelPool(target, channels, credentials)
+    # Unlike in the http-gateway, routes aren't split by path prefix, so more
+    # specific routes must be tried first: /subscriptions/query before
+    # /subscriptions/{subscriptionid}.
+    self._routes = sorted(_routes(),
+                          key=lambda r: r.pattern.pattern.count('(?P<'))
+
+  def _route(self, http_method: str, path: str):
+    for route in self._routes:
+      if route.http_method != http_method:
+        continue
+      match = route.pattern.match(path)
+      if match:
+        return route, match.groupdict()
+    return None, None
+
+  def _build_request(self, route: _Route, path_params: Dict[str, str],
+                     query: str, body: Optional[bytes]) -> message.Message:
+    request = route.method.request_class()
+    fields = {}
+    for name, values in urllib.parse.parse_qs(query).items():
+      fields[name] = values[-1]
+    fields.update({k: urllib.parse.unquote(v) for k, v in path_params.items()})
+    json_format.ParseDict(fields, request, ignore_unknown_fields=True)
+    if route.body and body:
+      content = json.loads(body)
+      target = request if route.body == '*' else getattr(request, route.body)
+      json_format.ParseDict(content, target, ignore_unknown_fields=True)
+    return request
+
+  def send(self, request, stream=False, timeout=None, verify=True, cert=None,
+           proxies=None):
+    if self._auth_adapter is not None:
+      self._auth_adapter.add_headers(request)
+    parsed = urllib.parse.urlparse(request.url)
+    t0 = time.monotonic()
+
+    route, path_params = self._route(request.method, parsed.path)
+    if route is None:
+      # Like the http-gateway, which responds in plain text.
+      return self._response(request, 404, b'Not Found\n', t0,
+                            'text/plain; charset=utf-8')
+    try:
+      body = request.body
+      if isinstance(body, str):
+        body = body.encode('utf-8')
+      grpc_request = self._build_request(route, path_params, parsed.query, body)
+    except (ValueError, json_format.ParseError) as e:
+      code = grpc.StatusCode.INVALID_ARGUMENT.value[0]
+      return self._response(request, 400, _error_body(code, str(e)), t0)
+
+    metadata = []
+    authorization = request.headers.get('Authorization')
+    if authorization:
+      metadata.append(('authorization', authorization))
+    if isinstance(timeout, tuple):
+      timeout = sum(t for t in timeout if t is not None) or None
+    stub = self._pool.stub(route.method.stub_class)
+    try:
+      result = getattr(stub, route.method.name)(
+          grpc_request, timeout=timeout, metadata=metadata)
+    except grpc.RpcError as e:
+      code, details = status_of(e)
+      if code == grpc.StatusCode.UNAVAILABLE.value[0]:
+        raise requests.ConnectionError(details, request=request)
+      if code == grpc.StatusCode.DEADLINE_EXCEEDED.value[0] and timeout:
+        raise requests.Timeout(details, request=request)
+      return self._response(request, http_status(code),
+                            _error_body(code, details), t0)
+    return self._response(request, 200, _json_body(message_to_dict(result)),
+                          t0)
+
+  def _response(self, request, status: int, content: bytes, t0: float,
+                content_type: str = 'application/json') -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = content
+    response.headers = CaseInsensitiveDict({
+        'Content-Type': content_type,
+        'Content-Length': str(len(content)),
+    })
+    response.encoding = 'utf-8'
+    response.url = request.url
+    response.request = request
+    response.reason = requests.status_codes._codes[status][0].upper()
+    response.elapsed = datetime.timedelta(seconds=time.monotonic() - t0)
+    return response
+
+  def close(self):
+    self._pool.close()
@@ -0,0 +1,153 @@
+"""Compact, mergeable latency histograms.
+
+Values are counted in logarithmically-sized buckets, in the spirit of HDR
+histograms: every recorded value can be reconstructed to within a fixed
+relative error no matter how large it is, using a small, bounded number of
+buckets.  Histograms with the same parameters can be merged exactly, which
+makes them suitable for aggregating results across threads, processes and
+hosts.
+
+Histograms are not thread-safe; callers recording from several threads must
+provide their own locking.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_RELATIVE_ERROR = 0.01
+
+# Values at or below this are counted in the first bucket.
+DEFAULT_LOWEST_VALUE = 1e-6
+
+# Upper bounds, in seconds, of the buckets exported to Prometheus.
+DEFAULT_EXPORT_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                         0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram(object):
+  """Histogram of non-negative values with bounded relative error."""
+
+  def __init__(self,
+               relative_error: float = DEFAULT_RELATIVE_ERROR,
+               lowest_value: float = DEFAULT_LOWEST_VALUE):
+    self.relative_error = relative_error
+    self.lowest_value = lowest_value
+    self._log_ratio = math.log((1 + relative_error) ** 2)
+    self.counts: Dict[int, int] = {}
+    self.count = 0
+    self.sum = 0.0
+    self.min: Optional[float] = None
+    self.max: Optional[float] = None
+
+  def _index(self, value: float) -> int:
+    if value <= self.lowest_value:
+      return 0
+    return int(math.log(value / self.lowest_value) / self._log_ratio) + 1
+
+  def _bucket_value(self, index: int) -> float:
+    """Representative value of a bucket (its geometric midpoint)."""
+    if index == 0:
+      return self.lowest_value
+    return self.lowest_value * math.exp((index - 0.5) * self._log_ratio)
+
+  def _bucket_upper_bound(self, index: int) -> float:
+    return self.lowest_value * math.exp(index * self._log_ratio)
+
+  def record(self, value: float, count: int = 1) -> None:
+    index = self._index(value)
+    self.counts[index] = self.counts.get(index, 0) + count
+    self.count += count
+    self.sum += value * count
+    if self.min is None or value < self.min:
+      self.min = value
+    if self.max is None or value > self.max:
+      self.max = value
+
+  def _check_compatible(self, other: 'Histogram') -> None:
+    if (other.relative_error != self.relative_error or
+        other.lowest_value != self.lowest_value):
+      raise ValueError('Cannot merge histograms with different parameters')
+
+  def merge(self, other: 'Histogram') -> None:
+    """Adds all values recorded in other to this histogram."""
+    self._check_compatible(other)
+    for index, count in other.counts.items():
+      self.counts[index] = self.counts.get(index, 0) + count
+    self.count += other.count
+    self.sum += other.sum
+    if other.min is not None and (self.min is None or other.min < self.min):
+      self.min = other.min
+    if other.max is not None and (self.max is None or other.max > self.max):
+      self.max = other.max
+
+  @property
+  def mean(self) -> Optional[float]:
+    return self.sum / self.count if self.count else None
+
+  def percentile(self, p: float) -> Optional[float]:
+    """Returns the value below which p percent of recorded values fall."""
+    if not self.count:
+      return None
+    rank = max(1, int(math.ceil(self.count * p / 100.0)))
+    seen = 0
+    for index in sorted(self.counts):
+      seen += self.counts[index]
+      if seen >= rank:
+        # Never report values outside the range actually recorded.
+        return min(max(self._bucket_value(index), self.min), self.max)
+    return self.max
+
+  def percentiles(self, ps=(50, 90, 99, 99.9)) -> Dict[str, Optional[float]]:
+    return {'p{:g}'.format(p): self.percentile(p) for p in ps}
+
+  def cumulative_counts(
+      self, bounds=DEFAULT_EXPORT_BOUNDS) -> List[Tuple[float, int]]:
+    """Returns (upper bound, number of values <= upper bound) for each bound.
+
+    Counts are exact when a bound coincides with a bucket boundary and
+    otherwise accurate to within the histogram's relative error.
+    """
+    result = []
+    indices = sorted(self.counts)
+    i = 0
+    seen = 0
+    for bound in bounds:
+      while (i < len(indices) and
+             self._bucket_upper_bound(indices[i]) <= bound * (1 + 1e-9)):
+        seen += self.counts[indices[i]]
+        i += 1
+      result.append((bound, seen))
+    return result
+
+  def summary(self) -> Dict[str, Any]:
+    """Returns count, mean, min, max and the usual percentiles."""
+    result = {
+        'count': self.count,
+        'mean': self.mean,
+        'min': self.min,
+        'max': self.max,
+    }
+    result.update(self.percentiles())
+    return result
+
+  def to_dict(self) -> Dict[str, Any]:
+    """Returns a JSON-serializable representation of this histogram."""
+    return {
+        'relative_error': self.relative_error,
+        'lowest_value': self.lowest_value,
+        'counts': {str(k): v for k, v in self.counts.items()},
+        'count': self.count,
+        'sum': self.sum,
+        'min': self.min,
+        'max': self.max,
+    }
+
+  @classmethod
+  def from_dict(cls, d: Dict[str, Any]) -> 'Histogram':
+    h = cls(d['relative_error'], d['lowest_value'])
+    h.counts = {int(k): v for k, v in d['counts'].items()}
+    h.count = d['count']
+    h.sum = d['sum']
+    h.min = d['min']
+    h.max = d['max']
+    return h
@@ -0,0 +1,55 @@
+"""Sessions for talking to a DSS."""
+
+import urllib.parse
+
+from monitorlib.instrumentation import InstrumentedSession
+
+
+class PrefixURLSession(InstrumentedSession):
+  """Requests session that adds a prefix to URLs that start with a '/'."""
+
+  def __init__(self, prefix_url):
+    super().__init__()
+
+    self._prefix_url = prefix_url
+
+  def prepare_request(self, request, **kwargs):
+    if request.url.startswith('/'):
+      request.url = self._prefix_url + request.url
+    return super().prepare_request(request, **kwargs)
+
+  def issue_token(self, scopes):
+    adapter = self.get_adapter(self._prefix_url)
+    intended_audience = urllib.parse.urlparse(self._prefix_url).hostname
+    return adapter.issue_token(intended_audience, scopes)
+
+
+def make_session(prefix_url, auth_adapter, instrumentation_hook=None,
+                 grpc_target=None, grpc_channels=None, resilience=None):
+  """Creates a PrefixURLSession that authenticates with auth_adapter.
+
+  If grpc_target (host:port of a grpc-backend) is specified, requests are sent
+  to it as gRPC calls rather than to prefix_url over HTTP, using grpc_channels
+  channels.  prefix_url still determines the paths of requests and the
+  audience of access tokens.  resilience (a monitorlib.resilience.Resilience)
+  adds timeouts, retries and hedging to every request.
+  """
+  s = PrefixURLSession(prefix_url)
+  if grpc_target is None:
+    s.mount('http://', auth_adapter)
+    s.mount('https://', auth_adapter)
+  else:
+    # Imported here so that grpcio is only needed when it is used.
+    from monitorlib import grpc_client
+    adapter = grpc_client.GRPCAdapter(
+        grpc_target, auth_adapter,
+        channels=grpc_channels or grpc_client.DEFAULT_CHANNELS)
+    s.mount('http://', adapter)
+    s.mount('https://', adapter)
+  # Obtain the first token while the caller is still setting up.
+  auth_adapter.prefetch_token(urllib.parse.urlparse(prefix_url).hostname)
+  if instrumentation_hook is not None:
+    s.add_instrumentation_hook(instrumentation_hook)
+  if resilience is not None:
+    s.set_resilience(resilience)
+  return s
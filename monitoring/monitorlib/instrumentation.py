@@ -0,0 +1,336 @@
+"""Timing of individual requests sent to a DSS.
+
+InstrumentedSession passes a RequestRecord for every request it sends to each
+of its instrumentation hooks.  RequestMetrics is a hook which aggregates these
+records into latency histograms per endpoint and can write them out as JSON or
+in the Prometheus text exposition format, e.g. for the node_exporter textfile
+collector or a Pushgateway.
+"""
+
+import collections
+import json
+import re
+import threading
+import time
+import urllib.parse
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from monitorlib import histogram
+
+# "endpoint" is the path of the request URL with entity IDs and versions
+# replaced by {id} and {version}.
+# "elapsed" is the number of seconds from sending the request until the
+# response body was received; "ttfb" is the number of seconds until the
+# response headers were received.
+# "error" is the name of the exception raised if no response was received, in
+# which case status, ttfb and response_bytes are None.
+RequestRecord = collections.namedtuple('RequestRecord', [
+    'host', 'method', 'endpoint', 'status', 'elapsed', 'ttfb', 'request_bytes',
+    'response_bytes', 'error'
+])
+
+InstrumentationHook = Callable[[RequestRecord], None]
+
+# Path segments following one of these are entity IDs.
+_COLLECTIONS = {
+    'identification_service_areas', 'subscriptions', 'operation_references',
+    'constraint_references'
+}
+
+# Path segments following a collection which are not entity IDs.
+_ACTIONS = {'query'}
+
+_UUID = re.compile(
+    r'^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?'
+    r'[0-9a-fA-F]{12}$')
+
+
+def is_uuid(value: str) -> bool:
+  return bool(_UUID.match(value))
+
+
+def url_template(url: str) -> str:
+  """Returns the path of url with entity IDs and versions collapsed.
+
+  For instance, /v1/dss/subscriptions/<uuid>/<version> becomes
+  /v1/dss/subscriptions/{id}/{version}.  The query string is dropped.
+  """
+  segments = urllib.parse.urlparse(url).path.split('/')
+  result = []
+  previous = None
+  for segment in segments:
+    if segment:
+      if previous in _COLLECTIONS and segment not in _ACTIONS:
+        segment = '{id}'
+      elif previous == '{id}':
+        segment = '{version}'
+      elif _UUID.match(segment):
+        segment = '{id}'
+    result.append(segment)
+    previous = segment
+  return '/'.join(result)
+
+
+def _body_size(body) -> int:
+  if body is None:
+    return 0
+  if isinstance(body, (bytes, str)):
+    return len(body)
+  # Streamed or file-like bodies: we cannot tell without consuming them.
+  return 0
+
+
+class InstrumentedSession(requests.Session):
+  """Requests session which reports the timing of every request it sends."""
+
+  def __init__(self):
+    super().__init__()
+    self.instrumentation_hooks: List[InstrumentationHook] = []
+    # A monitorlib.resilience.Resilience adding timeouts, retries and hedging.
+    self.resilience = None
+
+  def add_instrumentation_hook(self, hook: InstrumentationHook) -> None:
+    self.instrumentation_hooks.append(hook)
+
+  def set_resilience(self, resilience) -> None:
+    self.resilience = resilience
+
+  def send(self, request, **kwargs):
+    if self.resilience is not None:
+      # Each attempt (retries and hedges included) is reported to the hooks.
+      return self.resilience.send(self._send_instrumented, request, **kwargs)
+    return self._send_instrumented(request, **kwargs)
+
+  def _send_instrumented(self, request, **kwargs):
+    if not self.instrumentation_hooks:
+      return super().send(request, **kwargs)
+
+    parsed = urllib.parse.urlparse(request.url)
+    fields = {
+        'host': parsed.netloc,
+        'method': request.method,
+        'endpoint': url_template(request.url),
+        'request_bytes': _body_size(request.body),
+    }
+    t0 = time.perf_counter()
+    try:
+      resp = super().send(request, **kwargs)
+    except Exception as e:
+      self._report(RequestRecord(
+          status=None, elapsed=time.perf_counter() - t0, ttfb=None,
+          response_bytes=None, error=type(e).__name__, **fields))
+      raise
+    elapsed = time.perf_counter() - t0
+
+    if kwargs.get('stream'):
+      # Don't consume a body the caller intends to stream.
+      response_bytes = int(resp.headers.get('Content-Length', 0))
+    else:
+      response_bytes = len(resp.content)
+    self._report(RequestRecord(
+        status=resp.status_code, elapsed=elapsed,
+        ttfb=resp.elapsed.total_seconds(), response_bytes=response_bytes,
+        error=None, **fields))
+    return resp
+
+  def _report(self, record: RequestRecord) -> None:
+    for hook in self.instrumentation_hooks:
+      hook(record)
+
+
+class EndpointMetrics(object):
+  """Aggregated measurements of requests to one endpoint."""
+
+  def __init__(self):
+    self.elapsed = histogram.Histogram()
+    self.ttfb = histogram.Histogram()
+    self.statuses: Dict[str, int] = collections.Counter()
+    self.request_bytes = 0
+    self.response_bytes = 0
+
+  def record(self, record: RequestRecord) -> None:
+    self.elapsed.record(record.elapsed)
+    if record.ttfb is not None:
+      self.ttfb.record(record.ttfb)
+    self.statuses[record.error or str(record.status)] += 1
+    self.request_bytes += record.request_bytes
+    self.response_bytes += record.response_bytes or 0
+
+  def merge(self, other: 'EndpointMetrics') -> None:
+    self.elapsed.merge(other.elapsed)
+    self.ttfb.merge(other.ttfb)
+    self.statuses.update(other.statuses)
+    self.request_bytes += other.request_bytes
+    self.response_bytes += other.response_bytes
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {
+        'elapsed': self.elapsed.to_dict(),
+        'ttfb': self.ttfb.to_dict(),
+        'statuses': dict(self.statuses),
+        'request_bytes': self.request_bytes,
+        'response_bytes': self.response_bytes,
+    }
+
+  @classmethod
+  def from_dict(cls, d: Dict[str, Any]) -> 'EndpointMetrics':
+    m = cls()
+    m.elapsed = histogram.Histogram.from_dict(d['elapsed'])
+    m.ttfb = histogram.Histogram.from_dict(d['ttfb'])
+    m.statuses.update(d['statuses'])
+    m.request_bytes = d['request_bytes']
+    m.response_bytes = d['response_bytes']
+    return m
+
+
+# (host, method, endpoint)
+_EndpointKey = Tuple[str, str, str]
+
+
+def _escape_label(value: str) -> str:
+  return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def prometheus_labels(**labels) -> str:
+  """Formats labels for the Prometheus text exposition format."""
+  if not labels:
+    return ''
+  return '{' + ','.join('{}="{}"'.format(k, _escape_label(str(v)))
+                        for k, v in labels.items()) + '}'
+
+
+def prometheus_value(value: float) -> str:
+  return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def prometheus_header(name: str, kind: str, help_text: str) -> List[str]:
+  return ['# HELP {} {}'.format(name, help_text),
+          '# TYPE {} {}'.format(name, kind)]
+
+
+def prometheus_histogram(name: str, h: histogram.Histogram,
+                         labels: Dict[str, str]) -> List[str]:
+  """Returns the sample lines of a Prometheus histogram metric."""
+  lines = []
+  for bound, count in h.cumulative_counts():
+    lines.append('{}_bucket{} {}'.format(
+        name, prometheus_labels(le=prometheus_value(bound), **labels), count))
+  lines.append('{}_bucket{} {}'.format(
+      name, prometheus_labels(le='+Inf', **labels), h.count))
+  lines.append('{}_sum{} {}'.format(
+      name, prometheus_labels(**labels), prometheus_value(h.sum)))
+  lines.append('{}_count{} {}'.format(
+      name, prometheus_labels(**labels), h.count))
+  return lines
+
+
+class RequestMetrics(object):
+  """Thread-safe instrumentation hook aggregating requests per endpoint."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self.endpoints: Dict[_EndpointKey, EndpointMetrics] = {}
+
+  def __call__(self, record: RequestRecord) -> None:
+    key = (record.host, record.method, record.endpoint)
+    with self._lock:
+      metrics = self.endpoints.get(key)
+      if metrics is None:
+        metrics = EndpointMetrics()
+        self.endpoints[key] = metrics
+      metrics.record(record)
+
+  def merge(self, other: 'RequestMetrics') -> None:
+    with self._lock:
+      for key, metrics in other.endpoints.items():
+        if key not in self.endpoints:
+          self.endpoints[key] = EndpointMetrics()
+        self.endpoints[key].merge(metrics)
+
+  def to_dict(self) -> Dict[str, Any]:
+    """Returns every endpoint's histograms, for merging or archiving."""
+    with self._lock:
+      return {
+          'endpoints': [
+              dict(host=k[0], method=k[1], endpoint=k[2], **m.to_dict())
+              for k, m in sorted(self.endpoints.items())
+          ]
+      }
+
+  @classmethod
+  def from_dict(cls, d: Dict[str, Any]) -> 'RequestMetrics':
+    result = cls()
+    for e in d['endpoints']:
+      key = (e['host'], e['method'], e['endpoint'])
+      result.endpoints[key] = EndpointMetrics.from_dict(e)
+    return result
+
+  def summary(self) -> List[Dict[str, Any]]:
+    """Returns human-readable statistics for each endpoint."""
+    with self._lock:
+      return [{
+          'host': k[0],
+          'method': k[1],
+          'endpoint': k[2],
+          'statuses': dict(m.statuses),
+          'elapsed': m.elapsed.summary(),
+          'ttfb': m.ttfb.summary(),
+          'request_bytes': m.request_bytes,
+          'response_bytes': m.response_bytes,
+      } for k, m in sorted(self.endpoints.items())]
+
+  def write_json(self, path: str) -> None:
+    """Writes the summary along with the raw histograms to path."""
+    contents = {'summary': self.summary()}
+    contents.update(self.to_dict())
+    with open(path, 'w') as f:
+      json.dump(contents, f, indent=2)
+
+  def prometheus_text(self, prefix: str = 'dss_client',
+                      extra_labels: Optional[Dict[str, str]] = None) -> str:
+    """Returns the metrics in the Prometheus text exposition format."""
+    extra_labels = extra_labels or {}
+    lines = []
+
+    with self._lock:
+      endpoints = sorted(self.endpoints.items())
+
+      name = prefix + '_requests_total'
+      lines.extend(prometheus_header(
+          name, 'counter', 'Requests sent, by response status or error.'))
+      for (host, method, endpoint), m in endpoints:
+        for status, count in sorted(m.statuses.items()):
+          lines.append('{}{} {}'.format(name, prometheus_labels(
+              host=host, method=method, endpoint=endpoint, status=status,
+              **extra_labels), count))
+
+      for suffix, attr, help_text in (
+          ('request_duration_seconds', 'elapsed',
+           'Time from sending a request until its response body arrived.'),
+          ('time_to_first_byte_seconds', 'ttfb',
+           'Time from sending a request until its response headers arrived.')):
+        name = '{}_{}'.format(prefix, suffix)
+        lines.extend(prometheus_header(name, 'histogram', help_text))
+        for (host, method, endpoint), m in endpoints:
+          lines.extend(prometheus_histogram(name, getattr(m, attr), dict(
+              host=host, method=method, endpoint=endpoint, **extra_labels)))
+
+      for suffix, attr, help_text in (
+          ('request_bytes_total', 'request_bytes', 'Request body bytes sent.'),
+          ('response_bytes_total', 'response_bytes',
+           'Response body bytes received.')):
+        name = '{}_{}'.format(prefix, suffix)
+        lines.extend(prometheus_header(name, 'counter', help_text))
+        for (host, method, endpoint), m in endpoints:
+          lines.append('{}{} {}'.format(name, prometheus_labels(
+              host=host, method=method, endpoint=endpoint, **extra_labels),
+              getattr(m, attr)))
+
+    return '\n'.join(lines) + '\n'
+
+  def write_prometheus(self, path: str, prefix: str = 'dss_client',
+                       extra_labels: Optional[Dict[str, str]] = None) -> None:
+    with open(path, 'w') as f:
+      f.write(self.prometheus_text(prefix, extra_labels))
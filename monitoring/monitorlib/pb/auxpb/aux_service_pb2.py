@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: monitorlib/pb/auxpb/aux_service.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.api import annotations_pb2 as google_dot_api_dot_annotations__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n%monitorlib/pb/auxpb/aux_service.proto\x12\x05\x61uxpb\x1a\x1cgoogle/api/annotations.proto\"%\n\x14ValidateOauthRequest\x12\r\n\x05owner\x18\x01 \x01(\t\"\x17\n\x15ValidateOauthResponse2{\n\rDSSAuxService\x12j\n\rValidateOauth\x12\x1b.auxpb.ValidateOauthRequest\x1a\x1c.auxpb.ValidateOauthResponse\"\x1e\x82\xd3\xe4\x93\x02\x18\x12\x16/v1/dss/validate_oauthB\x12Z\x10pkg/api/v1/auxpbb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'monitorlib.pb.auxpb.aux_service_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'Z\020pkg/api/v1/auxpb'
+  _DSSAUXSERVICE.methods_by_name['ValidateOauth']._options = None
+  _DSSAUXSERVICE.methods_by_name['ValidateOauth']._serialized_options = b'\202\323\344\223\002\030\022\026/v1/dss/validate_oauth'
+  _VALIDATEOAUTHREQUEST._serialized_start=78
+  _VALIDATEOAUTHREQUEST._serialized_end=115
+  _VALIDATEOAUTHRESPONSE._serialized_start=117
+  _VALIDATEOAUTHRESPONSE._serialized_end=140
+  _DSSAUXSERVICE._serialized_start=142
+  _DSSAUXSERVICE._serialized_end=265
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,69 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from monitorlib.pb.auxpb import aux_service_pb2 as monitorlib_dot_pb_dot_auxpb_dot_aux__service__pb2
+
+
+class DSSAuxServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ValidateOauth = channel.unary_unary(
+                '/auxpb.DSSAuxService/ValidateOauth',
+                request_serializer=monitorlib_dot_pb_dot_auxpb_dot_aux__service__pb2.ValidateOauthRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_auxpb_dot_aux__service__pb2.ValidateOauthResponse.FromString,
+                )
+
+
+class DSSAuxServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def ValidateOauth(self, request, context):
+        """/dss/validate_oauth
+
+        Validate Oauth token against the DSS.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_DSSAuxServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ValidateOauth': grpc.unary_unary_rpc_method_handler(
+                    servicer.ValidateOauth,
+                    request_deserializer=monitorlib_dot_pb_dot_auxpb_dot_aux__service__pb2.ValidateOauthRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_auxpb_dot_aux__service__pb2.ValidateOauthResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'auxpb.DSSAuxService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class DSSAuxService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def ValidateOauth(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/auxpb.DSSAuxService/ValidateOauth',
+            monitorlib_dot_pb_dot_auxpb_dot_aux__service__pb2.ValidateOauthRequest.SerializeToString,
+            monitorlib_dot_pb_dot_auxpb_dot_aux__service__pb2.ValidateOauthResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
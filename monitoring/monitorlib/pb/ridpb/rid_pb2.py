@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: monitorlib/pb/ridpb/rid.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.api import annotations_pb2 as google_dot_api_dot_annotations__pb2
+from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1dmonitorlib/pb/ridpb/rid.proto\x12\x05ridpb\x1a\x1cgoogle/api/annotations.proto\x1a\x1fgoogle/protobuf/timestamp.proto\"b\n)CreateIdentificationServiceAreaParameters\x12 \n\x07\x65xtents\x18\x01 \x01(\x0b\x32\x0f.ridpb.Volume4D\x12\x13\n\x0b\x66lights_url\x18\x02 \x01(\t\"v\n&CreateIdentificationServiceAreaRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12@\n\x06params\x18\x02 \x01(\x0b\x32\x30.ridpb.CreateIdentificationServiceAreaParameters\"q\n\x1c\x43reateSubscriptionParameters\x12/\n\tcallbacks\x18\x01 \x01(\x0b\x32\x1c.ridpb.SubscriptionCallbacks\x12 \n\x07\x65xtents\x18\x02 \x01(\x0b\x32\x0f.ridpb.Volume4D\"\\\n\x19\x43reateSubscriptionRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x33\n\x06params\x18\x02 \x01(\x0b\x32#.ridpb.CreateSubscriptionParameters\"E\n&DeleteIdentificationServiceAreaRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\"\x91\x01\n\'DeleteIdentificationServiceAreaResponse\x12\x36\n\x0cservice_area\x18\x01 \x01(\x0b\x32 .ridpb.IdentificationServiceArea\x12.\n\x0bsubscribers\x18\x02 \x03(\x0b\x32\x19.ridpb.SubscriberToNotify\"8\n\x19\x44\x65leteSubscriptionRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\"G\n\x1a\x44\x65leteSubscriptionResponse\x12)\n\x0csubscription\x18\x01 \x01(\x0b\x32\x13.ridpb.Subscription\" \n\rErrorResponse\x12\x0f\n\x07message\x18\x01 \x01(\t\"2\n\nGeoPolygon\x12$\n\x08vertices\x18\x01 \x03(\x0b\x32\x12.ridpb.LatLngPoint\"D\n\x18GetFlightDetailsResponse\x12(\n\x07\x64\x65tails\x18\x01 \x01(\x0b\x32\x17.ridpb.RIDFlightDetails\"f\n\x12GetFlightsResponse\x12!\n\x07\x66lights\x18\x01 \x03(\x0b\x32\x10.ridpb.RIDFlight\x12-\n\ttimestamp\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"1\n#GetIdentificationServiceAreaRequest\x12\n\n\x02id\x18\x01 \x01(\t\"^\n$GetIdentificationServiceAreaResponse\x12\x36\n\x0cservice_area\x18\x01 \x01(\x0b\x32 .ridpb.IdentificationServiceArea\"$\n\x16GetSubscriptionRequest\x12\n\n\x02id\x18\x01 \x01(\t\"D\n\x17GetSubscriptionResponse\x12)\n\x0csubscription\x18\x01 \x01(\x0b\x32\x13.ridpb.Subscription\"\xba\x01\n\x19IdentificationServiceArea\x12\x13\n\x0b\x66lights_url\x18\x01 \x01(\t\x12\n\n\x02id\x18\x02 \x01(\t\x12\r\n\x05owner\x18\x03 \x01(\t\x12,\n\x08time_end\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\ntime_start\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0f\n\x07version\x18\x06 \x01(\t\"\'\n\x0bLatLngPoint\x12\x0b\n\x03lat\x18\x01 \x01(\x01\x12\x0b\n\x03lng\x18\x02 \x01(\x01\"\xbf\x01\n2PutIdentificationServiceAreaNotificationParameters\x12 \n\x07\x65xtents\x18\x01 \x01(\x0b\x32\x0f.ridpb.Volume4D\x12\x36\n\x0cservice_area\x18\x02 \x01(\x0b\x32 .ridpb.IdentificationServiceArea\x12/\n\rsubscriptions\x18\x03 \x03(\x0b\x32\x18.ridpb.SubscriptionState\"\x8e\x01\n$PutIdentificationServiceAreaResponse\x12\x36\n\x0cservice_area\x18\x01 \x01(\x0b\x32 .ridpb.IdentificationServiceArea\x12.\n\x0bsubscribers\x18\x02 \x03(\x0b\x32\x19.ridpb.SubscriberToNotify\"}\n\x17PutSubscriptionResponse\x12\x37\n\rservice_areas\x18\x01 \x03(\x0b\x32 .ridpb.IdentificationServiceArea\x12)\n\x0csubscription\x18\x02 \x01(\x0b\x32\x13.ridpb.Subscription\"\xc9\x01\n\x13RIDAircraftPosition\x12-\n\naccuracy_h\x18\x01 \x01(\x0e\x32\x19.ridpb.HorizontalAccuracy\x12+\n\naccuracy_v\x18\x02 \x01(\x0e\x32\x17.ridpb.VerticalAccuracy\x12\x0b\n\x03\x61lt\x18\x03 \x01(\x02\x12\x14\n\x0c\x65xtrapolated\x18\x04 \x01(\x08\x12\x0b\n\x03lat\x18\x05 \x01(\x01\x12\x0b\n\x03lng\x18\x06 \x01(\x01\x12\x19\n\x11pressure_altitude\x18\x07 \x01(\x02\"\x8b\x04\n\x10RIDAircraftState\x12\x15\n\rgroup_ceiling\x18\x01 \x01(\x02\x12\x13\n\x0bgroup_count\x18\x02 \x01(\x05\x12\x13\n\x0bgroup_floor\x18\x03 \x01(\x02\x12\x14\n\x0cgroup_radius\x18\x04 \x01(\x02\x12\x32\n\x0egroup_time_end\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x34\n\x10group_time_start\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12 \n\x06height\x18\x07 \x01(\x0b\x32\x10.ridpb.RIDHeight\x12\x37\n\x12operational_status\x18\x08 \x01(\x0e\x32\x1b.ridpb.RIDOperationalStatus\x12,\n\x08position\x18\t \x01(\x0b\x32\x1a.ridpb.RIDAircraftPosition\x12\r\n\x05speed\x18\n \x01(\x02\x12,\n\x0espeed_accuracy\x18\x0b \x01(\x0e\x32\x14.ridpb.SpeedAccuracy\x12-\n\ttimestamp\x18\x0c \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x1a\n\x12timestamp_accuracy\x18\r \x01(\x02\x12\r\n\x05track\x18\x0e \x01(\x02\x12\x16\n\x0evertical_speed\x18\x0f \x01(\x02\"+\n\x0bRIDAuthData\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\t\x12\x0e\n\x06\x66ormat\x18\x02 \x01(\t\"\xe7\x01\n\tRIDFlight\x12-\n\raircraft_type\x18\x01 \x01(\x0e\x32\x16.ridpb.RIDAircraftType\x12.\n\rcurrent_state\x18\x02 \x01(\x0b\x32\x17.ridpb.RIDAircraftState\x12\n\n\x02id\x18\x03 \x01(\t\x12:\n\x10recent_positions\x18\x04 \x03(\x0b\x32 .ridpb.RIDRecentAircraftPosition\x12\x11\n\tsimulated\x18\x05 \x01(\x08\x12 \n\x07volumes\x18\x06 \x03(\x0b\x32\x0f.ridpb.Volume4D\"\xdc\x01\n\x10RIDFlightDetails\x12%\n\tauth_data\x18\x01 \x01(\x0b\x32\x12.ridpb.RIDAuthData\x12\n\n\x02id\x18\x02 \x01(\t\x12\x1d\n\x15operation_description\x18\x03 \x01(\t\x12\x13\n\x0boperator_id\x18\x04 \x01(\t\x12-\n\x11operator_location\x18\x05 \x01(\x0b\x32\x12.ridpb.LatLngPoint\x12\x1b\n\x13registration_number\x18\x06 \x01(\t\x12\x15\n\rserial_number\x18\x07 \x01(\t\"\xbd\x01\n\tRIDHeight\x12\x10\n\x08\x64istance\x18\x01 \x01(\x02\x12\x36\n\treference\x18\x02 \x01(\x0e\x32#.ridpb.RIDHeight.RIDHeightReference\"f\n\x12RIDHeightReference\x12)\n%RID_HEIGHT_REFERENCE_TAKEOFF_LOCATION\x10\x00\x12%\n!RID_HEIGHT_REFERENCE_GROUND_LEVEL\x10\x01\"s\n\x19RIDRecentAircraftPosition\x12,\n\x08position\x18\x01 \x01(\x0b\x32\x1a.ridpb.RIDAircraftPosition\x12(\n\x04time\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\x9b\x01\n\'SearchIdentificationServiceAreasRequest\x12\x0c\n\x04\x61rea\x18\x01 \x01(\t\x12\x31\n\rearliest_time\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12/\n\x0blatest_time\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"c\n(SearchIdentificationServiceAreasResponse\x12\x37\n\rservice_areas\x18\x01 \x03(\x0b\x32 .ridpb.IdentificationServiceArea\"*\n\x1aSearchSubscriptionsRequest\x12\x0c\n\x04\x61rea\x18\x01 \x01(\t\"I\n\x1bSearchSubscriptionsResponse\x12*\n\rsubscriptions\x18\x01 \x03(\x0b\x32\x13.ridpb.Subscription\"R\n\x12SubscriberToNotify\x12/\n\rsubscriptions\x18\x01 \x03(\x0b\x32\x18.ridpb.SubscriptionState\x12\x0b\n\x03url\x18\x02 \x01(\t\"\xe5\x01\n\x0cSubscription\x12/\n\tcallbacks\x18\x01 \x01(\x0b\x32\x1c.ridpb.SubscriptionCallbacks\x12\n\n\x02id\x18\x02 \x01(\t\x12\x1a\n\x12notification_index\x18\x03 \x01(\x05\x12\r\n\x05owner\x18\x04 \x01(\t\x12,\n\x08time_end\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\ntime_start\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0f\n\x07version\x18\x07 \x01(\t\"@\n\x15SubscriptionCallbacks\x12\'\n\x1fidentification_service_area_url\x18\x01 \x01(\t\"H\n\x11SubscriptionState\x12\x1a\n\x12notification_index\x18\x01 \x01(\x05\x12\x17\n\x0fsubscription_id\x18\x02 \x01(\t\"b\n)UpdateIdentificationServiceAreaParameters\x12 \n\x07\x65xtents\x18\x01 \x01(\x0b\x32\x0f.ridpb.Volume4D\x12\x13\n\x0b\x66lights_url\x18\x02 \x01(\t\"\x87\x01\n&UpdateIdentificationServiceAreaRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12@\n\x06params\x18\x02 \x01(\x0b\x32\x30.ridpb.UpdateIdentificationServiceAreaParameters\x12\x0f\n\x07version\x18\x03 \x01(\t\"q\n\x1cUpdateSubscriptionParameters\x12/\n\tcallbacks\x18\x01 \x01(\x0b\x32\x1c.ridpb.SubscriptionCallbacks\x12 \n\x07\x65xtents\x18\x02 \x01(\x0b\x32\x0f.ridpb.Volume4D\"m\n\x19UpdateSubscriptionRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x33\n\x06params\x18\x02 \x01(\x0b\x32#.ridpb.UpdateSubscriptionParameters\x12\x0f\n\x07version\x18\x03 \x01(\t\"Z\n\x08Volume3D\x12\x13\n\x0b\x61ltitude_hi\x18\x01 \x01(\x02\x12\x13\n\x0b\x61ltitude_lo\x18\x02 \x01(\x02\x12$\n\tfootprint\x18\x03 \x01(\x0b\x32\x11.ridpb.GeoPolygon\"\x91\x01\n\x08Volume4D\x12\'\n\x0espatial_volume\x18\x01 \x01(\x0b\x32\x0f.ridpb.Volume3D\x12,\n\x08time_end\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\ntime_start\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp*\xd3\x01\n\x12HorizontalAccuracy\x12\x0e\n\nHA_UNKNOWN\x10\x00\x12\x11\n\rH_A10_NM_PLUS\x10\x01\x12\x0c\n\x08H_A10_NM\x10\x02\x12\x0b\n\x07H_A4_NM\x10\x03\x12\x0b\n\x07H_A2_NM\x10\x04\x12\x0b\n\x07H_A1_NM\x10\x05\x12\x0c\n\x08H_A05_NM\x10\x06\x12\x0c\n\x08H_A03_NM\x10\x07\x12\x0c\n\x08H_A01_NM\x10\x08\x12\r\n\tH_A005_NM\x10\t\x12\n\n\x06H_A30M\x10\n\x12\n\n\x06H_A10M\x10\x0b\x12\t\n\x05H_A3M\x10\x0c\x12\t\n\x05H_A1M\x10\r*\x9d\x02\n\x0fRIDAircraftType\x12\x10\n\x0cNOT_DECLARED\x10\x00\x12\r\n\tAEROPLANE\x10\x01\x12\x0e\n\nROTORCRAFT\x10\x02\x12\r\n\tGYROPLANE\x10\x03\x12\x08\n\x04VTOL\x10\x04\x12\x0f\n\x0bORNITHOPTER\x10\x05\x12\n\n\x06GLIDER\x10\x06\x12\x08\n\x04KITE\x10\x07\x12\x10\n\x0c\x46REE_BALLOON\x10\x08\x12\x13\n\x0f\x43\x41PTIVE_BALLOON\x10\t\x12\x0b\n\x07\x41IRSHIP\x10\n\x12\x1a\n\x16\x46REE_FALL_OR_PARACHUTE\x10\x0b\x12\n\n\x06ROCKET\x10\x0c\x12\x1d\n\x19TETHERED_POWERED_AIRCRAFT\x10\r\x12\x13\n\x0fGROUND_OBSTACLE\x10\x0e\x12\t\n\x05OTHER\x10\x0f*@\n\x14RIDOperationalStatus\x12\x0e\n\nUNDECLARED\x10\x00\x12\n\n\x06GROUND\x10\x01\x12\x0c\n\x08\x41IRBORNE\x10\x02*h\n\rSpeedAccuracy\x12\x0e\n\nSA_UNKNOWN\x10\x00\x12\x11\n\rS_A10MPS_PLUS\x10\x01\x12\x0c\n\x08S_A10MPS\x10\x02\x12\x0b\n\x07S_A3MPS\x10\x03\x12\x0b\n\x07S_A1MPS\x10\x04\x12\x0c\n\x08S_A03MPS\x10\x05*{\n\x10VerticalAccuracy\x12\x0e\n\nVA_UNKNOWN\x10\x00\x12\x10\n\x0cV_A150M_PLUS\x10\x01\x12\x0b\n\x07V_A150M\x10\x02\x12\n\n\x06V_A45M\x10\x03\x12\n\n\x06V_A25M\x10\x04\x12\n\n\x06V_A10M\x10\x05\x12\t\n\x05V_A3M\x10\x06\x12\t\n\x05V_A1M\x10\x07\x32\xd6\x0c\n\"DiscoveryAndSynchronizationService\x12\xb8\x01\n\x1f\x43reateIdentificationServiceArea\x12-.ridpb.CreateIdentificationServiceAreaRequest\x1a+.ridpb.PutIdentificationServiceAreaResponse\"9\x82\xd3\xe4\x93\x02\x33\x1a)/v1/dss/identification_service_areas/{id}:\x06params\x12\x82\x01\n\x12\x43reateSubscription\x12 .ridpb.CreateSubscriptionRequest\x1a\x1e.ridpb.PutSubscriptionResponse\"*\x82\xd3\xe4\x93\x02$\x1a\x1a/v1/dss/subscriptions/{id}:\x06params\x12\xbd\x01\n\x1f\x44\x65leteIdentificationServiceArea\x12-.ridpb.DeleteIdentificationServiceAreaRequest\x1a..ridpb.DeleteIdentificationServiceAreaResponse\";\x82\xd3\xe4\x93\x02\x35*3/v1/dss/identification_service_areas/{id}/{version}\x12\x87\x01\n\x12\x44\x65leteSubscription\x12 .ridpb.DeleteSubscriptionRequest\x1a!.ridpb.DeleteSubscriptionResponse\",\x82\xd3\xe4\x93\x02&*$/v1/dss/subscriptions/{id}/{version}\x12\xaa\x01\n\x1cGetIdentificationServiceArea\x12*.ridpb.GetIdentificationServiceAreaRequest\x1a+.ridpb.GetIdentificationServiceAreaResponse\"1\x82\xd3\xe4\x93\x02+\x12)/v1/dss/identification_service_areas/{id}\x12t\n\x0fGetSubscription\x12\x1d.ridpb.GetSubscriptionRequest\x1a\x1e.ridpb.GetSubscriptionResponse\"\"\x82\xd3\xe4\x93\x02\x1c\x12\x1a/v1/dss/subscriptions/{id}\x12\xb1\x01\n SearchIdentificationServiceAreas\x12..ridpb.SearchIdentificationServiceAreasRequest\x1a/.ridpb.SearchIdentificationServiceAreasResponse\",\x82\xd3\xe4\x93\x02&\x12$/v1/dss/identification_service_areas\x12{\n\x13SearchSubscriptions\x12!.ridpb.SearchSubscriptionsRequest\x1a\".ridpb.SearchSubscriptionsResponse\"\x1d\x82\xd3\xe4\x93\x02\x17\x12\x15/v1/dss/subscriptions\x12\xc2\x01\n\x1fUpdateIdentificationServiceArea\x12-.ridpb.UpdateIdentificationServiceAreaRequest\x1a+.ridpb.PutIdentificationServiceAreaResponse\"C\x82\xd3\xe4\x93\x02=\x1a\x33/v1/dss/identification_service_areas/{id}/{version}:\x06params\x12\x8c\x01\n\x12UpdateSubscription\x12 .ridpb.UpdateSubscriptionRequest\x1a\x1e.ridpb.PutSubscriptionResponse\"4\x82\xd3\xe4\x93\x02.\x1a$/v1/dss/subscriptions/{id}/{version}:\x06paramsb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'monitorlib.pb.ridpb.rid_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['CreateIdentificationServiceArea']._options = None
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['CreateIdentificationServiceArea']._serialized_options = b'\202\323\344\223\0023\032)/v1/dss/identification_service_areas/{id}:\006params'
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['CreateSubscription']._options = None
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['CreateSubscription']._serialized_options = b'\202\323\344\223\002$\032\032/v1/dss/subscriptions/{id}:\006params'
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['DeleteIdentificationServiceArea']._options = None
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['DeleteIdentificationServiceArea']._serialized_options = b'\202\323\344\223\0025*3/v1/dss/identification_service_areas/{id}/{version}'
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['DeleteSubscription']._options = None
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['DeleteSubscription']._serialized_options = b'\202\323\344\223\002&*$/v1/dss/subscriptions/{id}/{version}'
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['GetIdentificationServiceArea']._options = None
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['GetIdentificationServiceArea']._serialized_options = b'\202\323\344\223\002+\022)/v1/dss/identification_service_areas/{id}'
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['GetSubscription']._options = None
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['GetSubscription']._serialized_options = b'\202\323\344\223\002\034\022\032/v1/dss/subscriptions/{id}'
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['SearchIdentificationServiceAreas']._options = None
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['SearchIdentificationServiceAreas']._serialized_options = b'\202\323\344\223\002&\022$/v1/dss/identification_service_areas'
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['SearchSubscriptions']._options = None
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['SearchSubscriptions']._serialized_options = b'\202\323\344\223\002\027\022\025/v1/dss/subscriptions'
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['UpdateIdentificationServiceArea']._options = None
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['UpdateIdentificationServiceArea']._serialized_options = b'\202\323\344\223\002=\0323/v1/dss/identification_service_areas/{id}/{version}:\006params'
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['UpdateSubscription']._options = None
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE.methods_by_name['UpdateSubscription']._serialized_options = b'\202\323\344\223\002.\032$/v1/dss/subscriptions/{id}/{version}:\006params'
+  _HORIZONTALACCURACY._serialized_start=5173
+  _HORIZONTALACCURACY._serialized_end=5384
+  _RIDAIRCRAFTTYPE._serialized_start=5387
+  _RIDAIRCRAFTTYPE._serialized_end=5672
+  _RIDOPERATIONALSTATUS._serialized_start=5674
+  _RIDOPERATIONALSTATUS._serialized_end=5738
+  _SPEEDACCURACY._serialized_start=5740
+  _SPEEDACCURACY._serialized_end=5844
+  _VERTICALACCURACY._serialized_start=5846
+  _VERTICALACCURACY._serialized_end=5969
+  _CREATEIDENTIFICATIONSERVICEAREAPARAMETERS._serialized_start=103
+  _CREATEIDENTIFICATIONSERVICEAREAPARAMETERS._serialized_end=201
+  _CREATEIDENTIFICATIONSERVICEAREAREQUEST._serialized_start=203
+  _CREATEIDENTIFICATIONSERVICEAREAREQUEST._serialized_end=321
+  _CREATESUBSCRIPTIONPARAMETERS._serialized_start=323
+  _CREATESUBSCRIPTIONPARAMETERS._serialized_end=436
+  _CREATESUBSCRIPTIONREQUEST._serialized_start=438
+  _CREATESUBSCRIPTIONREQUEST._serialized_end=530
+  _DELETEIDENTIFICATIONSERVICEAREAREQUEST._serialized_start=532
+  _DELETEIDENTIFICATIONSERVICEAREAREQUEST._serialized_end=601
+  _DELETEIDENTIFICATIONSERVICEAREARESPONSE._serialized_start=604
+  _DELETEIDENTIFICATIONSERVICEAREARESPONSE._serialized_end=749
+  _DELETESUBSCRIPTIONREQUEST._serialized_start=751
+  _DELETESUBSCRIPTIONREQUEST._serialized_end=807
+  _DELETESUBSCRIPTIONRESPONSE._serialized_start=809
+  _DELETESUBSCRIPTIONRESPONSE._serialized_end=880
+  _ERRORRESPONSE._serialized_start=882
+  _ERRORRESPONSE._serialized_end=914
+  _GEOPOLYGON._serialized_start=916
+  _GEOPOLYGON._serialized_end=966
+  _GETFLIGHTDETAILSRESPONSE._serialized_start=968
+  _GETFLIGHTDETAILSRESPONSE._serialized_end=1036
+  _GETFLIGHTSRESPONSE._serialized_start=1038
+  _GETFLIGHTSRESPONSE._serialized_end=1140
+  _GETIDENTIFICATIONSERVICEAREAREQUEST._serialized_start=1142
+  _GETIDENTIFICATIONSERVICEAREAREQUEST._serialized_end=1191
+  _GETIDENTIFICATIONSERVICEAREARESPONSE._serialized_start=1193
+  _GETIDENTIFICATIONSERVICEAREARESPONSE._serialized_end=1287
+  _GETSUBSCRIPTIONREQUEST._serialized_start=1289
+  _GETSUBSCRIPTIONREQUEST._serialized_end=1325
+  _GETSUBSCRIPTIONRESPONSE._serialized_start=1327
+  _GETSUBSCRIPTIONRESPONSE._serialized_end=1395
+  _IDENTIFICATIONSERVICEAREA._serialized_start=1398
+  _IDENTIFICATIONSERVICEAREA._serialized_end=1584
+  _LATLNGPOINT._serialized_start=1586
+  _LATLNGPOINT._serialized_end=1625
+  _PUTIDENTIFICATIONSERVICEAREANOTIFICATIONPARAMETERS._serialized_start=1628
+  _PUTIDENTIFICATIONSERVICEAREANOTIFICATIONPARAMETERS._serialized_end=1819
+  _PUTIDENTIFICATIONSERVICEAREARESPONSE._serialized_start=1822
+  _PUTIDENTIFICATIONSERVICEAREARESPONSE._serialized_end=1964
+  _PUTSUBSCRIPTIONRESPONSE._serialized_start=1966
+  _PUTSUBSCRIPTIONRESPONSE._serialized_end=2091
+  _RIDAIRCRAFTPOSITION._serialized_start=2094
+  _RIDAIRCRAFTPOSITION._serialized_end=2295
+  _RIDAIRCRAFTSTATE._serialized_start=2298
+  _RIDAIRCRAFTSTATE._serialized_end=2821
+  _RIDAUTHDATA._serialized_start=2823
+  _RIDAUTHDATA._serialized_end=2866
+  _RIDFLIGHT._serialized_start=2869
+  _RIDFLIGHT._serialized_end=3100
+  _RIDFLIGHTDETAILS._serialized_start=3103
+  _RIDFLIGHTDETAILS._serialized_end=3323
+  _RIDHEIGHT._serialized_start=3326
+  _RIDHEIGHT._serialized_end=3515
+  _RIDHEIGHT_RIDHEIGHTREFERENCE._serialized_start=3413
+  _RIDHEIGHT_RIDHEIGHTREFERENCE._serialized_end=3515
+  _RIDRECENTAIRCRAFTPOSITION._serialized_start=3517
+  _RIDRECENTAIRCRAFTPOSITION._serialized_end=3632
+  _SEARCHIDENTIFICATIONSERVICEAREASREQUEST._serialized_start=3635
+  _SEARCHIDENTIFICATIONSERVICEAREASREQUEST._serialized_end=3790
+  _SEARCHIDENTIFICATIONSERVICEAREASRESPONSE._serialized_start=3792
+  _SEARCHIDENTIFICATIONSERVICEAREASRESPONSE._serialized_end=3891
+  _SEARCHSUBSCRIPTIONSREQUEST._serialized_start=3893
+  _SEARCHSUBSCRIPTIONSREQUEST._serialized_end=3935
+  _SEARCHSUBSCRIPTIONSRESPONSE._serialized_start=3937
+  _SEARCHSUBSCRIPTIONSRESPONSE._serialized_end=4010
+  _SUBSCRIBERTONOTIFY._serialized_start=4012
+  _SUBSCRIBERTONOTIFY._serialized_end=4094
+  _SUBSCRIPTION._serialized_start=4097
+  _SUBSCRIPTION._serialized_end=4326
+  _SUBSCRIPTIONCALLBACKS._serialized_start=4328
+  _SUBSCRIPTIONCALLBACKS._serialized_end=4392
+  _SUBSCRIPTIONSTATE._serialized_start=4394
+  _SUBSCRIPTIONSTATE._serialized_end=4466
+  _UPDATEIDENTIFICATIONSERVICEAREAPARAMETERS._serialized_start=4468
+  _UPDATEIDENTIFICATIONSERVICEAREAPARAMETERS._serialized_end=4566
+  _UPDATEIDENTIFICATIONSERVICEAREAREQUEST._serialized_start=4569
+  _UPDATEIDENTIFICATIONSERVICEAREAREQUEST._serialized_end=4704
+  _UPDATESUBSCRIPTIONPARAMETERS._serialized_start=4706
+  _UPDATESUBSCRIPTIONPARAMETERS._serialized_end=4819
+  _UPDATESUBSCRIPTIONREQUEST._serialized_start=4821
+  _UPDATESUBSCRIPTIONREQUEST._serialized_end=4930
+  _VOLUME3D._serialized_start=4932
+  _VOLUME3D._serialized_end=5022
+  _VOLUME4D._serialized_start=5025
+  _VOLUME4D._serialized_end=5170
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE._serialized_start=5972
+  _DISCOVERYANDSYNCHRONIZATIONSERVICE._serialized_end=7594
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,403 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from monitorlib.pb.ridpb import rid_pb2 as monitorlib_dot_pb_dot_ridpb_dot_rid__pb2
+
+
+class DiscoveryAndSynchronizationServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.CreateIdentificationServiceArea = channel.unary_unary(
+                '/ridpb.DiscoveryAndSynchronizationService/CreateIdentificationServiceArea',
+                request_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.CreateIdentificationServiceAreaRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutIdentificationServiceAreaResponse.FromString,
+                )
+        self.CreateSubscription = channel.unary_unary(
+                '/ridpb.DiscoveryAndSynchronizationService/CreateSubscription',
+                request_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.CreateSubscriptionRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutSubscriptionResponse.FromString,
+                )
+        self.DeleteIdentificationServiceArea = channel.unary_unary(
+                '/ridpb.DiscoveryAndSynchronizationService/DeleteIdentificationServiceArea',
+                request_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteIdentificationServiceAreaRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteIdentificationServiceAreaResponse.FromString,
+                )
+        self.DeleteSubscription = channel.unary_unary(
+                '/ridpb.DiscoveryAndSynchronizationService/DeleteSubscription',
+                request_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteSubscriptionRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteSubscriptionResponse.FromString,
+                )
+        self.GetIdentificationServiceArea = channel.unary_unary(
+                '/ridpb.DiscoveryAndSynchronizationService/GetIdentificationServiceArea',
+                request_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetIdentificationServiceAreaRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetIdentificationServiceAreaResponse.FromString,
+                )
+        self.GetSubscription = channel.unary_unary(
+                '/ridpb.DiscoveryAndSynchronizationService/GetSubscription',
+                request_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetSubscriptionRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetSubscriptionResponse.FromString,
+                )
+        self.SearchIdentificationServiceAreas = channel.unary_unary(
+                '/ridpb.DiscoveryAndSynchronizationService/SearchIdentificationServiceAreas',
+                request_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchIdentificationServiceAreasRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchIdentificationServiceAreasResponse.FromString,
+                )
+        self.SearchSubscriptions = channel.unary_unary(
+                '/ridpb.DiscoveryAndSynchronizationService/SearchSubscriptions',
+                request_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchSubscriptionsRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchSubscriptionsResponse.FromString,
+                )
+        self.UpdateIdentificationServiceArea = channel.unary_unary(
+                '/ridpb.DiscoveryAndSynchronizationService/UpdateIdentificationServiceArea',
+                request_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.UpdateIdentificationServiceAreaRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutIdentificationServiceAreaResponse.FromString,
+                )
+        self.UpdateSubscription = channel.unary_unary(
+                '/ridpb.DiscoveryAndSynchronizationService/UpdateSubscription',
+                request_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.UpdateSubscriptionRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutSubscriptionResponse.FromString,
+                )
+
+
+class DiscoveryAndSynchronizationServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def CreateIdentificationServiceArea(self, request, context):
+        """/dss/identification_service_areas/{id}
+
+        Create a new Identification Service Area.  This call will fail if an Identification Service Area with the same ID already exists.
+
+        The DSS assumes the USS has already added the appropriate retention period to operation end time in `time_end` field before storing it.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CreateSubscription(self, request, context):
+        """/dss/subscriptions/{id}
+
+        Create a subscription.  This call will fail if a Subscription with the same ID already exists.
+
+        Subscription notifications are only triggered by (and contain full information of) changes to, creation of, or deletion of, Entities referenced by or stored in the DSS; they do not involve any data transfer (such as remote ID telemetry updates) apart from Entity information.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeleteIdentificationServiceArea(self, request, context):
+        """/dss/identification_service_areas/{id}/{version}
+
+        Delete an Identification Service Area.  USSs should not delete Identification Service Areas before the end of the last managed flight plus the retention period.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeleteSubscription(self, request, context):
+        """/dss/subscriptions/{id}/{version}
+
+        Delete a subscription.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetIdentificationServiceArea(self, request, context):
+        """/dss/identification_service_areas/{id}
+
+        Retrieve full information of an Identification Service Area owned by the client.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSubscription(self, request, context):
+        """/dss/subscriptions/{id}
+
+        Verify the existence/valdity and state of a particular subscription.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SearchIdentificationServiceAreas(self, request, context):
+        """/dss/identification_service_areas
+
+        Retrieve all Identification Service Areas in the DAR for a given area during the given time.  Note that some Identification Service Areas returned may lie entirely outside the requested area.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SearchSubscriptions(self, request, context):
+        """/dss/subscriptions
+
+        Retrieve subscriptions intersecting an area of interest.  Subscription notifications are only triggered by (and contain full information of) changes to, creation of, or deletion of, Entities referenced by or stored in the DSS; they do not involve any data transfer (such as remote ID telemetry updates) apart from Entity information.
+
+        Only Subscriptions belonging to the caller are returned.  This endpoint would be used if a USS lost track of Subscriptions they had created and/or wanted to resolve an error indicating that they had too many existing Subscriptions in an area.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpdateIdentificationServiceArea(self, request, context):
+        """/dss/identification_service_areas/{id}/{version}
+
+        Update an Identification Service Area.  The full content of the existing Identification Service Area will be replaced with the provided information as only the most recent version is retained.
+
+        The DSS assumes the USS has already added the appropriate retention period to operation end time in `time_end` field before storing it.  Updating `time_start` is not allowed if it is before the current time.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpdateSubscription(self, request, context):
+        """/dss/subscriptions/{id}/{version}
+
+        Update a Subscription.  The full content of the existing Subscription will be replaced with the provided information as only the most recent version is retained.
+
+        Subscription notifications are only triggered by (and contain full information of) changes to, creation of, or deletion of, Entities referenced by or stored in the DSS; they do not involve any data transfer (such as remote ID telemetry updates) apart from Entity information.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_DiscoveryAndSynchronizationServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'CreateIdentificationServiceArea': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateIdentificationServiceArea,
+                    request_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.CreateIdentificationServiceAreaRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutIdentificationServiceAreaResponse.SerializeToString,
+            ),
+            'CreateSubscription': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateSubscription,
+                    request_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.CreateSubscriptionRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutSubscriptionResponse.SerializeToString,
+            ),
+            'DeleteIdentificationServiceArea': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeleteIdentificationServiceArea,
+                    request_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteIdentificationServiceAreaRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteIdentificationServiceAreaResponse.SerializeToString,
+            ),
+            'DeleteSubscription': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeleteSubscription,
+                    request_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteSubscriptionRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteSubscriptionResponse.SerializeToString,
+            ),
+            'GetIdentificationServiceArea': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetIdentificationServiceArea,
+                    request_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetIdentificationServiceAreaRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetIdentificationServiceAreaResponse.SerializeToString,
+            ),
+            'GetSubscription': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSubscription,
+                    request_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetSubscriptionRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetSubscriptionResponse.SerializeToString,
+            ),
+            'SearchIdentificationServiceAreas': grpc.unary_unary_rpc_method_handler(
+                    servicer.SearchIdentificationServiceAreas,
+                    request_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchIdentificationServiceAreasRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchIdentificationServiceAreasResponse.SerializeToString,
+            ),
+            'SearchSubscriptions': grpc.unary_unary_rpc_method_handler(
+                    servicer.SearchSubscriptions,
+                    request_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchSubscriptionsRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchSubscriptionsResponse.SerializeToString,
+            ),
+            'UpdateIdentificationServiceArea': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdateIdentificationServiceArea,
+                    request_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.UpdateIdentificationServiceAreaRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutIdentificationServiceAreaResponse.SerializeToString,
+            ),
+            'UpdateSubscription': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdateSubscription,
+                    request_deserializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.UpdateSubscriptionRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutSubscriptionResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'ridpb.DiscoveryAndSynchronizationService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class DiscoveryAndSynchronizationService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def CreateIdentificationServiceArea(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ridpb.DiscoveryAndSynchronizationService/CreateIdentificationServiceArea',
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.CreateIdentificationServiceAreaRequest.SerializeToString,
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutIdentificationServiceAreaResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def CreateSubscription(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ridpb.DiscoveryAndSynchronizationService/CreateSubscription',
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.CreateSubscriptionRequest.SerializeToString,
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutSubscriptionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def DeleteIdentificationServiceArea(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ridpb.DiscoveryAndSynchronizationService/DeleteIdentificationServiceArea',
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteIdentificationServiceAreaRequest.SerializeToString,
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteIdentificationServiceAreaResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def DeleteSubscription(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ridpb.DiscoveryAndSynchronizationService/DeleteSubscription',
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteSubscriptionRequest.SerializeToString,
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.DeleteSubscriptionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetIdentificationServiceArea(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ridpb.DiscoveryAndSynchronizationService/GetIdentificationServiceArea',
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetIdentificationServiceAreaRequest.SerializeToString,
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetIdentificationServiceAreaResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetSubscription(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ridpb.DiscoveryAndSynchronizationService/GetSubscription',
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetSubscriptionRequest.SerializeToString,
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.GetSubscriptionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SearchIdentificationServiceAreas(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ridpb.DiscoveryAndSynchronizationService/SearchIdentificationServiceAreas',
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchIdentificationServiceAreasRequest.SerializeToString,
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchIdentificationServiceAreasResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SearchSubscriptions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ridpb.DiscoveryAndSynchronizationService/SearchSubscriptions',
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchSubscriptionsRequest.SerializeToString,
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.SearchSubscriptionsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def UpdateIdentificationServiceArea(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ridpb.DiscoveryAndSynchronizationService/UpdateIdentificationServiceArea',
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.UpdateIdentificationServiceAreaRequest.SerializeToString,
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutIdentificationServiceAreaResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def UpdateSubscription(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ridpb.DiscoveryAndSynchronizationService/UpdateSubscription',
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.UpdateSubscriptionRequest.SerializeToString,
+            monitorlib_dot_pb_dot_ridpb_dot_rid__pb2.PutSubscriptionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
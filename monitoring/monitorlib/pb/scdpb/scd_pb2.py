@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: monitorlib/pb/scdpb/scd.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.api import annotations_pb2 as google_dot_api_dot_annotations__pb2
+from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1dmonitorlib/pb/scdpb/scd.proto\x12\x05scdpb\x1a\x1cgoogle/api/annotations.proto\x1a\x1fgoogle/protobuf/timestamp.proto\"]\n\x18\x41irspaceConflictResponse\x12\x30\n\x10\x65ntity_conflicts\x18\x01 \x03(\x0b\x32\x16.scdpb.EntityReference\x12\x0f\n\x07message\x18\x02 \x01(\t\";\n\x08\x41ltitude\x12\x11\n\treference\x18\x01 \x01(\t\x12\r\n\x05units\x18\x02 \x01(\t\x12\r\n\x05value\x18\x03 \x01(\x01\"\x8d\x01\n!ChangeConstraintReferenceResponse\x12\x38\n\x14\x63onstraint_reference\x18\x01 \x01(\x0b\x32\x1a.scdpb.ConstraintReference\x12.\n\x0bsubscribers\x18\x02 \x03(\x0b\x32\x19.scdpb.SubscriberToNotify\"\x8a\x01\n ChangeOperationReferenceResponse\x12\x36\n\x13operation_reference\x18\x01 \x01(\x0b\x32\x19.scdpb.OperationReference\x12.\n\x0bsubscribers\x18\x02 \x03(\x0b\x32\x19.scdpb.SubscriberToNotify\"\xb8\x01\n\x06\x43ircle\x12/\n\x08geometry\x18\x01 \x01(\x0b\x32\x1d.scdpb.Circle.GeometryMessage\x12+\n\nproperties\x18\x02 \x01(\x0b\x32\x17.scdpb.CircleProperties\x12\x0c\n\x04type\x18\x03 \x01(\t\x1a\x42\n\x0fGeometryMessage\x12!\n\x0b\x63oordinates\x18\x01 \x01(\x0b\x32\x0c.scdpb.Point\x12\x0c\n\x04type\x18\x02 \x01(\t\"1\n\x10\x43ircleProperties\x12\x1d\n\x06radius\x18\x01 \x01(\x0b\x32\r.scdpb.Radius\"f\n\nConstraint\x12)\n\x07\x64\x65tails\x18\x01 \x01(\x0b\x32\x18.scdpb.ConstraintDetails\x12-\n\treference\x18\x02 \x01(\x0b\x32\x1a.scdpb.ConstraintReference\"C\n\x11\x43onstraintDetails\x12\x0c\n\x04type\x18\x01 \x01(\t\x12 \n\x07volumes\x18\x02 \x03(\x0b\x32\x0f.scdpb.Volume4D\"\xa4\x01\n\x13\x43onstraintReference\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0b\n\x03ovn\x18\x02 \x01(\t\x12\r\n\x05owner\x18\x03 \x01(\t\x12\x1d\n\x08time_end\x18\x04 \x01(\x0b\x32\x0b.scdpb.Time\x12\x1f\n\ntime_start\x18\x05 \x01(\x0b\x32\x0b.scdpb.Time\x12\x14\n\x0cuss_base_url\x18\x06 \x01(\t\x12\x0f\n\x07version\x18\x07 \x01(\x05\"6\n DeleteConstraintReferenceRequest\x12\x12\n\nentityuuid\x18\x01 \x01(\t\"5\n\x1f\x44\x65leteOperationReferenceRequest\x12\x12\n\nentityuuid\x18\x01 \x01(\t\"3\n\x19\x44\x65leteSubscriptionRequest\x12\x16\n\x0esubscriptionid\x18\x01 \x01(\t\"G\n\x1a\x44\x65leteSubscriptionResponse\x12)\n\x0csubscription\x18\x01 \x01(\x0b\x32\x13.scdpb.Subscription\"\x83\x01\n\x0f\x45ntityReference\x12\x38\n\x14\x63onstraint_reference\x18\x01 \x01(\x0b\x32\x1a.scdpb.ConstraintReference\x12\x36\n\x13operation_reference\x18\x02 \x01(\x0b\x32\x19.scdpb.OperationReference\"\xd2\x01\n\x0b\x45rrorReport\x12\x0c\n\x04\x62ody\x18\x01 \x01(\t\x12\x0f\n\x07headers\x18\x02 \x03(\t\x12\x0f\n\x07problem\x18\x03 \x01(\t\x12\x11\n\treport_id\x18\x04 \x01(\t\x12\x15\n\rresponse_body\x18\x05 \x01(\t\x12\x15\n\rresponse_code\x18\x06 \x01(\x05\x12!\n\x0ctime_request\x18\x07 \x01(\x0b\x32\x0b.scdpb.Time\x12\"\n\rtime_response\x18\x08 \x01(\x0b\x32\x0b.scdpb.Time\x12\x0b\n\x03url\x18\t \x01(\t\" \n\rErrorResponse\x12\x0f\n\x07message\x18\x01 \x01(\t\"E\n\x1cGetConstraintDetailsResponse\x12%\n\nconstraint\x18\x01 \x01(\x0b\x32\x11.scdpb.Constraint\"3\n\x1dGetConstraintReferenceRequest\x12\x12\n\nentityuuid\x18\x01 \x01(\t\"Z\n\x1eGetConstraintReferenceResponse\x12\x38\n\x14\x63onstraint_reference\x18\x01 \x01(\x0b\x32\x1a.scdpb.ConstraintReference\"B\n\x1bGetOperationDetailsResponse\x12#\n\toperation\x18\x01 \x01(\x0b\x32\x10.scdpb.Operation\"2\n\x1cGetOperationReferenceRequest\x12\x12\n\nentityuuid\x18\x01 \x01(\t\"W\n\x1dGetOperationReferenceResponse\x12\x36\n\x13operation_reference\x18\x01 \x01(\x0b\x32\x19.scdpb.OperationReference\"K\n\x1dGetOperationTelemetryResponse\x12*\n\ttelemetry\x18\x01 \x01(\x0b\x32\x17.scdpb.VehicleTelemetry\"0\n\x16GetSubscriptionRequest\x12\x16\n\x0esubscriptionid\x18\x01 \x01(\t\"D\n\x17GetSubscriptionResponse\x12)\n\x0csubscription\x18\x01 \x01(\x0b\x32\x13.scdpb.Subscription\"V\n\x1eImplicitSubscriptionParameters\x12\x1e\n\x16notify_for_constraints\x18\x01 \x01(\x08\x12\x14\n\x0cuss_base_url\x18\x02 \x01(\t\":\n\x14MakeDssReportRequest\x12\"\n\x06params\x18\x01 \x01(\x0b\x32\x12.scdpb.ErrorReport\"c\n\tOperation\x12(\n\x07\x64\x65tails\x18\x01 \x01(\x0b\x32\x17.scdpb.OperationDetails\x12,\n\treference\x18\x02 \x01(\x0b\x32\x19.scdpb.OperationReference\"Q\n\x10OperationDetails\x12\r\n\x05state\x18\x01 \x01(\t\x12\x0c\n\x04vlos\x18\x02 \x01(\x08\x12 \n\x07volumes\x18\x03 \x03(\x0b\x32\x0f.scdpb.Volume4D\"\xbc\x01\n\x12OperationReference\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0b\n\x03ovn\x18\x02 \x01(\t\x12\r\n\x05owner\x18\x03 \x01(\t\x12\x17\n\x0fsubscription_id\x18\x04 \x01(\t\x12\x1d\n\x08time_end\x18\x05 \x01(\x0b\x32\x0b.scdpb.Time\x12\x1f\n\ntime_start\x18\x06 \x01(\x0b\x32\x0b.scdpb.Time\x12\x14\n\x0cuss_base_url\x18\x07 \x01(\t\x12\x0f\n\x07version\x18\x08 \x01(\x05\"*\n\x05Point\x12\x13\n\x0b\x63oordinates\x18\x01 \x01(\x01\x12\x0c\n\x04type\x18\x02 \x01(\t\":\n\x07Polygon\x12!\n\x0b\x63oordinates\x18\x01 \x03(\x0b\x32\x0c.scdpb.Point\x12\x0c\n\x04type\x18\x02 \x01(\t\"\x90\x01\n\x08Position\x12\x12\n\naccuracy_h\x18\x01 \x01(\t\x12\x12\n\naccuracy_v\x18\x02 \x01(\t\x12!\n\x08\x61ltitude\x18\x03 \x01(\x0b\x32\x0f.scdpb.Altitude\x12\x14\n\x0c\x65xtrapolated\x18\x04 \x01(\x08\x12\x10\n\x08latitude\x18\x05 \x01(\x01\x12\x11\n\tlongitude\x18\x06 \x01(\x01\"\x8f\x01\n\x1ePutConstraintDetailsParameters\x12%\n\nconstraint\x18\x01 \x01(\x0b\x32\x11.scdpb.Constraint\x12\x15\n\rconstraint_id\x18\x02 \x01(\t\x12/\n\rsubscriptions\x18\x03 \x03(\x0b\x32\x18.scdpb.SubscriptionState\"o\n PutConstraintReferenceParameters\x12 \n\x07\x65xtents\x18\x01 \x03(\x0b\x32\x0f.scdpb.Volume4D\x12\x13\n\x0bold_version\x18\x02 \x01(\x05\x12\x14\n\x0cuss_base_url\x18\x03 \x01(\t\"l\n\x1dPutConstraintReferenceRequest\x12\x12\n\nentityuuid\x18\x01 \x01(\t\x12\x37\n\x06params\x18\x02 \x01(\x0b\x32\'.scdpb.PutConstraintReferenceParameters\"\x8b\x01\n\x1dPutOperationDetailsParameters\x12#\n\toperation\x18\x01 \x01(\x0b\x32\x10.scdpb.Operation\x12\x14\n\x0coperation_id\x18\x02 \x01(\t\x12/\n\rsubscriptions\x18\x03 \x03(\x0b\x32\x18.scdpb.SubscriptionState\"\xe4\x01\n\x1fPutOperationReferenceParameters\x12 \n\x07\x65xtents\x18\x01 \x03(\x0b\x32\x0f.scdpb.Volume4D\x12\x0b\n\x03key\x18\x02 \x01(\t\x12?\n\x10new_subscription\x18\x03 \x01(\x0b\x32%.scdpb.ImplicitSubscriptionParameters\x12\x13\n\x0bold_version\x18\x04 \x01(\x05\x12\r\n\x05state\x18\x05 \x01(\t\x12\x17\n\x0fsubscription_id\x18\x06 \x01(\t\x12\x14\n\x0cuss_base_url\x18\x07 \x01(\t\"j\n\x1cPutOperationReferenceRequest\x12\x12\n\nentityuuid\x18\x01 \x01(\t\x12\x36\n\x06params\x18\x02 \x01(\x0b\x32&.scdpb.PutOperationReferenceParameters\"\xa7\x01\n\x19PutSubscriptionParameters\x12 \n\x07\x65xtents\x18\x01 \x01(\x0b\x32\x0f.scdpb.Volume4D\x12\x1e\n\x16notify_for_constraints\x18\x02 \x01(\x08\x12\x1d\n\x15notify_for_operations\x18\x03 \x01(\x08\x12\x13\n\x0bold_version\x18\x04 \x01(\x05\x12\x14\n\x0cuss_base_url\x18\x05 \x01(\t\"b\n\x16PutSubscriptionRequest\x12\x30\n\x06params\x18\x01 \x01(\x0b\x32 .scdpb.PutSubscriptionParameters\x12\x16\n\x0esubscriptionid\x18\x02 \x01(\t\"\xa4\x01\n\x17PutSubscriptionResponse\x12/\n\x0b\x63onstraints\x18\x01 \x03(\x0b\x32\x1a.scdpb.ConstraintReference\x12-\n\noperations\x18\x02 \x03(\x0b\x32\x19.scdpb.OperationReference\x12)\n\x0csubscription\x18\x03 \x01(\x0b\x32\x13.scdpb.Subscription\"^\n QueryConstraintReferencesRequest\x12:\n\x06params\x18\x01 \x01(\x0b\x32*.scdpb.SearchConstraintReferenceParameters\"P\n\x19QuerySubscriptionsRequest\x12\x33\n\x06params\x18\x01 \x01(\x0b\x32#.scdpb.SearchSubscriptionParameters\"&\n\x06Radius\x12\r\n\x05units\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02\"P\n#SearchConstraintReferenceParameters\x12)\n\x10\x61rea_of_interest\x18\x01 \x01(\x0b\x32\x0f.scdpb.Volume4D\"_\n\"SearchConstraintReferencesResponse\x12\x39\n\x15\x63onstraint_references\x18\x01 \x03(\x0b\x32\x1a.scdpb.ConstraintReference\"O\n\"SearchOperationReferenceParameters\x12)\n\x10\x61rea_of_interest\x18\x01 \x01(\x0b\x32\x0f.scdpb.Volume4D\"[\n SearchOperationReferenceResponse\x12\x37\n\x14operation_references\x18\x01 \x03(\x0b\x32\x19.scdpb.OperationReference\"]\n SearchOperationReferencesRequest\x12\x39\n\x06params\x18\x01 \x01(\x0b\x32).scdpb.SearchOperationReferenceParameters\"I\n\x1cSearchSubscriptionParameters\x12)\n\x10\x61rea_of_interest\x18\x01 \x01(\x0b\x32\x0f.scdpb.Volume4D\"I\n\x1bSearchSubscriptionsResponse\x12*\n\rsubscriptions\x18\x01 \x03(\x0b\x32\x13.scdpb.Subscription\"[\n\x12SubscriberToNotify\x12/\n\rsubscriptions\x18\x01 \x03(\x0b\x32\x18.scdpb.SubscriptionState\x12\x14\n\x0cuss_base_url\x18\x02 \x01(\t\"\x99\x02\n\x0cSubscription\x12\x1c\n\x14\x64\x65pendent_operations\x18\x01 \x03(\t\x12\n\n\x02id\x18\x02 \x01(\t\x12\x1d\n\x15implicit_subscription\x18\x03 \x01(\x08\x12\x1a\n\x12notification_index\x18\x04 \x01(\x05\x12\x1e\n\x16notify_for_constraints\x18\x05 \x01(\x08\x12\x1d\n\x15notify_for_operations\x18\x06 \x01(\x08\x12\x1d\n\x08time_end\x18\x07 \x01(\x0b\x32\x0b.scdpb.Time\x12\x1f\n\ntime_start\x18\x08 \x01(\x0b\x32\x0b.scdpb.Time\x12\x14\n\x0cuss_base_url\x18\t \x01(\t\x12\x0f\n\x07version\x18\n \x01(\x05\"H\n\x11SubscriptionState\x12\x1a\n\x12notification_index\x18\x01 \x01(\x05\x12\x17\n\x0fsubscription_id\x18\x02 \x01(\t\"A\n\x04Time\x12\x0e\n\x06\x66ormat\x18\x01 \x01(\t\x12)\n\x05value\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\x88\x01\n\x10VehicleTelemetry\x12\n\n\x02id\x18\x01 \x01(\t\x12!\n\x08position\x18\x02 \x01(\x0b\x32\x0f.scdpb.Position\x12\"\n\rtime_measured\x18\x03 \x01(\x0b\x32\x0b.scdpb.Time\x12!\n\x08velocity\x18\x04 \x01(\x0b\x32\x0f.scdpb.Velocity\"=\n\x08Velocity\x12\r\n\x05speed\x18\x01 \x01(\x02\x12\r\n\x05track\x18\x02 \x01(\x02\x12\x13\n\x0bunits_speed\x18\x03 \x01(\t\"\xac\x01\n\x08Volume3D\x12\'\n\x0e\x61ltitude_lower\x18\x01 \x01(\x0b\x32\x0f.scdpb.Altitude\x12\'\n\x0e\x61ltitude_upper\x18\x02 \x01(\x0b\x32\x0f.scdpb.Altitude\x12%\n\x0eoutline_circle\x18\x03 \x01(\x0b\x32\r.scdpb.Circle\x12\'\n\x0foutline_polygon\x18\x04 \x01(\x0b\x32\x0e.scdpb.Polygon\"k\n\x08Volume4D\x12\x1d\n\x08time_end\x18\x01 \x01(\x0b\x32\x0b.scdpb.Time\x12\x1f\n\ntime_start\x18\x02 \x01(\x0b\x32\x0b.scdpb.Time\x12\x1f\n\x06volume\x18\x03 \x01(\x0b\x32\x0f.scdpb.Volume3D2\xaa\x0f\n\x1cUTMAPIUSSDSSAndUSSUSSService\x12\xa2\x01\n\x19\x44\x65leteConstraintReference\x12\'.scdpb.DeleteConstraintReferenceRequest\x1a(.scdpb.ChangeConstraintReferenceResponse\"2\x82\xd3\xe4\x93\x02,**/dss/v1/constraint_references/{entityuuid}\x12\x9e\x01\n\x18\x44\x65leteOperationReference\x12&.scdpb.DeleteOperationReferenceRequest\x1a\'.scdpb.ChangeOperationReferenceResponse\"1\x82\xd3\xe4\x93\x02+*)/dss/v1/operation_references/{entityuuid}\x12\x89\x01\n\x12\x44\x65leteSubscription\x12 .scdpb.DeleteSubscriptionRequest\x1a!.scdpb.DeleteSubscriptionResponse\".\x82\xd3\xe4\x93\x02(*&/dss/v1/subscriptions/{subscriptionid}\x12\x99\x01\n\x16GetConstraintReference\x12$.scdpb.GetConstraintReferenceRequest\x1a%.scdpb.GetConstraintReferenceResponse\"2\x82\xd3\xe4\x93\x02,\x12*/dss/v1/constraint_references/{entityuuid}\x12\x95\x01\n\x15GetOperationReference\x12#.scdpb.GetOperationReferenceRequest\x1a$.scdpb.GetOperationReferenceResponse\"1\x82\xd3\xe4\x93\x02+\x12)/dss/v1/operation_references/{entityuuid}\x12\x80\x01\n\x0fGetSubscription\x12\x1d.scdpb.GetSubscriptionRequest\x1a\x1e.scdpb.GetSubscriptionResponse\".\x82\xd3\xe4\x93\x02(\x12&/dss/v1/subscriptions/{subscriptionid}\x12\x61\n\rMakeDssReport\x12\x1b.scdpb.MakeDssReportRequest\x1a\x12.scdpb.ErrorReport\"\x1f\x82\xd3\xe4\x93\x02\x19\"\x0f/dss/v1/reports:\x06params\x12\xa4\x01\n\x16PutConstraintReference\x12$.scdpb.PutConstraintReferenceRequest\x1a(.scdpb.ChangeConstraintReferenceResponse\":\x82\xd3\xe4\x93\x02\x34\x1a*/dss/v1/constraint_references/{entityuuid}:\x06params\x12\xa0\x01\n\x15PutOperationReference\x12#.scdpb.PutOperationReferenceRequest\x1a\'.scdpb.ChangeOperationReferenceResponse\"9\x82\xd3\xe4\x93\x02\x33\x1a)/dss/v1/operation_references/{entityuuid}:\x06params\x12\x88\x01\n\x0fPutSubscription\x12\x1d.scdpb.PutSubscriptionRequest\x1a\x1e.scdpb.PutSubscriptionResponse\"6\x82\xd3\xe4\x93\x02\x30\x1a&/dss/v1/subscriptions/{subscriptionid}:\x06params\x12\x9a\x01\n\x19QueryConstraintReferences\x12\'.scdpb.QueryConstraintReferencesRequest\x1a).scdpb.SearchConstraintReferencesResponse\")\x82\xd3\xe4\x93\x02#\"\x19/dss/v1/constraints/query:\x06params\x12\x87\x01\n\x12QuerySubscriptions\x12 .scdpb.QuerySubscriptionsRequest\x1a\".scdpb.SearchSubscriptionsResponse\"+\x82\xd3\xe4\x93\x02%\"\x1b/dss/v1/subscriptions/query:\x06params\x12\xa1\x01\n\x19SearchOperationReferences\x12\'.scdpb.SearchOperationReferencesRequest\x1a\'.scdpb.SearchOperationReferenceResponse\"2\x82\xd3\xe4\x93\x02,\"\"/dss/v1/operation_references/query:\x06paramsb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'monitorlib.pb.scdpb.scd_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['DeleteConstraintReference']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['DeleteConstraintReference']._serialized_options = b'\202\323\344\223\002,**/dss/v1/constraint_references/{entityuuid}'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['DeleteOperationReference']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['DeleteOperationReference']._serialized_options = b'\202\323\344\223\002+*)/dss/v1/operation_references/{entityuuid}'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['DeleteSubscription']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['DeleteSubscription']._serialized_options = b'\202\323\344\223\002(*&/dss/v1/subscriptions/{subscriptionid}'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['GetConstraintReference']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['GetConstraintReference']._serialized_options = b'\202\323\344\223\002,\022*/dss/v1/constraint_references/{entityuuid}'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['GetOperationReference']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['GetOperationReference']._serialized_options = b'\202\323\344\223\002+\022)/dss/v1/operation_references/{entityuuid}'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['GetSubscription']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['GetSubscription']._serialized_options = b'\202\323\344\223\002(\022&/dss/v1/subscriptions/{subscriptionid}'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['MakeDssReport']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['MakeDssReport']._serialized_options = b'\202\323\344\223\002\031\"\017/dss/v1/reports:\006params'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['PutConstraintReference']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['PutConstraintReference']._serialized_options = b'\202\323\344\223\0024\032*/dss/v1/constraint_references/{entityuuid}:\006params'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['PutOperationReference']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['PutOperationReference']._serialized_options = b'\202\323\344\223\0023\032)/dss/v1/operation_references/{entityuuid}:\006params'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['PutSubscription']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['PutSubscription']._serialized_options = b'\202\323\344\223\0020\032&/dss/v1/subscriptions/{subscriptionid}:\006params'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['QueryConstraintReferences']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['QueryConstraintReferences']._serialized_options = b'\202\323\344\223\002#\"\031/dss/v1/constraints/query:\006params'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['QuerySubscriptions']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['QuerySubscriptions']._serialized_options = b'\202\323\344\223\002%\"\033/dss/v1/subscriptions/query:\006params'
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['SearchOperationReferences']._options = None
+  _UTMAPIUSSDSSANDUSSUSSSERVICE.methods_by_name['SearchOperationReferences']._serialized_options = b'\202\323\344\223\002,\"\"/dss/v1/operation_references/query:\006params'
+  _AIRSPACECONFLICTRESPONSE._serialized_start=103
+  _AIRSPACECONFLICTRESPONSE._serialized_end=196
+  _ALTITUDE._serialized_start=198
+  _ALTITUDE._serialized_end=257
+  _CHANGECONSTRAINTREFERENCERESPONSE._serialized_start=260
+  _CHANGECONSTRAINTREFERENCERESPONSE._serialized_end=401
+  _CHANGEOPERATIONREFERENCERESPONSE._serialized_start=404
+  _CHANGEOPERATIONREFERENCERESPONSE._serialized_end=542
+  _CIRCLE._serialized_start=545
+  _CIRCLE._serialized_end=729
+  _CIRCLE_GEOMETRYMESSAGE._serialized_start=663
+  _CIRCLE_GEOMETRYMESSAGE._serialized_end=729
+  _CIRCLEPROPERTIES._serialized_start=731
+  _CIRCLEPROPERTIES._serialized_end=780
+  _CONSTRAINT._serialized_start=782
+  _CONSTRAINT._serialized_end=884
+  _CONSTRAINTDETAILS._serialized_start=886
+  _CONSTRAINTDETAILS._serialized_end=953
+  _CONSTRAINTREFERENCE._serialized_start=956
+  _CONSTRAINTREFERENCE._serialized_end=1120
+  _DELETECONSTRAINTREFERENCEREQUEST._serialized_start=1122
+  _DELETECONSTRAINTREFERENCEREQUEST._serialized_end=1176
+  _DELETEOPERATIONREFERENCEREQUEST._serialized_start=1178
+  _DELETEOPERATIONREFERENCEREQUEST._serialized_end=1231
+  _DELETESUBSCRIPTIONREQUEST._serialized_start=1233
+  _DELETESUBSCRIPTIONREQUEST._serialized_end=1284
+  _DELETESUBSCRIPTIONRESPONSE._serialized_start=1286
+  _DELETESUBSCRIPTIONRESPONSE._serialized_end=1357
+  _ENTITYREFERENCE._serialized_start=1360
+  _ENTITYREFERENCE._serialized_end=1491
+  _ERRORREPORT._serialized_start=1494
+  _ERRORREPORT._serialized_end=1704
+  _ERRORRESPONSE._serialized_start=1706
+  _ERRORRESPONSE._serialized_end=1738
+  _GETCONSTRAINTDETAILSRESPONSE._serialized_start=1740
+  _GETCONSTRAINTDETAILSRESPONSE._serialized_end=1809
+  _GETCONSTRAINTREFERENCEREQUEST._serialized_start=1811
+  _GETCONSTRAINTREFERENCEREQUEST._serialized_end=1862
+  _GETCONSTRAINTREFERENCERESPONSE._serialized_start=1864
+  _GETCONSTRAINTREFERENCERESPONSE._serialized_end=1954
+  _GETOPERATIONDETAILSRESPONSE._serialized_start=1956
+  _GETOPERATIONDETAILSRESPONSE._serialized_end=2022
+  _GETOPERATIONREFERENCEREQUEST._serialized_start=2024
+  _GETOPERATIONREFERENCEREQUEST._serialized_end=2074
+  _GETOPERATIONREFERENCERESPONSE._serialized_start=2076
+  _GETOPERATIONREFERENCERESPONSE._serialized_end=2163
+  _GETOPERATIONTELEMETRYRESPONSE._serialized_start=2165
+  _GETOPERATIONTELEMETRYRESPONSE._serialized_end=2240
+  _GETSUBSCRIPTIONREQUEST._serialized_start=2242
+  _GETSUBSCRIPTIONREQUEST._serialized_end=2290
+  _GETSUBSCRIPTIONRESPONSE._serialized_start=2292
+  _GETSUBSCRIPTIONRESPONSE._serialized_end=2360
+  _IMPLICITSUBSCRIPTIONPARAMETERS._serialized_start=2362
+  _IMPLICITSUBSCRIPTIONPARAMETERS._serialized_end=2448
+  _MAKEDSSREPORTREQUEST._serialized_start=2450
+  _MAKEDSSREPORTREQUEST._serialized_end=2508
+  _OPERATION._serialized_start=2510
+  _OPERATION._serialized_end=2609
+  _OPERATIONDETAILS._serialized_start=2611
+  _OPERATIONDETAILS._serialized_end=2692
+  _OPERATIONREFERENCE._serialized_start=2695
+  _OPERATIONREFERENCE._serialized_end=2883
+  _POINT._serialized_start=2885
+  _POINT._serialized_end=2927
+  _POLYGON._serialized_start=2929
+  _POLYGON._serialized_end=2987
+  _POSITION._serialized_start=2990
+  _POSITION._serialized_end=3134
+  _PUTCONSTRAINTDETAILSPARAMETERS._serialized_start=3137
+  _PUTCONSTRAINTDETAILSPARAMETERS._serialized_end=3280
+  _PUTCONSTRAINTREFERENCEPARAMETERS._serialized_start=3282
+  _PUTCONSTRAINTREFERENCEPARAMETERS._serialized_end=3393
+  _PUTCONSTRAINTREFERENCEREQUEST._serialized_start=3395
+  _PUTCONSTRAINTREFERENCEREQUEST._serialized_end=3503
+  _PUTOPERATIONDETAILSPARAMETERS._serialized_start=3506
+  _PUTOPERATIONDETAILSPARAMETERS._serialized_end=3645
+  _PUTOPERATIONREFERENCEPARAMETERS._serialized_start=3648
+  _PUTOPERATIONREFERENCEPARAMETERS._serialized_end=3876
+  _PUTOPERATIONREFERENCEREQUEST._serialized_start=3878
+  _PUTOPERATIONREFERENCEREQUEST._serialized_end=3984
+  _PUTSUBSCRIPTIONPARAMETERS._serialized_start=3987
+  _PUTSUBSCRIPTIONPARAMETERS._serialized_end=4154
+  _PUTSUBSCRIPTIONREQUEST._serialized_start=4156
+  _PUTSUBSCRIPTIONREQUEST._serialized_end=4254
+  _PUTSUBSCRIPTIONRESPONSE._serialized_start=4257
+  _PUTSUBSCRIPTIONRESPONSE._serialized_end=4421
+  _QUERYCONSTRAINTREFERENCESREQUEST._serialized_start=4423
+  _QUERYCONSTRAINTREFERENCESREQUEST._serialized_end=4517
+  _QUERYSUBSCRIPTIONSREQUEST._serialized_start=4519
+  _QUERYSUBSCRIPTIONSREQUEST._serialized_end=4599
+  _RADIUS._serialized_start=4601
+  _RADIUS._serialized_end=4639
+  _SEARCHCONSTRAINTREFERENCEPARAMETERS._serialized_start=4641
+  _SEARCHCONSTRAINTREFERENCEPARAMETERS._serialized_end=4721
+  _SEARCHCONSTRAINTREFERENCESRESPONSE._serialized_start=4723
+  _SEARCHCONSTRAINTREFERENCESRESPONSE._serialized_end=4818
+  _SEARCHOPERATIONREFERENCEPARAMETERS._serialized_start=4820
+  _SEARCHOPERATIONREFERENCEPARAMETERS._serialized_end=4899
+  _SEARCHOPERATIONREFERENCERESPONSE._serialized_start=4901
+  _SEARCHOPERATIONREFERENCERESPONSE._serialized_end=4992
+  _SEARCHOPERATIONREFERENCESREQUEST._serialized_start=4994
+  _SEARCHOPERATIONREFERENCESREQUEST._serialized_end=5087
+  _SEARCHSUBSCRIPTIONPARAMETERS._serialized_start=5089
+  _SEARCHSUBSCRIPTIONPARAMETERS._serialized_end=5162
+  _SEARCHSUBSCRIPTIONSRESPONSE._serialized_start=5164
+  _SEARCHSUBSCRIPTIONSRESPONSE._serialized_end=5237
+  _SUBSCRIBERTONOTIFY._serialized_start=5239
+  _SUBSCRIBERTONOTIFY._serialized_end=5330
+  _SUBSCRIPTION._serialized_start=5333
+  _SUBSCRIPTION._serialized_end=5614
+  _SUBSCRIPTIONSTATE._serialized_start=5616
+  _SUBSCRIPTIONSTATE._serialized_end=5688
+  _TIME._serialized_start=5690
+  _TIME._serialized_end=5755
+  _VEHICLETELEMETRY._serialized_start=5758
+  _VEHICLETELEMETRY._serialized_end=5894
+  _VELOCITY._serialized_start=5896
+  _VELOCITY._serialized_end=5957
+  _VOLUME3D._serialized_start=5960
+  _VOLUME3D._serialized_end=6132
+  _VOLUME4D._serialized_start=6134
+  _VOLUME4D._serialized_end=6241
+  _UTMAPIUSSDSSANDUSSUSSSERVICE._serialized_start=6244
+  _UTMAPIUSSDSSANDUSSUSSSERVICE._serialized_end=8206
+# @@protoc_insertion_point(module_scope)
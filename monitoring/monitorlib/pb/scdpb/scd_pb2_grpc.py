@@ -0,0 +1,496 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from monitorlib.pb.scdpb import scd_pb2 as monitorlib_dot_pb_dot_scdpb_dot_scd__pb2
+
+
+class UTMAPIUSSDSSAndUSSUSSServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.DeleteConstraintReference = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/DeleteConstraintReference',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteConstraintReferenceRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeConstraintReferenceResponse.FromString,
+                )
+        self.DeleteOperationReference = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/DeleteOperationReference',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteOperationReferenceRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeOperationReferenceResponse.FromString,
+                )
+        self.DeleteSubscription = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/DeleteSubscription',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteSubscriptionRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteSubscriptionResponse.FromString,
+                )
+        self.GetConstraintReference = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/GetConstraintReference',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetConstraintReferenceRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetConstraintReferenceResponse.FromString,
+                )
+        self.GetOperationReference = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/GetOperationReference',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetOperationReferenceRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetOperationReferenceResponse.FromString,
+                )
+        self.GetSubscription = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/GetSubscription',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetSubscriptionRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetSubscriptionResponse.FromString,
+                )
+        self.MakeDssReport = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/MakeDssReport',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.MakeDssReportRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ErrorReport.FromString,
+                )
+        self.PutConstraintReference = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/PutConstraintReference',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutConstraintReferenceRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeConstraintReferenceResponse.FromString,
+                )
+        self.PutOperationReference = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/PutOperationReference',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutOperationReferenceRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeOperationReferenceResponse.FromString,
+                )
+        self.PutSubscription = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/PutSubscription',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutSubscriptionRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutSubscriptionResponse.FromString,
+                )
+        self.QueryConstraintReferences = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/QueryConstraintReferences',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.QueryConstraintReferencesRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchConstraintReferencesResponse.FromString,
+                )
+        self.QuerySubscriptions = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/QuerySubscriptions',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.QuerySubscriptionsRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchSubscriptionsResponse.FromString,
+                )
+        self.SearchOperationReferences = channel.unary_unary(
+                '/scdpb.UTMAPIUSSDSSAndUSSUSSService/SearchOperationReferences',
+                request_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchOperationReferencesRequest.SerializeToString,
+                response_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchOperationReferenceResponse.FromString,
+                )
+
+
+class UTMAPIUSSDSSAndUSSUSSServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def DeleteConstraintReference(self, request, context):
+        """Delete the specified Constraint reference from the DSS.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeleteOperationReference(self, request, context):
+        """Remove the specified Operation reference from the DSS.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeleteSubscription(self, request, context):
+        """Remove the specified Subscription from the DSS.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetConstraintReference(self, request, context):
+        """Retrieve the specified Constraint reference from the DSS.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetOperationReference(self, request, context):
+        """Retrieve the specified Operation reference from the DSS.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSubscription(self, request, context):
+        """Retrieve the specified Subscription from the DSS.
+
+        Retrieve a specific subscription.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def MakeDssReport(self, request, context):
+        """Report information about communication issues to a DSS.
+
+        Report issues to a DSS. Data sent to this endpoint is archived.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PutConstraintReference(self, request, context):
+        """Create/Update the specified Constraint reference in the DSS.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PutOperationReference(self, request, context):
+        """Create/Update the specified Operation reference in the DSS.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PutSubscription(self, request, context):
+        """Create/Update the specified Subscription in the DSS.
+
+        Create or update a subscription.
+
+        Subscription notifications are only triggered by (and contain full information of) changes to, creation of, or deletion of, Entities referenced by or stored in the DSS; they do not involve any data transfer (such as remote ID telemetry updates) apart from Entity information.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def QueryConstraintReferences(self, request, context):
+        """Retrieve all Constraints references in the specified area/volume from the DSS.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def QuerySubscriptions(self, request, context):
+        """Retrieve all Subscriptions in the specified area/volume from the DSS.
+
+        Retrieve Subscriptions intersecting an area of interest.  Subscription
+        notifications are only triggered by (and contain full information of) changes to,
+        creation of, or deletion of, Entities referenced by or stored in the DSS;
+        they do not involve any data transfer (such as remote ID telemetry updates) apart
+        from Entity information.
+
+        Note that this parameter is a JSON object (in the 'request-body'). Note that either
+        or both of the 'altitude' and 'time' values may be omitted from this parameter.
+
+        Only Subscriptions belonging to the caller are returned.  This endpoint would be
+        used if a USS lost track of Subscriptions they had created and/or wanted to resolve
+        an error indicating that they had too many existing Subscriptions in an area.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SearchOperationReferences(self, request, context):
+        """Retrieve all Operation references in the specified area/volume/time from the DSS.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_UTMAPIUSSDSSAndUSSUSSServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'DeleteConstraintReference': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeleteConstraintReference,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteConstraintReferenceRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeConstraintReferenceResponse.SerializeToString,
+            ),
+            'DeleteOperationReference': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeleteOperationReference,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteOperationReferenceRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeOperationReferenceResponse.SerializeToString,
+            ),
+            'DeleteSubscription': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeleteSubscription,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteSubscriptionRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteSubscriptionResponse.SerializeToString,
+            ),
+            'GetConstraintReference': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetConstraintReference,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetConstraintReferenceRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetConstraintReferenceResponse.SerializeToString,
+            ),
+            'GetOperationReference': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetOperationReference,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetOperationReferenceRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetOperationReferenceResponse.SerializeToString,
+            ),
+            'GetSubscription': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSubscription,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetSubscriptionRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetSubscriptionResponse.SerializeToString,
+            ),
+            'MakeDssReport': grpc.unary_unary_rpc_method_handler(
+                    servicer.MakeDssReport,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.MakeDssReportRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ErrorReport.SerializeToString,
+            ),
+            'PutConstraintReference': grpc.unary_unary_rpc_method_handler(
+                    servicer.PutConstraintReference,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutConstraintReferenceRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeConstraintReferenceResponse.SerializeToString,
+            ),
+            'PutOperationReference': grpc.unary_unary_rpc_method_handler(
+                    servicer.PutOperationReference,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutOperationReferenceRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeOperationReferenceResponse.SerializeToString,
+            ),
+            'PutSubscription': grpc.unary_unary_rpc_method_handler(
+                    servicer.PutSubscription,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutSubscriptionRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutSubscriptionResponse.SerializeToString,
+            ),
+            'QueryConstraintReferences': grpc.unary_unary_rpc_method_handler(
+                    servicer.QueryConstraintReferences,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.QueryConstraintReferencesRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchConstraintReferencesResponse.SerializeToString,
+            ),
+            'QuerySubscriptions': grpc.unary_unary_rpc_method_handler(
+                    servicer.QuerySubscriptions,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.QuerySubscriptionsRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchSubscriptionsResponse.SerializeToString,
+            ),
+            'SearchOperationReferences': grpc.unary_unary_rpc_method_handler(
+                    servicer.SearchOperationReferences,
+                    request_deserializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchOperationReferencesRequest.FromString,
+                    response_serializer=monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchOperationReferenceResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'scdpb.UTMAPIUSSDSSAndUSSUSSService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class UTMAPIUSSDSSAndUSSUSSService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def DeleteConstraintReference(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/DeleteConstraintReference',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteConstraintReferenceRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeConstraintReferenceResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def DeleteOperationReference(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/DeleteOperationReference',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteOperationReferenceRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeOperationReferenceResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def DeleteSubscription(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/DeleteSubscription',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteSubscriptionRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.DeleteSubscriptionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetConstraintReference(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/GetConstraintReference',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetConstraintReferenceRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetConstraintReferenceResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetOperationReference(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/GetOperationReference',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetOperationReferenceRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetOperationReferenceResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetSubscription(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/GetSubscription',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetSubscriptionRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.GetSubscriptionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def MakeDssReport(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/MakeDssReport',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.MakeDssReportRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ErrorReport.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PutConstraintReference(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/PutConstraintReference',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutConstraintReferenceRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeConstraintReferenceResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PutOperationReference(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/PutOperationReference',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutOperationReferenceRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.ChangeOperationReferenceResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PutSubscription(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/PutSubscription',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutSubscriptionRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.PutSubscriptionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def QueryConstraintReferences(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/QueryConstraintReferences',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.QueryConstraintReferencesRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchConstraintReferencesResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def QuerySubscriptions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/QuerySubscriptions',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.QuerySubscriptionsRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchSubscriptionsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SearchOperationReferences(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/scdpb.UTMAPIUSSDSSAndUSSUSSService/SearchOperationReferences',
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchOperationReferencesRequest.SerializeToString,
+            monitorlib_dot_pb_dot_scdpb_dot_scd__pb2.SearchOperationReferenceResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
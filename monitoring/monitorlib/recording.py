@@ -0,0 +1,252 @@
+"""Recordings of the requests sent to a DSS, for replaying them later.
+
+A recording is a JSON Lines file (gzipped if its name ends in .gz) whose first
+line is a header giving the wall-clock time the recording started, followed by
+one line per request:
+
+  {"t": 0.513, "method": "PUT", "endpoint": "/v1/dss/subscriptions/{id}",
+   "path": "/v1/dss/subscriptions/<uuid>", "query": "", "body": {...},
+   "status": 200, "elapsed": 0.012, "versions": ["<version>"]}
+
+"t" is the number of seconds from the start of the recording until the
+request was sent, "endpoint" is the URL template of instrumentation.url_template
+and "versions" lists the versions (and OVNs) of the entity in the response, so
+that a replay can substitute the versions its own requests received.
+
+A Recorder attaches to any requests.Session (PrefixURLSession, the
+interoperability test's DSSClient, ...) and appends every request the session
+completes to a recording, which Recording.load reads back.  read_gateway_trace
+converts the log an http-gateway started with -trace-requests writes to stderr
+into a Recording; that log has neither bodies nor query strings, so those are
+None in its records.
+"""
+
+import datetime
+import gzip
+import json
+import re
+import threading
+import time
+import urllib.parse
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+import requests
+
+from monitorlib import instrumentation
+
+FORMAT_VERSION = 1
+
+# Keys of the entity objects in DSS responses, e.g. {"service_area": {...}}.
+ENTITY_KEYS = [
+    'service_area', 'subscription', 'operation_reference',
+    'constraint_reference'
+]
+# Fields of entities whose values later requests refer to.
+VERSION_FIELDS = ['version', 'ovn']
+
+Record = Dict[str, Any]
+
+
+def _open(path: str, mode: str) -> TextIO:
+  if path.endswith('.gz'):
+    return gzip.open(path, mode + 't', encoding='utf-8')
+  return open(path, mode, encoding='utf-8')
+
+
+def entity_versions(body: Any) -> List[str]:
+  """Returns the versions and OVNs of the entity in a DSS response body."""
+  if not isinstance(body, dict):
+    return []
+  for key in ENTITY_KEYS:
+    entity = body.get(key)
+    if isinstance(entity, dict):
+      return [entity[f] for f in VERSION_FIELDS
+              if isinstance(entity.get(f), str) and entity[f]]
+  return []
+
+
+def _json_or_none(data) -> Any:
+  if not data:
+    return None
+  try:
+    return json.loads(data)
+  except ValueError:
+    return None
+
+
+class Recorder(object):
+  """Appends the requests of attached sessions to a recording.
+
+  Several sessions, used from several threads, may be attached to the same
+  Recorder.  Requests which raise rather than receive a response are not
+  recorded.
+  """
+
+  def __init__(self, path: str):
+    self._file = _open(path, 'w')
+    self._lock = threading.Lock()
+    self._started = time.time()
+    self._write({
+        'format': FORMAT_VERSION,
+        'started': format_timestamp(self._started),
+    })
+
+  def attach(self, session: requests.Session) -> requests.Session:
+    """Records every request session completes from now on."""
+    session.hooks['response'].append(self._on_response)
+    return session
+
+  def record(self, resp: requests.Response, read_body: bool = True) -> None:
+    """Appends the request of resp; if not read_body, versions are omitted."""
+    request = resp.request
+    elapsed = resp.elapsed.total_seconds()
+    url = urllib.parse.urlparse(request.url)
+    body = request.body
+    if isinstance(body, bytes):
+      body = body.decode('utf-8', errors='replace')
+    self._write({
+        't': round(time.time() - elapsed - self._started, 6),
+        'method': request.method,
+        'endpoint': instrumentation.url_template(request.url),
+        'path': url.path,
+        'query': url.query,
+        'body': _json_or_none(body),
+        'status': resp.status_code,
+        'elapsed': round(elapsed, 6),
+        'versions': (entity_versions(_json_or_none(resp.content))
+                     if read_body else []),
+    })
+
+  def _on_response(self, resp: requests.Response, *args, **kwargs):
+    # Don't consume a body the caller intends to stream.
+    self.record(resp, read_body=not kwargs.get('stream'))
+
+  def _write(self, line: Dict[str, Any]) -> None:
+    data = json.dumps(line, separators=(',', ':')) + '\n'
+    with self._lock:
+      self._file.write(data)
+
+  def close(self) -> None:
+    with self._lock:
+      self._file.close()
+
+
+class Recording(object):
+  """Records and the wall-clock time (seconds since the epoch) they start at.
+
+  records may be a generator, so that long recordings are streamed from disk
+  rather than loaded at once; it can then only be iterated over once.
+  """
+
+  def __init__(self, records: Iterable[Record], started: Optional[float]):
+    self.records = records
+    self.started = started
+
+  @classmethod
+  def load(cls, path: str) -> 'Recording':
+    """Opens a recording written by a Recorder or by save."""
+    f = _open(path, 'r')
+    header = json.loads(f.readline())
+    if header.get('format') != FORMAT_VERSION:
+      f.close()
+      raise ValueError('{} is not a recording of format {}'.format(
+          path, FORMAT_VERSION))
+    started = header.get('started')
+
+    def records():
+      with f:
+        for line in f:
+          if line.strip():
+            yield json.loads(line)
+
+    return cls(records(), parse_timestamp(started) if started else None)
+
+  def save(self, path: str) -> None:
+    with _open(path, 'w') as f:
+      f.write(json.dumps({
+          'format': FORMAT_VERSION,
+          'started': None if self.started is None else format_timestamp(
+              self.started),
+      }, separators=(',', ':')) + '\n')
+      for record in self.records:
+        f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+
+def format_timestamp(value: float) -> str:
+  """Formats seconds since the epoch as an RFC 3339 UTC timestamp."""
+  return datetime.datetime.utcfromtimestamp(value).isoformat() + 'Z'
+
+
+_GO_DURATION_PART = re.compile(r'([0-9.]+)(ns|us|µs|μs|ms|s|m|h)')
+_GO_DURATION_UNITS = {
+    'ns': 1e-9, 'us': 1e-6, 'µs': 1e-6, 'μs': 1e-6, 'ms': 1e-3, 's': 1,
+    'm': 60, 'h': 3600
+}
+
+
+def parse_go_duration(value: str) -> float:
+  """Parses a Go time.Duration string, e.g. 1m2.5s or 850µs, into seconds."""
+  if value in ('0', '0s'):
+    return 0
+  parts = _GO_DURATION_PART.findall(value)
+  if not parts or ''.join(n + u for n, u in parts) != value:
+    raise ValueError('Invalid duration: {}'.format(value))
+  return sum(float(n) * _GO_DURATION_UNITS[u] for n, u in parts)
+
+
+def parse_timestamp(value: str) -> float:
+  """Parses an RFC 3339 timestamp into seconds since the epoch."""
+  # zap's ISO8601 encoder writes e.g. 2020-06-01T12:34:56.789Z or ...+0200.
+  value = value.replace('Z', '+0000')
+  # strptime only accepts up to microseconds.
+  value = re.sub(r'(\.\d{6})\d+', r'\1', value)
+  if re.search(r'[+-]\d\d:\d\d$', value):
+    value = value[:-3] + value[-2:]
+  for fmt in ('%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z'):
+    try:
+      return datetime.datetime.strptime(value, fmt).timestamp()
+    except ValueError:
+      pass
+  raise ValueError('Invalid timestamp: {}'.format(value))
+
+
+def read_gateway_trace(lines: Iterable[str]) -> Recording:
+  """Converts an http-gateway -trace-requests log into a recording.
+
+  The gateway logs each request when it completes, so the time each request
+  was received is computed from its duration and records are sorted by it.
+  Lines which are not request traces (other log messages, health checks) are
+  skipped.  The log must use the default JSON format.
+  """
+  traces = []
+  for line in lines:
+    line = line.strip()
+    if not line.startswith('{'):
+      continue
+    try:
+      entry = json.loads(line)
+    except ValueError:
+      continue
+    if 'resp_status_code' not in entry:
+      continue
+    method, path = entry['msg'].split(' ')[:2]
+    if path == '/healthy':
+      continue
+    elapsed = parse_go_duration(entry['duration'])
+    traces.append((parse_timestamp(entry['ts']) - elapsed, method, path,
+                   entry['resp_status_code'], elapsed))
+
+  traces.sort(key=lambda trace: trace[0])
+  started = traces[0][0] if traces else None
+  return Recording([{
+      't': round(received - traces[0][0], 6),
+      'method': method,
+      'endpoint': instrumentation.url_template(path),
+      'path': path,
+      'query': None,
+      'body': None,
+      'status': status,
+      'elapsed': round(elapsed, 6),
+      'versions': [],
+  } for received, method, path, status, elapsed in traces], started)
+
@@ -0,0 +1,546 @@
+"""Timeouts, retries and hedged requests for DSS sessions.
+
+A Resilience object, set on an InstrumentedSession (PrefixURLSession or the
+interoperability test suite's DSSClient) with set_resilience, handles every
+request the session sends:
+
+* each attempt gets the timeout of its endpoint, unless the caller gave one;
+* failed attempts are retried, after a jittered exponential backoff, when
+  retrying cannot apply the request twice: reads (GETs and searches) are
+  retried after any error or 5xx response; versioned PUTs and DELETEs after
+  errors and 502, 503 and 504 responses, since the DSS's version check
+  rejects a second application (with a 409, so a retried write which had in
+  fact been applied fails rather than being applied twice); and other writes
+  only when they cannot have reached the DSS (the connection could not be
+  established).  Any request is retried after a 429 with a Retry-After
+  header; the DSS also answers 429 when an area has too many subscriptions,
+  which no retry will fix;
+* reads may be hedged: if a read is still unanswered after the hedge
+  percentile (e.g. the 95th) of its endpoint's latency so far, a second copy
+  is sent and whichever answers first is used;
+* retries and hedges both draw on one retry budget shared by all the
+  sessions using the Resilience object, which allows them to add at most a
+  fixed fraction to the requests sent over a sliding window (plus a small
+  minimum rate), so that they cut tail latency without multiplying the load
+  on a DSS which is failing.
+
+ResilienceMetrics counts the retries (by reason), the retries and hedges
+denied by the budget, and the hedges sent and won, per endpoint.  Every
+attempt, including retries and hedges, is also reported to the session's
+instrumentation hooks like any other request.
+"""
+
+import collections
+import fnmatch
+import json
+import queue
+import random
+import threading
+import time
+import urllib.parse
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+import urllib3
+
+from monitorlib import histogram, instrumentation
+
+# Kinds of requests, by what retrying them risks.
+READ = 'read'
+VERSIONED_WRITE = 'versioned_write'
+WRITE = 'write'
+
+# Reasons for retrying.
+NOT_SENT = 'not_sent'  # The connection could not be established.
+ERROR = 'error'  # No response, e.g. a timeout or a reset connection.
+THROTTLED = 'throttled'  # 429 with a Retry-After header
+UNAVAILABLE = 'unavailable'  # 502, 503 or 504
+SERVER_ERROR = 'server_error'  # Any other 5xx
+
+DEFAULT_BACKOFF_SEC = 0.05
+DEFAULT_MAX_BACKOFF_SEC = 2
+DEFAULT_BUDGET_RATIO = 0.1
+DEFAULT_BUDGET_MIN_PER_SEC = 1
+DEFAULT_BUDGET_WINDOW_SEC = 10
+DEFAULT_HEDGE_MIN_DELAY_SEC = 0.005
+
+# Latency samples of an endpoint needed before its reads are hedged.
+HEDGE_MIN_SAMPLES = 20
+
+# POST endpoints which only read, by pattern.
+DEFAULT_IDEMPOTENT_POSTS = ('*/query',)
+
+_RETRYABLE_STATUSES = {
+    READ: None,  # Any 5xx
+    VERSIONED_WRITE: {502, 503, 504},
+    WRITE: set(),
+}
+
+# (host, method, endpoint), as in instrumentation.RequestMetrics.
+_EndpointKey = Tuple[str, str, str]
+
+
+def request_kind(method: str, endpoint: str,
+                 idempotent_posts=DEFAULT_IDEMPOTENT_POSTS) -> str:
+  """Classifies a request by its method and url_template."""
+  if method in ('GET', 'HEAD', 'OPTIONS'):
+    return READ
+  if method == 'POST' and any(
+      fnmatch.fnmatchcase(endpoint, p) for p in idempotent_posts):
+    return READ
+  if method in ('PUT', 'DELETE') and endpoint.endswith('/{version}'):
+    return VERSIONED_WRITE
+  return WRITE
+
+
+def _not_sent(e: Exception) -> bool:
+  if isinstance(e, requests.exceptions.ConnectTimeout):
+    return True
+  reason = getattr(e.args[0], 'reason', None) if e.args else None
+  return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+def retry_reason(kind: str, response: Optional[requests.Response],
+                 error: Optional[Exception]) -> Optional[str]:
+  """Returns why the outcome of an attempt should be retried, if it should."""
+  if error is not None:
+    if not isinstance(error, requests.RequestException):
+      return None
+    if _not_sent(error):
+      return NOT_SENT
+    return ERROR if kind != WRITE else None
+  status = response.status_code
+  if status == 429:
+    return THROTTLED if 'Retry-After' in response.headers else None
+  if status < 500:
+    return None
+  statuses = _RETRYABLE_STATUSES[kind]
+  if statuses is not None and status not in statuses:
+    return None
+  return UNAVAILABLE if status in (502, 503, 504) else SERVER_ERROR
+
+
+class RetryBudget(object):
+  """Limits retries and hedges to a fraction of the requests sent.
+
+  Over any window_sec, at most ratio times the number of requests sent plus
+  min_per_sec * window_sec retries and hedges are allowed.
+  """
+
+  def __init__(self, ratio: float = DEFAULT_BUDGET_RATIO,
+               min_per_sec: float = DEFAULT_BUDGET_MIN_PER_SEC,
+               window_sec: float = DEFAULT_BUDGET_WINDOW_SEC):
+    self.ratio = ratio
+    self.min_per_sec = min_per_sec
+    self.window_sec = window_sec
+    self._lock = threading.Lock()
+    self._requests = collections.deque()
+    self._spent = collections.deque()
+
+  def _prune(self, now: float) -> None:
+    horizon = now - self.window_sec
+    for times in (self._requests, self._spent):
+      while times and times[0] < horizon:
+        times.popleft()
+
+  def record_request(self) -> None:
+    with self._lock:
+      now = time.monotonic()
+      self._prune(now)
+      self._requests.append(now)
+
+  def try_spend(self) -> bool:
+    """Returns whether a retry or hedge may be sent, and counts it if so."""
+    with self._lock:
+      now = time.monotonic()
+      self._prune(now)
+      allowed = (self.min_per_sec * self.window_sec +
+                 self.ratio * len(self._requests))
+      if len(self._spent) >= allowed:
+        return False
+      self._spent.append(now)
+      return True
+
+
+class EndpointResilience(object):
+  """Counts of what was done for the requests to one endpoint."""
+
+  def __init__(self):
+    self.requests = 0
+    self.retries: Dict[str, int] = collections.Counter()
+    self.retries_denied = 0
+    self.hedges = 0
+    self.hedges_won = 0
+    self.hedges_denied = 0
+
+  def merge(self, other: 'EndpointResilience') -> None:
+    self.requests += other.requests
+    self.retries.update(other.retries)
+    self.retries_denied += other.retries_denied
+    self.hedges += other.hedges
+    self.hedges_won += other.hedges_won
+    self.hedges_denied += other.hedges_denied
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {
+        'requests': self.requests,
+        'retries': dict(self.retries),
+        'retries_denied': self.retries_denied,
+        'hedges': self.hedges,
+        'hedges_won': self.hedges_won,
+        'hedges_denied': self.hedges_denied,
+    }
+
+  @classmethod
+  def from_dict(cls, d: Dict[str, Any]) -> 'EndpointResilience':
+    result = cls()
+    result.requests = d['requests']
+    result.retries.update(d['retries'])
+    result.retries_denied = d['retries_denied']
+    result.hedges = d['hedges']
+    result.hedges_won = d['hedges_won']
+    result.hedges_denied = d['hedges_denied']
+    return result
+
+
+class ResilienceMetrics(object):
+  """Thread-safe counts of retries and hedges per endpoint."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self.endpoints: Dict[_EndpointKey, EndpointResilience] = \
+        collections.defaultdict(EndpointResilience)
+
+  def record(self, key: _EndpointKey, field: str,
+             reason: Optional[str] = None) -> None:
+    with self._lock:
+      endpoint = self.endpoints[key]
+      if field == 'retries':
+        endpoint.retries[reason] += 1
+      else:
+        setattr(endpoint, field, getattr(endpoint, field) + 1)
+
+  def merge(self, other: 'ResilienceMetrics') -> None:
+    with self._lock:
+      for key, endpoint in other.endpoints.items():
+        self.endpoints[key].merge(endpoint)
+
+  def to_dict(self) -> Dict[str, Any]:
+    with self._lock:
+      return {
+          'endpoints': [
+              dict(host=k[0], method=k[1], endpoint=k[2], **e.to_dict())
+              for k, e in sorted(self.endpoints.items())
+          ]
+      }
+
+  @classmethod
+  def from_dict(cls, d: Dict[str, Any]) -> 'ResilienceMetrics':
+    result = cls()
+    for e in d['endpoints']:
+      result.endpoints[(e['host'], e['method'], e['endpoint'])] = \
+          EndpointResilience.from_dict(e)
+    return result
+
+  def totals(self) -> EndpointResilience:
+    """Returns the counts of all endpoints together."""
+    result = EndpointResilience()
+    with self._lock:
+      for endpoint in self.endpoints.values():
+        result.merge(endpoint)
+    return result
+
+  def write_json(self, path: str) -> None:
+    contents = {'totals': self.totals().to_dict()}
+    contents.update(self.to_dict())
+    with open(path, 'w') as f:
+      json.dump(contents, f, indent=2)
+
+  def prometheus_text(self, prefix: str = 'dss_client',
+                      extra_labels: Optional[Dict[str, str]] = None) -> str:
+    """Returns the metrics in the Prometheus text exposition format."""
+    extra_labels = extra_labels or {}
+    lines = []
+    with self._lock:
+      endpoints = sorted(self.endpoints.items())
+
+      name = prefix + '_retries_total'
+      lines.extend(instrumentation.prometheus_header(
+          name, 'counter', 'Retries sent, by reason.'))
+      for (host, method, endpoint), e in endpoints:
+        for reason, count in sorted(e.retries.items()):
+          lines.append('{}{} {}'.format(name, instrumentation.prometheus_labels(
+              host=host, method=method, endpoint=endpoint, reason=reason,
+              **extra_labels), count))
+
+      for suffix, attr, help_text in (
+          ('resilient_requests_total', 'requests',
+           'Requests handled by the resilience layer (not counting retries '
+           'and hedges).'),
+          ('retries_denied_total', 'retries_denied',
+           'Retries not sent because the retry budget was exhausted.'),
+          ('hedges_total', 'hedges', 'Hedged requests sent.'),
+          ('hedges_won_total', 'hedges_won',
+           'Hedged requests whose response was used.'),
+          ('hedges_denied_total', 'hedges_denied',
+           'Hedged requests not sent because the retry budget was '
+           'exhausted.')):
+        name = '{}_{}'.format(prefix, suffix)
+        lines.extend(instrumentation.prometheus_header(name, 'counter',
+                                                       help_text))
+        for (host, method, endpoint), e in endpoints:
+          lines.append('{}{} {}'.format(name, instrumentation.prometheus_labels(
+              host=host, method=method, endpoint=endpoint, **extra_labels),
+              getattr(e, attr)))
+    return '\n'.join(lines) + '\n'
+
+
+def _close(response: Optional[requests.Response]) -> None:
+  if response is not None:
+    response.close()
+
+
+class Resilience(object):
+  """Timeouts, retries and hedging shared by any number of sessions.
+
+  Args:
+    timeout: Seconds each attempt may take (as requests' timeout, i.e. to
+      connect and between bytes received), unless its endpoint has a timeout
+      of its own or the caller specified one; None for no timeout.
+    endpoint_timeouts: Timeouts by pattern (fnmatch-style) matched against
+      "METHOD endpoint", e.g. {"GET */identification_service_areas": 2}.  The
+      first matching pattern applies.
+    max_retries: Retries of a request after its first attempt.
+    backoff: Base of the exponential backoff between attempts, in seconds.
+      Each wait is drawn uniformly up to backoff * 2^(retry - 1).
+    max_backoff: Longest wait between attempts, in seconds.
+    budget: Limits retries and hedges; by default, to 10% of requests.
+    hedge_percentile: If set, reads still unanswered after this percentile of
+      their endpoint's latency are hedged.
+    hedge_min_delay: Shortest time to wait before hedging, in seconds.
+    idempotent_posts: Patterns of POST endpoints which only read.
+    metrics: Where to count retries and hedges.
+    seed: Seed of the backoff jitter.
+  """
+
+  def __init__(self, timeout: Optional[float] = None,
+               endpoint_timeouts: Optional[Dict[str, float]] = None,
+               max_retries: int = 0, backoff: float = DEFAULT_BACKOFF_SEC,
+               max_backoff: float = DEFAULT_MAX_BACKOFF_SEC,
+               budget: Optional[RetryBudget] = None,
+               hedge_percentile: Optional[float] = None,
+               hedge_min_delay: float = DEFAULT_HEDGE_MIN_DELAY_SEC,
+               idempotent_posts=DEFAULT_IDEMPOTENT_POSTS,
+               metrics: Optional[ResilienceMetrics] = None,
+               seed: Optional[int] = None):
+    self.timeout = timeout
+    self.endpoint_timeouts = dict(endpoint_timeouts or {})
+    self.max_retries = max_retries
+    self.backoff = backoff
+    self.max_backoff = max_backoff
+    self.budget = budget or RetryBudget()
+    self.hedge_percentile = hedge_percentile
+    self.hedge_min_delay = hedge_min_delay
+    self.idempotent_posts = tuple(idempotent_posts)
+    self.metrics = metrics or ResilienceMetrics()
+    self.seed = seed
+    self._rng = random.Random(seed)
+    self._lock = threading.Lock()
+    self._latency: Dict[_EndpointKey, histogram.Histogram] = \
+        collections.defaultdict(histogram.Histogram)
+
+  def copy(self, metrics: Optional[ResilienceMetrics] = None) -> 'Resilience':
+    """Returns a Resilience with the same settings but no history.
+
+    The copy has a budget and latency history of its own, counts in metrics
+    (or new metrics), and draws the same backoff jitter as a new original
+    would.
+    """
+    return Resilience(
+        timeout=self.timeout, endpoint_timeouts=self.endpoint_timeouts,
+        max_retries=self.max_retries, backoff=self.backoff,
+        max_backoff=self.max_backoff,
+        budget=RetryBudget(ratio=self.budget.ratio,
+                           min_per_sec=self.budget.min_per_sec,
+                           window_sec=self.budget.window_sec),
+        hedge_percentile=self.hedge_percentile,
+        hedge_min_delay=self.hedge_min_delay,
+        idempotent_posts=self.idempotent_posts, metrics=metrics,
+        seed=self.seed)
+
+  def timeout_for(self, method: str, endpoint: str) -> Optional[float]:
+    name = '{} {}'.format(method, endpoint)
+    for pattern, timeout in self.endpoint_timeouts.items():
+      if fnmatch.fnmatchcase(name, pattern):
+        return timeout
+    return self.timeout
+
+  def _backoff(self, retry: int,
+               response: Optional[requests.Response]) -> float:
+    with self._lock:
+      delay = self._rng.uniform(
+          0, min(self.max_backoff, self.backoff * 2 ** (retry - 1)))
+    # Honor the DSS's request to slow down, within reason.
+    retry_after = response.headers.get('Retry-After') if response else None
+    if retry_after and retry_after.isdigit():
+      delay = max(delay, min(float(retry_after), self.max_backoff))
+    return delay
+
+  def _hedge_delay(self, key: _EndpointKey) -> Optional[float]:
+    with self._lock:
+      latency = self._latency.get(key)
+      if latency is None or latency.count < HEDGE_MIN_SAMPLES:
+        return None
+      return max(self.hedge_min_delay,
+                 latency.percentile(self.hedge_percentile))
+
+  def _attempt(self, send: Callable[..., requests.Response],
+               request: requests.PreparedRequest, kwargs: Dict[str, Any],
+               key: _EndpointKey
+              ) -> Tuple[Optional[requests.Response], Optional[Exception]]:
+    t0 = time.perf_counter()
+    try:
+      response = send(request, **kwargs)
+    except Exception as e:
+      return None, e
+    if response.status_code < 500 and response.status_code != 429:
+      with self._lock:
+        self._latency[key].record(time.perf_counter() - t0)
+    return response, None
+
+  def _hedged_attempt(
+      self, send: Callable[..., requests.Response],
+      request: requests.PreparedRequest, kwargs: Dict[str, Any],
+      key: _EndpointKey
+  ) -> Tuple[Optional[requests.Response], Optional[Exception]]:
+    delay = self._hedge_delay(key)
+    if delay is None:
+      return self._attempt(send, request, kwargs, key)
+
+    results = queue.Queue()
+
+    def run(hedge: bool):
+      results.put((hedge,) + self._attempt(send, request.copy(), kwargs, key))
+
+    threading.Thread(target=run, args=(False,), daemon=True).start()
+    outstanding = 1
+    try:
+      first = results.get(timeout=delay)
+    except queue.Empty:
+      first = None
+      if self.budget.try_spend():
+        self.metrics.record(key, 'hedges')
+        threading.Thread(target=run, args=(True,), daemon=True).start()
+        outstanding += 1
+      else:
+        self.metrics.record(key, 'hedges_denied')
+    if first is None:
+      first = results.get()
+    outstanding -= 1
+
+    hedge, response, error = first
+    failed = error is not None or response.status_code >= 500
+    if failed and outstanding:
+      # The other attempt may still succeed.
+      _close(response)
+      hedge, response, error = results.get()
+      outstanding -= 1
+    if outstanding:
+      # Let the slower attempt finish in the background and discard it.
+      threading.Thread(target=lambda: _close(results.get()[1]),
+                       daemon=True).start()
+    if hedge:
+      self.metrics.record(key, 'hedges_won')
+    return response, error
+
+  def send(self, send: Callable[..., requests.Response],
+           request: requests.PreparedRequest, **kwargs) -> requests.Response:
+    """Sends request with send, retrying and hedging as configured."""
+    endpoint = instrumentation.url_template(request.url)
+    key = (urllib.parse.urlparse(request.url).netloc, request.method, endpoint)
+    if kwargs.get('timeout') is None:
+      kwargs['timeout'] = self.timeout_for(request.method, endpoint)
+    kind = request_kind(request.method, endpoint, self.idempotent_posts)
+    hedge = (kind == READ and self.hedge_percentile is not None and
+             not kwargs.get('stream'))
+    self.budget.record_request()
+    self.metrics.record(key, 'requests')
+
+    retry = 0
+    while True:
+      attempt = self._hedged_attempt if hedge else self._attempt
+      response, error = attempt(send, request.copy(), kwargs, key)
+      reason = retry_reason(kind, response, error)
+      if reason is None or retry >= self.max_retries:
+        break
+      if not self.budget.try_spend():
+        self.metrics.record(key, 'retries_denied')
+        break
+      retry += 1
+      self.metrics.record(key, 'retries', reason)
+      delay = self._backoff(retry, response)
+      _close(response)
+      time.sleep(delay)
+
+    if error is not None:
+      raise error
+    return response
+
+
+def parse_endpoint_timeouts(value: str) -> Dict[str, float]:
+  """Parses --endpoint-timeouts, a JSON object of seconds by pattern."""
+  timeouts = json.loads(value) if value else {}
+  if not isinstance(timeouts, dict):
+    raise ValueError('Endpoint timeouts must be a JSON object')
+  return {pattern: float(t) for pattern, t in timeouts.items()}
+
+
+def add_options(add_option: Callable[..., Any]) -> None:
+  """Adds the resilience options with add_option.
+
+  add_option may be an argparse parser's add_argument or a pytest parser's
+  addoption.
+  """
+  add_option('--request-timeout', type=float,
+             help='Seconds each attempt of a request may take (to connect, '
+             'and between bytes of the response)')
+  add_option('--endpoint-timeouts', type=parse_endpoint_timeouts,
+             help='Timeouts of particular endpoints, as a JSON object of '
+             'seconds by "METHOD endpoint" pattern, e.g. '
+             '\'{"GET */identification_service_areas": 2}\'')
+  add_option('--max-retries', type=int, default=0,
+             help='Retries of failed requests which are safe to retry')
+  add_option('--retry-backoff', type=float, default=DEFAULT_BACKOFF_SEC,
+             help='Base, in seconds, of the jittered exponential backoff '
+             'between retries')
+  add_option('--retry-budget', type=float, default=DEFAULT_BUDGET_RATIO,
+             help='Retries and hedged requests allowed per request sent, '
+             'over a sliding window')
+  add_option('--hedge-percentile', type=float,
+             help='Send a second copy of reads still unanswered after this '
+             'percentile of their endpoint\'s latency (e.g. 95); by default, '
+             'reads are not hedged')
+
+
+def from_options(get_option: Callable[[str], Any],
+                 metrics: Optional[ResilienceMetrics] = None,
+                 seed: Optional[int] = None) -> Optional[Resilience]:
+  """Returns the Resilience of the options added by add_options.
+
+  get_option returns the value of an option given its destination name, e.g.
+  pytestconfig.getoption or lambda name: getattr(args, name).  seed, if any,
+  makes the backoff jitter reproducible.  Returns None if the options ask for
+  nothing, so that sessions are left as they were.
+  """
+  timeout = get_option('request_timeout')
+  endpoint_timeouts = get_option('endpoint_timeouts')
+  max_retries = get_option('max_retries') or 0
+  hedge_percentile = get_option('hedge_percentile')
+  if (timeout is None and not endpoint_timeouts and not max_retries and
+      hedge_percentile is None):
+    return None
+  return Resilience(
+      timeout=timeout, endpoint_timeouts=endpoint_timeouts,
+      max_retries=max_retries, backoff=get_option('retry_backoff'),
+      budget=RetryBudget(ratio=get_option('retry_budget')),
+      hedge_percentile=hedge_percentile, metrics=metrics, seed=seed)
@@ -0,0 +1,61 @@
+"""Request bodies and constants for the remote ID (RID) DSS API."""
+
+import datetime
+from typing import Any, Dict, List
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+ISA_PATH = '/identification_service_areas'
+SUBSCRIPTION_PATH = '/subscriptions'
+
+MAX_SUB_PER_AREA = 10
+
+MAX_SUB_TIME_HRS = 24
+
+
+def _extents(vertices: List[Dict[str, float]],
+             time_start: datetime.datetime,
+             time_end: datetime.datetime,
+             altitude_lo: float,
+             altitude_hi: float) -> Dict[str, Any]:
+  return {
+      'spatial_volume': {
+          'footprint': {
+              'vertices': vertices,
+          },
+          'altitude_lo': altitude_lo,
+          'altitude_hi': altitude_hi,
+      },
+      'time_start': time_start.strftime(DATE_FORMAT),
+      'time_end': time_end.strftime(DATE_FORMAT),
+  }
+
+
+def isa_body(vertices: List[Dict[str, float]],
+             time_start: datetime.datetime,
+             time_end: datetime.datetime,
+             flights_url: str = 'https://example.com/dss',
+             altitude_lo: float = 20,
+             altitude_hi: float = 400) -> Dict[str, Any]:
+  """Returns the body of a request to create or update an ISA."""
+  return {
+      'extents': _extents(vertices, time_start, time_end, altitude_lo,
+                          altitude_hi),
+      'flights_url': flights_url,
+  }
+
+
+def subscription_body(vertices: List[Dict[str, float]],
+                      time_start: datetime.datetime,
+                      time_end: datetime.datetime,
+                      callback_url: str = 'https://example.com/foo',
+                      altitude_lo: float = 20,
+                      altitude_hi: float = 400) -> Dict[str, Any]:
+  """Returns the body of a request to create or update a Subscription."""
+  return {
+      'extents': _extents(vertices, time_start, time_end, altitude_lo,
+                          altitude_hi),
+      'callbacks': {
+          'identification_service_area_url': callback_url
+      },
+  }
@@ -0,0 +1,136 @@
+"""Request bodies and constants for the strategic coordination (SCD) DSS API.
+
+Volumes follow the ASTM UTM API: outlines are GeoJSON, times and altitudes
+carry their format and units, and an Operation's key lists the OVNs of the
+Operations (and, when the Operation's Subscription is notified of them, the
+Constraints) it is known to be deconflicted from.
+"""
+
+import datetime
+from typing import Any, Dict, List, Optional
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+OPERATION_REFERENCE_PATH = '/operation_references'
+CONSTRAINT_REFERENCE_PATH = '/constraint_references'
+OPERATION_QUERY_PATH = '/operation_references/query'
+CONSTRAINT_QUERY_PATH = '/constraints/query'
+
+# States of an Operation.
+ACCEPTED = 'Accepted'
+ACTIVATED = 'Activated'
+NON_CONFORMING = 'NonConforming'
+CONTINGENT = 'Contingent'
+
+
+def time_value(t: datetime.datetime) -> Dict[str, str]:
+  return {'value': t.strftime(DATE_FORMAT), 'format': 'RFC3339'}
+
+
+def altitude(meters: float) -> Dict[str, Any]:
+  return {'value': meters, 'reference': 'W84', 'units': 'M'}
+
+
+def polygon(vertices: List[Dict[str, float]]) -> Dict[str, Any]:
+  """Returns a GeoJSON Polygon with vertices as its (closed) exterior ring."""
+  ring = [[v['lng'], v['lat']] for v in vertices]
+  if ring[0] != ring[-1]:
+    ring.append(ring[0])
+  return {'type': 'Polygon', 'coordinates': [ring]}
+
+
+def circle(lat: float, lng: float, radius_m: float) -> Dict[str, Any]:
+  """Returns a GeoJSON Feature describing a circle."""
+  return {
+      'type': 'Feature',
+      'geometry': {
+          'type': 'Point',
+          'coordinates': [lng, lat],
+      },
+      'properties': {
+          'radius': {
+              'value': radius_m,
+              'units': 'M',
+          },
+      },
+  }
+
+
+def volume4d(time_start: datetime.datetime,
+             time_end: datetime.datetime,
+             altitude_lower: float,
+             altitude_upper: float,
+             outline_polygon: Optional[Dict[str, Any]] = None,
+             outline_circle: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+  """Returns a Volume4D; exactly one of the outlines must be specified."""
+  if (outline_polygon is None) == (outline_circle is None):
+    raise ValueError('Exactly one of outline_polygon and outline_circle must '
+                     'be specified')
+  volume = {
+      'altitude_lower': altitude(altitude_lower),
+      'altitude_upper': altitude(altitude_upper),
+  }
+  if outline_polygon is not None:
+    volume['outline_polygon'] = outline_polygon
+  else:
+    volume['outline_circle'] = outline_circle
+  return {
+      'volume': volume,
+      'time_start': time_value(time_start),
+      'time_end': time_value(time_end),
+  }
+
+
+def operation_body(extents: List[Dict[str, Any]],
+                   key: List[str],
+                   old_version: int = 0,
+                   state: str = ACCEPTED,
+                   uss_base_url: str = 'https://example.com/uss',
+                   subscription_id: Optional[str] = None,
+                   notify_for_constraints: bool = False) -> Dict[str, Any]:
+  """Returns the body of a request to create or update an Operation.
+
+  Unless subscription_id names an existing Subscription, an implicit one is
+  created with the Operation.
+  """
+  body = {
+      'extents': extents,
+      'key': key,
+      'old_version': old_version,
+      'state': state,
+      'uss_base_url': uss_base_url,
+  }
+  if subscription_id is not None:
+    body['subscription_id'] = subscription_id
+  else:
+    body['new_subscription'] = {
+        'uss_base_url': uss_base_url,
+        'notify_for_constraints': notify_for_constraints,
+    }
+  return body
+
+
+def constraint_body(extents: List[Dict[str, Any]],
+                    old_version: int = 0,
+                    uss_base_url: str = 'https://example.com/uss'
+                    ) -> Dict[str, Any]:
+  """Returns the body of a request to create or update a Constraint."""
+  return {
+      'extents': extents,
+      'old_version': old_version,
+      'uss_base_url': uss_base_url,
+  }
+
+
+def conflicts(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+  """Returns the references listed in an AirspaceConflictResponse.
+
+  Each is the operation_reference or constraint_reference of an entry of
+  entity_conflicts.
+  """
+  references = []
+  for entry in body.get('entity_conflicts') or []:
+    for key in ('operation_reference', 'constraint_reference'):
+      if entry.get(key):
+        references.append(entry[key])
+  return references
@@ -0,0 +1,210 @@
+"""Bulk deletion of ISAs and Subscriptions left behind in a DSS.
+
+Runs that are aborted (or whose cleanup fails) leave entities behind, which
+make searches of the areas the tools use slower and can push an area over the
+DSS's limit on Subscriptions.  A Sweeper searches a set of areas ("tiles") in
+parallel for ISAs and Subscriptions of one owner, then deletes everything it
+found concurrently, at a bounded rate, using the versions the searches
+returned.  For example:
+
+  sweeper = Sweeper(session, concurrency=8, rate=50)
+  result = sweeper.sweep(geo.tile_region(-23.7, 130.6, -22.7, 131.6, 0.1))
+
+The DSS only returns the caller's own Subscriptions, but returns ISAs of every
+owner; only entities whose owner matches are deleted.
+"""
+
+import collections
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from google.auth import jwt
+import requests
+
+from monitorlib import geo, rid
+
+LOG = logging.getLogger(__name__)
+
+ISA = 'isa'
+SUBSCRIPTION = 'subscription'
+KINDS = [ISA, SUBSCRIPTION]
+
+DEFAULT_CONCURRENCY = 8
+
+_PATHS = {ISA: rid.ISA_PATH, SUBSCRIPTION: rid.SUBSCRIPTION_PATH}
+_RESULT_KEYS = {ISA: 'service_areas', SUBSCRIPTION: 'subscriptions'}
+_ENTITY_KEYS = {ISA: 'service_area', SUBSCRIPTION: 'subscription'}
+
+# (kind, id)
+EntityKey = Tuple[str, str]
+
+
+def token_subject(authorization: str) -> str:
+  """Returns the subject (the DSS owner) of an Authorization header's token."""
+  token = authorization.split(' ', 1)[-1]
+  return jwt.decode(token, verify=False)['sub']
+
+
+class _RateLimiter(object):
+  """Spaces out calls to wait() to at most rate per second."""
+
+  def __init__(self, rate: Optional[float]):
+    self._interval = 1.0 / rate if rate else 0
+    self._lock = threading.Lock()
+    self._next = time.monotonic()
+
+  def wait(self) -> None:
+    if not self._interval:
+      return
+    with self._lock:
+      send_at = max(self._next, time.monotonic())
+      self._next = send_at + self._interval
+    delay = send_at - time.monotonic()
+    if delay > 0:
+      time.sleep(delay)
+
+
+class SweepResult(object):
+  """Counts of entities found and what happened to them, per kind."""
+
+  def __init__(self):
+    self.searches = 0
+    self.failed_searches = 0
+    self.found: Dict[str, int] = collections.Counter()
+    self.skipped: Dict[str, int] = collections.Counter()
+    self.deleted: Dict[str, int] = collections.Counter()
+    self.already_gone: Dict[str, int] = collections.Counter()
+    self.failed: Dict[str, int] = collections.Counter()
+
+  @property
+  def failures(self) -> int:
+    return self.failed_searches + sum(self.failed.values())
+
+  def summary(self) -> str:
+    parts = ['{} searches ({} failed)'.format(self.searches,
+                                              self.failed_searches)]
+    for kind in KINDS:
+      parts.append('{}s: {} found, {} of other owners, {} deleted, {} already '
+                   'gone, {} failed'.format(
+                       kind, self.found[kind], self.skipped[kind],
+                       self.deleted[kind], self.already_gone[kind],
+                       self.failed[kind]))
+    return '; '.join(parts)
+
+
+class Sweeper(object):
+  """Finds and deletes one owner's ISAs and Subscriptions in given areas.
+
+  Args:
+    session: Session for the DSS, with URLs relative to the RID API root.
+    owner: Owner of the entities to delete.  If not specified, it is the
+      subject of the access token session authenticates with.
+    kinds: Kinds of entities to delete.
+    concurrency: Number of searches or deletes in flight at once.
+    rate: Maximum number of deletes per second, or None for no limit.
+  """
+
+  def __init__(self,
+               session: requests.Session,
+               owner: Optional[str] = None,
+               kinds: Iterable[str] = KINDS,
+               concurrency: int = DEFAULT_CONCURRENCY,
+               rate: Optional[float] = None):
+    self.session = session
+    self.owner = owner
+    self.kinds = list(kinds)
+    self.concurrency = concurrency
+    self._limiter = _RateLimiter(rate)
+    self._lock = threading.Lock()
+
+  def sweep(self, tiles: Iterable[List[Dict[str, float]]],
+            dry_run: bool = False) -> SweepResult:
+    """Deletes the owner's entities intersecting any of tiles.
+
+    If dry_run, entities are only counted as found.
+    """
+    result = SweepResult()
+    with concurrent.futures.ThreadPoolExecutor(self.concurrency) as executor:
+      entities = self._find(executor, list(tiles), result)
+      if not dry_run:
+        futures = [
+            executor.submit(self._delete, kind, entity_id, version, result)
+            for (kind, entity_id), version in entities.items()
+        ]
+        for future in futures:
+          future.result()
+    return result
+
+  def _find(self, executor: concurrent.futures.Executor,
+            tiles: List[List[Dict[str, float]]],
+            result: SweepResult) -> Dict[EntityKey, str]:
+    """Returns the version of every matching entity in any of tiles."""
+    futures = [
+        executor.submit(self._search, kind, geo.polygon_string(tile))
+        for tile in tiles for kind in self.kinds
+    ]
+    entities: Dict[EntityKey, str] = {}
+    owners: Dict[EntityKey, str] = {}
+    for future in futures:
+      result.searches += 1
+      try:
+        kind, resp = future.result()
+      except requests.RequestException as e:
+        LOG.warning('Search failed: %s', e)
+        result.failed_searches += 1
+        continue
+      if resp.status_code != 200:
+        LOG.warning('Search failed with %d: %s', resp.status_code, resp.text)
+        result.failed_searches += 1
+        continue
+      if self.owner is None:
+        self.owner = token_subject(resp.request.headers['Authorization'])
+        LOG.info('Sweeping entities owned by %s', self.owner)
+      for entity in resp.json()[_RESULT_KEYS[kind]]:
+        # Entities spanning several tiles are returned once per tile.
+        owners[(kind, entity['id'])] = entity['owner']
+        entities[(kind, entity['id'])] = entity['version']
+
+    for key, owner in owners.items():
+      if owner == self.owner:
+        result.found[key[0]] += 1
+      else:
+        result.skipped[key[0]] += 1
+        del entities[key]
+    return entities
+
+  def _search(self, kind: str, area: str) -> Tuple[str, requests.Response]:
+    return kind, self.session.get('{}?area={}'.format(_PATHS[kind], area))
+
+  def _delete(self, kind: str, entity_id: str, version: str,
+              result: SweepResult) -> None:
+    path = '{}/{}'.format(_PATHS[kind], entity_id)
+    outcome = None
+    try:
+      self._limiter.wait()
+      resp = self.session.delete('{}/{}'.format(path, version))
+      if resp.status_code not in (200, 404):
+        # The entity may have been updated since we found it; try again with
+        # its current version.
+        current = self.session.get(path)
+        if current.status_code == 404:
+          resp = current
+        elif current.status_code == 200:
+          current_version = current.json()[_ENTITY_KEYS[kind]]['version']
+          if current_version != version:
+            self._limiter.wait()
+            resp = self.session.delete('{}/{}'.format(path, current_version))
+      if resp.status_code == 200:
+        outcome = result.deleted
+      elif resp.status_code == 404:
+        outcome = result.already_gone
+      else:
+        LOG.warning('Failed to delete %s %s: %d %s', kind, entity_id,
+                    resp.status_code, resp.text)
+    except requests.RequestException as e:
+      LOG.warning('Failed to delete %s %s: %s', kind, entity_id, e)
+    with self._lock:
+      (outcome if outcome is not None else result.failed)[kind] += 1
@@ -0,0 +1,298 @@
+"""Access token cache shared by the prober, the interop suite and other tools.
+
+Tokens are cached per (audience, scopes) and considered stale `refresh_skew`
+seconds before the `exp` claim of the JWT, so no request is sent with a token
+that is about to expire.  A background thread replaces tokens shortly before
+they become stale so that nobody has to wait for them, callers keep using a
+token that is stale but still valid while its replacement is issued, concurrent
+misses for the same key share one issuance
+request, and tokens can optionally be persisted to disk so that subsequent runs
+skip issuance altogether.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_SKEW_SEC = 60
+
+# How long to wait before retrying a failed background refresh.
+REFRESH_RETRY_SEC = 5
+
+# How long before a token becomes stale the background thread replaces it, at
+# most; short-lived tokens are replaced halfway between issuance and staleness.
+BACKGROUND_LEAD_SEC = 5
+
+_Key = Tuple[str, str]
+
+
+def token_expiry(token: str) -> Optional[float]:
+  """Returns the `exp` claim of a JWT, or None if it cannot be determined."""
+  try:
+    payload = token.split('.')[1]
+    payload += '=' * (-len(payload) % 4)
+    exp = json.loads(base64.urlsafe_b64decode(payload.encode('ascii')))['exp']
+    return float(exp)
+  except (IndexError, KeyError, TypeError, ValueError):
+    return None
+
+
+class _Entry(object):
+  def __init__(self, token: str, expires_at: Optional[float],
+               refresh_at: Optional[float], issued_at: float):
+    self.token = token
+    self.expires_at = expires_at
+    self.refresh_at = refresh_at
+    # When the background thread replaces the token.
+    self.prefetch_at = None
+    if refresh_at is not None:
+      self.prefetch_at = refresh_at - min(BACKGROUND_LEAD_SEC,
+                                          (refresh_at - issued_at) / 2)
+
+
+class TokenCache(object):
+  """Thread-safe, self-refreshing cache of access tokens.
+
+  Args:
+    issue: Called with (scopes, audience) to obtain a new access token.
+    refresh_skew: A token is refreshed this many seconds before it expires.
+    background_refresh: Whether to refresh tokens from a background thread
+      before they become stale.
+    persist_path: If specified, tokens are loaded from and saved to this file.
+    namespace: Distinguishes tokens of different credentials sharing one
+      persist_path; should identify the issuer and principal.
+    clock: Source of the current time, in seconds since the epoch.
+  """
+
+  def __init__(self,
+               issue: Callable[[List[str], str], str],
+               refresh_skew: float = DEFAULT_REFRESH_SKEW_SEC,
+               background_refresh: bool = True,
+               persist_path: Optional[str] = None,
+               namespace: str = '',
+               clock: Callable[[], float] = time.time):
+    self._issue = issue
+    self._refresh_skew = refresh_skew
+    self._persist_path = persist_path
+    self._namespace = namespace
+    self._clock = clock
+
+    self._lock = threading.Lock()
+    self._entries: Dict[_Key, _Entry] = {}
+    self._scopes: Dict[_Key, List[str]] = {}
+    self._in_flight: Dict[_Key, Future] = {}
+
+    self._closed = False
+    self._wakeup = threading.Condition(self._lock)
+    self._refresher = None
+    if persist_path:
+      self._load()
+    if background_refresh:
+      self._refresher = threading.Thread(
+          target=self._refresh_loop, name='token-refresh', daemon=True)
+      self._refresher.start()
+
+  def _make_entry(self, token: str, issued_at: float) -> _Entry:
+    expires_at = token_expiry(token)
+    if expires_at is None:
+      return _Entry(token, None, None, issued_at)
+    # Never refresh a short-lived token more often than twice per lifetime.
+    skew = min(self._refresh_skew, (expires_at - issued_at) / 2)
+    return _Entry(token, expires_at, expires_at - skew, issued_at)
+
+  def _is_fresh(self, entry: Optional[_Entry], early: bool = False) -> bool:
+    """Returns whether entry can be used without refreshing it first.
+
+    With early, the entry is stale from the moment the background thread should
+    replace it instead.
+    """
+    if entry is None:
+      return False
+    if entry.refresh_at is None:
+      return True
+    return self._clock() < (entry.prefetch_at if early else entry.refresh_at)
+
+  def _is_usable(self, key: _Key, entry: Optional[_Entry]) -> bool:
+    """Returns whether entry can be used, if need be while it is refreshed."""
+    if self._is_fresh(entry):
+      return True
+    # A stale token still works until it expires, so nobody needs to wait for
+    # its replacement.
+    return (entry is not None and key in self._in_flight and
+            self._clock() < entry.expires_at)
+
+  def get(self, scopes: List[str], audience: str) -> str:
+    """Returns a token for audience with scopes, issuing one if necessary."""
+    key = (audience, ' '.join(scopes))
+    with self._lock:
+      entry = self._entries.get(key)
+      if self._is_usable(key, entry):
+        return entry.token
+      self._scopes[key] = list(scopes)
+    return self._fetch(key).token
+
+  def prefetch(self, scopes: List[str], audience: str) -> None:
+    """Has the background thread issue a token for audience with scopes now.
+
+    Without background refresh, the token is issued synchronously instead.
+    """
+    key = (audience, ' '.join(scopes))
+    with self._lock:
+      if key in self._scopes:
+        return
+      self._scopes[key] = list(scopes)
+      self._wakeup.notify()
+    if self._refresher is None:
+      self._fetch(key)
+
+  async def get_async(self, scopes: List[str], audience: str) -> str:
+    """Like get, but waits for issuance without blocking the event loop."""
+    key = (audience, ' '.join(scopes))
+    with self._lock:
+      entry = self._entries.get(key)
+      if self._is_usable(key, entry):
+        return entry.token
+    return await asyncio.get_event_loop().run_in_executor(
+        None, self.get, scopes, audience)
+
+  def _fetch(self, key: _Key, early: bool = False) -> _Entry:
+    """Issues a token for key, or waits for an issuance already in flight.
+
+    With early, a token due to be replaced by the background thread is
+    replaced even though it is not stale yet.
+    """
+    with self._lock:
+      entry = self._entries.get(key)
+      if self._is_fresh(entry, early):
+        # Another caller refreshed the token while we were waiting for the lock.
+        return entry
+      future = self._in_flight.get(key)
+      owner = future is None
+      if owner:
+        future = Future()
+        self._in_flight[key] = future
+      scopes = self._scopes[key]
+    if not owner:
+      return future.result()
+
+    try:
+      issued_at = self._clock()
+      entry = self._make_entry(self._issue(list(scopes), key[0]), issued_at)
+    except BaseException as e:
+      with self._lock:
+        del self._in_flight[key]
+      future.set_exception(e)
+      raise
+    with self._lock:
+      self._entries[key] = entry
+      del self._in_flight[key]
+      self._wakeup.notify()
+    future.set_result(entry)
+    if self._persist_path:
+      self._save()
+    return entry
+
+  def _next_refresh(
+      self, retry_at: Dict[_Key, float]
+  ) -> Tuple[Optional[_Key], Optional[float]]:
+    """Returns the key which needs refreshing soonest and when."""
+    soonest_key, soonest = None, None
+    for key in self._scopes:
+      entry = self._entries.get(key)
+      if entry is None:
+        # Prefetched, but not yet issued.
+        refresh_at = retry_at.get(key, 0)
+      elif entry.refresh_at is None:
+        continue
+      else:
+        refresh_at = max(entry.prefetch_at, retry_at.get(key, 0))
+      if soonest is None or refresh_at < soonest:
+        soonest_key, soonest = key, refresh_at
+    return soonest_key, soonest
+
+  def _refresh_loop(self) -> None:
+    retry_at: Dict[_Key, float] = {}
+    while True:
+      with self._lock:
+        while True:
+          if self._closed:
+            return
+          key, refresh_at = self._next_refresh(retry_at)
+          if key is not None:
+            if refresh_at <= self._clock():
+              break
+            self._wakeup.wait(refresh_at - self._clock())
+          else:
+            self._wakeup.wait()
+      try:
+        self._fetch(key, early=True)
+        retry_at.pop(key, None)
+      except Exception as e:
+        LOG.warning('Failed to refresh token for %s: %s', key, e)
+        retry_at[key] = self._clock() + REFRESH_RETRY_SEC
+
+  def close(self) -> None:
+    """Stops the background refresh thread."""
+    with self._lock:
+      self._closed = True
+      self._wakeup.notify()
+    if self._refresher is not None:
+      self._refresher.join()
+
+  # Persistence
+
+  def _disk_key(self, key: _Key) -> str:
+    return json.dumps([self._namespace, key[0], key[1]])
+
+  def _read_file(self) -> Dict[str, Dict]:
+    try:
+      with open(self._persist_path, 'r') as f:
+        return json.load(f)
+    except (IOError, ValueError):
+      return {}
+
+  def _load(self) -> None:
+    now = self._clock()
+    for disk_key, value in self._read_file().items():
+      namespace, audience, scopes = json.loads(disk_key)
+      if namespace != self._namespace:
+        continue
+      expires_at = value['expires_at']
+      entry = _Entry(value['token'], expires_at, expires_at - self._refresh_skew,
+                     now)
+      if entry.refresh_at > now:
+        key = (audience, scopes)
+        self._entries[key] = entry
+        self._scopes[key] = scopes.split(' ') if scopes else []
+
+  def _save(self) -> None:
+    # Merge with what is already on disk so that caches for other credentials
+    # (or other processes) sharing the file keep their tokens.
+    with self._lock:
+      entries = {
+          self._disk_key(key): {'token': e.token, 'expires_at': e.expires_at}
+          for key, e in self._entries.items() if e.expires_at is not None
+      }
+    now = self._clock()
+    contents = {
+        k: v for k, v in self._read_file().items() if v['expires_at'] > now
+    }
+    contents.update(entries)
+    directory = os.path.dirname(os.path.abspath(self._persist_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tokens')
+    try:
+      with os.fdopen(fd, 'w') as f:
+        json.dump(contents, f)
+      os.replace(tmp_path, self._persist_path)
+    except BaseException:
+      os.unlink(tmp_path)
+      raise
@@ -1,30 +1,19 @@
+from monitorlib import geo
+
 MAX_SUB_PER_AREA = 10
 
 MAX_SUB_TIME_HRS = 24
 
 DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 
-VERTICES = [
-    {
-        'lng': 130.6205,
-        'lat': -23.6558
-    },
-    {
-        'lng': 130.6301,
-        'lat': -23.6898
-    },
-    {
-        'lng': 130.6700,
-        'lat': -23.6709
-    },
-    {
-        'lng': 130.6466,
-        'lat': -23.6407
-    },
-]
+# Each test module creates its entities in its own footprints from this grid
+# (see the `footprint` fixture in conftest.py), so modules can run in parallel
+# without seeing each other's ISAs and Subscriptions.  The grid lies south of
+# the one used by the interoperability tests so the two never overlap either.
+FOOTPRINT_GRID = geo.Grid(origin_lat=-24.7, rows=10)
 
-GEO_POLYGON_STRING = ','.join(
-    '{},{}'.format(x['lat'], x['lng']) for x in VERTICES)
+# Number of footprints reserved for each test module.
+FOOTPRINTS_PER_MODULE = 2
 
 HUGE_VERTICES = [
     {
@@ -1,195 +1,249 @@
 import copy
+import logging
 import requests
-import urllib.parse
 import uuid
 
-from google.auth.transport import requests as google_requests
-from google.oauth2 import service_account
 import pytest
 
-SCOPES = [
-    'dss.write.identification_service_areas',
-    'dss.read.identification_service_areas',
-]
+import common
+from monitorlib import (
+    auth, geo, infrastructure, instrumentation, resilience, sweeper, tokens)
+from monitorlib.auth import (
+    SCOPES, AuthAdapter, DummyOAuthServerAdapter, ServiceAccountAuthAdapter,
+    UsernamePasswordAuthAdapter)
+from monitorlib.infrastructure import PrefixURLSession
 
+LOG = logging.getLogger(__name__)
 
-class AuthAdapter(requests.adapters.HTTPAdapter):
-  """Base class for requests adapters that add JWTs to requests."""
 
-  def issue_token(self, intended_audience, scopes):
-    """Subclasses must return a bearer token for the given audience."""
-
-    raise NotImplementedError()
-
-  def add_headers(self, request, **kwargs):
-    intended_audience = urllib.parse.urlparse(request.url).hostname
-    if intended_audience not in self._tokens:
-      self._tokens[intended_audience] = self.issue_token(intended_audience, SCOPES)
-    token = self._tokens[intended_audience]
-    request.headers['Authorization'] = 'Bearer ' + token
-
-
-class DummyOAuthServerAdapter(AuthAdapter):
-  """Requests adapter that gets JWTs that uses the Dummy OAuth Server"""
-
-  def __init__(self, token_endpoint):
-    super().__init__()
-
-    oauth_session = requests.Session()
-
-    self._oauth_token_endpoint = token_endpoint
-    self._oauth_session = oauth_session
-    self._tokens = {}
-
-  def issue_token(self, intended_audience, scopes):
-    url = '{}?grant_type=client_credentials&scope={}&intended_audience={}&issuer=dummy'.format(
-        self._oauth_token_endpoint, urllib.parse.quote(' '.join(scopes)),
-        urllib.parse.quote(intended_audience))
-    response = self._oauth_session.post(url).json()
-    return response['access_token']
-
-class ServiceAccountAuthAdapter(AuthAdapter):
-  """Requests adapter that gets JWTs using a service account."""
-
-  def __init__(self, token_endpoint, service_account_json):
-    super().__init__()
+def pytest_addoption(parser):
+  parser.addoption('--api-version-role')
+  parser.addoption('--dss-endpoint')
+  parser.addoption('--scd-dss-endpoint')
+  parser.addoption('--oauth-token-endpoint')
 
-    credentials = service_account.Credentials.from_service_account_file(
-        service_account_json).with_scopes(['email'])
-    oauth_session = google_requests.AuthorizedSession(credentials)
+  parser.addoption('--dss-grpc-endpoint',
+                   help='host:port of a grpc-backend to send requests to as '
+                   'gRPC calls, bypassing the http-gateway at --dss-endpoint')
+  parser.addoption('--grpc-channels', type=int,
+                   help='Number of gRPC channels to spread calls over')
 
-    self._oauth_token_endpoint = token_endpoint
-    self._oauth_session = oauth_session
-    self._tokens = {}
+  parser.addoption('--oauth-service-account-json')
 
-  def issue_token(self, intended_audience, scopes):
-    url = '{}?grant_type=client_credentials&scope={}&intended_audience={}'.format(
-        self._oauth_token_endpoint, urllib.parse.quote(' '.join(scopes)),
-        urllib.parse.quote(intended_audience))
-    response = self._oauth_session.post(url).json()
-    return response['access_token']
+  parser.addoption('--oauth-username')
+  parser.addoption('--oauth-password')
+  parser.addoption('--oauth-client-id')
 
+  parser.addoption('--use-dummy-oauth')
 
-class UsernamePasswordAuthAdapter(AuthAdapter):
-  """Requests adapter that gets JWTs using a username and password."""
+  parser.addoption('--jwt-private-key-file',
+                   help='Sign access tokens locally with this RSA private key '
+                   'instead of requesting them from an OAuth server')
+  parser.addoption('--jwt-issuer', default=auth.DEFAULT_ISSUER,
+                   help='Issuer of locally-signed access tokens')
+  parser.addoption('--jwt-subject', default=auth.DEFAULT_SUBJECT,
+                   help='Subject of locally-signed access tokens')
+  parser.addoption('--jwt-lifetime', type=float,
+                   default=auth.DEFAULT_TOKEN_LIFETIME_SEC,
+                   help='Seconds until locally-signed access tokens expire')
+  parser.addoption('--jwt-claims', type=auth.parse_claims,
+                   help='Additional claims of locally-signed access tokens, as '
+                   'a JSON object')
+
+  parser.addoption('--token-refresh-skew', type=float,
+                   default=tokens.DEFAULT_REFRESH_SKEW_SEC,
+                   help='Refresh access tokens this many seconds before they '
+                   'expire')
+  parser.addoption('--token-cache-file',
+                   help='File to persist access tokens in between runs')
+
+  parser.addoption('--request-metrics-json',
+                   help='Write per-endpoint request timing to this JSON file')
+  parser.addoption('--request-metrics-prometheus',
+                   help='Write per-endpoint request timing to this file in the '
+                   'Prometheus text exposition format')
+
+  resilience.add_options(parser.addoption)
+  parser.addoption('--resilience-metrics-json',
+                   help='Write per-endpoint counts of retries and hedged '
+                   'requests to this JSON file')
+  parser.addoption('--resilience-metrics-prometheus',
+                   help='Write per-endpoint counts of retries and hedged '
+                   'requests to this file in the Prometheus text exposition '
+                   'format')
+
+  parser.addoption('--footprint-offset', type=int, default=0,
+                   help='Shift the footprints used by the test modules by this '
+                   'many modules, so that several probers can run against the '
+                   'same DSS at the same time')
+  parser.addoption('--sweep', action='store_true',
+                   help='After each test module, delete any ISAs and '
+                   'Subscriptions it left behind in its footprints')
+
+
+# Name under which the prober daemon registers itself as a pytest plugin.
+DAEMON_PLUGIN = 'prober_daemon'
+
+
+def _daemon(pytestconfig):
+  """Returns the prober daemon running these tests, if any."""
+  return pytestconfig.pluginmanager.get_plugin(DAEMON_PLUGIN)
+
+
+def make_auth_adapter(pytestconfig):
+  return auth.make_auth_adapter(
+      pytestconfig.getoption('oauth_token_endpoint'),
+      service_account_json=pytestconfig.getoption('oauth_service_account_json'),
+      username=pytestconfig.getoption('oauth_username'),
+      password=pytestconfig.getoption('oauth_password'),
+      client_id=pytestconfig.getoption('oauth_client_id'),
+      use_dummy_oauth=pytestconfig.getoption('use_dummy_oauth') is not None,
+      private_key_file=pytestconfig.getoption('jwt_private_key_file'),
+      signer_options={
+          'issuer': pytestconfig.getoption('jwt_issuer'),
+          'subject': pytestconfig.getoption('jwt_subject'),
+          'lifetime': pytestconfig.getoption('jwt_lifetime'),
+          'extra_claims': pytestconfig.getoption('jwt_claims'),
+      },
+      token_cache_options={
+          'refresh_skew': pytestconfig.getoption('token_refresh_skew'),
+          'persist_path': pytestconfig.getoption('token_cache_file'),
+      })
 
-  def __init__(self, token_endpoint, username, password, client_id):
-    super().__init__()
 
-    self._oauth_token_endpoint = token_endpoint
-    self._username = username
-    self._password = password
-    self._client_id = client_id
-    self._tokens = {}
+@pytest.fixture(scope='session')
+def request_metrics(pytestconfig):
+  daemon = _daemon(pytestconfig)
+  if daemon is not None:
+    # The daemon accumulates request metrics across cycles and serves them.
+    yield daemon.request_metrics
+    return
+
+  metrics = instrumentation.RequestMetrics()
+  yield metrics
+
+  if hasattr(pytestconfig, 'workeroutput'):
+    # This is a pytest-xdist worker; the controller merges the metrics of all
+    # workers and writes them out.
+    pytestconfig.workeroutput['request_metrics'] = metrics.to_dict()
+  else:
+    _write_request_metrics(pytestconfig, metrics)
 
-  def issue_token(self, intended_audience, scopes):
-    scopes.append('aud:{}'.format(intended_audience))
-    response = requests.post(self._oauth_token_endpoint, data={
-      'grant_type': "password",
-      'username': self._username,
-      'password': self._password,
-      'client_id': self._client_id,
-      'scope': ' '.join(scopes),
-    }).json()
-    return response['access_token']
 
+def _write_request_metrics(config, metrics):
+  json_path = config.getoption('request_metrics_json')
+  if json_path:
+    metrics.write_json(json_path)
+  prometheus_path = config.getoption('request_metrics_prometheus')
+  if prometheus_path:
+    metrics.write_prometheus(prometheus_path, prefix='dss_prober')
 
-class PrefixURLSession(requests.Session):
-  """Requests session that adds a prefix to URLs that start with a '/'."""
 
-  def __init__(self, prefix_url):
-    super().__init__()
+@pytest.fixture(scope='session')
+def resilience_metrics(pytestconfig):
+  daemon = _daemon(pytestconfig)
+  if daemon is not None:
+    yield daemon.resilience_metrics
+    return
 
-    self._prefix_url = prefix_url
+  metrics = resilience.ResilienceMetrics()
+  yield metrics
 
-  def prepare_request(self, request, **kwargs):
-    if request.url.startswith('/'):
-      request.url = self._prefix_url + request.url
-    return super().prepare_request(request, **kwargs)
+  if hasattr(pytestconfig, 'workeroutput'):
+    pytestconfig.workeroutput['resilience_metrics'] = metrics.to_dict()
+  else:
+    _write_resilience_metrics(pytestconfig, metrics)
 
-  def issue_token(self, scopes):
-    adapter = self.get_adapter(self._prefix_url)
-    intended_audience = urllib.parse.urlparse(self._prefix_url).hostname
-    return adapter.issue_token(intended_audience, scopes)
 
-def pytest_addoption(parser):
-  parser.addoption('--api-version-role')
-  parser.addoption('--dss-endpoint')
-  parser.addoption('--scd-dss-endpoint')
-  parser.addoption('--oauth-token-endpoint')
+def _write_resilience_metrics(config, metrics):
+  json_path = config.getoption('resilience_metrics_json')
+  if json_path:
+    metrics.write_json(json_path)
+  prometheus_path = config.getoption('resilience_metrics_prometheus')
+  if prometheus_path:
+    with open(prometheus_path, 'w') as f:
+      f.write(metrics.prometheus_text(prefix='dss_prober'))
 
-  parser.addoption('--oauth-service-account-json')
 
-  parser.addoption('--oauth-username')
-  parser.addoption('--oauth-password')
-  parser.addoption('--oauth-client-id')
-
-  parser.addoption('--use-dummy-oauth')
+@pytest.fixture(scope='session')
+def request_resilience(pytestconfig, resilience_metrics):
+  """Returns the Resilience shared by all sessions, or None."""
+
+  def create():
+    return resilience.from_options(pytestconfig.getoption, resilience_metrics)
+
+  daemon = _daemon(pytestconfig)
+  if daemon is not None:
+    # Keep the latency history which hedging delays are based on.
+    return daemon.shared_session('resilience', create)
+  return create()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+  # Called on the pytest-xdist controller as each worker finishes.
+  output = getattr(node, 'workeroutput', {})
+  if output.get('request_metrics') is not None:
+    if not hasattr(node.config, 'worker_request_metrics'):
+      node.config.worker_request_metrics = instrumentation.RequestMetrics()
+    node.config.worker_request_metrics.merge(
+        instrumentation.RequestMetrics.from_dict(output['request_metrics']))
+  if output.get('resilience_metrics') is not None:
+    if not hasattr(node.config, 'worker_resilience_metrics'):
+      node.config.worker_resilience_metrics = resilience.ResilienceMetrics()
+    node.config.worker_resilience_metrics.merge(
+        resilience.ResilienceMetrics.from_dict(output['resilience_metrics']))
+
+
+def pytest_sessionfinish(session):
+  metrics = getattr(session.config, 'worker_request_metrics', None)
+  if metrics is not None:
+    _write_request_metrics(session.config, metrics)
+  metrics = getattr(session.config, 'worker_resilience_metrics', None)
+  if metrics is not None:
+    _write_resilience_metrics(session.config, metrics)
 
 
 @pytest.fixture(scope='session')
-def session(pytestconfig):
-  oauth_token_endpoint = pytestconfig.getoption('oauth_token_endpoint')
-
-  # Create an auth adapter to get JWTs using the given credentials.  We can use
-  # either a service account, a username/password/client_id or a dummy oauth server.
-  if pytestconfig.getoption('oauth_service_account_json') is not None:
-    auth_adapter = ServiceAccountAuthAdapter(oauth_token_endpoint,
-        pytestconfig.getoption('oauth_service_account_json'))
-  elif pytestconfig.getoption('oauth_username') is not None:
-    auth_adapter = UsernamePasswordAuthAdapter(oauth_token_endpoint,
-        pytestconfig.getoption('oauth_username'),
-        pytestconfig.getoption('oauth_password'),
-        pytestconfig.getoption('oauth_client_id'))
-  elif pytestconfig.getoption('use_dummy_oauth') is not None:
-    auth_adapter = DummyOAuthServerAdapter(oauth_token_endpoint)
-  else:
-    raise ValueError(
-        'You must provide either an OAuth service account, or a username, '
-        'password and client ID')
-
+def session(pytestconfig, request_metrics, request_resilience):
   dss_endpoint = pytestconfig.getoption('dss_endpoint')
   if dss_endpoint is None:
     raise ValueError('Missing required --dss-endpoint')
   api_version_role = pytestconfig.getoption('api_version_role', '')
 
-  s = PrefixURLSession(dss_endpoint + api_version_role)
-  s.mount('http://', auth_adapter)
-  s.mount('https://', auth_adapter)
-  return s
+  def create():
+    return infrastructure.make_session(
+        dss_endpoint + api_version_role, make_auth_adapter(pytestconfig),
+        request_metrics,
+        grpc_target=pytestconfig.getoption('dss_grpc_endpoint'),
+        grpc_channels=pytestconfig.getoption('grpc_channels'),
+        resilience=request_resilience)
+
+  daemon = _daemon(pytestconfig)
+  if daemon is not None:
+    # Reuse the session of the previous cycle to keep connections and tokens
+    # warm.
+    return daemon.shared_session('session', create)
+  return create()
 
 
 @pytest.fixture(scope='session')
-def scd_session(pytestconfig):
+def scd_session(pytestconfig, request_metrics, request_resilience):
   scd_dss_endpoint = pytestconfig.getoption('scd_dss_endpoint')
   if scd_dss_endpoint is None:
     return None
 
-  oauth_token_endpoint = pytestconfig.getoption('oauth_token_endpoint')
-
-  # Create an auth adapter to get JWTs using the given credentials.  We can use
-  # either a service account, a username/password/client_id or a dummy oauth server.
-  if pytestconfig.getoption('oauth_service_account_json') is not None:
-    auth_adapter = ServiceAccountAuthAdapter(oauth_token_endpoint,
-        pytestconfig.getoption('oauth_service_account_json'))
-  elif pytestconfig.getoption('oauth_username') is not None:
-    auth_adapter = UsernamePasswordAuthAdapter(oauth_token_endpoint,
-        pytestconfig.getoption('oauth_username'),
-        pytestconfig.getoption('oauth_password'),
-        pytestconfig.getoption('oauth_client_id'))
-  elif pytestconfig.getoption('use_dummy_oauth') is not None:
-    auth_adapter = DummyOAuthServerAdapter(oauth_token_endpoint)
-  else:
-    raise ValueError(
-        'You must provide either an OAuth service account, or a username, '
-        'password and client ID')
+  def create():
+    return infrastructure.make_session(
+        scd_dss_endpoint, make_auth_adapter(pytestconfig), request_metrics,
+        grpc_target=pytestconfig.getoption('dss_grpc_endpoint'),
+        grpc_channels=pytestconfig.getoption('grpc_channels'),
+        resilience=request_resilience)
 
-  scd_dss_endpoint = pytestconfig.getoption('scd_dss_endpoint')
-
-  s = PrefixURLSession(scd_dss_endpoint)
-  s.mount('http://', auth_adapter)
-  s.mount('https://', auth_adapter)
-  return s
+  daemon = _daemon(pytestconfig)
+  if daemon is not None:
+    return daemon.shared_session('scd_session', create)
+  return create()
 
 
 @pytest.fixture(scope='function')
@@ -200,12 +254,80 @@ def rogue_session(pytestconfig):
   if dss_endpoint is None:
     raise ValueError('Missing required --dss-endpoint')
 
+  grpc_target = pytestconfig.getoption('dss_grpc_endpoint')
+  if grpc_target is not None:
+    from monitorlib import grpc_client
+    auth_adapter = grpc_client.GRPCAdapter(grpc_target)
+
   s = PrefixURLSession(dss_endpoint + api_version_role)
   s.mount('http://', auth_adapter)
   s.mount('https://', auth_adapter)
   return s
 
 
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+  # The tests of a module depend on each other (e.g. create, then get, then
+  # delete), so when running in parallel with pytest-xdist every module must
+  # run on a single worker.
+  if config.getoption('dist', default='no') == 'load':
+    config.option.dist = 'loadfile'
+
+
+def pytest_collection_modifyitems(config, items):
+  # Number the test modules so that each gets its own footprints.  Every
+  # pytest-xdist worker collects the same items, so they all agree on the
+  # numbering.
+  modules = sorted(set(item.nodeid.split('::')[0] for item in items))
+  config.footprint_module_index = {m: i for i, m in enumerate(modules)}
+
+
+@pytest.fixture(scope='module')
+def footprint(request, pytestconfig):
+  """Returns a function giving the vertices of this module's footprints.
+
+  footprint(i), for 0 <= i < common.FOOTPRINTS_PER_MODULE, is a footprint no
+  other test module uses.
+  """
+  module_index = (pytestconfig.footprint_module_index[request.node.nodeid] +
+                  pytestconfig.getoption('footprint_offset'))
+
+  def vertices(i):
+    if not 0 <= i < common.FOOTPRINTS_PER_MODULE:
+      raise ValueError('Each module only has {} footprints'.format(
+          common.FOOTPRINTS_PER_MODULE))
+    return common.FOOTPRINT_GRID.vertices(
+        module_index * common.FOOTPRINTS_PER_MODULE + i)
+
+  return vertices
+
+
+@pytest.fixture(scope='module', autouse=True)
+def sweep(request, pytestconfig, footprint):
+  """Deletes what the module left in its footprints, if --sweep."""
+  if not pytestconfig.getoption('sweep'):
+    yield
+    return
+  # Requested before the module's tests run, since fixtures can no longer be
+  # requested once teardown has begun.
+  session = request.getfixturevalue('session')
+  yield
+  tiles = [footprint(i) for i in range(common.FOOTPRINTS_PER_MODULE)]
+  result = sweeper.Sweeper(session).sweep(tiles)
+  if sum(result.deleted.values()):
+    LOG.info('Swept %s: %s', request.node.nodeid, result.summary())
+
+
+@pytest.fixture(scope='module')
+def vertices(footprint):
+  return footprint(0)
+
+
+@pytest.fixture(scope='module')
+def geo_polygon_string(vertices):
+  return geo.polygon_string(vertices)
+
+
 @pytest.fixture(scope='module')
 def isa1_uuid():
   return str(uuid.uuid4())
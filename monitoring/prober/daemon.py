@@ -0,0 +1,333 @@
+"""Runs the prober continuously and serves its results to Prometheus.
+
+Every --interval seconds, the prober tests are run in-process with pytest.
+Sessions (and therefore connections and access tokens) are kept from one
+cycle to the next, and the outcome of each scenario (test module), its
+duration, the expiry propagation delays it measured and the latency of every
+DSS endpoint it called are exposed at /metrics.  Usage:
+
+  python daemon.py --interval 30 --metrics-port 8080 \
+      --dss-endpoint <URL> --api-version-role <ROLE> ... (other prober options)
+"""
+
+import argparse
+import collections
+import http.server
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import pytest
+
+from monitorlib import histogram, instrumentation, resilience
+
+LOG = logging.getLogger('prober_daemon')
+
+# Must match conftest.DAEMON_PLUGIN.
+PLUGIN_NAME = 'prober_daemon'
+
+METRIC_PREFIX = 'dss_prober'
+
+PROBER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Name of the property recorded by scenarios that measure expiry propagation.
+EXPIRY_PROPAGATION_PROPERTY = 'expiry_propagation_sec'
+
+PASSED = 'passed'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+
+def scenario_name(nodeid: str) -> str:
+  """Returns the scenario (test module) name of a pytest node ID."""
+  module = os.path.basename(nodeid.split('::')[0])
+  if module.endswith('.py'):
+    module = module[:-len('.py')]
+  if module.startswith('test_'):
+    module = module[len('test_'):]
+  return module
+
+
+class _ScenarioResult(object):
+  """Outcome of one scenario in one cycle."""
+
+  def __init__(self):
+    self.duration = 0.0
+    self.tests: Dict[str, str] = {}
+    self.expiry_propagation: List[float] = []
+    self.collection_failed = False
+
+  @property
+  def outcome(self) -> str:
+    if self.collection_failed or FAILED in self.tests.values():
+      return FAILED
+    if PASSED in self.tests.values():
+      return PASSED
+    return SKIPPED
+
+
+class ProberMetrics(object):
+  """Thread-safe accumulation of cycle results, rendered for Prometheus."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self.cycles = collections.Counter()
+    self.cycle_duration = histogram.Histogram()
+    self.last_cycle_time: Optional[float] = None
+    self.scenario_success: Dict[str, int] = {}
+    self.scenario_runs = collections.Counter()
+    self.scenario_duration: Dict[str, histogram.Histogram] = {}
+    self.scenario_last_run: Dict[str, float] = {}
+    self.test_success: Dict[tuple, int] = {}
+    self.expiry_propagation: Dict[str, histogram.Histogram] = {}
+    self.expiry_propagation_last: Dict[str, float] = {}
+
+  def record_cycle(self, results: Dict[str, _ScenarioResult], succeeded: bool,
+                   duration: float, end_time: float) -> None:
+    with self._lock:
+      self.cycles[PASSED if succeeded else FAILED] += 1
+      self.cycle_duration.record(duration)
+      self.last_cycle_time = end_time
+      for scenario, result in results.items():
+        outcome = result.outcome
+        self.scenario_runs[(scenario, outcome)] += 1
+        if outcome == SKIPPED:
+          continue
+        self.scenario_success[scenario] = int(outcome == PASSED)
+        self.scenario_last_run[scenario] = end_time
+        self.scenario_duration.setdefault(
+            scenario, histogram.Histogram()).record(result.duration)
+        for test, test_outcome in result.tests.items():
+          if test_outcome != SKIPPED:
+            self.test_success[(scenario, test)] = int(test_outcome == PASSED)
+        for delay in result.expiry_propagation:
+          self.expiry_propagation.setdefault(
+              scenario, histogram.Histogram()).record(delay)
+          self.expiry_propagation_last[scenario] = delay
+
+  def prometheus_text(self) -> str:
+    p = METRIC_PREFIX
+    labels = instrumentation.prometheus_labels
+    lines = []
+    with self._lock:
+      lines.extend(instrumentation.prometheus_header(
+          p + '_cycles_total', 'counter',
+          'Prober cycles run, by whether every scenario passed.'))
+      for result in (PASSED, FAILED):
+        lines.append('{}_cycles_total{} {}'.format(
+            p, labels(result=result), self.cycles[result]))
+
+      lines.extend(instrumentation.prometheus_header(
+          p + '_cycle_duration_seconds', 'histogram',
+          'Time taken to run every scenario once.'))
+      lines.extend(instrumentation.prometheus_histogram(
+          p + '_cycle_duration_seconds', self.cycle_duration, {}))
+
+      if self.last_cycle_time is not None:
+        lines.extend(instrumentation.prometheus_header(
+            p + '_last_cycle_timestamp_seconds', 'gauge',
+            'When the most recent cycle finished.'))
+        lines.append('{}_last_cycle_timestamp_seconds {}'.format(
+            p, instrumentation.prometheus_value(self.last_cycle_time)))
+
+      lines.extend(instrumentation.prometheus_header(
+          p + '_scenario_success', 'gauge',
+          'Whether the most recent run of a scenario passed.'))
+      for scenario, success in sorted(self.scenario_success.items()):
+        lines.append('{}_scenario_success{} {}'.format(
+            p, labels(scenario=scenario), success))
+
+      lines.extend(instrumentation.prometheus_header(
+          p + '_scenario_runs_total', 'counter', 'Scenario runs, by outcome.'))
+      for (scenario, outcome), count in sorted(self.scenario_runs.items()):
+        lines.append('{}_scenario_runs_total{} {}'.format(
+            p, labels(scenario=scenario, result=outcome), count))
+
+      lines.extend(instrumentation.prometheus_header(
+          p + '_scenario_last_run_timestamp_seconds', 'gauge',
+          'When a scenario was last run.'))
+      for scenario, t in sorted(self.scenario_last_run.items()):
+        lines.append('{}_scenario_last_run_timestamp_seconds{} {}'.format(
+            p, labels(scenario=scenario), instrumentation.prometheus_value(t)))
+
+      lines.extend(instrumentation.prometheus_header(
+          p + '_scenario_duration_seconds', 'histogram',
+          'Time taken to run a scenario, including setup and teardown.'))
+      for scenario, h in sorted(self.scenario_duration.items()):
+        lines.extend(instrumentation.prometheus_histogram(
+            p + '_scenario_duration_seconds', h, {'scenario': scenario}))
+
+      lines.extend(instrumentation.prometheus_header(
+          p + '_test_success', 'gauge',
+          'Whether the most recent run of a test passed.'))
+      for (scenario, test), success in sorted(self.test_success.items()):
+        lines.append('{}_test_success{} {}'.format(
+            p, labels(scenario=scenario, test=test), success))
+
+      lines.extend(instrumentation.prometheus_header(
+          p + '_expiry_propagation_seconds', 'histogram',
+          'Time from an entity\'s time_end until the DSS stopped returning it.'))
+      for scenario, h in sorted(self.expiry_propagation.items()):
+        lines.extend(instrumentation.prometheus_histogram(
+            p + '_expiry_propagation_seconds', h, {'scenario': scenario}))
+
+      lines.extend(instrumentation.prometheus_header(
+          p + '_expiry_propagation_last_seconds', 'gauge',
+          'Most recently measured expiry propagation delay.'))
+      for scenario, delay in sorted(self.expiry_propagation_last.items()):
+        lines.append('{}_expiry_propagation_last_seconds{} {}'.format(
+            p, labels(scenario=scenario),
+            instrumentation.prometheus_value(delay)))
+
+    return '\n'.join(lines) + '\n'
+
+
+class _CyclePlugin(object):
+  """pytest plugin collecting the results of one cycle."""
+
+  def __init__(self, daemon: 'ProberDaemon'):
+    self._daemon = daemon
+    self.results: Dict[str, _ScenarioResult] = collections.defaultdict(
+        _ScenarioResult)
+
+  def pytest_configure(self, config):
+    # Lets conftest find the daemon to share sessions and request metrics.
+    config.pluginmanager.register(self._daemon, PLUGIN_NAME)
+
+  def pytest_collectreport(self, report):
+    if report.failed:
+      self.results[scenario_name(report.nodeid)].collection_failed = True
+
+  def pytest_runtest_logreport(self, report):
+    result = self.results[scenario_name(report.nodeid)]
+    result.duration += report.duration
+    test = report.nodeid.split('::')[-1]
+    if report.failed:
+      result.tests[test] = FAILED
+    elif report.when == 'call' or (report.when == 'setup' and report.skipped):
+      result.tests[test] = SKIPPED if report.skipped else PASSED
+    if report.when == 'call':
+      for name, value in report.user_properties:
+        if name == EXPIRY_PROPAGATION_PROPERTY:
+          result.expiry_propagation.append(value)
+
+
+class ProberDaemon(object):
+  """Runs prober cycles and keeps the state shared between them."""
+
+  def __init__(self, pytest_args: List[str],
+               scenarios: Optional[List[str]] = None):
+    self._pytest_args = pytest_args
+    if scenarios:
+      self._paths = [os.path.join(PROBER_DIR, 'test_{}.py'.format(s))
+                     for s in scenarios]
+    else:
+      self._paths = [PROBER_DIR]
+    self._sessions = {}
+    self._sessions_lock = threading.Lock()
+    self.request_metrics = instrumentation.RequestMetrics()
+    self.resilience_metrics = resilience.ResilienceMetrics()
+    self.metrics = ProberMetrics()
+
+  def shared_session(self, name: str, create: Callable[[], object]):
+    """Returns the session called name, creating it on first use."""
+    with self._sessions_lock:
+      if name not in self._sessions:
+        self._sessions[name] = create()
+      return self._sessions[name]
+
+  def run_cycle(self) -> bool:
+    """Runs every scenario once; returns whether they all passed."""
+    plugin = _CyclePlugin(self)
+    t0 = time.monotonic()
+    try:
+      exit_code = pytest.main(
+          ['-p', 'no:cacheprovider', '-q'] + self._paths + self._pytest_args,
+          plugins=[plugin])
+    except Exception:
+      LOG.exception('Prober cycle crashed')
+      exit_code = None
+    duration = time.monotonic() - t0
+    succeeded = exit_code == 0
+    self.metrics.record_cycle(plugin.results, succeeded, duration, time.time())
+    LOG.info('Cycle %s in %.1fs', PASSED if succeeded else FAILED, duration)
+    return succeeded
+
+  def prometheus_text(self) -> str:
+    return (self.metrics.prometheus_text() +
+            self.request_metrics.prometheus_text(prefix=METRIC_PREFIX) +
+            self.resilience_metrics.prometheus_text(prefix=METRIC_PREFIX))
+
+
+def _make_handler(daemon: ProberDaemon):
+
+  class MetricsHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+      if self.path == '/metrics':
+        body = daemon.prometheus_text().encode('utf-8')
+        content_type = 'text/plain; version=0.0.4; charset=utf-8'
+      elif self.path == '/healthz':
+        body = b'ok\n'
+        content_type = 'text/plain'
+      else:
+        self.send_error(404)
+        return
+      self.send_response(200)
+      self.send_header('Content-Type', content_type)
+      self.send_header('Content-Length', str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def log_message(self, format, *args):
+      LOG.debug(format, *args)
+
+  return MetricsHandler
+
+
+def serve_metrics(daemon: ProberDaemon, port: int) -> http.server.HTTPServer:
+  """Serves /metrics from a background thread."""
+  server = http.server.ThreadingHTTPServer(('', port), _make_handler(daemon))
+  threading.Thread(target=server.serve_forever, name='metrics', daemon=True)\
+      .start()
+  return server
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(
+      description=__doc__.split('\n\n')[0],
+      epilog='All other arguments are passed on to pytest.')
+  parser.add_argument('--interval', type=float, default=60,
+                      help='Seconds between the starts of consecutive cycles')
+  parser.add_argument('--metrics-port', type=int, default=8080,
+                      help='Port on which to serve /metrics')
+  parser.add_argument('--scenario', action='append', dest='scenarios',
+                      help='Name of a scenario to run, e.g. isa_simple for '
+                      'test_isa_simple.py; may be repeated.  By default, all '
+                      'scenarios are run')
+  return parser.parse_known_args(argv)
+
+
+def main(argv=None) -> int:
+  logging.basicConfig(level=logging.INFO)
+  args, pytest_args = parse_args(argv)
+  daemon = ProberDaemon(pytest_args, args.scenarios)
+  server = serve_metrics(daemon, args.metrics_port)
+  LOG.info('Serving metrics on port %d', server.server_address[1])
+
+  stop = threading.Event()
+  signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+  while not stop.is_set():
+    start = time.monotonic()
+    daemon.run_cycle()
+    stop.wait(max(0, args.interval - (time.monotonic() - start)))
+  server.shutdown()
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
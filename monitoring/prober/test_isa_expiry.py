@@ -1,14 +1,23 @@
 """Test ISAs aren't returned after they expire."""
 
 import datetime
-import time
+
+import pytest
 
 import common
+from monitorlib import expiry
+
+
+@pytest.fixture(scope='module')
+def isa1_time_end():
+  # DATE_FORMAT has no fractional seconds, so this is the time_end the DSS sees.
+  return (datetime.datetime.utcnow() +
+          datetime.timedelta(seconds=5)).replace(microsecond=0)
 
 
-def test_create(session, isa1_uuid):
+def test_create(session, isa1_uuid, isa1_time_end, vertices):
   time_start = datetime.datetime.utcnow()
-  time_end = time_start + datetime.timedelta(seconds=5)
+  time_end = isa1_time_end
 
   resp = session.put(
       '/identification_service_areas/{}'.format(isa1_uuid),
@@ -16,7 +25,7 @@ def test_create(session, isa1_uuid):
           'extents': {
               'spatial_volume': {
                   'footprint': {
-                      'vertices': common.VERTICES,
+                      'vertices': vertices,
                   },
                   'altitude_lo': 20,
                   'altitude_hi': 400,
@@ -35,9 +44,14 @@ def test_valid_immediately(session, isa1_uuid):
   assert resp.status_code == 200
 
 
-def test_sleep_5_seconds():
-  # But if we wait 5 seconds it will expire...
-  time.sleep(5)
+def test_wait_for_expiry(session, isa1_uuid, isa1_time_end, record_property,
+                         geo_polygon_string):
+  # But once its time_end passes it will expire...
+  result = expiry.wait_for_expiry(
+      expiry.isas_expired(session, [isa1_uuid], area=geo_polygon_string),
+      isa1_time_end)
+  record_property('expiry_propagation_sec', result.propagation_delay)
+  assert result.expired
 
 
 def test_not_returned_by_id(session, isa1_uuid):
@@ -47,9 +61,9 @@ def test_not_returned_by_id(session, isa1_uuid):
   assert resp.json()['message'] == 'resource not found: {}'.format(isa1_uuid)
 
 
-def test_not_returned_by_search(session, isa1_uuid):
+def test_not_returned_by_search(session, isa1_uuid, geo_polygon_string):
   # Or by search.
   resp = session.get('/identification_service_areas?area={}'.format(
-      common.GEO_POLYGON_STRING))
+      geo_polygon_string))
   assert resp.status_code == 200
   assert isa1_uuid not in [x['id'] for x in resp.json()['service_areas']]
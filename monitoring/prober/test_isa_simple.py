@@ -18,7 +18,7 @@ def test_isa_does_not_exist(session, isa1_uuid):
   assert resp.json()['message'] == 'resource not found: {}'.format(isa1_uuid)
 
 
-def test_create_isa(session, isa1_uuid):
+def test_create_isa(session, isa1_uuid, vertices):
   """ASTM Compliance Test: DSS0030_A_PUT_ISA."""
   time_start = datetime.datetime.utcnow()
   time_end = time_start + datetime.timedelta(minutes=60)
@@ -29,7 +29,7 @@ def test_create_isa(session, isa1_uuid):
           'extents': {
               'spatial_volume': {
                   'footprint': {
-                      'vertices': common.VERTICES,
+                      'vertices': vertices,
                   },
                   'altitude_lo': 20,
                   'altitude_hi': 400,
@@ -66,56 +66,60 @@ def test_get_isa_by_search_missing_params(session):
   assert resp.status_code == 400
 
 
-def test_get_isa_by_search(session, isa1_uuid):
+def test_get_isa_by_search(session, isa1_uuid, geo_polygon_string):
   resp = session.get('/identification_service_areas?area={}'.format(
-      common.GEO_POLYGON_STRING))
+      geo_polygon_string))
   assert resp.status_code == 200
   assert isa1_uuid in [x['id'] for x in resp.json()['service_areas']]
 
 
-def test_get_isa_by_search_earliest_time_included(session, isa1_uuid):
+def test_get_isa_by_search_earliest_time_included(session, isa1_uuid,
+                                                  geo_polygon_string):
   earliest_time = datetime.datetime.utcnow() + datetime.timedelta(minutes=59)
   resp = session.get('/identification_service_areas'
                      '?area={}&earliest_time={}'.format(
-                         common.GEO_POLYGON_STRING,
+                         geo_polygon_string,
                          earliest_time.strftime(common.DATE_FORMAT)))
   assert resp.status_code == 200
   assert isa1_uuid in [x['id'] for x in resp.json()['service_areas']]
 
 
-def test_get_isa_by_search_earliest_time_excluded(session, isa1_uuid):
+def test_get_isa_by_search_earliest_time_excluded(session, isa1_uuid,
+                                                  geo_polygon_string):
   earliest_time = datetime.datetime.utcnow() + datetime.timedelta(minutes=61)
   resp = session.get('/identification_service_areas'
                      '?area={}&earliest_time={}'.format(
-                         common.GEO_POLYGON_STRING,
+                         geo_polygon_string,
                          earliest_time.strftime(common.DATE_FORMAT)))
   assert resp.status_code == 200
   assert isa1_uuid not in [x['id'] for x in resp.json()['service_areas']]
 
 
-def test_get_isa_by_search_latest_time_included(session, isa1_uuid):
+def test_get_isa_by_search_latest_time_included(session, isa1_uuid,
+                                                geo_polygon_string):
   latest_time = datetime.datetime.utcnow() + datetime.timedelta(minutes=1)
   resp = session.get('/identification_service_areas'
                      '?area={}&latest_time={}'.format(
-                         common.GEO_POLYGON_STRING,
+                         geo_polygon_string,
                          latest_time.strftime(common.DATE_FORMAT)))
   assert resp.status_code == 200
   assert isa1_uuid in [x['id'] for x in resp.json()['service_areas']]
 
 
-def test_get_isa_by_search_latest_time_excluded(session, isa1_uuid):
+def test_get_isa_by_search_latest_time_excluded(session, isa1_uuid,
+                                                geo_polygon_string):
   latest_time = datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
   resp = session.get('/identification_service_areas'
                      '?area={}&latest_time={}'.format(
-                         common.GEO_POLYGON_STRING,
+                         geo_polygon_string,
                          latest_time.strftime(common.DATE_FORMAT)))
   assert resp.status_code == 200
   assert isa1_uuid not in [x['id'] for x in resp.json()['service_areas']]
 
 
-def test_get_isa_by_search_area_only(session, isa1_uuid):
+def test_get_isa_by_search_area_only(session, isa1_uuid, geo_polygon_string):
   resp = session.get('/identification_service_areas'
-                     '?area={}'.format(common.GEO_POLYGON_STRING))
+                     '?area={}'.format(geo_polygon_string))
   assert resp.status_code == 200
   assert isa1_uuid in [x['id'] for x in resp.json()['service_areas']]
 
@@ -154,9 +158,9 @@ def test_get_deleted_isa_by_id(session, isa1_uuid):
   assert resp.status_code == 404
 
 
-def test_get_deleted_isa_by_search(session, isa1_uuid):
+def test_get_deleted_isa_by_search(session, isa1_uuid, geo_polygon_string):
   resp = session.get('/identification_service_areas?area={}'.format(
-      common.GEO_POLYGON_STRING))
+      geo_polygon_string))
   assert resp.status_code == 200
   assert isa1_uuid not in [x['id'] for x in resp.json()['service_areas']]
 
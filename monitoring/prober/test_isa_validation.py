@@ -114,7 +114,7 @@ def test_isa_missing_extents(session, isa1_uuid):
   assert resp.json()['message'] == 'missing required extents'
 
 
-def test_isa_start_time_in_past(session, isa1_uuid):
+def test_isa_start_time_in_past(session, isa1_uuid, vertices):
   time_start = datetime.datetime.utcnow() - datetime.timedelta(minutes=10)
   time_end = time_start + datetime.timedelta(minutes=60)
 
@@ -124,7 +124,7 @@ def test_isa_start_time_in_past(session, isa1_uuid):
           'extents': {
               'spatial_volume': {
                   'footprint': {
-                      'vertices': common.VERTICES,
+                      'vertices': vertices,
                   },
                   'altitude_lo': 20,
                   'altitude_hi': 400,
@@ -139,7 +139,7 @@ def test_isa_start_time_in_past(session, isa1_uuid):
   )['message'] == 'IdentificationServiceArea time_start must not be in the past'
 
 
-def test_isa_start_time_after_time_end(session, isa1_uuid):
+def test_isa_start_time_after_time_end(session, isa1_uuid, vertices):
   time_start = datetime.datetime.utcnow() + datetime.timedelta(minutes=10)
   time_end = time_start - datetime.timedelta(minutes=5)
 
@@ -149,7 +149,7 @@ def test_isa_start_time_after_time_end(session, isa1_uuid):
           'extents': {
               'spatial_volume': {
                   'footprint': {
-                      'vertices': common.VERTICES,
+                      'vertices': vertices,
                   },
                   'altitude_lo': 20,
                   'altitude_hi': 400,
@@ -146,9 +146,10 @@ def test_scd_get_deleted_sub_by_id(scd_session, sub1_uuid):
 #   assert resp.status_code == 404
 
 
-def test_scd_get_deleted_sub_by_search(scd_session, sub1_uuid):
+def test_scd_get_deleted_sub_by_search(scd_session, sub1_uuid,
+                                       geo_polygon_string):
   if scd_session is None:
     return
-  resp = scd_session.get('/subscriptions?area={}'.format(common.GEO_POLYGON_STRING))
+  resp = scd_session.get('/subscriptions?area={}'.format(geo_polygon_string))
 #   assert resp.status_code == 200
 #   assert sub1_uuid not in [x['id'] for x in resp.json()['subscriptions']]
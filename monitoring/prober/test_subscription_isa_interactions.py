@@ -12,7 +12,7 @@ import datetime
 import common
 
 
-def test_create_isa(session, isa1_uuid):
+def test_create_isa(session, isa1_uuid, vertices):
   time_start = datetime.datetime.utcnow()
   time_end = time_start + datetime.timedelta(minutes=60)
 
@@ -22,7 +22,7 @@ def test_create_isa(session, isa1_uuid):
           'extents': {
               'spatial_volume': {
                   'footprint': {
-                      'vertices': common.VERTICES,
+                      'vertices': vertices,
                   },
                   'altitude_lo': 20,
                   'altitude_hi': 400,
@@ -35,7 +35,7 @@ def test_create_isa(session, isa1_uuid):
   assert resp.status_code == 200
 
 
-def test_create_subscription(session, isa1_uuid, sub1_uuid):
+def test_create_subscription(session, isa1_uuid, sub1_uuid, vertices):
   time_start = datetime.datetime.utcnow()
   time_end = time_start + datetime.timedelta(minutes=60)
 
@@ -45,7 +45,7 @@ def test_create_subscription(session, isa1_uuid, sub1_uuid):
           'extents': {
               'spatial_volume': {
                   'footprint': {
-                      'vertices': common.VERTICES,
+                      'vertices': vertices,
                   },
                   'altitude_lo': 20,
                   'altitude_hi': 400,
@@ -65,7 +65,7 @@ def test_create_subscription(session, isa1_uuid, sub1_uuid):
   assert isa1_uuid in [x['id'] for x in data['service_areas']]
 
 
-def test_modify_isa(session, isa1_uuid, sub1_uuid):
+def test_modify_isa(session, isa1_uuid, sub1_uuid, vertices):
   # GET the ISA first to find its version.
   resp = session.get('/identification_service_areas/{}'.format(isa1_uuid))
   assert resp.status_code == 200
@@ -78,7 +78,7 @@ def test_modify_isa(session, isa1_uuid, sub1_uuid):
           'extents': {
               'spatial_volume': {
                   'footprint': {
-                      'vertices': common.VERTICES,
+                      'vertices': vertices,
                   },
                   'altitude_lo': 12345,
                   'altitude_hi': 67890,
@@ -18,7 +18,7 @@ def test_sub_does_not_exist(session, sub1_uuid):
   assert resp.json()['message'] == 'resource not found: {}'.format(sub1_uuid)
 
 
-def test_create_sub(session, sub1_uuid):
+def test_create_sub(session, sub1_uuid, vertices):
   """ASTM Compliance Test: DSS0030_C_PUT_SUB."""
   time_start = datetime.datetime.utcnow()
   time_end = time_start + datetime.timedelta(minutes=60)
@@ -29,7 +29,7 @@ def test_create_sub(session, sub1_uuid):
           'extents': {
               'spatial_volume': {
                   'footprint': {
-                      'vertices': common.VERTICES,
+                      'vertices': vertices,
                   },
                   'altitude_lo': 20,
                   'altitude_hi': 400,
@@ -70,9 +70,9 @@ def test_get_sub_by_id(session, sub1_uuid):
   }
 
 
-def test_get_sub_by_search(session, sub1_uuid):
+def test_get_sub_by_search(session, sub1_uuid, geo_polygon_string):
   """ASTM Compliance Test: DSS0030_F_GET_SUBS_BY_AREA."""
-  resp = session.get('/subscriptions?area={}'.format(common.GEO_POLYGON_STRING))
+  resp = session.get('/subscriptions?area={}'.format(geo_polygon_string))
   assert resp.status_code == 200
   assert sub1_uuid in [x['id'] for x in resp.json()['subscriptions']]
 
@@ -109,7 +109,7 @@ def test_get_deleted_sub_by_id(session, sub1_uuid):
   assert resp.status_code == 404
 
 
-def test_get_deleted_sub_by_search(session, sub1_uuid):
-  resp = session.get('/subscriptions?area={}'.format(common.GEO_POLYGON_STRING))
+def test_get_deleted_sub_by_search(session, sub1_uuid, geo_polygon_string):
+  resp = session.get('/subscriptions?area={}'.format(geo_polygon_string))
   assert resp.status_code == 200
   assert sub1_uuid not in [x['id'] for x in resp.json()['subscriptions']]
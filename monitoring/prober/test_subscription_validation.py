@@ -83,13 +83,14 @@ def test_create_sub_with_huge_area(session, sub2_uuid):
   assert resp.status_code == 400
 
 
-def test_create_too_many_subs(session):
+def test_create_too_many_subs(session, footprint):
   """ASTM Compliance Test: DSS0050_MAX_SUBS_PER_AREA."""
   time_start = datetime.datetime.utcnow()
   time_end = time_start + datetime.timedelta(seconds=30)
   all_resp = []
 
-  # create 1 more than the max allowed Subscriptions per area
+  # create 1 more than the max allowed Subscriptions per area, in a footprint
+  # of their own so they don't get in the way of the other tests
   for index in range(common.MAX_SUB_PER_AREA + 1):
     resp = session.put(
         '/subscriptions/{}'.format(str(uuid.uuid4())),
@@ -97,24 +98,7 @@ def test_create_too_many_subs(session):
             'extents': {
                 'spatial_volume': {
                     'footprint': {
-                        'vertices': [
-                            {
-                                "lat": 37.440,
-                                "lng": -131.745,
-                            },
-                            {
-                                "lat": 37.459,
-                                "lng": -131.745,
-                            },
-                            {
-                                "lat": 37.459,
-                                "lng": -131.706,
-                            },
-                            {
-                                "lat": 37.440,
-                                "lng": -131.706,
-                            },
-                        ],
+                        'vertices': footprint(1),
                     },
                     'altitude_lo': 20,
                     'altitude_hi': 400,
@@ -133,7 +117,7 @@ def test_create_too_many_subs(session):
   assert all(all_resp)
 
 
-def test_create_sub_with_too_long_end_time(session, sub2_uuid):
+def test_create_sub_with_too_long_end_time(session, sub2_uuid, vertices):
     """ASTM Compliance Test: DSS0060_MAX_SUBS_DURATION."""
     time_start = datetime.datetime.utcnow()
     time_end = time_start + datetime.timedelta(hours=(common.MAX_SUB_TIME_HRS + 1))
@@ -143,7 +127,7 @@ def test_create_sub_with_too_long_end_time(session, sub2_uuid):
         json={
             "extents": {
                 "spatial_volume": {
-                    "footprint": {"vertices": common.VERTICES},
+                    "footprint": {"vertices": vertices},
                     "altitude_lo": 20,
                     "altitude_hi": 400,
                 },
@@ -155,7 +139,7 @@ def test_create_sub_with_too_long_end_time(session, sub2_uuid):
     )
     assert resp.status_code == 400
 
-def test_update_sub_with_too_long_end_time(session, sub2_uuid):
+def test_update_sub_with_too_long_end_time(session, sub2_uuid, vertices):
     """ASTM Compliance Test: DSS0060_MAX_SUBS_DURATION."""
     time_start = datetime.datetime.utcnow()
     time_end = time_start + datetime.timedelta(seconds=10)
@@ -165,7 +149,7 @@ def test_update_sub_with_too_long_end_time(session, sub2_uuid):
         json={
             "extents": {
                 "spatial_volume": {
-                    "footprint": {"vertices": common.VERTICES},
+                    "footprint": {"vertices": vertices},
                     "altitude_lo": 20,
                     "altitude_hi": 400,
                 },
@@ -183,7 +167,7 @@ def test_update_sub_with_too_long_end_time(session, sub2_uuid):
         json={
             "extents": {
                 "spatial_volume": {
-                    "footprint": {"vertices": common.VERTICES},
+                    "footprint": {"vertices": vertices},
                     "altitude_lo": 20,
                     "altitude_hi": 400,
                 },
@@ -25,7 +25,8 @@ def test_validate_token_bad_user(session):
   resp = session.get('/validate_oauth?owner=bad_user')
   assert resp.status_code == 403
 
-def test_put_isa_with_read_only_scope_token(rogue_session, session, isa2_uuid):
+def test_put_isa_with_read_only_scope_token(rogue_session, session,
+                                            isa2_uuid, vertices):
   read_only_token = session.issue_token(['dss.read.identification_service_areas'])
   rogue_session.headers['Authorization'] = f'Bearer {read_only_token}'
 
@@ -38,7 +39,7 @@ def test_put_isa_with_read_only_scope_token(rogue_session, session, isa2_uuid):
           'extents': {
               'spatial_volume': {
                   'footprint': {
-                      'vertices': common.VERTICES,
+                      'vertices': vertices,
                   },
                   'altitude_lo': 20,
                   'altitude_hi': 400,
@@ -51,7 +52,7 @@ def test_put_isa_with_read_only_scope_token(rogue_session, session, isa2_uuid):
   assert resp.status_code == 403
 
 
-def test_create_isa(session, isa1_uuid):
+def test_create_isa(session, isa1_uuid, vertices):
   time_start = datetime.datetime.utcnow()
   time_end = time_start + datetime.timedelta(minutes=60)
 
@@ -61,7 +62,7 @@ def test_create_isa(session, isa1_uuid):
           'extents': {
               'spatial_volume': {
                   'footprint': {
-                      'vertices': common.VERTICES,
+                      'vertices': vertices,
                   },
                   'altitude_lo': 20,
                   'altitude_hi': 400,
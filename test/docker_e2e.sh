@@ -117,7 +117,7 @@ docker run -d --name dummy-oauth-for-testing -p 8085:8085 \
 sleep 5
 echo " -------------- PYTEST -------------- "
 echo "Building Integration Test container"
-docker build -q --rm -f monitoring/prober/Dockerfile monitoring/prober -t e2e-test
+docker build -q --rm -f monitoring/prober/Dockerfile monitoring -t e2e-test
 
 echo "Finally Begin Testing"
 docker run --link dummy-oauth-for-testing:oauth \
@@ -1,9 +1,10 @@
 import requests
-import time
 from enum import Enum
 from google.auth.transport import requests as google_requests
 from google.oauth2 import service_account
-from typing import Optional, Dict, List, Any, Tuple
+from monitorlib import auth, resilience, tokens
+from monitorlib.instrumentation import InstrumentedSession
+from typing import Optional, Dict, List
 import urllib
 
 
@@ -11,6 +12,7 @@ class AuthType(Enum):
     NONE = 0
     SERVICE_ACCOUNT = 1
     PASSWORD = 2
+    PRIVATE_KEY = 3
 
 
 class OAuthClient:
@@ -22,11 +24,15 @@ class OAuthClient:
         username: Optional[str] = "",
         password: Optional[str] = "",
         client_id: Optional[str] = "",
+        private_key_file: Optional[str] = None,
+        signer_options: Optional[Dict] = None,
+        refresh_skew: float = tokens.DEFAULT_REFRESH_SKEW_SEC,
+        token_cache_file: Optional[str] = None,
     ):
         self._endpoint = endpoint
-        self.token_response_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
         self._req_params: Dict[str, str] = {}
         self.req = requests.Session()
+        self._signer: Optional[auth.TokenSigner] = None
 
         if auth_type is AuthType.SERVICE_ACCOUNT:
             credentials = service_account.Credentials.from_service_account_file(
@@ -34,6 +40,7 @@ class OAuthClient:
             ).with_scopes(["email"])
             self.req = google_requests.AuthorizedSession(credentials)
             self._req_params = {"grant_type": "client_credentials"}
+            principal = credentials.service_account_email
         elif auth_type is AuthType.PASSWORD:
             self._req_params = {
                 "grant_type": "password",
@@ -41,32 +48,42 @@ class OAuthClient:
                 "password": password,
                 "client_id": client_id,
             }
+            principal = f"{username}:{client_id}"
+        elif auth_type is AuthType.PRIVATE_KEY:
+            # Tokens are signed locally; the OAuth endpoint is not used
+            self._signer = auth.TokenSigner(private_key_file, **(signer_options or {}))
+            principal = (
+                f"{private_key_file}:{self._signer.issuer}:{self._signer.subject}"
+            )
         elif auth_type is AuthType.NONE:
             # No special setup requred
-            pass
+            principal = ""
         else:
             # Something unknown was passed in
             raise ("Unknown OAuth authentication Type")
         self.parameterized_url = False
+        self._tokens = tokens.TokenCache(
+            self._issueToken,
+            refresh_skew=refresh_skew,
+            persist_path=token_cache_file,
+            namespace=f"{auth_type.name}:{endpoint}:{principal}",
+        )
 
-    def _isExpired(self, token: Dict[str, Any]) -> bool:
-        expiration = token.get("expires_in")
-        request_time = token["request_time"]
-        if not expiration:
-            return False
-        return time.time() > (request_time + expiration)
+    def prefetchToken(self, scopes_list: List[str], audience: str) -> None:
+        self._tokens.prefetch(scopes_list, audience)
 
     def getToken(self, scopes_list: List[str], audience: str) -> str:
-        scopes = " ".join(scopes_list)
-        token = self.token_response_cache.get((scopes, audience))
-        if token is None or self._isExpired(token):
-            self.token_response_cache[(scopes, audience)] = self._issueToken(scopes, audience)
-        return self.token_response_cache[(scopes, audience)].get("access_token", "")
+        return self._tokens.get(scopes_list, audience)
+
+    async def getTokenAsync(self, scopes_list: List[str], audience: str) -> str:
+        return await self._tokens.get_async(scopes_list, audience)
 
-    def _issueToken(self, scopes, audience) -> Dict[str, Any]:
+    def _issueToken(self, scopes_list: List[str], audience: str) -> str:
+        if self._signer is not None:
+            return self._signer.sign(audience, scopes_list)
+        scopes = " ".join(scopes_list)
         data = {"scope": scopes, "intended_audience": audience, "issuer": "dummy"}
         data.update(self._req_params)
-        request_time = time.time()
         # Parameteterized URL is required to work with the Dummy Oauth Server
         # as it currently doesn't read from parameters from request body
         # TODO(charlie-pisuraj): Make Dummy OAuth Read params from request body
@@ -77,22 +94,30 @@ class OAuthClient:
             # methods is a list of Tuples
             response = self.req.post(self._endpoint, data=data)
         response.raise_for_status()
-        token = response.json()
-        token["request_time"] = request_time
-        return token
+        return response.json().get("access_token", "")
 
 
-class DSSClient(requests.Session):
-    def __init__(self, host: str, oauth_client: OAuthClient):
+class DSSClient(InstrumentedSession):
+    def __init__(
+        self,
+        host: str,
+        oauth_client: OAuthClient,
+        request_resilience: Optional[resilience.Resilience] = None,
+        intended_audience: Optional[str] = None,
+    ):
         super().__init__()
+        self.set_resilience(request_resilience)
         self._host = host
         self._oauth_client = oauth_client
-        self.intended_audience: str = ""
         self.scope: List[str] = [
             "dss.write.identification_service_areas",
             "dss.read.identification_service_areas",
         ]
-        self.intended_audience = urllib.parse.urlparse(host).hostname
+        # Defaults to the host the requests are sent to
+        self.intended_audience: str = (
+            intended_audience or urllib.parse.urlparse(host).hostname
+        )
+        self._oauth_client.prefetchToken(self.scope, self.intended_audience)
 
     def prepare_request(self, request, **kwargs) -> requests.request:
         token = self._oauth_client.getToken(self.scope, self.intended_audience)
@@ -0,0 +1,287 @@
+"""Benchmark of the interoperability test suite under injected faults.
+
+Every DSS is put behind a fault-injecting proxy (monitoring/faultproxy), and
+the test suite is run --fault-repeats times under each fault profile in turn,
+with the DSS clients talking to the proxies.  For each profile, the report
+shows how long every step and every round took (including the steps that
+failed), how many failed, the latency percentiles of the requests the clients
+sent and the faults the proxy injected, so that the effect of a slow, flaky
+or unreachable DSS on end-to-end duration and tail latency can be compared
+with the baseline profile.
+"""
+
+import collections
+import logging
+import urllib.parse
+from typing import Any, Dict, List, Optional
+
+import clients
+import reporting
+from faultproxy import faults, proxy
+from interop_test_suite import InterOpTestSuite
+from monitorlib import histogram, instrumentation, recording, resilience
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PROFILES = [
+    "baseline",
+    "slow-region",
+    "long-tail",
+    "errors-5pct",
+    "resets-2pct",
+]
+
+PERCENTILES = (50, 95, 99)
+
+
+def _base_url(url: str) -> str:
+    parsed = urllib.parse.urlsplit(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+class ProfileResult:
+    """Measurements of the test suite under one fault profile."""
+
+    def __init__(self, profile: faults.Profile):
+        self.profile = profile
+        self.rounds = 0
+        self.failed_rounds = 0
+        self.round_durations = histogram.Histogram()
+        self.step_durations: Dict[str, histogram.Histogram] = {}
+        self.step_failures: Dict[str, int] = collections.Counter()
+        self.request_metrics = instrumentation.RequestMetrics()
+        self.resilience_metrics = resilience.ResilienceMetrics()
+        self.injected: Dict[str, Any] = {}
+
+    def request_latency(self) -> histogram.Histogram:
+        """Latency of every request sent, whatever its endpoint."""
+        result = histogram.Histogram()
+        for metrics in self.request_metrics.endpoints.values():
+            result.merge(metrics.elapsed)
+        return result
+
+    def request_outcomes(self) -> Dict[str, int]:
+        """Number of requests by status (or exception name)."""
+        result = collections.Counter()
+        for metrics in self.request_metrics.endpoints.values():
+            result.update(metrics.statuses)
+        return dict(result)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "profile": self.profile.to_dict(),
+            "rounds": self.rounds,
+            "failed_rounds": self.failed_rounds,
+            "round_duration": self.round_durations.summary(),
+            "steps": {
+                name: {
+                    "duration": durations.summary(),
+                    "failures": self.step_failures[name],
+                }
+                for name, durations in self.step_durations.items()
+            },
+            "request_latency": self.request_latency().summary(),
+            "request_outcomes": self.request_outcomes(),
+            "injected_faults": self.injected,
+            "request_metrics": self.request_metrics.to_dict(),
+            "resilience_metrics": self.resilience_metrics.to_dict(),
+        }
+
+
+class FaultBenchmark:
+    """Runs the test suite under each of a list of fault profiles.
+
+    Args:
+      dss_urls: URLs of the DSSs, including their path prefix (e.g. /v1/dss).
+      oauth_client: Issues the access tokens of every DSS client.
+      profiles: Fault profiles to run under, in order.  Upstream i of the
+        profiles' rules is dss_urls[i].
+      repeats: Number of times to run the test suite under each profile.
+      fault_seed: Seed of the proxy's random draws of faults.
+      request_resilience: Timeouts, retries and hedging of the DSS clients'
+        requests, if any.  Its retries and hedges are counted per profile,
+        and the counts of every profile are added to its metrics.
+      request_metrics: If specified, also receives the latency of every request
+        sent under every profile, in addition to each profile's own metrics.
+      recorder: If specified, records every request sent under every profile.
+      suite_options: Keyword arguments of InterOpTestSuite (concurrent,
+        workers, coverage, ...).
+    """
+
+    def __init__(
+        self,
+        dss_urls: List[str],
+        oauth_client: clients.OAuthClient,
+        profiles: List[faults.Profile],
+        repeats: int = 1,
+        fault_seed: Optional[int] = None,
+        request_resilience: Optional[resilience.Resilience] = None,
+        request_metrics: Optional[instrumentation.RequestMetrics] = None,
+        recorder: Optional[recording.Recorder] = None,
+        **suite_options,
+    ):
+        self.dss_urls = dss_urls
+        self.request_resilience = request_resilience
+        self.request_metrics = request_metrics
+        self.recorder = recorder
+        self.oauth_client = oauth_client
+        self.profiles = profiles
+        self.repeats = repeats
+        self.suite_options = suite_options
+        self.proxy = proxy.FaultProxy(
+            [_base_url(url) for url in dss_urls], seed=fault_seed
+        )
+        self.results: List[ProfileResult] = []
+        self._suites: List[InterOpTestSuite] = []
+
+    def footprints(self) -> List[List[Dict[str, float]]]:
+        """Returns the footprints used by the rounds run so far."""
+        return [v for suite in self._suites for v in suite.footprints()]
+
+    def run(self) -> List[ProfileResult]:
+        self.proxy.start()
+        try:
+            for profile in self.profiles:
+                self.results.append(self._runProfile(profile))
+        finally:
+            self.proxy.stop()
+        return self.results
+
+    def _runProfile(self, profile: faults.Profile) -> ProfileResult:
+        result = ProfileResult(profile)
+        profile_resilience = None
+        if self.request_resilience is not None:
+            # Each profile starts from the same settings, with its own metrics
+            # and latency history (on which hedging delays are based)
+            profile_resilience = self.request_resilience.copy(
+                metrics=result.resilience_metrics
+            )
+        dss_clients: Dict[str, clients.DSSClient] = {}
+        for url, address in zip(self.dss_urls, self.proxy.addresses):
+            dss = clients.DSSClient(
+                host=proxy.proxied_url(url, address),
+                oauth_client=self.oauth_client,
+                request_resilience=profile_resilience,
+                # Tokens are still intended for the DSS rather than the proxy
+                intended_audience=urllib.parse.urlsplit(url).hostname,
+            )
+            dss.add_instrumentation_hook(result.request_metrics)
+            if self.request_metrics is not None:
+                dss.add_instrumentation_hook(self.request_metrics)
+            if self.recorder is not None:
+                self.recorder.attach(dss)
+            # Reports name the DSSs rather than their proxies
+            dss_clients[url] = dss
+
+        suite = InterOpTestSuite(dss_clients, **self.suite_options)
+        self._suites.append(suite)
+        self.proxy.set_profile(profile)
+        for repeat in range(self.repeats):
+            LOG.info(
+                f"Profile {profile.name}: running the test suite "
+                f"({repeat + 1}/{self.repeats})"
+            )
+            suite.startTest()
+            result.rounds += len(suite.rounds)
+        result.injected = self.proxy.stats.to_dict(self.proxy.upstreams)
+
+        result.failed_rounds = suite.failed_rounds
+        result.round_durations = suite.round_durations
+        result.step_durations = dict(suite.step_durations)
+        result.step_failures.update(suite.step_failures)
+        for dss in dss_clients.values():
+            dss.close()
+        if self.request_resilience is not None:
+            self.request_resilience.metrics.merge(result.resilience_metrics)
+        return result
+
+    def report(self) -> str:
+        """Formats a comparison of the profiles, then each profile's steps."""
+        lines = [
+            "Rounds and requests by fault profile "
+            "(durations in s, request latency in ms):"
+        ]
+        rows = [
+            ["profile", "rounds", "failed"]
+            + [f"round p{p:g}" for p in PERCENTILES]
+            + ["requests", "5xx/failed"]
+            + [f"req p{p:g}" for p in PERCENTILES + (99.9,)]
+            + ["retries", "hedges/won"]
+        ]
+        baseline = None
+        for result in self.results:
+            latency = result.request_latency()
+            outcomes = result.request_outcomes()
+            # Steps expect some 4xx responses, so only 5xx responses and requests
+            # that got no response at all count as errors
+            errors = sum(n for status, n in outcomes.items() if status[0] not in "1234")
+            row = [result.profile.name, str(result.rounds), str(result.failed_rounds)]
+            row.extend(
+                _seconds(result.round_durations.percentile(p)) for p in PERCENTILES
+            )
+            row.extend([str(latency.count), str(errors)])
+            row.extend(_ms(latency.percentile(p)) for p in PERCENTILES + (99.9,))
+            totals = result.resilience_metrics.totals()
+            row.extend(
+                [
+                    str(sum(totals.retries.values())),
+                    f"{totals.hedges}/{totals.hedges_won}",
+                ]
+            )
+            rows.append(row)
+            if baseline is None:
+                baseline = result
+        lines.extend(reporting.table(rows))
+
+        for result in self.results:
+            lines.append("")
+            injected = collections.Counter()
+            for upstream in result.injected.values():
+                injected.update(upstream["faults"])
+            lines.append(
+                f"{result.profile.name}: step durations in s, "
+                + "/".join(f"p{p:g}" for p in PERCENTILES)
+                + "/max; injected "
+                + (
+                    ", ".join(f"{n} {f}" for f, n in sorted(injected.items()))
+                    or "nothing"
+                )
+            )
+            rows = [["step", "duration", "vs " + baseline.profile.name, "failed"]]
+            for name, durations in result.step_durations.items():
+                values = [durations.percentile(p) for p in PERCENTILES]
+                base = baseline.step_durations.get(name)
+                rows.append(
+                    [
+                        name,
+                        "/".join(_seconds(v) for v in values + [durations.max]),
+                        _ratio(
+                            durations.percentile(50),
+                            base.percentile(50) if base else None,
+                        ),
+                        str(result.step_failures[name]),
+                    ]
+                )
+            lines.extend(reporting.table(rows))
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dss": self.dss_urls,
+            "repeats": self.repeats,
+            "profiles": [result.to_dict() for result in self.results],
+        }
+
+
+def _seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}"
+
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.0f}"
+
+
+def _ratio(value: Optional[float], base: Optional[float]) -> str:
+    if value is None or not base:
+        return "-"
+    return f"x{value / base:.1f}"
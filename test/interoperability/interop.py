@@ -5,14 +5,24 @@ import sys
 import argparse
 import clients
 import datetime
+import json
 import uuid
+import fault_benchmark
+import interop_test_suite
+import replication_lag
+from faultproxy import faults
+from monitorlib import auth, instrumentation, recording, resilience, sweeper, tokens
 from interop_test_suite import InterOpTestSuite
 from typing import Dict
 
 
 def parseArgs() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Test Interoperability of DSSs")
-    parser.add_argument("OAuth", help="URI to the OAuth Server.")
+    parser.add_argument(
+        "OAuth",
+        help="URI to the OAuth Server. Ignored when signing tokens with "
+        "--private-key-file.",
+    )
 
     # When using Password OAuth flow, Username, Password, and Clients-id are
     # necessary for authentication
@@ -31,21 +41,229 @@ def parseArgs() -> argparse.Namespace:
         help="Path to Service Account Credentials file used to get OAuth Token",
     )
 
+    # Alternatively, tokens may be signed locally with a private key the DSSs
+    # accept, without an OAuth Server.
+    parser.add_argument(
+        "--private-key-file",
+        help="Sign OAuth Tokens locally with this RSA private key instead of "
+        "requesting them from the OAuth Server",
+    )
+    parser.add_argument(
+        "--token-issuer",
+        default=auth.DEFAULT_ISSUER,
+        help="Issuer of locally-signed OAuth Tokens",
+    )
+    parser.add_argument(
+        "--token-subject",
+        default=auth.DEFAULT_SUBJECT,
+        help="Subject of locally-signed OAuth Tokens",
+    )
+    parser.add_argument(
+        "--token-lifetime",
+        type=float,
+        default=auth.DEFAULT_TOKEN_LIFETIME_SEC,
+        help="Seconds until locally-signed OAuth Tokens expire",
+    )
+    parser.add_argument(
+        "--token-claims",
+        type=auth.parse_claims,
+        help="Additional claims of locally-signed OAuth Tokens, as a JSON object",
+    )
+
+    parser.add_argument(
+        "--token-refresh-skew",
+        type=float,
+        default=tokens.DEFAULT_REFRESH_SKEW_SEC,
+        help="Refresh access tokens this many seconds before they expire",
+    )
+    parser.add_argument(
+        "--token-cache-file", help="File to persist access tokens in between runs"
+    )
+
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Send the requests of steps that query every DSS to all DSSs in parallel",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of rounds to run at the same time",
+    )
+    parser.add_argument(
+        "--coverage",
+        choices=interop_test_suite.COVERAGES,
+        default=interop_test_suite.COVERAGE_ALL,
+        help="Which orderings of the DSSs to run as rounds: every permutation "
+        "(all), every DSS as primary once (primaries), every ordered pair of DSSs "
+        "(pairs) or a random sample of permutations (sample)",
+    )
+    parser.add_argument(
+        "--sample-size",
+        type=int,
+        help="Number of permutations to run when using --coverage sample",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed used with --coverage sample and for the jitter of "
+        "retry backoffs",
+    )
+
+    parser.add_argument(
+        "--replication-lag",
+        action="store_true",
+        help="Instead of running the test suite, measure how long entities "
+        "written on each DSS take to become visible on every DSS",
+    )
+    parser.add_argument(
+        "--lag-samples",
+        type=int,
+        default=replication_lag.DEFAULT_SAMPLES,
+        help="Number of entities to write when measuring replication lag",
+    )
+    parser.add_argument(
+        "--lag-kinds",
+        default=",".join(replication_lag.KINDS),
+        help="Comma-separated kinds of entities to write when measuring "
+        "replication lag",
+    )
+    parser.add_argument(
+        "--lag-poll-interval",
+        type=float,
+        default=replication_lag.DEFAULT_POLL_INTERVAL_SEC,
+        help="Seconds between polls of each DSS when measuring replication lag",
+    )
+    parser.add_argument(
+        "--lag-timeout",
+        type=float,
+        default=replication_lag.DEFAULT_TIMEOUT_SEC,
+        help="Seconds to wait for an entity to become visible on a DSS",
+    )
+    parser.add_argument(
+        "--lag-json", help="Write replication lag distributions to this JSON file"
+    )
+
+    parser.add_argument(
+        "--fault-benchmark",
+        action="store_true",
+        help="Instead of running the test suite once, run it behind a "
+        "fault-injecting proxy under each of --fault-profiles and report how "
+        "step durations and request latencies change",
+    )
+    parser.add_argument(
+        "--fault-profiles",
+        default=",".join(fault_benchmark.DEFAULT_PROFILES),
+        help="Comma-separated fault profiles to benchmark: names of built-in "
+        f"profiles ({', '.join(faults.BUILTIN_PROFILES)}) or JSON files",
+    )
+    parser.add_argument(
+        "--fault-repeats",
+        type=int,
+        default=1,
+        help="Number of times to run the test suite under each fault profile",
+    )
+    parser.add_argument(
+        "--fault-seed", type=int, help="Random seed of the injected faults"
+    )
+    parser.add_argument(
+        "--fault-json", help="Write the fault benchmark's results to this JSON file"
+    )
+
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="After the run, delete any ISAs and Subscriptions it left behind "
+        "in its footprints on every DSS, even if the run failed",
+    )
+
+    parser.add_argument(
+        "--request-metrics-json",
+        help="Write per-endpoint request timing to this JSON file",
+    )
+    parser.add_argument(
+        "--request-metrics-prometheus",
+        help="Write per-endpoint request timing to this file in the Prometheus "
+        "text exposition format",
+    )
+    resilience.add_options(parser.add_argument)
+    parser.add_argument(
+        "--resilience-metrics-json",
+        help="Write per-endpoint counts of retries and hedged requests to this "
+        "JSON file",
+    )
+    parser.add_argument(
+        "--record-requests",
+        help="Record every request sent to the DSS instances in this file "
+        "(gzipped if it ends in .gz), for replaying with the load testing tools",
+    )
+
     parser.add_argument(
         "DSS", help="List of URIs to DSS Servers. At least 2 DSSs", nargs="+"
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    args.lag_kinds = args.lag_kinds.split(",")
+    try:
+        args.fault_profiles = [
+            faults.load_profile(spec) for spec in args.fault_profiles.split(",")
+        ]
+    except ValueError as e:
+        parser.error(str(e))
+    if args.coverage == interop_test_suite.COVERAGE_SAMPLE and (
+        not args.sample_size or args.sample_size < 1
+    ):
+        parser.error("--coverage sample requires a positive --sample-size")
+    rounds = interop_test_suite.selectRounds(
+        args.DSS, args.coverage, args.sample_size, args.seed
+    )
+    if len(rounds) > interop_test_suite.FOOTPRINT_GRID.cell_count:
+        parser.error(
+            f"--coverage {args.coverage} selects {len(rounds)} rounds but only "
+            f"{interop_test_suite.FOOTPRINT_GRID.cell_count} footprints are "
+            "available; choose a smaller coverage"
+        )
+    for kind in args.lag_kinds:
+        if kind not in replication_lag.KINDS:
+            parser.error(
+                f"Unknown kind {kind}; expected one of {', '.join(replication_lag.KINDS)}"
+            )
+    return args
+
+
+def sweep(dss_clients: Dict[str, clients.DSSClient], footprints) -> None:
+    """Deletes this run's leftover entities in footprints from every DSS."""
+    for name, dss in dss_clients.items():
+        result = sweeper.Sweeper(dss).sweep(footprints)
+        print(f"Swept {name}: {result.summary()}")
 
 
 def main() -> int:
     args = parseArgs()
 
-    if args.service_account:
+    if args.private_key_file:
+        oauth_client = clients.OAuthClient(
+            args.OAuth,
+            clients.AuthType.PRIVATE_KEY,
+            private_key_file=args.private_key_file,
+            signer_options={
+                "issuer": args.token_issuer,
+                "subject": args.token_subject,
+                "lifetime": args.token_lifetime,
+                "extra_claims": args.token_claims,
+            },
+            refresh_skew=args.token_refresh_skew,
+            token_cache_file=args.token_cache_file,
+        )
+    elif args.service_account:
         oauth_client = clients.OAuthClient(
             args.OAuth,
             clients.AuthType.SERVICE_ACCOUNT,
             service_account_json=args.service_account,
+            refresh_skew=args.token_refresh_skew,
+            token_cache_file=args.token_cache_file,
         )
     elif args.username:
         assert args.password, "Password is required when using Username"
@@ -56,18 +274,105 @@ def main() -> int:
             username=args.username,
             password=args.password,
             client_id=args.client_id,
+            refresh_skew=args.token_refresh_skew,
+            token_cache_file=args.token_cache_file,
         )
     else:
-        oauth_client = clients.OAuthClient(args.OAuth, clients.AuthType.NONE)
+        oauth_client = clients.OAuthClient(
+            args.OAuth,
+            clients.AuthType.NONE,
+            refresh_skew=args.token_refresh_skew,
+            token_cache_file=args.token_cache_file,
+        )
         oauth_client.parameterized_url = True
 
+    request_metrics = instrumentation.RequestMetrics()
+    resilience_metrics = resilience.ResilienceMetrics()
+    request_resilience = resilience.from_options(
+        lambda name: getattr(args, name), resilience_metrics, seed=args.seed
+    )
     dss_clients: Dict[str, clients.DSSClient] = {}
     for dss in args.DSS:
-        dss_clients[dss] = clients.DSSClient(host=dss, oauth_client=oauth_client)
+        dss_clients[dss] = clients.DSSClient(
+            host=dss, oauth_client=oauth_client, request_resilience=request_resilience
+        )
+        dss_clients[dss].add_instrumentation_hook(request_metrics)
+    recorder = None
+    if args.record_requests:
+        recorder = recording.Recorder(args.record_requests)
+        for dss_client in dss_clients.values():
+            recorder.attach(dss_client)
+
+    footprints = None
+    try:
+        if args.replication_lag:
+            measurement = replication_lag.ReplicationLagMeasurement(
+                dss_clients,
+                kinds=args.lag_kinds,
+                poll_interval=args.lag_poll_interval,
+                timeout=args.lag_timeout,
+            )
+            footprints = measurement.footprints
+            measurement.run(args.lag_samples)
+            print(measurement.matrix_report())
+            if args.lag_json:
+                with open(args.lag_json, "w") as f:
+                    json.dump(measurement.to_dict(), f, indent=2)
+        elif args.fault_benchmark:
+            benchmark = fault_benchmark.FaultBenchmark(
+                args.DSS,
+                oauth_client,
+                args.fault_profiles,
+                repeats=args.fault_repeats,
+                fault_seed=args.fault_seed,
+                request_resilience=request_resilience,
+                request_metrics=request_metrics,
+                recorder=recorder,
+                concurrent=args.concurrent,
+                workers=args.workers,
+                coverage=args.coverage,
+                sample_size=args.sample_size,
+                seed=args.seed,
+            )
+            footprints = benchmark.footprints
+            benchmark.run()
+            print(benchmark.report())
+            if args.fault_json:
+                with open(args.fault_json, "w") as f:
+                    json.dump(benchmark.to_dict(), f, indent=2)
+        else:
+            # Begin Tests
+            tests = InterOpTestSuite(
+                dss_clients,
+                concurrent=args.concurrent,
+                workers=args.workers,
+                coverage=args.coverage,
+                sample_size=args.sample_size,
+                seed=args.seed,
+            )
+            footprints = tests.footprints
+            tests.startTest()
+    finally:
+        if args.sweep and footprints:
+            sweep(dss_clients, footprints())
+        if recorder is not None:
+            recorder.close()
 
-    # Begin Tests
-    tests = InterOpTestSuite(dss_clients)
-    tests.startTest()
+    if args.request_metrics_json:
+        request_metrics.write_json(args.request_metrics_json)
+    if args.request_metrics_prometheus:
+        request_metrics.write_prometheus(
+            args.request_metrics_prometheus, prefix="dss_interop"
+        )
+    if args.resilience_metrics_json:
+        resilience_metrics.write_json(args.resilience_metrics_json)
+    if request_resilience is not None:
+        totals = resilience_metrics.totals()
+        print(
+            f"Retried {sum(totals.retries.values())} requests "
+            f"({totals.retries_denied} denied by the retry budget); hedged "
+            f"{totals.hedges} reads, of which {totals.hedges_won} answered first"
+        )
 
     return os.EX_OK
 
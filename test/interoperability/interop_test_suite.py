@@ -4,10 +4,15 @@ import inspect
 import datetime
 import uuid
 import collections
-import time
 import logging
+import random
+import requests
+import threading
+import time
 
-from typing import Dict, Any, List, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from monitorlib import expiry, geo, histogram
+from typing import Dict, Any, List, Callable, Iterable, Optional, Tuple
 
 logging.basicConfig(level=logging.INFO)
 LOG = logging.getLogger(__name__)
@@ -21,48 +26,177 @@ VERTICES = [
     {"lng": 130.6466, "lat": -23.6407},
 ]
 
-GEO_POLYGON_STRING = ",".join("{},{}".format(x["lat"], x["lng"]) for x in VERTICES)
-
 SHORT_WAIT_SEC = 5
 
+# Footprints handed out to rounds, one grid cell per round. The grid is bounded
+# so that other measurements can use the area north of it; 800 cells are enough
+# for every permutation of 6 DSSs.
+FOOTPRINT_ROWS = 20
+FOOTPRINT_GRID = geo.Grid(rows=FOOTPRINT_ROWS)
+
+# Strategies for choosing which orderings of the DSSs are run as rounds
+COVERAGE_ALL = "all"  # every permutation of all DSSs
+COVERAGE_PRIMARIES = "primaries"  # every DSS is primary once
+COVERAGE_PAIRS = "pairs"  # every ordered (primary, other) pair of DSSs
+COVERAGE_SAMPLE = "sample"  # a random sample of all permutations
+COVERAGES = [COVERAGE_ALL, COVERAGE_PRIMARIES, COVERAGE_PAIRS, COVERAGE_SAMPLE]
+
 # "type" indicates the type of entity could be ISAs or SUBs
 # "uuid" is the actual UUID value of entity stored in the DSS
 TestContext = collections.namedtuple("TestContext", ["type", "uuid"])
 
 
+def selectRounds(
+    dss_names: List[str],
+    coverage: str,
+    sample_size: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> List[Tuple[str, ...]]:
+    """Returns the DSS orderings to run as rounds; the first DSS of each ordering
+    is the primary DSS of that round."""
+    if coverage == COVERAGE_ALL:
+        return list(itertools.permutations(dss_names))
+    elif coverage == COVERAGE_PRIMARIES:
+        return [
+            tuple(dss_names[i:] + dss_names[:i]) for i in range(len(dss_names))
+        ]
+    elif coverage == COVERAGE_PAIRS:
+        return list(itertools.permutations(dss_names, 2))
+    elif coverage == COVERAGE_SAMPLE:
+        if not sample_size or sample_size < 1:
+            raise ValueError(
+                "A positive sample size is required when sampling permutations"
+            )
+        rounds = list(itertools.permutations(dss_names))
+        return random.Random(seed).sample(rounds, min(sample_size, len(rounds)))
+    else:
+        raise ValueError(f"Unknown coverage: {coverage}")
+
+
 class InterOpTestSuite:
-    def __init__(self, dss_clients: Dict[str, clients.DSSClient]):
+    def __init__(
+        self,
+        dss_clients: Dict[str, clients.DSSClient],
+        concurrent: bool = False,
+        workers: int = 1,
+        coverage: str = COVERAGE_ALL,
+        sample_size: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
         self.dss_clients = dss_clients
+        self.concurrent = concurrent
+        self.workers = workers
+        self.coverage = coverage
+        self.sample_size = sample_size
+        self.seed = seed
+        self.rounds: List[Tuple[str, ...]] = []
+        # How long each step took (whether or not it passed), and how many
+        # times each step failed, across every round run so far
+        self.step_durations: Dict[str, histogram.Histogram] = collections.defaultdict(
+            histogram.Histogram
+        )
+        self.step_failures: Dict[str, int] = collections.Counter()
+        self.round_durations = histogram.Histogram()
+        self.failed_rounds = 0
+        self._lock = threading.Lock()
+
+    def footprints(self) -> List[List[Dict[str, float]]]:
+        """Returns the footprint of every round selected by startTest."""
+        return [FOOTPRINT_GRID.vertices(round) for round in range(len(self.rounds))]
 
     def startTest(self):
-        for round, dss_permutation in enumerate(
-            itertools.permutations(self.dss_clients)
-        ):
-            primary_dss = dss_permutation[0]
-            all_other_dss = list(dss_permutation[1:])
-            ts = TestSteps()
-            LOG.info(f"Round {round}")
-            for name, test_step in self._getTests().items():
-                try:
-                    test_step(
-                        ts, self.dss_clients, primary_dss, all_other_dss=all_other_dss
-                    )
-                    LOG.info(f"{name} Passed with {primary_dss} as primary DSS")
-                except AssertionError as e:
-                    docstring = inspect.cleandoc(inspect.getdoc(test_step))
-                    msg = (
-                        f"Failed {name} with {primary_dss} as primary DSS\n"
-                        f"\tTest Purpose: {docstring}\n"
-                        f"\tFailure Message: {e}\n"
-                        f"\tContinuing to next round if any"
-                    )
-                    LOG.error(msg)
-                    LOG.debug(f"Cleaning up round {round + 1}")
-                    ts.cleanUp(self.dss_clients, primary_dss)
-                    break
-
-            LOG.debug(f"Cleaning up round {round + 1}")
+        self.rounds = rounds = selectRounds(
+            list(self.dss_clients), self.coverage, self.sample_size, self.seed
+        )
+        if len(rounds) > FOOTPRINT_GRID.cell_count:
+            raise ValueError(
+                f"{len(rounds)} rounds selected but only "
+                f"{FOOTPRINT_GRID.cell_count} footprints are available; "
+                "choose a smaller coverage"
+            )
+        LOG.info(f"Running {len(rounds)} rounds with {self.workers} worker(s)")
+
+        executor = None
+        if self.concurrent:
+            # One worker per DSS for every round in flight so a fan-out step
+            # takes as long as the slowest DSS rather than the sum of all of them.
+            executor = ThreadPoolExecutor(
+                max_workers=len(self.dss_clients) * self.workers
+            )
+        try:
+            if self.workers <= 1:
+                for round, dss_permutation in enumerate(rounds):
+                    self._runRound(round, dss_permutation, executor)
+            else:
+                with ThreadPoolExecutor(max_workers=self.workers) as round_executor:
+                    futures = [
+                        round_executor.submit(
+                            self._runRound, round, dss_permutation, executor
+                        )
+                        for round, dss_permutation in enumerate(rounds)
+                    ]
+                    for future in futures:
+                        future.result()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _runRound(
+        self,
+        round: int,
+        dss_permutation: Tuple[str, ...],
+        executor: Optional[ThreadPoolExecutor],
+    ):
+        primary_dss = dss_permutation[0]
+        all_other_dss = list(dss_permutation[1:])
+        # Every round works in its own footprint so that rounds running at the
+        # same time never see each other's ISAs and Subscriptions.
+        ts = TestSteps(executor, vertices=FOOTPRINT_GRID.vertices(round))
+        LOG.info(f"Round {round}")
+        round_start = time.monotonic()
+        failed = False
+        for name, test_step in self._getTests().items():
+            step_start = time.monotonic()
+            try:
+                test_step(
+                    ts, self.dss_clients, primary_dss, all_other_dss=all_other_dss
+                )
+                self._recordStep(name, time.monotonic() - step_start, passed=True)
+                LOG.info(
+                    f"Round {round}: {name} Passed with {primary_dss} as primary DSS"
+                )
+            except (AssertionError, requests.RequestException) as e:
+                self._recordStep(name, time.monotonic() - step_start, passed=False)
+                failed = True
+                docstring = inspect.cleandoc(inspect.getdoc(test_step))
+                msg = (
+                    f"Round {round}: Failed {name} with {primary_dss} as primary DSS\n"
+                    f"\tTest Purpose: {docstring}\n"
+                    f"\tFailure Message: {e}\n"
+                    f"\tContinuing to next round if any"
+                )
+                LOG.error(msg)
+                LOG.debug(f"Cleaning up round {round + 1}")
+                self._cleanUp(ts, primary_dss)
+                break
+
+        LOG.debug(f"Cleaning up round {round + 1}")
+        self._cleanUp(ts, primary_dss)
+        with self._lock:
+            self.round_durations.record(time.monotonic() - round_start)
+            self.failed_rounds += failed
+
+    def _recordStep(self, name: str, duration: float, passed: bool) -> None:
+        with self._lock:
+            self.step_durations[name].record(duration)
+            if not passed:
+                self.step_failures[name] += 1
+
+    def _cleanUp(self, ts: "TestSteps", primary_dss: str) -> None:
+        try:
             ts.cleanUp(self.dss_clients, primary_dss)
+        except requests.RequestException as e:
+            LOG.warning(f"Could not clean up on {primary_dss}: {e}")
 
     def _getTests(self) -> Dict[str, Callable]:
         # methods is a list of Tuples
@@ -80,10 +214,65 @@ class InterOpTestSuite:
 class TestSteps:
     """Class containing Test Steps & Context for executing the tests
     functions that follows testStep%d naming convention will be run as test steps
+
+    When an executor is provided, steps that query every DSS send their
+    per-DSS requests concurrently; results are still asserted on in DSS order.
+    All entities are created within `vertices`.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        executor: Optional[ThreadPoolExecutor] = None,
+        vertices: List[Dict[str, float]] = VERTICES,
+    ):
         self.context: Dict[Any, TestContext] = {}
+        # time_end of entities (by name) that are expected to expire during the round
+        self.time_end: Dict[str, datetime.datetime] = {}
+        # How long each entity took to expire on each DSS after its time_end
+        self.expiry_propagation: Dict[str, Dict[str, expiry.ExpiryResult]] = {}
+        self._executor = executor
+        self.vertices = vertices
+        self.geo_polygon_string = geo.polygon_string(vertices)
+
+    def _fan_out(
+        self, all_dss: List[str], send_request: Callable[[int, str], Any]
+    ) -> List[Any]:
+        """Calls send_request(index, dss) for each DSS and returns the responses
+        in the same order as all_dss."""
+        if self._executor is None:
+            return [send_request(index, dss) for index, dss in enumerate(all_dss)]
+        futures = [
+            self._executor.submit(send_request, index, dss)
+            for index, dss in enumerate(all_dss)
+        ]
+        return [future.result() for future in futures]
+
+    def _wait_for_expiry(
+        self,
+        name: str,
+        all_dss: List[str],
+        make_condition: Callable[[clients.DSSClient], Callable[[], bool]],
+        time_end: datetime.datetime,
+        dss_map: Dict[str, clients.DSSClient],
+    ) -> None:
+        """Waits until the entity described by name has expired on every DSS,
+        then records and logs how long that took on each DSS."""
+        results = self._fan_out(
+            all_dss,
+            lambda index, dss: expiry.wait_for_expiry(
+                make_condition(dss_map[dss]), time_end
+            ),
+        )
+        self.expiry_propagation[name] = dict(zip(all_dss, results))
+        for dss, result in zip(all_dss, results):
+            if result.expired:
+                LOG.info(
+                    f"{name} expired on {dss} {result.propagation_delay:.2f}s after its time_end"
+                )
+            else:
+                LOG.warning(
+                    f"{name} still present on {dss} {result.propagation_delay:.2f}s after its time_end"
+                )
 
     def _extract_sub_ids_from_isa_put_response(
         self, response: Dict[str, Any]
@@ -98,6 +287,9 @@ class TestSteps:
     def cleanUp(self, dss_map, primary_dss):
         dss = dss_map[primary_dss]
         for entity_type, stored_uuid in self.context.values():
+            if entity_type in ("ISA", "SUB") and stored_uuid not in self.context:
+                # Its creation failed, so there is no version to delete
+                continue
             if entity_type == "ISA":
                 version = self.context[stored_uuid].uuid
                 dss.delete(f"/identification_service_areas/{stored_uuid}/{version}")
@@ -122,7 +314,7 @@ class TestSteps:
             json={
                 "extents": {
                     "spatial_volume": {
-                        "footprint": {"vertices": VERTICES},
+                        "footprint": {"vertices": self.vertices},
                         "altitude_lo": 20,
                         "altitude_hi": 400,
                     },
@@ -150,15 +342,17 @@ class TestSteps:
         """Can create Subscription in all DSSs, ISA accessible from all
         non-primary DSSs."""
         time_end = datetime.datetime.utcnow() + datetime.timedelta(minutes=10)
-        for index, dss in enumerate([primary_dss] + all_other_dss):
-            sub_1_uuid = str(uuid.uuid4())
-            self.context[f"sub_1_{index}_uuid"] = TestContext("SUB", sub_1_uuid)
-            resp = dss_map[dss].put(
-                f"/subscriptions/{sub_1_uuid}",
+        all_dss = [primary_dss] + all_other_dss
+        for index in range(len(all_dss)):
+            self.context[f"sub_1_{index}_uuid"] = TestContext("SUB", str(uuid.uuid4()))
+
+        def put_subscription(index: int, dss: str) -> requests.Response:
+            return dss_map[dss].put(
+                f"/subscriptions/{self.context[f'sub_1_{index}_uuid'].uuid}",
                 json={
                     "extents": {
                         "spatial_volume": {
-                            "footprint": {"vertices": VERTICES},
+                            "footprint": {"vertices": self.vertices},
                             "altitude_lo": 20,
                             "altitude_hi": 400,
                         },
@@ -169,6 +363,10 @@ class TestSteps:
                     },
                 },
             )
+
+        responses = self._fan_out(all_dss, put_subscription)
+        for index, (dss, resp) in enumerate(zip(all_dss, responses)):
+            sub_1_uuid = self.context[f"sub_1_{index}_uuid"].uuid
             assert resp.status_code == 200, f"Failed to Insert Subscription to {dss}"
             data = resp.json()
             isa_ids = [isa["id"] for isa in data["service_areas"]]
@@ -190,10 +388,14 @@ class TestSteps:
     ) -> None:
         """Can retrieve specific Subscription emplaced in primary DSS
         from all DSSs."""
-        for dss in [primary_dss] + all_other_dss:
-            resp = dss_map[dss].get(
+        all_dss = [primary_dss] + all_other_dss
+        responses = self._fan_out(
+            all_dss,
+            lambda index, dss: dss_map[dss].get(
                 f"/subscriptions/{self.context['sub_1_0_uuid'].uuid}"
-            )
+            ),
+        )
+        for dss, resp in zip(all_dss, responses):
             assert resp.status_code == 200, f"{dss} failed to get SUB_1"
 
             data = resp.json()
@@ -212,8 +414,13 @@ class TestSteps:
         all_sub_1 = set()
         for index in range(len(all_dss)):
             all_sub_1.add(self.context[f"sub_1_{index}_uuid"].uuid)
-        for index, dss in enumerate(all_dss):
-            resp = dss_map[dss].get(f"/subscriptions?area={GEO_POLYGON_STRING}")
+        responses = self._fan_out(
+            all_dss,
+            lambda index, dss: dss_map[dss].get(
+                f"/subscriptions?area={self.geo_polygon_string}"
+            ),
+        )
+        for dss, resp in zip(all_dss, responses):
             assert resp.status_code == 200, f"{dss} failed to get SUB_1 by area"
 
             returned_subs = set([x["id"] for x in resp.json()["subscriptions"]])
@@ -243,7 +450,7 @@ class TestSteps:
             json={
                 "extents": {
                     "spatial_volume": {
-                        "footprint": {"vertices": VERTICES},
+                        "footprint": {"vertices": self.vertices},
                         "altitude_lo": 20,
                         "altitude_hi": 400,
                     },
@@ -258,6 +465,7 @@ class TestSteps:
         assert updated_data["service_area"]["time_end"] == time_end.strftime(
             DATE_FORMAT
         ), f"Unsuccessful Update; no change to end time"
+        self.time_end["ISA_1"] = time_end
 
     def testStep6(
         self, dss_map: Dict[str, clients.DSSClient], primary_dss: str, **kwargs
@@ -280,10 +488,13 @@ class TestSteps:
     ) -> None:
         """Subscription deletion from ID index was effective on primary DSS"""
         all_dss = [primary_dss] + all_other_dss
-        for index, dss_name in enumerate(all_dss):
-            dss = dss_map[dss_name]
-            sub_uuid = self.context[f"sub_1_{index}_uuid"].uuid
-            resp = dss.get(f"/subscriptions/{sub_uuid}")
+        responses = self._fan_out(
+            all_dss,
+            lambda index, dss: dss_map[dss].get(
+                f"/subscriptions/{self.context[f'sub_1_{index}_uuid'].uuid}"
+            ),
+        )
+        for resp in responses:
             assert (
                 resp.status_code == 404
             ), f"Expecting code 404, found {resp.status_code}"
@@ -297,8 +508,13 @@ class TestSteps:
         """Subscription deletion from geographic index was effective on primary DSS"""
         all_sub_1 = [sub for sub in self.context if sub.startswith("sub_1_")]
         all_dss = [primary_dss] + all_other_dss
-        for dss in all_dss:
-            resp = dss_map[dss].get(f"/subscriptions?area={GEO_POLYGON_STRING}")
+        responses = self._fan_out(
+            all_dss,
+            lambda index, dss: dss_map[dss].get(
+                f"/subscriptions?area={self.geo_polygon_string}"
+            ),
+        )
+        for resp in responses:
             assert (
                 resp.status_code == 200
             ), f"Expecting code 200, found {resp.status_code}"
@@ -321,21 +537,34 @@ class TestSteps:
         """Expired ISA automatically removed, ISA modifications
         accessible from all non-primary DSSs"""
 
-        # sleep X seconds for ISA_1 to expire
-        time.sleep(SHORT_WAIT_SEC)
+        all_dss = [primary_dss] + all_other_dss
+
+        # wait for ISA_1 to expire on every DSS
+        isa_1_uuid = self.context["isa_1_uuid"].uuid
+        self._wait_for_expiry(
+            "ISA_1",
+            all_dss,
+            lambda dss: expiry.isas_expired(
+                dss, [isa_1_uuid], area=self.geo_polygon_string
+            ),
+            self.time_end["ISA_1"],
+            dss_map,
+        )
 
         time_end = datetime.datetime.utcnow() + datetime.timedelta(
             seconds=SHORT_WAIT_SEC
         )
-        for index, dss in enumerate([primary_dss] + all_other_dss):
-            sub_2_uuid = str(uuid.uuid4())
-            self.context[f"sub_2_{index}_uuid"] = TestContext("SUB", sub_2_uuid)
-            resp = dss_map[dss].put(
-                f"/subscriptions/{sub_2_uuid}",
+        for index in range(len(all_dss)):
+            self.context[f"sub_2_{index}_uuid"] = TestContext("SUB", str(uuid.uuid4()))
+        self.time_end["SUB_2"] = time_end
+
+        def put_subscription(index: int, dss: str) -> requests.Response:
+            return dss_map[dss].put(
+                f"/subscriptions/{self.context[f'sub_2_{index}_uuid'].uuid}",
                 json={
                     "extents": {
                         "spatial_volume": {
-                            "footprint": {"vertices": VERTICES},
+                            "footprint": {"vertices": self.vertices},
                             "altitude_lo": 20,
                             "altitude_hi": 400,
                         },
@@ -346,6 +575,10 @@ class TestSteps:
                     },
                 },
             )
+
+        responses = self._fan_out(all_dss, put_subscription)
+        for index, (dss, resp) in enumerate(zip(all_dss, responses)):
+            sub_2_uuid = self.context[f"sub_2_{index}_uuid"].uuid
             assert resp.status_code == 200, f"Failed to Insert Subscription to {dss}"
             data = resp.json()
             isa_ids = [isa["id"] for isa in data["service_areas"]]
@@ -372,7 +605,7 @@ class TestSteps:
             json={
                 "extents": {
                     "spatial_volume": {
-                        "footprint": {"vertices": VERTICES},
+                        "footprint": {"vertices": self.vertices},
                         "altitude_lo": 20,
                         "altitude_hi": 400,
                     },
@@ -429,10 +662,28 @@ class TestSteps:
         ), f"{primary_dss} returned too few Subscriptions, missing: {missing_subs}"
 
     def testStep12(
-        self, dss_map: Dict[str, clients.DSSClient], primary_dss: str, **kwargs
+        self,
+        dss_map: Dict[str, clients.DSSClient],
+        primary_dss: str,
+        all_other_dss: List[str],
     ) -> None:
         """Expired Subscriptions don’t trigger subscription notification requests"""
-        time.sleep(SHORT_WAIT_SEC)
+        # wait for all SUB_2s to expire on every DSS
+        sub_2_uuids = [
+            entity.uuid
+            for name, entity in self.context.items()
+            if name.startswith("sub_2_")
+        ]
+        self._wait_for_expiry(
+            "SUB_2",
+            [primary_dss] + all_other_dss,
+            lambda dss: expiry.subscriptions_expired(
+                dss, sub_2_uuids, area=self.geo_polygon_string
+            ),
+            self.time_end["SUB_2"],
+            dss_map,
+        )
+
         time_end = datetime.datetime.utcnow() + datetime.timedelta(minutes=10)
         self.context["isa_3_uuid"] = TestContext("ISA", str(uuid.uuid4()))
         resp = dss_map[primary_dss].put(
@@ -440,7 +691,7 @@ class TestSteps:
             json={
                 "extents": {
                     "spatial_volume": {
-                        "footprint": {"vertices": VERTICES},
+                        "footprint": {"vertices": self.vertices},
                         "altitude_lo": 20,
                         "altitude_hi": 400,
                     },
@@ -478,8 +729,13 @@ class TestSteps:
         all_sub_2 = set()
         for index in range(len(all_dss)):
             all_sub_2.add(self.context[f"sub_2_{index}_uuid"].uuid)
-        for index, dss in enumerate(all_dss):
-            resp = dss_map[dss].get(f"/subscriptions?area={GEO_POLYGON_STRING}")
+        responses = self._fan_out(
+            all_dss,
+            lambda index, dss: dss_map[dss].get(
+                f"/subscriptions?area={self.geo_polygon_string}"
+            ),
+        )
+        for dss, resp in zip(all_dss, responses):
             assert resp.status_code == 200, f"{dss} failed to get SUB_2 by area"
 
             returned_subs = set([x["id"] for x in resp.json()["subscriptions"]])
@@ -497,9 +753,13 @@ class TestSteps:
     ) -> None:
         """Expired Subscription removed from ID index on primary DSS"""
         all_dss = [primary_dss] + all_other_dss
-        for index, dss in enumerate(all_dss):
-            sub_2_uuid = self.context[f"sub_2_{index}_uuid"].uuid
-            resp = dss_map[dss].get(f"/subscriptions/{sub_2_uuid}")
+        responses = self._fan_out(
+            all_dss,
+            lambda index, dss: dss_map[dss].get(
+                f"/subscriptions/{self.context[f'sub_2_{index}_uuid'].uuid}"
+            ),
+        )
+        for resp in responses:
             assert (
                 resp.status_code == 404
             ), f"Expecting code 404, found {resp.status_code}"
@@ -532,15 +792,17 @@ class TestSteps:
     ) -> None:
         """Deleted ISA removed from all DSSs"""
         time_end = datetime.datetime.utcnow() + datetime.timedelta(minutes=10)
-        for index, dss in enumerate([primary_dss] + all_other_dss):
-            sub_3_uuid = str(uuid.uuid4())
-            self.context[f"sub_3_{index}_uuid"] = TestContext("SUB", sub_3_uuid)
-            resp = dss_map[dss].put(
-                f"/subscriptions/{sub_3_uuid}",
+        all_dss = [primary_dss] + all_other_dss
+        for index in range(len(all_dss)):
+            self.context[f"sub_3_{index}_uuid"] = TestContext("SUB", str(uuid.uuid4()))
+
+        def put_subscription(index: int, dss: str) -> requests.Response:
+            return dss_map[dss].put(
+                f"/subscriptions/{self.context[f'sub_3_{index}_uuid'].uuid}",
                 json={
                     "extents": {
                         "spatial_volume": {
-                            "footprint": {"vertices": VERTICES},
+                            "footprint": {"vertices": self.vertices},
                             "altitude_lo": 20,
                             "altitude_hi": 400,
                         },
@@ -551,6 +813,10 @@ class TestSteps:
                     },
                 },
             )
+
+        responses = self._fan_out(all_dss, put_subscription)
+        for index, (dss, resp) in enumerate(zip(all_dss, responses)):
+            sub_3_uuid = self.context[f"sub_3_{index}_uuid"].uuid
             assert resp.status_code == 200, f"Failed to Insert Subscription to {dss}"
             data = resp.json()
             isa_ids = [isa["id"] for isa in data["service_areas"]]
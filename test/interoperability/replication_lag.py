@@ -0,0 +1,267 @@
+"""Measurement of how long writes on one DSS take to become visible on others.
+
+Each sample creates an ISA or a Subscription on one DSS (the writer) and, as
+soon as the write has been acknowledged, tight-polls every DSS (the readers,
+including the writer itself) in parallel, both by ID and by searching the
+entity's footprint, until the entity shows up.  The lag of a (writer, reader)
+pair is the time from the acknowledgement of the write until the start of the
+first poll of the reader that saw the entity, so it is accurate to within one
+poll interval plus one request.  Writers take turns so that every pair
+accumulates a distribution of lags over the run.
+"""
+
+import collections
+import datetime
+import itertools
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import clients
+import interop_test_suite
+import reporting
+from monitorlib import geo, histogram, rid
+
+LOG = logging.getLogger(__name__)
+
+ISA = "isa"
+SUBSCRIPTION = "subscription"
+KINDS = [ISA, SUBSCRIPTION]
+
+BY_ID = "id"
+BY_AREA = "area"
+METHODS = [BY_ID, BY_AREA]
+
+DEFAULT_SAMPLES = 60
+DEFAULT_POLL_INTERVAL_SEC = 0.01
+DEFAULT_TIMEOUT_SEC = 10
+
+# Lifetime of the entities written; they are deleted after each sample anyway.
+ENTITY_TTL = datetime.timedelta(minutes=10)
+
+# Footprints of samples, one grid cell per sample, north of the footprints the
+# test rounds use so that measurements can run alongside them.
+_ROUNDS_GRID = interop_test_suite.FOOTPRINT_GRID
+FOOTPRINT_GRID = geo.Grid(
+    origin_lat=_ROUNDS_GRID.origin_lat + _ROUNDS_GRID.rows * _ROUNDS_GRID.cell_pitch_deg
+)
+
+_PATHS = {ISA: rid.ISA_PATH, SUBSCRIPTION: rid.SUBSCRIPTION_PATH}
+_RESULT_KEYS = {ISA: "service_areas", SUBSCRIPTION: "subscriptions"}
+_ENTITY_KEYS = {ISA: "service_area", SUBSCRIPTION: "subscription"}
+
+# (kind, method, writer, reader)
+PairKey = Tuple[str, str, str, str]
+
+
+class PairLag:
+    """Lag distribution of one (writer, reader) pair."""
+
+    def __init__(self):
+        self.lag = histogram.Histogram()
+        self.timeouts = 0
+
+    def summary(self) -> Dict[str, Any]:
+        result = self.lag.summary()
+        result["timeouts"] = self.timeouts
+        return result
+
+
+class ReplicationLagMeasurement:
+    """Measures replication lag between every pair of DSSs.
+
+    Args:
+      dss_clients: Clients of every DSS, by name.
+      kinds: Kinds of entities to write.
+      poll_interval: Seconds between the end of one poll and the start of the
+        next on each reader.
+      timeout: Seconds after the write to give up waiting for the entity on a
+        reader; such samples are counted as timeouts.
+      footprint_offset: Index of the first footprint of FOOTPRINT_GRID to use.
+    """
+
+    def __init__(
+        self,
+        dss_clients: Dict[str, clients.DSSClient],
+        kinds: List[str] = KINDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SEC,
+        timeout: float = DEFAULT_TIMEOUT_SEC,
+        footprint_offset: int = 0,
+    ):
+        self.dss_clients = dss_clients
+        self.kinds = kinds
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.footprint_offset = footprint_offset
+        self.pairs: Dict[PairKey, PairLag] = collections.defaultdict(PairLag)
+        self.failed_writes: Dict[str, int] = collections.Counter()
+        self._lock = threading.Lock()
+        # One poller per reader and method.
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(dss_clients) * len(METHODS)
+        )
+        self.samples = 0
+
+    def footprints(self) -> List[List[Dict[str, float]]]:
+        """Returns the footprint of every sample taken so far."""
+        return [
+            FOOTPRINT_GRID.vertices(self.footprint_offset + index)
+            for index in range(self.samples)
+        ]
+
+    def run(self, samples: int) -> None:
+        """Takes samples, with writers and kinds taking turns."""
+        names = list(self.dss_clients)
+        schedule = itertools.product(self.kinds, names)
+        try:
+            for index, (kind, writer) in zip(
+                range(samples), itertools.cycle(schedule)
+            ):
+                self.samples = index + 1
+                self.sample(index, kind, writer)
+        finally:
+            self._executor.shutdown()
+
+    def sample(self, index: int, kind: str, writer: str) -> None:
+        """Writes one entity on writer and waits for it on every DSS."""
+        vertices = FOOTPRINT_GRID.vertices(self.footprint_offset + index)
+        entity_id = str(uuid.uuid4())
+        time_start = datetime.datetime.utcnow()
+        time_end = time_start + ENTITY_TTL
+        if kind == ISA:
+            body = rid.isa_body(vertices, time_start, time_end)
+        else:
+            body = rid.subscription_body(vertices, time_start, time_end)
+
+        resp = self.dss_clients[writer].put(
+            f"{_PATHS[kind]}/{entity_id}", json=body
+        )
+        written_at = time.monotonic()
+        if resp.status_code != 200:
+            LOG.warning(
+                f"Sample {index}: failed to create {kind} on {writer}: "
+                f"{resp.status_code} {resp.text}"
+            )
+            with self._lock:
+                self.failed_writes[writer] += 1
+            return
+        version = resp.json()[_ENTITY_KEYS[kind]]["version"]
+
+        try:
+            area = geo.polygon_string(vertices)
+            futures = {
+                (method, reader): self._executor.submit(
+                    self._poll,
+                    self._condition(kind, method, reader, entity_id, area),
+                    written_at,
+                )
+                for reader in self.dss_clients
+                for method in METHODS
+            }
+            for (method, reader), future in futures.items():
+                lag = future.result()
+                with self._lock:
+                    pair = self.pairs[(kind, method, writer, reader)]
+                    if lag is None:
+                        pair.timeouts += 1
+                    else:
+                        pair.lag.record(lag)
+                if lag is None:
+                    LOG.warning(
+                        f"Sample {index}: {kind} written on {writer} not "
+                        f"visible by {method} on {reader} after {self.timeout}s"
+                    )
+        finally:
+            resp = self.dss_clients[writer].delete(
+                f"{_PATHS[kind]}/{entity_id}/{version}"
+            )
+            if resp.status_code != 200:
+                LOG.warning(
+                    f"Sample {index}: failed to delete {kind} {entity_id} from "
+                    f"{writer}: {resp.status_code}"
+                )
+
+    def _condition(
+        self, kind: str, method: str, reader: str, entity_id: str, area: str
+    ) -> Callable[[], bool]:
+        dss = self.dss_clients[reader]
+        if method == BY_ID:
+            return lambda: dss.get(f"{_PATHS[kind]}/{entity_id}").status_code == 200
+
+        def found_by_area() -> bool:
+            resp = dss.get(f"{_PATHS[kind]}?area={area}")
+            return resp.status_code == 200 and any(
+                x["id"] == entity_id for x in resp.json()[_RESULT_KEYS[kind]]
+            )
+
+        return found_by_area
+
+    def _poll(
+        self, is_visible: Callable[[], bool], written_at: float
+    ) -> Optional[float]:
+        """Returns the lag at which is_visible first held, or None on timeout."""
+        deadline = written_at + self.timeout
+        while True:
+            poll_time = time.monotonic()
+            if is_visible():
+                return poll_time - written_at
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the summary and raw histogram of every pair."""
+        return {
+            "dss": list(self.dss_clients),
+            "failed_writes": dict(self.failed_writes),
+            "pairs": [
+                {
+                    "kind": kind,
+                    "method": method,
+                    "writer": writer,
+                    "reader": reader,
+                    "summary": pair.summary(),
+                    "lag": pair.lag.to_dict(),
+                }
+                for (kind, method, writer, reader), pair in sorted(
+                    self.pairs.items()
+                )
+            ],
+        }
+
+    def matrix_report(self, percentiles=(50, 99)) -> str:
+        """Formats one writer x reader matrix per kind and method."""
+        names = list(self.dss_clients)
+        # Short labels keep the matrix narrow; the legend maps them to DSSs.
+        labels = {name: f"DSS{i}" for i, name in enumerate(names)}
+        lines = [f"{labels[name]}: {name}" for name in names]
+        for kind in self.kinds:
+            for method in METHODS:
+                lines.append("")
+                lines.append(
+                    f"{kind} by {method}: lag ms "
+                    + "/".join(f"p{p:g}" for p in percentiles)
+                    + " (samples, timeouts), writer down, reader across"
+                )
+                rows = [["writer"] + [labels[name] for name in names]]
+                for writer in names:
+                    row = [labels[writer]]
+                    for reader in names:
+                        pair = self.pairs.get((kind, method, writer, reader))
+                        row.append(_cell(pair, percentiles))
+                    rows.append(row)
+                lines.extend(reporting.table(rows))
+        return "\n".join(lines)
+
+
+def _cell(pair: Optional[PairLag], percentiles) -> str:
+    if pair is None:
+        return "-"
+    values = "/".join(
+        "-" if v is None else f"{v * 1000:.0f}"
+        for v in (pair.lag.percentile(p) for p in percentiles)
+    )
+    return f"{values} ({pair.lag.count}, {pair.timeouts})"
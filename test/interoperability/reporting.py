@@ -0,0 +1,18 @@
+"""Plain-text formatting shared by the reports of the interoperability tools."""
+
+from typing import List
+
+
+def table(rows: List[List[str]]) -> List[str]:
+    """Aligns rows into columns: the first left-aligned, the others right-aligned.
+
+    Every row must have as many cells as the first, which is usually a header.
+    """
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return [
+        "  ".join(
+            cell.rjust(width) if i else cell.ljust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    ]